@@ -3,6 +3,7 @@
 STOP=0
 START=1
 SKIP_STARTUP_CONNECTION=false
+BACKGROUND_DEVICE_CONNECTION=false
 VERBOSE_EVENT_LOGGING=false
 IN_DEV=false
 EXTERNAL_CALLBACK_SERVICE=false
@@ -22,6 +23,9 @@ for option in "$@"; do
         --skip-startup-connection)
             SKIP_STARTUP_CONNECTION=true
             ;;
+        --background-device-connection)
+            BACKGROUND_DEVICE_CONNECTION=true
+            ;;
         --dev)
             IN_DEV=true
             ;;
@@ -119,9 +123,11 @@ if [[ $START == 1 ]]; then
 
     #Add future arguments here
     declare -A h_only_args=(        ["SKIP_STARTUP_CONNECTION"]="$SKIP_STARTUP_CONNECTION"
+                                    ["BACKGROUND_DEVICE_CONNECTION"]="$BACKGROUND_DEVICE_CONNECTION"
                                     ["VERBOSE_EVENT_LOGGING"]="$VERBOSE_EVENT_LOGGING"
                                     ["EXTERNAL_CALLBACK_SERVICE"]="$EXTERNAL_CALLBACK_SERVICE" )
     declare -A h_only_arg_strings=( ["SKIP_STARTUP_CONNECTION"]="--skip-startup-connection"
+                                    ["BACKGROUND_DEVICE_CONNECTION"]="--background-device-connection"
                                     ["VERBOSE_EVENT_LOGGING"]="--verbose-event-logging"
                                     ["EXTERNAL_CALLBACK_SERVICE"]="--external-callbacks")
 
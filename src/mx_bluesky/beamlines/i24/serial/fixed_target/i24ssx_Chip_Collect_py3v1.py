@@ -33,6 +33,9 @@ from mx_bluesky.beamlines.i24.serial.fixed_target.ft_utils import (
 from mx_bluesky.beamlines.i24.serial.fixed_target.i24ssx_Chip_Manager_py3v1 import (
     write_parameter_file,
 )
+from mx_bluesky.beamlines.i24.serial.fixed_target.pmac_upload import (
+    upload_pmac_commands,
+)
 from mx_bluesky.beamlines.i24.serial.parameters import (
     ChipDescription,
     FixedTargetParameters,
@@ -236,6 +239,7 @@ def load_motion_program_data(
 ):
     logger.info("Loading motion program data for chip.")
     logger.info(f"Pump_repeat is {PumpProbeSetting(pump_repeat)}")
+    commands = []
     if pump_repeat == PumpProbeSetting.NoPP:
         if map_type == MappingType.NoMap:
             prefix = 11
@@ -251,15 +255,14 @@ def load_motion_program_data(
         # Pump setting chosen
         prefix = 14
         logger.info(f"Setting program prefix to {prefix}")
-        yield from bps.abs_set(pmac.pmac_string, "P1439=0", wait=True)
         if checker_pattern:
             logger.info("Checker pattern setting enabled.")
-            yield from bps.abs_set(pmac.pmac_string, "P1439=1", wait=True)
+        commands.append(f"P1439={int(checker_pattern)}")
         if pump_repeat == PumpProbeSetting.Medium1:
             # Medium1 has time delays (Fast shutter opening time in ms)
-            yield from bps.abs_set(pmac.pmac_string, "P1441=50", wait=True)
+            commands.append("P1441=50")
         else:
-            yield from bps.abs_set(pmac.pmac_string, "P1441=0", wait=True)
+            commands.append("P1441=0")
     else:
         logger.warning(f"Unknown Pump repeat, pump_repeat = {pump_repeat}")
         return
@@ -272,9 +275,8 @@ def load_motion_program_data(
         value = str(v[1])
         s = f"P{pvar}={value}"
         logger.info(f"{key} \t {s}")
-        yield from bps.abs_set(pmac.pmac_string, s, wait=True)
-        yield from bps.sleep(0.02)
-    yield from bps.sleep(0.2)
+        commands.append(s)
+    yield from upload_pmac_commands(pmac, commands)
 
 
 @log.log_on_entry
@@ -35,6 +35,9 @@ from mx_bluesky.beamlines.i24.serial.fixed_target.ft_utils import (
     Fiducials,
     MappingType,
 )
+from mx_bluesky.beamlines.i24.serial.fixed_target.pmac_upload import (
+    upload_pmac_commands,
+)
 from mx_bluesky.beamlines.i24.serial.parameters import get_chip_format
 from mx_bluesky.beamlines.i24.serial.parameters.constants import (
     CS_FILES_PATH,
@@ -44,7 +47,14 @@ from mx_bluesky.beamlines.i24.serial.parameters.constants import (
     PARAM_FILE_PATH_FT,
     PVAR_FILE_PATH,
 )
-from mx_bluesky.beamlines.i24.serial.setup_beamline import Pilatus, caget, caput, pv
+from mx_bluesky.beamlines.i24.serial.setup_beamline import (
+    Pilatus,
+    caget,
+    caput,
+    pv,
+    read_register_bank,
+    set_register_bank,
+)
 from mx_bluesky.beamlines.i24.serial.setup_beamline.setup_detector import (
     get_detector_type,
 )
@@ -110,12 +120,8 @@ def initialise_stages(
     caput(pv.pilat_cbftemplate, 0)
 
     sleep(0.1)
-    logger.info("Clearing General Purpose PVs 1-120")
-    for i in range(4, 120):
-        pvar = "ME14E-MO-IOC-01:GP" + str(i)
-        caput(pvar, 0)
-        sys.stdout.write(".")
-        sys.stdout.flush()
+    logger.info("Clearing General Purpose PVs 4-119")
+    set_register_bank({register: 0 for register in range(4, 120)})
 
     logger.info("Initialisation of the stages complete")
     yield from bps.wait(group=group)
@@ -244,11 +250,11 @@ def save_screen_map() -> MsgGenerator:
     logger.info(f"Saving {litemap_path.as_posix()} currentchip.map")
     with open(litemap_path / "currentchip.map", "w") as f:
         logger.debug("Printing only blocks with block_val == 1")
+        block_vals = read_register_bank(range(11, 92))
         for x in range(1, 82):
-            block_str = "ME14E-MO-IOC-01:GP%i" % (x + 10)
-            block_val = int(caget(block_str))
+            block_val = int(block_vals[x + 10])
             if block_val == 1:
-                logger.info("%s %d" % (block_str, block_val))
+                logger.info("ME14E-MO-IOC-01:GP%i %d" % (x + 10, block_val))
             line = "%02dstatus    P3%02d1 \t%s\n" % (x, x, block_val)
             f.write(line)
     yield from bps.null()
@@ -265,6 +271,7 @@ def upload_parameters(pmac: PMAC = inject("pmac")) -> MsgGenerator:
     if not map_file.exists():
         raise FileNotFoundError(f"The file {map_file} has not yet been created")
 
+    commands = []
     with open(map_file) as f:
         logger.info(f"Chipid {ChipType.Oxford}")
         logger.info(f"width {width}")
@@ -285,8 +292,8 @@ def upload_parameters(pmac: PMAC = inject("pmac")) -> MsgGenerator:
                 x = 1
             else:
                 x += 1
-            yield from bps.abs_set(pmac.pmac_string, s, wait=True)
-            sleep(0.02)
+            commands.append(s)
+    yield from upload_pmac_commands(pmac, commands)
 
     logger.warning("Automatic Setting Mapping Type to Lite has been disabled")
     logger.debug("Upload parameters done.")
@@ -294,25 +301,25 @@ def upload_parameters(pmac: PMAC = inject("pmac")) -> MsgGenerator:
 
 
 @log.log_on_entry
-def upload_full(pmac: PMAC | None = None) -> MsgGenerator:
+def upload_full(
+    pmac: PMAC | None = None, pvar_lines: list[str] | None = None
+) -> MsgGenerator:
+    """Uploads the full map to the PMAC. This is read from currentchip.full, unless
+    the P-variable lines from mapping.convert_chip_to_hex are passed in pvar_lines."""
     setup_logging()
     if not pmac:
         pmac = i24.pmac()
 
-    map_file: Path = FULLMAP_PATH / "currentchip.full"
-    if not map_file.exists():
-        raise FileNotFoundError(f"The file {map_file} has not yet been created")
-    with open(map_file) as fh:
-        f = fh.readlines()
+    if pvar_lines is not None:
+        f = pvar_lines
+    else:
+        map_file: Path = FULLMAP_PATH / "currentchip.full"
+        if not map_file.exists():
+            raise FileNotFoundError(f"The file {map_file} has not yet been created")
+        with open(map_file) as fh:
+            f = fh.read().splitlines()
 
-    for _i in range(len(f) // 2):
-        pmac_list = []
-        for _j in range(2):
-            pmac_list.append(f.pop(0).rstrip("\n"))
-        writeline = " ".join(pmac_list)
-        logger.info(f"{writeline}")
-        yield from bps.abs_set(pmac.pmac_string, writeline, wait=True)
-        yield from bps.sleep(0.02)
+    yield from upload_pmac_commands(pmac, f)
     logger.debug("Upload fullmap done")
     yield from bps.null()
 
@@ -505,18 +512,13 @@ def load_stock_map(map_choice: str = "clear") -> MsgGenerator:
     map_dict["half1"] = half1
     map_dict["half2"] = half2
 
-    logger.info("Clearing GP 10-74")  # Actually 11-44
-    for i in range(1, 65):
-        pvar = "ME14E-MO-IOC-01:GP" + str(i + 10)
-        caput(pvar, 0)
-        sys.stdout.write(".")
-        sys.stdout.flush()
-    logger.info("Map cleared")
+    # Clear GP 11-74 and set the blocks in the map in one go
     logger.info(f"Loading Map Choice {map_choice}")
-    for i in map_dict[map_choice]:
-        pvar = "ME14E-MO-IOC-01:GP" + str(i + 10)
-        caput(pvar, 1)
-    logger.debug("Load stock map done.")
+    start = time.perf_counter()
+    blocks = {i + 10: 0 for i in range(1, 65)}
+    blocks.update({i + 10: 1 for i in map_dict[map_choice]})
+    set_register_bank(blocks)
+    logger.info(f"Map {map_choice} loaded in {time.perf_counter() - start:.3f}s")
     yield from bps.null()
 
 
@@ -6,6 +6,7 @@ This version changed to python3 March2020 by RLO
 
 import logging
 import time
+from pathlib import Path
 
 import numpy as np
 from matplotlib import pyplot as plt
@@ -14,16 +15,18 @@ from mx_bluesky.beamlines.i24.serial import log
 from mx_bluesky.beamlines.i24.serial.fixed_target.ft_utils import ChipType
 from mx_bluesky.beamlines.i24.serial.fixed_target.i24ssx_Chip_StartUp_py3v1 import (
     check_files,
-    get_shot_order,
-    get_xy,
+    chip_address_table,
     read_parameter_file,
     write_file,
 )
-from mx_bluesky.beamlines.i24.serial.parameters import get_chip_format
 from mx_bluesky.beamlines.i24.serial.parameters.constants import PARAM_FILE_PATH_FT
 
 logger = logging.getLogger("I24ssx.chip_mapping")
 
+# The full map is uploaded to the PMAC as P-variables from P5001, one per row of windows
+FIRST_FULL_MAP_PVAR = 5001
+FULL_MAP_HEX_DIGITS = 7
+
 
 def setup_logging():
     # Log should now change name daily.
@@ -33,6 +36,14 @@ def setup_logging():
 
 @log.log_on_entry
 def read_file_make_dict(fid, chip_type, switch=False):
+    table = chip_address_table(chip_type)
+    coordinates = dict(
+        zip(
+            table["address"].tolist(),
+            zip(table["x"].tolist(), table["y"].tolist(), strict=True),
+            strict=True,
+        )
+    )
     a_dict = {}
     b_dict = {}
     with open(fid) as f:
@@ -43,8 +54,7 @@ def read_file_make_dict(fid, chip_type, switch=False):
                 entry = line.rstrip().split()
                 addr = entry[0][-5:]
                 pres = entry[4]
-                x, y = get_xy(addr, chip_type)
-                a_dict[x, y] = pres
+                a_dict[coordinates[addr]] = pres
                 b_dict[addr] = pres
     if switch is True:
         return b_dict
@@ -52,92 +62,107 @@ def read_file_make_dict(fid, chip_type, switch=False):
         return a_dict
 
 
+def read_presence(fid, chip_type) -> np.ndarray:
+    """Reads the presence column of a chip map file into an array in the same order
+    as chip_address_table(chip_type). Wells missing from the file are given -1."""
+    table = chip_address_table(chip_type)
+    row = {addr: i for i, addr in enumerate(table["address"].tolist())}
+    presence = np.full(len(table), -1, dtype=np.int8)
+    with open(fid) as f:
+        for line in f:
+            if line.startswith("#"):
+                continue
+            entry = line.split()
+            presence[row[entry[0][-5:]]] = int(entry[4])
+    return presence
+
+
 @log.log_on_entry
 def plot_file(fid, chip_type):
-    chip_dict = read_file_make_dict(fid, chip_type)
-    x_list, y_list, z_list = [], [], []
-    for k in sorted(chip_dict.keys()):
-        x, y = k[0], k[1]
-        pres = chip_dict[k]
-        x_list.append(float(x))
-        y_list.append(float(y))
-        z_list.append(float(pres))
-
-    X = np.array(x_list)
-    Y = np.array(y_list)
-    Z = np.array(z_list)
-    xr = X.ravel()
-    yr = Y.ravel()
-    zr = Z.ravel()
+    table = chip_address_table(chip_type)
+    presence = read_presence(fid, chip_type)
 
     fig = plt.figure(num=None, figsize=(12, 12), facecolor="0.6", edgecolor="k")
     fig.subplots_adjust(
         left=0.03, bottom=0.03, right=0.97, top=0.97, wspace=0, hspace=0
     )
-    ax1 = fig.add_subplot(111, aspect="equal", axisbg="0.3")
-    ax1.scatter(xr, yr, c=zr, s=8, alpha=1, marker="s", linewidth=0.1, cmap="winter")
+    ax1 = fig.add_subplot(111, aspect="equal", facecolor="0.3")
+    ax1.scatter(
+        table["x"],
+        table["y"],
+        c=presence,
+        s=8,
+        alpha=1,
+        marker="s",
+        linewidth=0.1,
+        cmap="winter",
+    )
     ax1.set_xlim(-1, 26)
     ax1.set_ylim(-1, 26)
     ax1.invert_yaxis()
     check_files("i24", [f"{chip_type}.png"])
-    plt.savefig(f"{fid[:-5]}.png", dpi=200, bbox_inches="tight", pad_inches=0.05)
+    plt.savefig(
+        Path(fid).with_suffix(".png"), dpi=200, bbox_inches="tight", pad_inches=0.05
+    )
     return 1
 
 
+def presence_to_pvar_lines(presence: np.ndarray, chip_type) -> list[str]:
+    """Converts a presence map, in the order of chip_address_table(chip_type), into the
+    P-variable assignments which tell the PMAC which windows to shoot, e.g.
+    "P5001=$FFFFF00".
+
+    There is one P-variable for each row of windows in each block, starting from
+    P5001 and in the order the rows are shot. Each holds the row's windows as bits, the
+    first window in the most significant bit, left aligned in FULL_MAP_HEX_DIGITS hex
+    digits.
+    """
+    table = chip_address_table(chip_type)
+    windows_per_block = int(table["window_col"].max()) + 1
+    if windows_per_block > 4 * FULL_MAP_HEX_DIGITS:
+        raise ValueError(
+            f"Can't fit {windows_per_block} windows in {FULL_MAP_HEX_DIGITS} hex digits"
+        )
+    if not np.isin(presence, (0, 1)).all():
+        raise ValueError("A full map must only contain 0 or 1 for each well")
+
+    rows = (
+        presence[np.argsort(table["shot_index"])]
+        .astype(np.uint8)
+        .reshape(-1, windows_per_block)
+    )
+    # Every other row is shot backwards, so is put back in window order
+    rows[1::2] = rows[1::2, ::-1]
+    # packbits pads each row with zeros to whole bytes, so it is already left aligned
+    hex_rows = [
+        row.tobytes().hex().upper().ljust(FULL_MAP_HEX_DIGITS, "0")
+        for row in np.packbits(rows, axis=1)
+    ]
+    return [
+        f"P{FIRST_FULL_MAP_PVAR + i}=${hex_row[:FULL_MAP_HEX_DIGITS]}"
+        for i, hex_row in enumerate(hex_rows)
+    ]
+
+
 @log.log_on_entry
-def convert_chip_to_hex(fid, chip_type):
-    chip_dict = read_file_make_dict(fid, chip_type, True)
-    chip_format = get_chip_format(ChipType(chip_type))
-    check_files("i24", [f"{chip_type}.full"])
-    with open(f"{fid[:-5]}.full", "w") as g:
-        # Normal
-        if chip_type in [ChipType.Oxford, ChipType.OxfordInner]:
-            shot_order_list = get_shot_order(chip_type)
-            logger.info("Shot Order List: \n")
-            logger.info(f"{shot_order_list[:14]}")
-            logger.info(f"{shot_order_list[-14:]}")
-            for i, k in enumerate(shot_order_list):
-                if i % 20 == 0:
-                    logger.info("\n")
-                else:
-                    logger.info(f"{k}")
-            sorted_pres_list = []
-            for addr in shot_order_list:
-                sorted_pres_list.append(chip_dict[addr])
-
-            windows_per_block = chip_format.x_num_steps
-            number_of_lines = int(len(sorted_pres_list) / windows_per_block)
-            hex_length = windows_per_block / 4
-            pad = int(7 - hex_length)
-            for i in range(number_of_lines):
-                sublist = sorted_pres_list[
-                    i * windows_per_block : (i * windows_per_block) + windows_per_block
-                ]
-                if i % 2 == 0:
-                    right_list = sublist
-                else:
-                    right_list = sublist[::-1]
-                hex_string = (f"{{0:0>{hex_length}X}}").format(
-                    int("".join(str(x) for x in right_list), 2)
-                )
-                hex_string = hex_string + (pad * "0")
-                pvar = 5001 + i
-                line = f"P{pvar}=${hex_string}"
-                g.write(line + "\n")
-                logger.info("hex string: %s" % (hex_string + 4 * "0"))
-                logger.info(f"line number= {i}")
-                logger.info(
-                    "right_list: \n{}\n".format("".join(str(x) for x in right_list))
-                )
-                logger.info(f"PVAR: {line}")
-                if (i + 1) % windows_per_block == 0:
-                    logger.info(
-                        "\n %s" % (40 * (" %i" % ((i / windows_per_block) + 2)))
-                    )
-            logger.info(f"hex_length: {hex_length}")
-        else:
-            logger.warning("Chip type unknown, no conversion done.")
-    return 0
+def convert_chip_to_hex(fid, chip_type, save_file: bool = True) -> list[str]:
+    """Converts the chip map in fid into the P-variable lines for the PMAC, see
+    presence_to_pvar_lines, and returns them. Unless save_file is False, they are also
+    written to a .full file next to fid."""
+    lines: list[str] = []
+    if chip_type in [ChipType.Oxford, ChipType.OxfordInner]:
+        lines = presence_to_pvar_lines(read_presence(fid, chip_type), chip_type)
+        logger.info(
+            f"Converted {fid} into {len(lines)} P-variables, P{FIRST_FULL_MAP_PVAR} "
+            f"to P{FIRST_FULL_MAP_PVAR + len(lines) - 1}"
+        )
+    else:
+        logger.warning("Chip type unknown, no conversion done.")
+    if save_file:
+        check_files("i24", [f"{chip_type}.full"])
+        with open(Path(fid).with_suffix(".full"), "w") as g:
+            g.writelines(f"{line}\n" for line in lines)
+    return lines
 
 
 def main():
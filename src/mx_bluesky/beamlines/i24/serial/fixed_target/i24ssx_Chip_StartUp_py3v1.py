@@ -6,6 +6,7 @@ import logging
 import os
 import string
 import time
+from functools import cache
 from pathlib import Path
 
 import numpy as np
@@ -24,6 +25,23 @@ from mx_bluesky.beamlines.i24.serial.parameters.constants import (
 
 logger = logging.getLogger("I24ssx.chip_startup")
 
+# Letters naming the rows and columns of windows within a block
+WINDOW_LETTERS = string.ascii_lowercase + string.ascii_uppercase + "0"
+
+# A row of the chip address table, for one well
+CHIP_ADDRESS_DTYPE = np.dtype(
+    [
+        ("address", "U5"),
+        ("block_row", np.int32),
+        ("block_col", np.int32),
+        ("window_row", np.int32),
+        ("window_col", np.int32),
+        ("x", np.float64),
+        ("y", np.float64),
+        ("shot_index", np.int32),
+    ]
+)
+
 
 def setup_logging():
     # Log should now change name daily.
@@ -60,9 +78,8 @@ def get_xy(addr: str, chip_type: ChipType):
     r2, c2 = entry[1][0], entry[1][1]
     blockR = string.ascii_uppercase.index(R)
     blockC = int(C) - 1
-    lowercase_list = list(string.ascii_lowercase + string.ascii_uppercase + "0")
-    windowR = lowercase_list.index(r2)
-    windowC = lowercase_list.index(c2)
+    windowR = WINDOW_LETTERS.index(r2)
+    windowC = WINDOW_LETTERS.index(c2)
 
     chip_params = get_chip_format(chip_type)
 
@@ -79,6 +96,86 @@ def get_xy(addr: str, chip_type: ChipType):
     return x, y
 
 
+def chip_address_table(chip_type: ChipType) -> np.ndarray:
+    """Gets a table of every well on the chip, as a CHIP_ADDRESS_DTYPE array in
+    alphanumeric order, e.g. A1_aa, A1_ab, ... H8_tt for an Oxford chip.
+
+    shot_index is the position of the well in the order they are shot in: the blocks
+    go down the first column, up the second and so on, and the windows within each
+    block snake along its rows from the top.
+
+    The table is only built once for each chip format and is read only.
+    """
+    chip_format = get_chip_format(ChipType(chip_type))
+    return _build_address_table(
+        chip_format.x_blocks,
+        chip_format.x_num_steps,
+        chip_format.x_step_size,
+        chip_format.y_num_steps,
+        chip_format.y_step_size,
+        chip_format.b2b_horz,
+        chip_format.b2b_vert,
+    )
+
+
+@cache
+def _build_address_table(
+    blk_num: int,
+    x_num_steps: int,
+    x_step_size: float,
+    y_num_steps: int,
+    y_step_size: float,
+    b2b_horz: float,
+    b2b_vert: float,
+) -> np.ndarray:
+    # There are only names for the first len(WINDOW_LETTERS) windows
+    wnd_num = len(WINDOW_LETTERS[:x_num_steps])
+    block_row, block_col, window_row, window_col = (
+        index.ravel()
+        for index in np.indices((blk_num, blk_num, wnd_num, wnd_num), dtype=np.int32)
+    )
+
+    table = np.empty(block_row.size, dtype=CHIP_ADDRESS_DTYPE)
+    block_names = np.char.add(
+        np.array(list(string.ascii_uppercase[:blk_num]))[block_row],
+        np.array([str(c) for c in range(1, blk_num + 1)])[block_col],
+    )
+    letters = np.array(list(WINDOW_LETTERS[:wnd_num]))
+    table["address"] = np.char.add(
+        np.char.add(block_names, "_"),
+        np.char.add(letters[window_row], letters[window_col]),
+    )
+    table["block_row"] = block_row
+    table["block_col"] = block_col
+    table["window_row"] = window_row
+    table["window_col"] = window_col
+    # Summed in the same order as get_xy, so the coordinates are identical
+    table["x"] = (
+        (block_col * b2b_horz)
+        + (block_col * (x_num_steps - 1) * x_step_size)
+        + (window_col * x_step_size)
+    )
+    table["y"] = (
+        (block_row * b2b_vert)
+        + (block_row * (y_num_steps - 1) * y_step_size)
+        + (window_row * y_step_size)
+    )
+
+    block_shot = block_col * blk_num + np.where(
+        block_col % 2 == 1, blk_num - 1 - block_row, block_row
+    )
+    col_shot = np.where(window_row % 2 == 1, wnd_num - 1 - window_col, window_col)
+    table["shot_index"] = (block_shot * wnd_num + window_row) * wnd_num + col_shot
+
+    table.flags.writeable = False
+    return table
+
+
+def shot_ordered(table: np.ndarray) -> np.ndarray:
+    """Reorders a chip address table into the order the wells are shot in."""
+    return table[np.argsort(table["shot_index"])]
+
+
 def pathli(l_in=None, way="typewriter", reverse=False):
     if l_in is None:
         l_in = []
@@ -136,62 +233,14 @@ def zippum(list_1_args, list_2_args):
 
 
 def get_alphanumeric(chip_type: ChipType):
-    cell_format = get_chip_format(chip_type)
-    blk_num = cell_format.x_blocks
-    wnd_num = cell_format.x_num_steps
-    uppercase_list = list(string.ascii_uppercase)[:blk_num]
-    lowercase_list = list(string.ascii_lowercase + string.ascii_uppercase + "0")[
-        :wnd_num
-    ]
-    number_list = [str(x) for x in range(1, blk_num + 1)]
-
-    block_list = zippum([uppercase_list, "expand", 0], [number_list, "typewriter", 0])
-    window_list = zippum(
-        [lowercase_list, "expand", 0], [lowercase_list, "typewriter", 0]
-    )
-
-    alphanumeric_list = []
-    for block in block_list:
-        for window in window_list:
-            alphanumeric_list.append(block + "_" + window)
+    alphanumeric_list = chip_address_table(chip_type)["address"].tolist()
     logger.info(f"Length of alphanumeric list = {len(alphanumeric_list)}")
     return alphanumeric_list
 
 
 @log.log_on_entry
 def get_shot_order(chip_type: ChipType):
-    cell_format = get_chip_format(chip_type)
-    blk_num = cell_format.x_blocks
-    wnd_num = cell_format.x_num_steps
-    uppercase_list = list(string.ascii_uppercase)[:blk_num]
-    number_list = [str(x) for x in range(1, blk_num + 1)]
-    lowercase_list = list(string.ascii_lowercase + string.ascii_uppercase + "0")[
-        :wnd_num
-    ]
-
-    block_list = zippum([uppercase_list, "snake", 0], [number_list, "expand", 0])
-    window_dn = zippum([lowercase_list, "expand", 0], [lowercase_list, "snake", 0])
-    window_up = zippum([lowercase_list, "expand", 1], [lowercase_list, "snake", 0])
-
-    switch = 0
-    count = 0
-    collect_list = []
-    for block in block_list:
-        if switch == 0:
-            for window in window_dn:
-                collect_list.append(block + "_" + window)
-            count += 1
-            if count == blk_num:
-                count = 0
-                switch = 1
-        else:
-            for window in window_up:
-                collect_list.append(block + "_" + window)
-            count += 1
-            if count == blk_num:
-                count = 0
-                switch = 0
-
+    collect_list = shot_ordered(chip_address_table(chip_type))["address"].tolist()
     logger.info(f"Length of collect list = {len(collect_list)}")
     return collect_list
 
@@ -214,26 +263,30 @@ def write_file(
 
     fiducial_list = fiducials(params.chip.chip_type.value)
 
-    if order == "alphanumeric":
-        addr_list = get_alphanumeric(params.chip.chip_type)
-    elif order == "shot":
-        addr_list = get_shot_order(params.chip.chip_type)
-    else:
+    table = chip_address_table(params.chip.chip_type)
+    if order == "shot":
+        table = shot_ordered(table)
+    elif order != "alphanumeric":
         raise ValueError(f"{order=} unrecognised")
 
+    if "rand" in suffix:
+        present = np.random.randint(2, size=len(table)).astype(str)
+    else:
+        present = np.full(len(table), "-1")
+    present[np.isin(table["address"], fiducial_list or [])] = "0"
+
+    lines = [
+        f"{params.filename}_{addr}\t{x}\t{y}\t0.0\t{pres}\n"
+        for addr, x, y, pres in zip(
+            table["address"].tolist(),
+            table["x"].tolist(),
+            table["y"].tolist(),
+            present.tolist(),
+            strict=True,
+        )
+    ]
     with open(chip_file_path, "a") as g:
-        for addr in addr_list:
-            xtal_name = "_".join([params.filename, addr])
-            (x, y) = get_xy(xtal_name, params.chip.chip_type)
-            if addr in fiducial_list:
-                pres = "0"
-            else:
-                if "rand" in suffix:
-                    pres = str(np.random.randint(2))
-                else:
-                    pres = "-1"
-            line = "\t".join([xtal_name, str(x), str(y), "0.0", pres]) + "\n"
-            g.write(line)
+        g.writelines(lines)
 
     logger.info(f"Write {chip_file_path} completed")
 
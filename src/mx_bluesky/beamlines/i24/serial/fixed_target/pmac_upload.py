@@ -0,0 +1,74 @@
+"""
+Upload P-variable assignments, such as the motion program parameters and the chip
+maps, to the PMAC through its PMAC_STRING PV.
+The PMAC runs every command in a line it is sent, in order, so the assignments are
+joined into as few lines as fit in the PV rather than sent one at a time.
+"""
+
+import logging
+import time
+from collections.abc import Iterable
+
+import bluesky.plan_stubs as bps
+from blueapi.core import MsgGenerator
+from dodal.devices.i24.pmac import PMAC
+
+logger = logging.getLogger("I24ssx.pmac_upload")
+
+# PMAC_STRING is an EPICS string, which holds 40 characters including the null
+MAX_PMAC_STRING_LENGTH = 39
+
+
+class PMACUploadError(Exception):
+    pass
+
+
+def pack_pmac_commands(
+    commands: Iterable[str], max_length: int = MAX_PMAC_STRING_LENGTH
+) -> list[str]:
+    """Joins commands, e.g. "P1101=5", with spaces into as few lines of at most
+    max_length characters as possible, keeping them in order."""
+    lines: list[str] = []
+    line = ""
+    for command in commands:
+        if len(command) > max_length:
+            raise ValueError(
+                f"PMAC command {command} is longer than {max_length} characters"
+            )
+        if not line:
+            line = command
+        elif len(line) + 1 + len(command) <= max_length:
+            line = f"{line} {command}"
+        else:
+            lines.append(line)
+            line = command
+    if line:
+        lines.append(line)
+    return lines
+
+
+def upload_pmac_commands(pmac: PMAC, commands: Iterable[str]) -> MsgGenerator:
+    """Sends commands to the PMAC, packed into as few lines as possible. Each line is
+    sent once the PMAC has taken the previous one, and pmac_string is read back once at
+    the end to check the last line was the last one written, raising a PMACUploadError
+    if not.
+
+    The PMAC device has no way to read back an arbitrary P-variable, so this can't check
+    the values the PMAC itself holds."""
+    start = time.perf_counter()
+    commands = list(commands)
+    lines = pack_pmac_commands(commands)
+    for line in lines:
+        logger.debug(f"PMAC string: {line}")
+        yield from bps.abs_set(pmac.pmac_string, line, wait=True)
+    if lines:
+        readback = yield from bps.rd(pmac.pmac_string)
+        if readback != lines[-1]:
+            raise PMACUploadError(
+                f"PMAC string read back as {readback}, expected {lines[-1]}, after "
+                "uploading"
+            )
+    logger.info(
+        f"Uploaded {len(commands)} PMAC commands in {len(lines)} lines in "
+        f"{time.perf_counter() - start:.3f}s"
+    )
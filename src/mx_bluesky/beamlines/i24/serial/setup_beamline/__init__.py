@@ -1,14 +1,19 @@
 from . import pv, setup_beamline
-from .ca import caget, cagetstring, caput
+from .ca import caget, caget_many, cagetstring, caput, caput_many
 from .pv_abstract import Detector, Eiger, Pilatus
+from .register_bank import read_register_bank, set_register_bank
 
 __all__ = [
     "caget",
+    "caget_many",
     "cagetstring",
     "caput",
+    "caput_many",
     "Detector",
     "Eiger",
     "Pilatus",
     "pv",
+    "read_register_bank",
+    "set_register_bank",
     "setup_beamline",
 ]
@@ -1,43 +1,94 @@
-from subprocess import PIPE, Popen
+"""Channel Access gets and puts for i24 serial, done in process with pyepics rather
+than by running the caget, caput and cainfo command line tools.
 
+The channel to each PV is created the first time it is used and kept for the rest of
+the session. It is monitored, so reading it again doesn't need another round trip, and
+its native type, which decides how a value is written to it, is only looked up once.
+caget_many and caput_many read or write many PVs in one go, connecting to all of them
+before waiting for any.
+"""
 
-def cagetstring(pv):
-    val = None
-    while val is None:
-        try:
-            a = Popen(["caget", "-S", pv], stdout=PIPE, stderr=PIPE)
-            a_stdout, a_stderr = a.communicate()
-            val = a_stdout.split()[1]
-            val = str(val.decode("ascii"))
-        except Exception:
-            print("Exception in ca_py3.py cagetstring maybe this PV aint a string")
-            pass
-    return val
-
-
-def caget(pv):
-    val = None
-    while val is None:
-        try:
-            a = Popen(["caget", pv], stdout=PIPE, stderr=PIPE)
-            a_stdout, a_stderr = a.communicate()
-            val = a_stdout.split()[1].decode("ascii")
-        except Exception:
-            print("Exception in ca_py3.py caget, maybe this PV doesnt exist:", pv)
-            pass
-    return val
-
-
-def caput(pv, new_val):
-    check = Popen(["cainfo", pv], stdout=PIPE, stderr=PIPE)
-    # print('check', check)
-    check_stdout, check_stderr = check.communicate()
-    if check_stdout.split()[11].decode("ascii") == "DBF_CHAR":
-        a = Popen(["caput", "-S", pv, str(new_val)], stdout=PIPE, stderr=PIPE)
-        a_stdout, a_stderr = a.communicate()
-    else:
-        a = Popen(["caput", pv, str(new_val)], stdout=PIPE, stderr=PIPE)
-        a_stdout, a_stderr = a.communicate()
+from collections.abc import Sequence
+from functools import cache
+from typing import Any
+
+import epics
+from epics import dbr
+
+CONNECTION_TIMEOUT_S = 5.0
+GET_TIMEOUT_S = 5.0
+# A get is tried this many times before giving up
+GET_ATTEMPTS = 3
+# Native types which are read as text and written as given, rather than parsed from
+# strings
+_TEXT_TYPES = (dbr.STRING, dbr.CHAR, dbr.ENUM)
+
+
+@cache
+def _channel(pv: str) -> epics.PV:
+    return epics.PV(pv, connection_timeout=CONNECTION_TIMEOUT_S)
+
+
+def _get_string(channel: epics.PV) -> str | None:
+    """Gets the value of channel as caget prints it, or None if the get timed out.
+    Floats are formatted with %g, as caget does, rather than to the precision of the PV
+    as pyepics' as_string does."""
+    if dbr.native_type(channel.ftype) in _TEXT_TYPES:
+        return channel.get(as_string=True, timeout=GET_TIMEOUT_S)
+    value = channel.get(timeout=GET_TIMEOUT_S)
+    if value is None:
+        return None
+    return f"{value:g}" if isinstance(value, float) else str(value)
+
+
+def caget_many(pvs: Sequence[str]) -> list[str]:
+    """Reads the values of all of pvs as strings, as caget does.
+
+    Raises a TimeoutError naming the PVs which couldn't be read if any still can't
+    after GET_ATTEMPTS tries."""
+    channels = [_channel(pv) for pv in pvs]
+    values: list[str | None] = [None] * len(channels)
+    for _ in range(GET_ATTEMPTS):
+        for i, channel in enumerate(channels):
+            if values[i] is None and channel.wait_for_connection(CONNECTION_TIMEOUT_S):
+                values[i] = _get_string(channel)
+        if all(value is not None for value in values):
+            return values  # type: ignore
+    missing = [pv for pv, value in zip(pvs, values, strict=True) if value is None]
+    raise TimeoutError(
+        f"Could not read {', '.join(missing)} after {GET_ATTEMPTS} attempts"
+    )
+
+
+def caput_many(pvs: Sequence[str], values: Sequence[Any]):
+    """Writes each of values to the PV at the same position in pvs, without waiting
+    for the puts to complete, as caput does. Strings written to numeric PVs are
+    parsed first.
+
+    Raises a TimeoutError, before writing anything, if any of the PVs can't be
+    connected to."""
+    if len(pvs) != len(values):
+        raise ValueError(f"Got {len(values)} values to write to {len(pvs)} PVs")
+    channels = [_channel(pv) for pv in pvs]
+    for pv, channel in zip(pvs, channels, strict=True):
+        if not channel.wait_for_connection(CONNECTION_TIMEOUT_S):
+            raise TimeoutError(f"Could not connect to {pv} to write to it")
+    for channel, value in zip(channels, values, strict=True):
+        if isinstance(value, str) and dbr.native_type(channel.ftype) not in _TEXT_TYPES:
+            value = evaluate(value)
+        channel.put(value)
+
+
+def cagetstring(pv: str) -> str:
+    return caget(pv)
+
+
+def caget(pv: str) -> str:
+    return caget_many([pv])[0]
+
+
+def caput(pv: str, new_val):
+    caput_many([pv], [new_val])
 
 
 def evaluate(val):
@@ -0,0 +1,42 @@
+"""Bulk reads and writes of the general purpose (GP) registers of the ME14E IOC, which
+hold the fixed target parameters and which blocks of the chip are in the lite map shown
+on the EDM screen.
+
+All the registers in a bank are read or written in one go with caget_many and
+caput_many, rather than one PV at a time.
+"""
+
+import logging
+import time
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from mx_bluesky.beamlines.i24.serial.setup_beamline.ca import caget_many, caput_many
+
+logger = logging.getLogger("I24ssx.register_bank")
+
+GP_PV_PREFIX = "ME14E-MO-IOC-01:GP"
+
+
+def gp_pv(register: int) -> str:
+    return f"{GP_PV_PREFIX}{register}"
+
+
+def set_register_bank(values: Mapping[int, Any]):
+    """Writes each value to the GP register numbered by its key."""
+    start = time.perf_counter()
+    caput_many([gp_pv(register) for register in values], list(values.values()))
+    logger.debug(
+        f"Set {len(values)} GP registers in {time.perf_counter() - start:.3f}s"
+    )
+
+
+def read_register_bank(registers: Iterable[int]) -> dict[int, str]:
+    """Reads the GP registers with the given numbers, as strings by register."""
+    start = time.perf_counter()
+    registers = list(registers)
+    values = caget_many([gp_pv(register) for register in registers])
+    logger.debug(
+        f"Read {len(registers)} GP registers in {time.perf_counter() - start:.3f}s"
+    )
+    return dict(zip(registers, values, strict=True))
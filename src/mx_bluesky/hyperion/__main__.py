@@ -1,11 +1,13 @@
 import atexit
 import json
 import threading
+import time
 from collections.abc import Callable
 from dataclasses import asdict
 from queue import Queue
 from traceback import format_exception
 from typing import Any
+from uuid import uuid4
 
 from blueapi.core import BlueskyContext, MsgGenerator
 from bluesky.callbacks.zmq import Publisher
@@ -42,11 +44,20 @@ from mx_bluesky.hyperion.log import (
 from mx_bluesky.hyperion.parameters.cli import parse_cli_args
 from mx_bluesky.hyperion.parameters.components import HyperionParameters
 from mx_bluesky.hyperion.parameters.constants import CONST, Actions, Status
-from mx_bluesky.hyperion.tracing import TRACER
+from mx_bluesky.hyperion.tracing import METER, TRACER
 from mx_bluesky.hyperion.utils.context import setup_context
+from mx_bluesky.hyperion.utils.device_connection import DeviceConnector
+from mx_bluesky.hyperion.utils.phase_timing import SampleTimer
 
 VERBOSE_EVENT_LOGGING: bool | None = None
 
+QUEUE_LATENCY = METER.create_histogram(
+    "hyperion.queue.latency",
+    unit="s",
+    description="Time from a queued experiment being able to run, because the one "
+    "before it finished or it was enqueued while idle, to it starting",
+)
+
 
 @dataclass
 class Command:
@@ -57,6 +68,14 @@ class Command:
     callbacks: CallbacksFactory | None = None
 
 
+@dataclass
+class QueuedExperiment:
+    experiment_id: str
+    plan_name: str
+    enqueued_at: float
+    command: Command
+
+
 @dataclass
 class StatusAndMessage:
     status: str
@@ -72,6 +91,11 @@ class ErrorStatusAndMessage(StatusAndMessage):
     exception_type: str = ""
 
 
+@dataclass
+class EnqueuedStatusAndMessage(StatusAndMessage):
+    experiment_id: str = ""
+
+
 def make_error_status_and_message(exception: Exception):
     return ErrorStatusAndMessage(
         status=Status.FAILED.value,
@@ -87,12 +111,18 @@ class BlueskyRunner:
         context: BlueskyContext,
         skip_startup_connection=False,
         use_external_callbacks: bool = False,
+        device_connector: DeviceConnector | None = None,
     ) -> None:
         self.command_queue: Queue[Command] = Queue()
+        # Experiments waiting to run once the current one has finished, next first
+        self.experiment_queue: list[QueuedExperiment] = []
+        self._experiment_queue_lock = threading.Lock()
+        self._queued_experiment_ready_at: float | None = None
         self.current_status: StatusAndMessage = StatusAndMessage(Status.IDLE)
         self.last_run_aborted: bool = False
         self.aperture_change_callback = ApertureChangeCallback()
         self.logging_uid_tag_callback = LogUidTaggingCallback()
+        self.sample_timer = SampleTimer()
         self.context: BlueskyContext
 
         self.RE = RE
@@ -110,6 +140,7 @@ class BlueskyRunner:
         if VERBOSE_EVENT_LOGGING:
             RE.subscribe(VerbosePlanExecutionLoggingCallback())
 
+        self.device_connector = device_connector
         self.skip_startup_connection = skip_startup_connection
         if not self.skip_startup_connection:
             LOGGER.info("Initialising dodal devices...")
@@ -127,12 +158,9 @@ class BlueskyRunner:
 
         devices: Any = PLAN_REGISTRY[plan_name]["setup"](self.context)
 
-        if (
-            self.current_status.status == Status.BUSY.value
-            or self.current_status.status == Status.ABORTING.value
-        ):
-            return StatusAndMessage(Status.FAILED, "Bluesky already running")
-        else:
+        with self._experiment_queue_lock:
+            if self._is_running():
+                return StatusAndMessage(Status.FAILED, "Bluesky already running")
             self.current_status = StatusAndMessage(Status.BUSY)
             self.command_queue.put(
                 Command(
@@ -145,6 +173,144 @@ class BlueskyRunner:
             )
             return StatusAndMessage(Status.SUCCESS)
 
+    def enqueue(
+        self,
+        experiment: Callable,
+        parameters: HyperionParameters,
+        plan_name: str,
+        callbacks: CallbacksFactory | None,
+    ) -> StatusAndMessage:
+        """Adds an experiment to the end of the queue, starting it straight away if
+        nothing is running. The parameters have already been validated and the devices
+        are resolved here so that the experiment can start as soon as the one before it
+        finishes."""
+        LOGGER.info(
+            f"Enqueueing {plan_name} with parameters: {parameters.model_dump_json(indent=2)}"
+        )
+
+        devices: Any = PLAN_REGISTRY[plan_name]["setup"](self.context)
+        queued_experiment = QueuedExperiment(
+            experiment_id=uuid4().hex,
+            plan_name=plan_name,
+            enqueued_at=time.time(),
+            command=Command(
+                action=Actions.START,
+                devices=devices,
+                experiment=experiment,
+                parameters=parameters,
+                callbacks=callbacks,
+            ),
+        )
+
+        with self._experiment_queue_lock:
+            if len(self.experiment_queue) >= CONST.EXPERIMENT_QUEUE_SIZE:
+                return StatusAndMessage(
+                    Status.FAILED,
+                    f"Experiment queue is full with {len(self.experiment_queue)} "
+                    "experiments waiting",
+                )
+            self.experiment_queue.append(queued_experiment)
+            if not self._is_running():
+                self._start_next_queued_experiment(time.perf_counter())
+        return EnqueuedStatusAndMessage(
+            status=Status.SUCCESS.value,
+            experiment_id=queued_experiment.experiment_id,
+        )
+
+    def queued_experiments(self) -> list[dict[str, Any]]:
+        """The experiments waiting to run, in the order they will run in"""
+        with self._experiment_queue_lock:
+            return [
+                {
+                    "experiment_id": queued.experiment_id,
+                    "plan_name": queued.plan_name,
+                    "enqueued_at": queued.enqueued_at,
+                    "sample_id": getattr(queued.command.parameters, "sample_id", None),
+                }
+                for queued in self.experiment_queue
+            ]
+
+    def cancel_queued(self, experiment_id: str) -> StatusAndMessage:
+        with self._experiment_queue_lock:
+            index = self._queue_index(experiment_id)
+            if index is None:
+                return StatusAndMessage(
+                    Status.FAILED, f"Experiment {experiment_id} is not in the queue"
+                )
+            del self.experiment_queue[index]
+        LOGGER.info(f"Cancelled queued experiment {experiment_id}")
+        return StatusAndMessage(Status.SUCCESS)
+
+    def move_queued(self, experiment_id: str, position: int) -> StatusAndMessage:
+        """Moves a queued experiment to position in the queue, where 0 is the next
+        experiment to run"""
+        with self._experiment_queue_lock:
+            index = self._queue_index(experiment_id)
+            if index is None:
+                return StatusAndMessage(
+                    Status.FAILED, f"Experiment {experiment_id} is not in the queue"
+                )
+            if not 0 <= position < len(self.experiment_queue):
+                return StatusAndMessage(
+                    Status.FAILED,
+                    f"Position {position} is outside of the queue of "
+                    f"{len(self.experiment_queue)} experiments",
+                )
+            self.experiment_queue.insert(position, self.experiment_queue.pop(index))
+        LOGGER.info(f"Moved queued experiment {experiment_id} to position {position}")
+        return StatusAndMessage(Status.SUCCESS)
+
+    def _is_running(self) -> bool:
+        return self.current_status.status in (Status.BUSY.value, Status.ABORTING.value)
+
+    def _queue_index(self, experiment_id: str) -> int | None:
+        for index, queued in enumerate(self.experiment_queue):
+            if queued.experiment_id == experiment_id:
+                return index
+        return None
+
+    def _start_next_queued_experiment(self, ready_at: float):
+        """Must be called holding the experiment queue lock, with something in the
+        queue"""
+        queued = self.experiment_queue.pop(0)
+        LOGGER.info(
+            f"Starting queued experiment {queued.experiment_id} ({queued.plan_name}), "
+            f"{len(self.experiment_queue)} left in the queue"
+        )
+        self.current_status = StatusAndMessage(Status.BUSY)
+        self._queued_experiment_ready_at = ready_at
+        self.command_queue.put(queued.command)
+
+    def _clear_experiment_queue(self):
+        with self._experiment_queue_lock:
+            self._clear_experiment_queue_locked()
+
+    def _clear_experiment_queue_locked(self):
+        """Must be called holding the experiment queue lock"""
+        if self.experiment_queue:
+            LOGGER.warning(
+                "Clearing the experiment queue, cancelling "
+                f"{[queued.experiment_id for queued in self.experiment_queue]}"
+            )
+        self.experiment_queue.clear()
+
+    def _finish_experiment(
+        self, finished_status: StatusAndMessage | None, run_next_queued: bool
+    ):
+        """Starts the next queued experiment, if the last one allows it and there is
+        one, or otherwise goes to finished_status, clearing the queue if the last
+        experiment stopped it. Done under the lock so that a start or enqueue can't
+        see the runner as idle in between."""
+        finished_at = time.perf_counter()
+        with self._experiment_queue_lock:
+            if run_next_queued and self.experiment_queue:
+                self._start_next_queued_experiment(finished_at)
+                return
+            if not run_next_queued:
+                self._clear_experiment_queue_locked()
+            if finished_status is not None:
+                self.current_status = finished_status
+
     def stopping_thread(self):
         try:
             self.RE.abort()
@@ -158,6 +324,7 @@ class BlueskyRunner:
         elif self.current_status.status == Status.ABORTING.value:
             return StatusAndMessage(Status.FAILED, "Bluesky already stopping")
         else:
+            self._clear_experiment_queue()
             self.current_status = StatusAndMessage(Status.ABORTING)
             stopping_thread = threading.Thread(target=self.stopping_thread)
             stopping_thread.start()
@@ -178,6 +345,12 @@ class BlueskyRunner:
             elif command.action == Actions.START:
                 if command.experiment is None:
                     raise ValueError("No experiment provided for START")
+                # Only carry on with the queue if the experiment finished or failed
+                # in a way that doesn't need anyone to look at the beamline
+                run_next_queued = False
+                # The status once finished, if nothing else is queued. Left as None
+                # after an abort, which sets the status itself
+                finished_status: StatusAndMessage | None = None
                 try:
                     if (
                         not self.use_external_callbacks
@@ -190,18 +363,25 @@ class BlueskyRunner:
                         self.subscribed_per_plan_callbacks += [
                             self.RE.subscribe(cb) for cb in cbs
                         ]
-                    with TRACER.start_span("do_run"):
+                    if (ready_at := self._queued_experiment_ready_at) is not None:
+                        self._queued_experiment_ready_at = None
+                        QUEUE_LATENCY.record(time.perf_counter() - ready_at)
+                    if self.device_connector:
+                        self.device_connector.wait_for_composite(command.devices)
+                    with TRACER.start_span("do_run"), self.sample_timer.active():
                         self.RE(command.experiment(command.devices, command.parameters))
 
-                    self.current_status = StatusAndMessage(
+                    finished_status = StatusAndMessage(
                         Status.IDLE,
                         self.aperture_change_callback.last_selected_aperture,
                     )
 
                     self.last_run_aborted = False
+                    run_next_queued = True
                 except WarningException as exception:
                     LOGGER.warning("Warning Exception", exc_info=True)
-                    self.current_status = make_error_status_and_message(exception)
+                    finished_status = make_error_status_and_message(exception)
+                    run_next_queued = True
                 except Exception as exception:
                     LOGGER.error("Exception on running plan", exc_info=True)
 
@@ -209,12 +389,13 @@ class BlueskyRunner:
                         # Aborting will cause an exception here that we want to swallow
                         self.last_run_aborted = False
                     else:
-                        self.current_status = make_error_status_and_message(exception)
+                        finished_status = make_error_status_and_message(exception)
                 finally:
                     [
                         self.RE.unsubscribe(cb)
                         for cb in self.subscribed_per_plan_callbacks
                     ]
+                    self._finish_experiment(finished_status, run_next_queued)
 
 
 def compose_start_args(context: BlueskyContext, plan_name: str, action: Actions):
@@ -252,14 +433,17 @@ class RunExperiment(Resource):
 
     def put(self, plan_name: str, action: Actions):
         status_and_message = StatusAndMessage(Status.FAILED, f"{action} not understood")
-        if action == Actions.START.value:
+        if action in (Actions.START.value, Actions.ENQUEUE.value):
             try:
                 plan, params, plan_name, callback_type = compose_start_args(
                     self.context, plan_name, action
                 )
-                status_and_message = self.runner.start(
-                    plan, params, plan_name, callback_type
+                run = (
+                    self.runner.start
+                    if action == Actions.START.value
+                    else self.runner.enqueue
                 )
+                status_and_message = run(plan, params, plan_name, callback_type)
             except Exception as e:
                 status_and_message = make_error_status_and_message(e)
                 LOGGER.error(format_exception(e))
@@ -290,8 +474,44 @@ class StopOrStatus(Resource):
                 f"Runner received status request - state of the runner object is: {self.runner.__dict__} - state of the RE is: {self.runner.RE.__dict__}"
             )
             status_and_message = self.runner.current_status
+            if self.runner.device_connector:
+                return {
+                    **asdict(status_and_message),
+                    "device_connection": self.runner.device_connector.progress(),
+                }
+        return asdict(status_and_message)
+
+
+class ExperimentQueue(Resource):
+    """The experiments waiting to run after the current one, next first"""
+
+    def __init__(self, runner: BlueskyRunner) -> None:
+        super().__init__()
+        self.runner = runner
+
+    def get(self, **kwargs):
+        return {"queue": self.runner.queued_experiments()}
+
+
+class QueueEntry(Resource):
+    """Cancels a queued experiment, or moves it to the position given as JSON e.g.
+    {"position": 0} to make it the next to run"""
+
+    def __init__(self, runner: BlueskyRunner) -> None:
+        super().__init__()
+        self.runner = runner
+
+    def put(self, experiment_id: str):
+        try:
+            position = int(json.loads(request.data)["position"])
+            status_and_message = self.runner.move_queued(experiment_id, position)
+        except Exception as e:
+            status_and_message = make_error_status_and_message(e)
         return asdict(status_and_message)
 
+    def delete(self, experiment_id: str):
+        return asdict(self.runner.cancel_queued(experiment_id))
+
 
 class FlushLogs(Resource):
     def put(self, **kwargs):
@@ -306,20 +526,47 @@ class FlushLogs(Resource):
         return asdict(status_and_message)
 
 
+class SampleTimings(Resource):
+    """Phase timings of recent samples, and their percentiles. Takes either a since
+    timestamp or a number of hours to go back as a query parameter, otherwise gives
+    all of the samples kept."""
+
+    def __init__(self, runner: BlueskyRunner) -> None:
+        super().__init__()
+        self.runner = runner
+
+    def get(self, **kwargs):
+        since = request.args.get("since", type=float)
+        if (hours := request.args.get("hours", type=float)) is not None:
+            since = time.time() - hours * 3600
+        sample_timer = self.runner.sample_timer
+        return {
+            "samples": sample_timer.samples(since),
+            "percentiles": sample_timer.percentiles(since),
+        }
+
+
 def create_app(
     test_config=None,
     RE: RunEngine = RunEngine({}),
     skip_startup_connection: bool = False,
     use_external_callbacks: bool = False,
+    background_device_connection: bool = False,
 ) -> tuple[Flask, BlueskyRunner]:
+    connect_in_background = background_device_connection and not skip_startup_connection
     context = setup_context(
-        wait_for_connection=not skip_startup_connection,
+        wait_for_connection=not skip_startup_connection and not connect_in_background,
     )
+    device_connector = None
+    if connect_in_background:
+        device_connector = DeviceConnector(context.devices)
+        device_connector.start()
     runner = BlueskyRunner(
         RE,
         context=context,
         use_external_callbacks=use_external_callbacks,
         skip_startup_connection=skip_startup_connection,
+        device_connector=device_connector,
     )
     app = Flask(__name__)
     if test_config:
@@ -334,6 +581,21 @@ def create_app(
         FlushLogs,
         "/flush_debug_log",
     )
+    api.add_resource(
+        ExperimentQueue,
+        "/queue",
+        resource_class_args=[runner],
+    )
+    api.add_resource(
+        QueueEntry,
+        "/queue/<string:experiment_id>",
+        resource_class_args=[runner],
+    )
+    api.add_resource(
+        SampleTimings,
+        "/sample_timings",
+        resource_class_args=[runner],
+    )
     api.add_resource(
         StopOrStatus,
         "/<string:action>",
@@ -351,6 +613,7 @@ def create_targets():
     app, runner = create_app(
         skip_startup_connection=args.skip_startup_connection,
         use_external_callbacks=args.use_external_callbacks,
+        background_device_connection=args.background_device_connection,
     )
     return app, runner, hyperion_port, args.dev_mode
 
@@ -1,3 +1,5 @@
+import asyncio
+import time
 from functools import partial
 
 import bluesky.plan_stubs as bps
@@ -6,8 +8,17 @@ from dodal.devices.oav.oav_errors import OAVError_ZoomLevelNotFound
 from dodal.devices.oav.oav_parameters import OAVParameters
 from dodal.devices.oav.pin_image_recognition import PinTipDetection
 from dodal.devices.oav.utils import ColorMode
+from ophyd.status import SubscriptionStatus
 
+from mx_bluesky.hyperion.log import LOGGER
 from mx_bluesky.hyperion.parameters.constants import CONST
+from mx_bluesky.hyperion.tracing import METER
+
+OAV_REFRESH_WAIT = METER.create_histogram(
+    "hyperion.oav.refresh_wait",
+    unit="s",
+    description="Time spent waiting for new OAV frames after a move",
+)
 
 # Helper function to make sure we set the waiting groups correctly
 set_using_group = partial(bps.abs_set, group=CONST.WAIT.READY_FOR_OAV)
@@ -85,3 +96,45 @@ def pre_centring_setup_oav(
     yield from setup_general_oav_params(oav, parameters)
     yield from setup_pin_tip_detection_params(pin_tip_detection_device, parameters)
     yield from bps.wait(CONST.WAIT.READY_FOR_OAV)
+
+
+def wait_for_new_oav_frames(
+    oav: OAV,
+    after: str = "move",
+    frames: int = CONST.HARDWARE.OAV_REFRESH_FRAMES,
+    timeout: float = CONST.HARDWARE.OAV_REFRESH_TIMEOUT,
+):
+    """Waits for the OAV array counter to go up by frames, so that an image used
+    afterwards was taken after any motion before this was called had finished.
+
+    If the camera doesn't produce the frames within timeout seconds, which it only
+    won't if it isn't acquiring, a warning is logged and the plan carries on.
+
+    The time waited is logged and recorded in the hyperion.oav.refresh_wait metric,
+    labelled with after, a short description of the motion being waited for.
+    """
+    start_count = yield from bps.rd(oav.cam.array_counter)  # type: ignore # See: https://github.com/bluesky/bluesky/issues/1809
+
+    async def new_frames():
+        start = time.perf_counter()
+        timed_out = False
+        status = SubscriptionStatus(
+            oav.cam.array_counter,
+            lambda *, value, **_: value >= start_count + frames,
+            timeout=timeout,
+        )
+        try:
+            await asyncio.to_thread(status.wait)
+        except TimeoutError:
+            timed_out = True
+            LOGGER.warning(
+                f"OAV did not produce {frames} new frames in {timeout}s, carrying on"
+            )
+        waited = time.perf_counter() - start
+        OAV_REFRESH_WAIT.record(waited, {"after": after, "timed_out": timed_out})
+        LOGGER.info(f"Waited {waited:.3f}s for {frames} new OAV frames after {after}")
+
+    tasks = yield from bps.wait_for([new_frames])
+    # The RunEngine returns the finished tasks rather than raising their exceptions
+    for task in tasks or []:
+        task.result()
@@ -1,19 +1,26 @@
-from collections.abc import Generator
+import asyncio
+from collections.abc import Callable, Generator
+from typing import Any
 
 from bluesky import plan_stubs as bps
 from bluesky import preprocessors as bpp
-from bluesky.utils import Msg
+from bluesky.utils import Msg, MsgGenerator
 from dodal.devices.dcm import DCM
 from dodal.devices.detector import (
     DetectorParams,
 )
 from dodal.devices.detector.detector_motion import DetectorMotion, ShutterState
 from dodal.devices.eiger import EigerDetector
+from ophyd.status import StatusBase
+from ophyd.utils import InvalidState
+from ophyd_async.core import SignalR
 
 from mx_bluesky.hyperion.device_setup_plans.position_detector import (
     set_detector_z_position,
     set_shutter,
 )
+from mx_bluesky.hyperion.parameters.constants import CONST
+from mx_bluesky.hyperion.utils.phase_timing import time_in_background
 
 
 def fill_in_energy_if_not_supplied(dcm: DCM, detector_params: DetectorParams):
@@ -37,11 +44,14 @@ def start_preparing_data_collection_then_do_plan(
      * Arming the Eiger
      * Moving the detector to the specified position
      * Opening the detect shutter
-     If the plan fails it will disarm the eiger.
+     If the plan fails it will disarm the eiger. The time taken to arm is recorded in
+     the background timings of the sample, so that how much of it was overlapped with
+     the plan can be seen.
     """
 
     def wrapped_plan():
-        yield from bps.abs_set(eiger.do_arm, 1, group=group)  # type: ignore # See: https://github.com/bluesky/bluesky/issues/1809
+        arm_status = yield from bps.abs_set(eiger.do_arm, 1, group=group)  # type: ignore # See: https://github.com/bluesky/bluesky/issues/1809
+        time_in_background(arm_status, CONST.PHASE.EIGER_ARMING)
         if detector_distance_mm:
             yield from set_detector_z_position(
                 detector_motion, detector_distance_mm, group
@@ -53,3 +63,94 @@ def start_preparing_data_collection_then_do_plan(
         wrapped_plan(),
         except_plan=lambda e: (yield from bps.stop(eiger)),  # type: ignore # See: https://github.com/bluesky/bluesky/issues/1809
     )
+
+
+def wait_for_signals(
+    predicate: Callable[..., bool], *signals: SignalR, timeout: float
+) -> MsgGenerator:
+    """Waits until predicate, called with the latest value of each of the signals in
+    order, returns True. The signals are monitored rather than polled, so the plan
+    continues as soon as the condition is met.
+
+    Raises a TimeoutError giving the last value of each signal if the condition is not
+    met within timeout seconds.
+    """
+    values: dict[str, Any] = {}
+
+    async def condition_met():
+        met = asyncio.Event()
+
+        def update(signal: SignalR, value):
+            values[signal.name] = value
+            if len(values) == len(signals) and predicate(
+                *(values[s.name] for s in signals)
+            ):
+                met.set()
+
+        callbacks = [lambda value, s=s: update(s, value) for s in signals]
+        for signal, callback in zip(signals, callbacks, strict=True):
+            signal.subscribe_value(callback)
+        try:
+            await asyncio.wait_for(met.wait(), timeout)
+        except TimeoutError as e:
+            raise TimeoutError(
+                f"Timed out after {timeout}s waiting for "
+                f"{', '.join(s.name for s in signals)}, last values {values}"
+            ) from e
+        finally:
+            for signal, callback in zip(signals, callbacks, strict=True):
+                signal.clear_sub(callback)
+
+    tasks = yield from bps.wait_for([condition_met])
+    # The RunEngine returns the finished tasks rather than raising their exceptions
+    for task in tasks or []:
+        task.result()
+
+
+def status_done(status: StatusBase) -> asyncio.Future:
+    """A future on the running loop which completes, or fails, with status"""
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def set_future(status: StatusBase):
+        if future.done():
+            return
+        if status.success:
+            future.set_result(None)
+        else:
+            future.set_exception(status.exception() or RuntimeError(f"{status} failed"))
+
+    status.add_callback(lambda status: loop.call_soon_threadsafe(set_future, status))
+    return future
+
+
+def wait_for_status(
+    make_status: Callable[[], StatusBase], description: str, timeout: float
+) -> MsgGenerator:
+    """Waits for the ophyd status returned by make_status, which is called once the
+    plan reaches this point. Raises a TimeoutError saying what was being waited for if
+    the status does not finish within timeout seconds, or the status's error if it
+    fails.
+    """
+
+    async def finished():
+        status = make_status()
+        try:
+            await asyncio.wait_for(status_done(status), timeout)
+        except TimeoutError as e:
+            raise TimeoutError(
+                f"Timed out after {timeout}s waiting for {description}"
+            ) from e
+        finally:
+            try:
+                # Stops any monitoring the status is still doing
+                status.set_exception(
+                    RuntimeError(f"No longer waiting for {description}")
+                )
+            except InvalidState:
+                pass  # It had already finished
+
+    tasks = yield from bps.wait_for([finished])
+    # The RunEngine returns the finished tasks rather than raising their exceptions
+    for task in tasks or []:
+        task.result()
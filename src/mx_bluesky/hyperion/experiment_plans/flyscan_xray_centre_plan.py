@@ -4,8 +4,7 @@ import dataclasses
 from collections.abc import Callable
 from functools import partial
 from pathlib import Path
-from time import time
-from typing import Protocol
+from typing import Any, Protocol
 
 import bluesky.plan_stubs as bps
 import bluesky.preprocessors as bpp
@@ -62,6 +61,10 @@ from mx_bluesky.hyperion.device_setup_plans.setup_zebra import (
     setup_zebra_for_panda_flyscan,
     tidy_up_zebra_after_gridscan,
 )
+from mx_bluesky.hyperion.device_setup_plans.utils import (
+    wait_for_signals,
+    wait_for_status,
+)
 from mx_bluesky.hyperion.device_setup_plans.xbpm_feedback import (
     transmission_and_xbpm_feedback_for_collection_decorator,
 )
@@ -71,6 +74,8 @@ from mx_bluesky.hyperion.parameters.constants import CONST
 from mx_bluesky.hyperion.parameters.gridscan import ThreeDGridScan
 from mx_bluesky.hyperion.tracing import TRACER
 from mx_bluesky.hyperion.utils.context import device_composite_from_context
+from mx_bluesky.hyperion.utils.phase_timing import sample_timing_wrapper, timed_phase
+from mx_bluesky.hyperion.utils.utils import compact_scan_points
 
 
 class SmargonSpeedException(Exception):
@@ -139,6 +144,10 @@ def flyscan_xray_centre(
 
     feature_controlled = _get_feature_controlled(composite, parameters)
 
+    def tidy_plan():
+        with timed_phase(CONST.PHASE.CLEANUP):
+            yield from feature_controlled.tidy_plan(composite)
+
     @bpp.set_run_key_decorator(CONST.PLAN.GRIDSCAN_OUTER)
     @bpp.run_decorator(  # attach experiment metadata to the start document
         md={
@@ -151,7 +160,7 @@ def flyscan_xray_centre(
             ],
         }
     )
-    @bpp.finalize_decorator(lambda: feature_controlled.tidy_plan(composite))
+    @bpp.finalize_decorator(lambda: tidy_plan())
     @transmission_and_xbpm_feedback_for_collection_decorator(
         composite.xbpm_feedback,
         composite.attenuator,
@@ -164,7 +173,11 @@ def flyscan_xray_centre(
     ):
         yield from run_gridscan_and_move(fgs_composite, params, feature_controlled)
 
-    return run_gridscan_and_move_and_tidy(composite, parameters, feature_controlled)
+    return sample_timing_wrapper(
+        run_gridscan_and_move_and_tidy(composite, parameters, feature_controlled),
+        "flyscan_xray_centre",
+        parameters.sample_id,
+    )
 
 
 @bpp.set_run_key_decorator(CONST.PLAN.GRIDSCAN_AND_MOVE)
@@ -197,7 +210,7 @@ def run_gridscan_and_move(
     LOGGER.info("Grid scan finished, getting results.")
 
     try:
-        with TRACER.start_span("wait_for_zocalo"):
+        with TRACER.start_span("wait_for_zocalo"), timed_phase(CONST.PHASE.ZOCALO_WAIT):
             yield from bps.trigger_and_read(
                 [fgs_composite.zocalo], name=ZOCALO_READING_PLAN_NAME
             )
@@ -214,7 +227,10 @@ def run_gridscan_and_move(
                 LOGGER.warning("No X-ray centre received")
                 raise CrystalNotFoundException()
             if bbox_size is not None:
-                with TRACER.start_span("change_aperture"):
+                with (
+                    TRACER.start_span("change_aperture"),
+                    timed_phase(CONST.PHASE.APERTURE_CHANGE),
+                ):
                     yield from set_aperture_for_bbox_size(
                         fgs_composite.aperture_scatterguard, bbox_size
                     )
@@ -287,90 +303,124 @@ def run_gridscan(
     yield from wait_for_gridscan_valid(feature_controlled.fgs_motors)
 
     LOGGER.info("Waiting for arming to finish")
-    yield from bps.wait(CONST.WAIT.GRID_READY_FOR_DC)
+    with timed_phase(CONST.PHASE.EIGER_ARMING):
+        yield from bps.wait(CONST.WAIT.GRID_READY_FOR_DC)
     yield from bps.stage(fgs_composite.eiger)  # type: ignore # See: https://github.com/bluesky/bluesky/issues/1809
 
+    if parameters.features.compact_scan_points_in_documents:
+        scan_points = [
+            compact_scan_points(parameters.grid_1_spec),
+            compact_scan_points(parameters.grid_2_spec),
+        ]
+    else:
+        scan_points = [
+            parameters.scan_points_first_grid,
+            parameters.scan_points_second_grid,
+        ]
     yield from kickoff_and_complete_gridscan(
         feature_controlled.fgs_motors,
         fgs_composite.eiger,
         fgs_composite.synchrotron,
-        [parameters.scan_points_first_grid, parameters.scan_points_second_grid],
+        scan_points,
         parameters.scan_indices,
         do_during_run=read_during_collection,
+        end_run_before_eiger_unstage=parameters.features.early_zocalo_run_end,
     )
     yield from bps.abs_set(feature_controlled.fgs_motors.z_steps, 0, wait=False)
 
 
+@TRACER.start_as_current_span(CONST.PLAN.DO_FGS)
 def kickoff_and_complete_gridscan(
     gridscan: FastGridScanCommon,
     eiger: EigerDetector,
     synchrotron: Synchrotron,
-    scan_points: list[AxesPoints[Axis]],
+    scan_points: list[AxesPoints[Axis]] | list[dict[str, Any]],
     scan_start_indices: list[int],
     do_during_run: Callable[[], MsgGenerator] | None = None,
+    end_run_before_eiger_unstage: bool = False,
 ):
-    @TRACER.start_as_current_span(CONST.PLAN.DO_FGS)
-    @bpp.set_run_key_decorator(CONST.PLAN.DO_FGS)
-    @bpp.run_decorator(
-        md={
-            "subplan_name": CONST.PLAN.DO_FGS,
-            "scan_points": scan_points,
-            "scan_start_indices": scan_start_indices,
-        }
-    )
-    @bpp.contingency_decorator(
-        except_plan=lambda e: (yield from bps.stop(eiger)),  # type: ignore # See: https://github.com/bluesky/bluesky/issues/1809
-        else_plan=lambda: (yield from bps.unstage(eiger)),  # type: ignore # See: https://github.com/bluesky/bluesky/issues/1809
-    )
+    """Runs the gridscan in the do_fgs sub-run, which Zocalo is told has ended when
+    it closes. With end_run_before_eiger_unstage the sub-run closes as soon as the
+    filewriters have closed the files, rather than after the Eiger is unstaged, so that
+    Zocalo can start processing while the detector disarms."""
+
     def do_fgs():
         # Check topup gate
         expected_images = yield from bps.rd(gridscan.expected_images)
         exposure_sec_per_image = yield from bps.rd(eiger.cam.acquire_time)  # type: ignore # See: https://github.com/bluesky/bluesky/issues/1809
         LOGGER.info("waiting for topup if necessary...")
-        yield from check_topup_and_wait_if_necessary(
-            synchrotron,
-            expected_images * exposure_sec_per_image,
-            30.0,
-        )
+        with timed_phase(CONST.PHASE.TOPUP_WAIT):
+            yield from check_topup_and_wait_if_necessary(
+                synchrotron,
+                expected_images * exposure_sec_per_image,
+                30.0,
+            )
         yield from read_hardware_for_zocalo(eiger)
         LOGGER.info("Wait for all moves with no assigned group")
         yield from bps.wait()
         LOGGER.info("kicking off FGS")
-        yield from bps.kickoff(gridscan, wait=True)
-        gridscan_start_time = time()
-        LOGGER.info("Waiting for Zocalo device queue to have been cleared...")
-        yield from bps.wait(
-            ZOCALO_STAGE_GROUP
-        )  # Make sure ZocaloResults queue is clear and ready to accept our new data
-        if do_during_run:
-            LOGGER.info(f"Running {do_during_run} during FGS")
-            yield from do_during_run()
-        LOGGER.info("completing FGS")
-        yield from bps.complete(gridscan, wait=True)
-
-        # Remove this logging statement once metrics have been added
-        LOGGER.info(
-            f"Gridscan motion program took {round(time()-gridscan_start_time,2)} to complete"
+        with timed_phase(CONST.PHASE.FGS):
+            yield from bps.kickoff(gridscan, wait=True)
+            LOGGER.info("Waiting for Zocalo device queue to have been cleared...")
+            yield from bps.wait(
+                ZOCALO_STAGE_GROUP
+            )  # Make sure ZocaloResults queue is clear and ready to accept our new data
+            if do_during_run:
+                LOGGER.info(f"Running {do_during_run} during FGS")
+                yield from do_during_run()
+            LOGGER.info("completing FGS")
+            yield from bps.complete(gridscan, wait=True)
+
+    def do_fgs_until_files_closed():
+        yield from do_fgs()
+        LOGGER.info("Waiting for the filewriters to close the files")
+        yield from wait_for_status(
+            eiger.odin.create_finished_status,
+            "the Eiger filewriters to close the files",
+            CONST.HARDWARE.EIGER_FILES_CLOSED_TIMEOUT,
         )
 
-    yield from do_fgs()
+    def in_do_fgs_run(plan: MsgGenerator) -> MsgGenerator:
+        return bpp.set_run_key_wrapper(
+            bpp.run_wrapper(
+                plan,
+                md={
+                    "subplan_name": CONST.PLAN.DO_FGS,
+                    "scan_points": scan_points,
+                    "scan_start_indices": scan_start_indices,
+                },
+            ),
+            CONST.PLAN.DO_FGS,
+        )
+
+    def tidying_eiger(plan: MsgGenerator) -> MsgGenerator:
+        return bpp.contingency_wrapper(
+            plan,
+            except_plan=lambda e: (yield from bps.stop(eiger)),  # type: ignore # See: https://github.com/bluesky/bluesky/issues/1809
+            else_plan=lambda: (yield from bps.unstage(eiger)),  # type: ignore # See: https://github.com/bluesky/bluesky/issues/1809
+        )
+
+    if end_run_before_eiger_unstage:
+        yield from tidying_eiger(in_do_fgs_run(do_fgs_until_files_closed()))
+    else:
+        yield from in_do_fgs_run(tidying_eiger(do_fgs()))
 
 
 def wait_for_gridscan_valid(fgs_motors: FastGridScanCommon, timeout=0.5):
     LOGGER.info("Waiting for valid fgs_params")
-    SLEEP_PER_CHECK = 0.1
-    times_to_check = int(timeout / SLEEP_PER_CHECK)
-    for _ in range(times_to_check):
-        scan_invalid = yield from bps.rd(fgs_motors.scan_invalid)
-        pos_counter = yield from bps.rd(fgs_motors.position_counter)
-        LOGGER.debug(
-            f"Scan invalid: {scan_invalid} and position counter: {pos_counter}"
+    try:
+        yield from wait_for_signals(
+            lambda scan_invalid, pos_counter: not scan_invalid and pos_counter == 0,
+            fgs_motors.scan_invalid,
+            fgs_motors.position_counter,
+            timeout=timeout,
         )
-        if not scan_invalid and pos_counter == 0:
-            LOGGER.info("Gridscan scan valid and position counter reset")
-            return
-        yield from bps.sleep(SLEEP_PER_CHECK)
-    raise WarningException("Scan invalid - pin too long/short/bent and out of range")
+    except TimeoutError as e:
+        LOGGER.info(e)
+        raise WarningException(
+            "Scan invalid - pin too long/short/bent and out of range"
+        ) from e
+    LOGGER.info("Gridscan scan valid and position counter reset")
 
 
 def set_aperture_for_bbox_size(
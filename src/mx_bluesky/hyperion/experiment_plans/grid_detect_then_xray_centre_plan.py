@@ -58,6 +58,7 @@ from mx_bluesky.hyperion.parameters.gridscan import (
     ThreeDGridScan,
 )
 from mx_bluesky.hyperion.utils.context import device_composite_from_context
+from mx_bluesky.hyperion.utils.phase_timing import sample_timing_wrapper, timed_phase
 
 
 @dataclasses.dataclass
@@ -130,13 +131,15 @@ def detect_grid_and_do_gridscan(
             snapshot_template,
             str(snapshot_dir),
             grid_width_microns=parameters.grid_width_um,
+            edge_outlier_percentile=parameters.edge_outlier_percentile,
         )
 
-    yield from run_grid_detection_plan(
-        oav_params,
-        snapshot_template,
-        parameters.snapshot_directory,
-    )
+    with timed_phase(CONST.PHASE.GRID_DETECTION):
+        yield from run_grid_detection_plan(
+            oav_params,
+            snapshot_template,
+            parameters.snapshot_directory,
+        )
 
     yield from bps.abs_set(
         composite.backlight, BacklightPosition.OUT, group=CONST.WAIT.GRID_READY_FOR_DC
@@ -200,10 +203,14 @@ def grid_detect_then_xray_centre(
         parameters,
     )
 
-    return start_preparing_data_collection_then_do_plan(
-        eiger,
-        composite.detector_motion,
-        parameters.detector_params.detector_distance,
-        plan_to_perform,  # type: ignore # See: https://github.com/bluesky/bluesky/issues/1809 and MsgGenerator should allow for return values
-        group=CONST.WAIT.GRID_READY_FOR_DC,
+    return sample_timing_wrapper(
+        start_preparing_data_collection_then_do_plan(
+            eiger,
+            composite.detector_motion,
+            parameters.detector_params.detector_distance,
+            plan_to_perform,  # type: ignore # See: https://github.com/bluesky/bluesky/issues/1809 and MsgGenerator should allow for return values
+            group=CONST.WAIT.GRID_READY_FOR_DC,
+        ),
+        "grid_detect_then_xray_centre",
+        parameters.sample_id,
     )
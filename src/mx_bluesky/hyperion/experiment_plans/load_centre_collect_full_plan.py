@@ -13,6 +13,7 @@ from mx_bluesky.hyperion.experiment_plans.rotation_scan_plan import (
 )
 from mx_bluesky.hyperion.parameters.load_centre_collect import LoadCentreCollect
 from mx_bluesky.hyperion.utils.context import device_composite_from_context
+from mx_bluesky.hyperion.utils.phase_timing import sample_timing_wrapper
 
 
 @dataclasses.dataclass
@@ -41,6 +42,16 @@ def load_centre_collect_full_plan(
     """
     if not oav_params:
         oav_params = OAVParameters(context="xrayCentring")
-    yield from robot_load_then_centre(composite, params.robot_load_then_centre)
 
-    yield from multi_rotation_scan(composite, params.multi_rotation_scan, oav_params)
+    def _load_centre_collect(oav_params: OAVParameters):
+        yield from robot_load_then_centre(composite, params.robot_load_then_centre)
+
+        yield from multi_rotation_scan(
+            composite, params.multi_rotation_scan, oav_params
+        )
+
+    yield from sample_timing_wrapper(
+        _load_centre_collect(oav_params),
+        "load_centre_collect_full_plan",
+        params.sample_id,
+    )
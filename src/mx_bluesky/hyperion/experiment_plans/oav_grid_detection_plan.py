@@ -1,22 +1,30 @@
 from __future__ import annotations
 
+import asyncio
 import dataclasses
 import math
+import sys
 from typing import TYPE_CHECKING
 
 import bluesky.plan_stubs as bps
+import bluesky.preprocessors as bpp
 import numpy as np
 from blueapi.core import BlueskyContext
 from dodal.devices.backlight import Backlight
+from dodal.devices.oav.grid_overlay import SnapshotWithGrid
 from dodal.devices.oav.oav_detector import OAV
 from dodal.devices.oav.pin_image_recognition import PinTipDetection
 from dodal.devices.oav.pin_image_recognition.utils import NONE_VALUE
 from dodal.devices.oav.utils import PinNotFoundException, wait_for_tip_to_be_found
 from dodal.devices.smargon import Smargon
+from ophyd.status import StatusBase, SubscriptionStatus
+from ophyd.utils import InvalidState
 
 from mx_bluesky.hyperion.device_setup_plans.setup_oav import (
     pre_centring_setup_oav,
+    wait_for_new_oav_frames,
 )
+from mx_bluesky.hyperion.device_setup_plans.utils import status_done
 from mx_bluesky.hyperion.exceptions import catch_exception_and_warn
 from mx_bluesky.hyperion.log import LOGGER
 from mx_bluesky.hyperion.parameters.constants import CONST
@@ -41,20 +49,102 @@ def create_devices(context: BlueskyContext) -> OavGridDetectionComposite:
 
 
 def get_min_and_max_y_of_pin(
-    top: np.ndarray, bottom: np.ndarray, full_image_height_px: int
+    top: np.ndarray,
+    bottom: np.ndarray,
+    full_image_height_px: int,
+    outlier_percentile: float = 0,
 ) -> tuple[int, int]:
     """Gives the minimum and maximum y that would cover the whole pin.
 
     First filters out where no edge was found or the edge covers the full image.
-    If this results in no edges found then returns a min/max that covers the full image
+    If this results in no edges found then returns a min/max that covers the full image.
+
+    If outlier_percentile is given the min and max are that percentile of the top edge
+    and 100 - outlier_percentile of the bottom edge, so that a few columns where the
+    edge was detected wrongly don't stretch the grid.
+    """
+    top = np.asarray(top)
+    bottom = np.asarray(bottom)
+    valid_top = top[(top != 0) & (top != NONE_VALUE)]
+    valid_bottom = bottom[(bottom != full_image_height_px) & (bottom != NONE_VALUE)]
+    if not valid_top.size:
+        min_y = 0
+    elif outlier_percentile:
+        min_y = np.percentile(valid_top, outlier_percentile, method="lower")
+    else:
+        min_y = valid_top.min()
+    if not valid_bottom.size:
+        max_y = full_image_height_px
+    elif outlier_percentile:
+        max_y = np.percentile(valid_bottom, 100 - outlier_percentile, method="higher")
+    else:
+        max_y = valid_bottom.max()
+    return int(min_y), int(max_y)
+
+
+@dataclasses.dataclass
+class GridExtent:
+    """A grid covering the pin as seen in the OAV, in pixels"""
+
+    upper_left: tuple[int, float]
+    x_steps: int
+    y_steps: int
+    height_px: float
+
+
+def get_grid_extent(
+    top_edge: np.ndarray,
+    bottom_edge: np.ndarray,
+    tip_x_px: int,
+    full_image_height_px: int,
+    grid_width_pixels: int,
+    box_size_x_pixels: float,
+    box_size_y_pixels: float,
+    even_rows: bool = False,
+    outlier_percentile: float = 0,
+) -> GridExtent:
+    """Gives the grid of boxes that covers the pin from its tip to grid_width_pixels
+    along, given the top and bottom edges of the pin already cut to that width.
+
+    If even_rows is set and the pin covers an odd number of rows, an extra row is added
+    with the grid shifted up by half a box to keep it centred on the pin.
     """
-    filtered_top = top[np.where((top != 0) & (top != NONE_VALUE))]
-    min_y = min(filtered_top) if len(filtered_top) else 0
-    filtered_bottom = bottom[
-        np.where((bottom != full_image_height_px) & (bottom != NONE_VALUE))
-    ]
-    max_y = max(filtered_bottom) if len(filtered_bottom) else full_image_height_px
-    return min_y, max_y
+    min_y, max_y = (
+        float(n)
+        for n in get_min_and_max_y_of_pin(
+            top_edge, bottom_edge, full_image_height_px, outlier_percentile
+        )
+    )
+    grid_height_px = max_y - min_y
+    y_steps = math.ceil(grid_height_px / box_size_y_pixels)
+
+    if y_steps % 2 and even_rows:
+        LOGGER.debug(
+            f"Forcing number of rows in first grid to be even: Adding an extra row onto bottom of first grid and shifting grid upwards by {box_size_y_pixels/2}"
+        )
+        y_steps += 1
+        min_y -= box_size_y_pixels / 2
+        grid_height_px += box_size_y_pixels
+
+    return GridExtent(
+        upper_left=(tip_x_px, min_y),
+        x_steps=math.ceil(grid_width_pixels / box_size_x_pixels),
+        y_steps=y_steps,
+        height_px=grid_height_px,
+    )
+
+
+class _LazyArrayStr:
+    """Formats the whole of an array for a log message, only if the message is
+    actually formatted"""
+
+    def __init__(self, array: np.ndarray):
+        self.array = array
+
+    def __str__(self) -> str:
+        return np.array2string(
+            self.array, threshold=self.array.size, max_line_width=sys.maxsize
+        )
 
 
 def grid_detection_plan(
@@ -64,6 +154,7 @@ def grid_detection_plan(
     snapshot_dir: str,
     grid_width_microns: float,
     box_size_um: float = 20,
+    edge_outlier_percentile: float = CONST.PARAM.GRIDSCAN.EDGE_OUTLIER_PERCENTILE,
 ):
     """
     Creates the parameters for two grids that are 90 degrees from each other and
@@ -76,6 +167,8 @@ def grid_detection_plan(
         snapshot_dir (str): The location to save snapshots
         grid_width_microns (int): The width of the grid to scan in microns
         box_size_um (float): The size of each box of the grid in microns
+        edge_outlier_percentile (float): The percentile of the detected pin edges to
+            draw the grid to, rather than their extremes, see get_min_and_max_y_of_pin
     """
     oav: OAV = composite.oav
     smargon: Smargon = composite.smargon
@@ -97,77 +190,156 @@ def grid_detection_plan(
 
     grid_width_pixels = int(grid_width_microns / oav.parameters.micronsPerXPixel)
 
-    # The FGS uses -90 so we need to match it
-    for angle in [0, -90]:
-        yield from bps.mv(smargon.omega, angle)  # type: ignore # See: https://github.com/bluesky/bluesky/issues/1809
-        # need to wait for the OAV image to update
-        # See #673 for improvements
-        yield from bps.sleep(CONST.HARDWARE.OAV_REFRESH_DELAY)
-
-        tip_x_px, tip_y_px = yield from catch_exception_and_warn(
-            PinNotFoundException, wait_for_tip_to_be_found, pin_tip_detection
-        )
-
-        LOGGER.info(f"Tip is at x,y: {tip_x_px},{tip_y_px}")
+    # The FGS uses -90 so we need to match it. Once the snapshot image at one angle
+    # has been grabbed we start moving to the next, with the grid being drawn on the
+    # snapshot and saved while moving
+    snapshot_event_open = False
 
-        top_edge = np.array((yield from bps.rd(pin_tip_detection.triggered_top_edge)))
-        bottom_edge = np.array(
-            (yield from bps.rd(pin_tip_detection.triggered_bottom_edge))
-        )
-
-        full_image_height_px = yield from bps.rd(oav.cam.array_size.array_size_y)
-
-        # only use the area from the start of the pin onwards
-        top_edge = top_edge[tip_x_px : tip_x_px + grid_width_pixels]
-        bottom_edge = bottom_edge[tip_x_px : tip_x_px + grid_width_pixels]
-        LOGGER.info(f"OAV Edge detection top: {list(top_edge)}")
-        LOGGER.info(f"OAV Edge detection bottom: {list(bottom_edge)}")
-
-        min_y, max_y = (
-            float(n)
-            for n in get_min_and_max_y_of_pin(
-                top_edge, bottom_edge, full_image_height_px
+    def detect_grid_at_each_angle():
+        nonlocal snapshot_event_open
+        for angle in [0, -90]:
+            yield from bps.abs_set(
+                smargon.omega, angle, group=CONST.WAIT.GRID_DETECTION_OMEGA
             )
-        )
-
-        grid_height_px: float = max_y - min_y
-
-        y_steps: int = math.ceil(grid_height_px / box_size_y_pixels)
-
-        # Panda not configured to run a half complete snake so enforce even rows on first grid
-        # See https://github.com/DiamondLightSource/hyperion/wiki/PandA-constant%E2%80%90motion-scanning#motion-program-summary
-        if y_steps % 2 and angle == 0:
-            LOGGER.debug(
-                f"Forcing number of rows in first grid to be even: Adding an extra row onto bottom of first grid and shifting grid upwards by {box_size_y_pixels/2}"
+            if snapshot_event_open:
+                yield from _finish_snapshot_event(oav)
+                snapshot_event_open = False
+            yield from bps.wait(CONST.WAIT.GRID_DETECTION_OMEGA)
+            yield from wait_for_new_oav_frames(oav, "grid detection omega move")
+
+            tip_x_px, tip_y_px = yield from catch_exception_and_warn(
+                PinNotFoundException, wait_for_tip_to_be_found, pin_tip_detection
             )
-            y_steps += 1
-            min_y -= box_size_y_pixels / 2
-            max_y += box_size_y_pixels / 2
-            grid_height_px += box_size_y_pixels
-
-        LOGGER.info(f"Drawing snapshot {grid_width_pixels} by {grid_height_px}")
 
-        x_steps = math.ceil(grid_width_pixels / box_size_x_pixels)
+            LOGGER.info(f"Tip is at x,y: {tip_x_px},{tip_y_px}")
 
-        upper_left = (tip_x_px, min_y)
-
-        yield from bps.abs_set(oav.grid_snapshot.top_left_x, upper_left[0])  # type: ignore # See: https://github.com/bluesky/bluesky/issues/1809
-        yield from bps.abs_set(oav.grid_snapshot.top_left_y, upper_left[1])  # type: ignore # See: https://github.com/bluesky/bluesky/issues/1809
-        yield from bps.abs_set(oav.grid_snapshot.box_width, box_size_x_pixels)  # type: ignore # See: https://github.com/bluesky/bluesky/issues/1809
-        yield from bps.abs_set(oav.grid_snapshot.num_boxes_x, x_steps)  # type: ignore # See: https://github.com/bluesky/bluesky/issues/1809
-        yield from bps.abs_set(oav.grid_snapshot.num_boxes_y, y_steps)  # type: ignore # See: https://github.com/bluesky/bluesky/issues/1809
+            top_edge = np.array(
+                (yield from bps.rd(pin_tip_detection.triggered_top_edge))
+            )
+            bottom_edge = np.array(
+                (yield from bps.rd(pin_tip_detection.triggered_bottom_edge))
+            )
 
-        snapshot_filename = snapshot_template.format(angle=abs(angle))
+            full_image_height_px = yield from bps.rd(oav.cam.array_size.array_size_y)
+
+            # only use the area from the start of the pin onwards
+            top_edge = top_edge[tip_x_px : tip_x_px + grid_width_pixels]
+            bottom_edge = bottom_edge[tip_x_px : tip_x_px + grid_width_pixels]
+            LOGGER.debug("OAV Edge detection top: %s", _LazyArrayStr(top_edge))
+            LOGGER.debug("OAV Edge detection bottom: %s", _LazyArrayStr(bottom_edge))
+
+            # Panda not configured to run a half complete snake so enforce even rows on first grid
+            # See https://github.com/DiamondLightSource/hyperion/wiki/PandA-constant%E2%80%90motion-scanning#motion-program-summary
+            grid = get_grid_extent(
+                top_edge,
+                bottom_edge,
+                tip_x_px,
+                full_image_height_px,
+                grid_width_pixels,
+                box_size_x_pixels,
+                box_size_y_pixels,
+                even_rows=angle == 0,
+                outlier_percentile=edge_outlier_percentile,
+            )
 
-        yield from bps.abs_set(oav.grid_snapshot.filename, snapshot_filename)  # type: ignore # See: https://github.com/bluesky/bluesky/issues/1809
-        yield from bps.abs_set(oav.grid_snapshot.directory, snapshot_dir)  # type: ignore # See: https://github.com/bluesky/bluesky/issues/1809
-        yield from bps.trigger(oav.grid_snapshot, wait=True)  # type: ignore # See: https://github.com/bluesky/bluesky/issues/1809
-        yield from bps.create(CONST.DESCRIPTORS.OAV_GRID_SNAPSHOT_TRIGGERED)
+            LOGGER.info(f"Drawing snapshot {grid_width_pixels} by {grid.height_px}")
 
-        yield from bps.read(oav.grid_snapshot)  # type: ignore # See: https://github.com/bluesky/bluesky/issues/1809
-        yield from bps.read(smargon)
-        yield from bps.save()
+            yield from _set_up_grid_snapshot(
+                oav,
+                grid.upper_left,
+                box_size_x_pixels,
+                grid.x_steps,
+                grid.y_steps,
+                snapshot_template.format(angle=abs(angle)),
+                snapshot_dir,
+            )
+            yield from bps.create(CONST.DESCRIPTORS.OAV_GRID_SNAPSHOT_TRIGGERED)
+            snapshot_event_open = True
+            yield from bps.read(smargon)
 
-        LOGGER.info(
-            f"Grid calculated at {angle}: {x_steps} by {y_steps} steps starting at {upper_left}px"
+            LOGGER.info(
+                f"Grid calculated at {angle}: {grid.x_steps} by {grid.y_steps} steps starting at {grid.upper_left}px"
+            )
+        yield from _finish_snapshot_event(oav)
+        snapshot_event_open = False
+
+    def drop_unfinished_snapshot_event(_: Exception):
+        # The snapshot may not have been saved, so the event is not emitted
+        if snapshot_event_open:
+            yield from bps.drop()
+
+    yield from bpp.contingency_wrapper(
+        detect_grid_at_each_angle(), except_plan=drop_unfinished_snapshot_event
+    )
+
+
+def _set_up_grid_snapshot(
+    oav: OAV,
+    upper_left: tuple[int, float],
+    box_size_x_pixels: float,
+    x_steps: int,
+    y_steps: int,
+    snapshot_filename: str,
+    snapshot_dir: str,
+):
+    """Sets up the grid to draw on the snapshot and triggers it, returning once the
+    image has been taken. The grid is then drawn and the snapshots saved in the
+    background in the GRID_SNAPSHOT group"""
+    group = CONST.WAIT.GRID_SNAPSHOT
+    yield from bps.abs_set(oav.grid_snapshot.top_left_x, upper_left[0], group=group)  # type: ignore # See: https://github.com/bluesky/bluesky/issues/1809
+    yield from bps.abs_set(oav.grid_snapshot.top_left_y, upper_left[1], group=group)  # type: ignore # See: https://github.com/bluesky/bluesky/issues/1809
+    yield from bps.abs_set(oav.grid_snapshot.box_width, box_size_x_pixels, group=group)  # type: ignore # See: https://github.com/bluesky/bluesky/issues/1809
+    yield from bps.abs_set(oav.grid_snapshot.num_boxes_x, x_steps, group=group)  # type: ignore # See: https://github.com/bluesky/bluesky/issues/1809
+    yield from bps.abs_set(oav.grid_snapshot.num_boxes_y, y_steps, group=group)  # type: ignore # See: https://github.com/bluesky/bluesky/issues/1809
+    yield from bps.abs_set(oav.grid_snapshot.filename, snapshot_filename, group=group)  # type: ignore # See: https://github.com/bluesky/bluesky/issues/1809
+    yield from bps.abs_set(oav.grid_snapshot.directory, snapshot_dir, group=group)  # type: ignore # See: https://github.com/bluesky/bluesky/issues/1809
+    # The unmodified image is saved, setting last_saved_path, before the grid is drawn
+    yield from bps.abs_set(oav.grid_snapshot.last_saved_path, "", group=group)  # type: ignore # See: https://github.com/bluesky/bluesky/issues/1809
+    yield from bps.wait(group)
+
+    snapshot_taken = yield from bps.trigger(oav.grid_snapshot, group=group)  # type: ignore # See: https://github.com/bluesky/bluesky/issues/1809
+    yield from _wait_for_snapshot_image(oav.grid_snapshot, snapshot_taken)
+
+
+def _wait_for_snapshot_image(snapshot: SnapshotWithGrid, snapshot_taken: StatusBase):
+    """Waits for the image to draw the grid on to have been taken, or for the whole
+    snapshot to finish first. Raises the error if either fails first.
+
+    The snapshot device has no signal for the image having been grabbed, so the
+    unmodified image being saved to last_saved_path, which happens straight after, is
+    used as the sign that it has."""
+
+    async def image_taken():
+        image_saved = SubscriptionStatus(
+            snapshot.last_saved_path,
+            lambda *, value, **_: bool(value),
+            timeout=CONST.HARDWARE.OAV_SNAPSHOT_IMAGE_TIMEOUT,
         )
+        waiting = [status_done(image_saved), status_done(snapshot_taken)]
+        try:
+            done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                future.result()
+        finally:
+            for future in waiting:
+                future.cancel()
+            try:
+                # Stops monitoring last_saved_path and its timeout thread
+                image_saved.set_exception(
+                    RuntimeError("No longer waiting for the snapshot image")
+                )
+            except InvalidState:
+                pass  # It had already finished
+
+    tasks = yield from bps.wait_for([image_taken])
+    # The RunEngine returns the finished tasks rather than raising their exceptions
+    for task in tasks or []:
+        task.result()
+
+
+def _finish_snapshot_event(oav: OAV):
+    """Waits for the grid snapshot to be saved and adds it to the open event, which
+    holds the smargon position it was taken at"""
+    yield from bps.wait(CONST.WAIT.GRID_SNAPSHOT)
+    yield from bps.read(oav.grid_snapshot)  # type: ignore # See: https://github.com/bluesky/bluesky/issues/1809
+    yield from bps.save()
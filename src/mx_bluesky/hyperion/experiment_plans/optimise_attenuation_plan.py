@@ -1,10 +1,13 @@
 import dataclasses
+import math
+from collections.abc import Callable, Generator
 from enum import Enum
 
 import bluesky.plan_stubs as bps
 import bluesky.preprocessors as bpp
 import numpy as np
 from blueapi.core import BlueskyContext
+from bluesky.utils import Msg
 from dodal.devices.attenuator import Attenuator
 from dodal.devices.xspress3.xspress3 import Xspress3
 from dodal.devices.zebra_controlled_shutter import ZebraShutter, ZebraShutterState
@@ -22,6 +25,13 @@ class Direction(Enum):
     NEGATIVE = "negative"
 
 
+class TransmissionSearch(Enum):
+    # Multiply or divide the transmission by a fixed increment each cycle
+    STEP = "step"
+    # Use LogTransmissionSearch, see model_search_optimisation
+    MODEL = "model"
+
+
 @dataclasses.dataclass
 class OptimizeAttenuationComposite:
     """All devices which are directly or indirectly required by this plan"""
@@ -176,6 +186,169 @@ def is_deadtime_optimised(
     return False
 
 
+def read_deadtime(
+    composite: OptimizeAttenuationComposite,
+) -> Generator[Msg, None, float]:
+    total_time = yield from bps.rd(composite.xspress3mini.channels[1].total_time)
+    reset_ticks = yield from bps.rd(composite.xspress3mini.channels[1].reset_ticks)
+
+    LOGGER.info(f"Current total time = {total_time}")
+    LOGGER.info(f"Current reset ticks = {reset_ticks}")
+    deadtime = 0
+
+    """
+        The reset ticks PV stops ticking while the detector is unable to process events, so the absolute difference between the total time and the
+        reset ticks time gives the deadtime in unit time. Divide by total time to get it as a percentage.
+    """
+
+    if total_time != reset_ticks:
+        deadtime = 1 - abs(total_time - reset_ticks) / (total_time)
+
+    LOGGER.info(f"Deadtime is now at {deadtime}")
+    return deadtime
+
+
+def read_total_count(
+    composite: OptimizeAttenuationComposite, low_roi: int, high_roi: int
+) -> Generator[Msg, None, float]:
+    data = np.array(
+        (yield from bps.rd(composite.xspress3mini.dt_corrected_latest_mca[1]))
+    )
+    total_count = data[int(low_roi) : int(high_roi)].sum()
+    LOGGER.info(f"Total count is {total_count}")
+    return total_count
+
+
+class LogTransmissionSearch:
+    """Finds the next transmission to try when looking for one that gives a reading,
+    such as the deadtime or total counts, between low and high. The reading must go up
+    with transmission.
+
+    The reading is modelled as a power of the transmission, a straight line on log
+    axes, through the last two readings or proportional to the transmission until there
+    are two. The next transmission is the one the model gives aim at. If that is
+    outside the transmissions already known to read below and above the range, the
+    search bisects between them on log transmission instead.
+    """
+
+    # Multiplies the transmission if nothing was read, so the model can't be used
+    ZERO_READING_STEP = 10
+    # Fitted powers outside this range are more likely noise than the detector
+    MIN_POWER = 0.5
+    MAX_POWER = 2
+
+    def __init__(
+        self,
+        low: float,
+        high: float,
+        aim: float,
+        upper_transmission_limit: float,
+        lower_transmission_limit: float,
+    ):
+        self.low = low
+        self.high = high
+        self.aim = aim
+        self.upper_transmission_limit = upper_transmission_limit
+        self.lower_transmission_limit = lower_transmission_limit
+        self._highest_below: float | None = None
+        self._lowest_above: float | None = None
+        self._last_reading: tuple[float, float] | None = None
+
+    def _power(self, transmission: float, reading: float) -> float:
+        if self._last_reading is None:
+            return 1
+        last_transmission, last_reading = self._last_reading
+        if last_reading <= 0 or reading <= 0 or last_transmission == transmission:
+            return 1
+        power = math.log(reading / last_reading) / math.log(
+            transmission / last_transmission
+        )
+        return power if self.MIN_POWER <= power <= self.MAX_POWER else 1
+
+    def next_transmission(self, transmission: float, reading: float) -> float:
+        """Gives the transmission to try after reading outside the range at
+        transmission. Raises AttenuationOptimisationFailedException if it would be below
+        the lower transmission limit."""
+        if reading < self.low:
+            if self._highest_below is None or transmission > self._highest_below:
+                self._highest_below = transmission
+        elif self._lowest_above is None or transmission < self._lowest_above:
+            self._lowest_above = transmission
+
+        if reading > 0:
+            power = self._power(transmission, reading)
+            new_transmission = transmission * (self.aim / reading) ** (1 / power)
+        else:
+            new_transmission = transmission * self.ZERO_READING_STEP
+        self._last_reading = (transmission, reading)
+
+        if self._highest_below is not None and self._lowest_above is not None:
+            if not self._highest_below < new_transmission < self._lowest_above:
+                new_transmission = math.sqrt(self._highest_below * self._lowest_above)
+        new_transmission = min(new_transmission, self.upper_transmission_limit)
+
+        if new_transmission < self.lower_transmission_limit:
+            raise AttenuationOptimisationFailedException(
+                f"Transmission has gone below lower threshold {self.lower_transmission_limit}"
+            )
+        return new_transmission
+
+
+def model_search_optimisation(
+    composite: OptimizeAttenuationComposite,
+    transmission: float,
+    read: Callable[[], Generator[Msg, None, float]],
+    low: float,
+    high: float,
+    aim: float,
+    max_cycles: int,
+    upper_transmission_limit: float,
+    lower_transmission_limit: float,
+):
+    """Optimises the attenuation for the Xspress3Mini by searching for a transmission at
+    which read gives a value between low and high, using LogTransmissionSearch to choose
+    each transmission to try. This usually takes far fewer exposures, and so less dose
+    to the sample, than stepping the transmission by a fixed increment.
+
+    If the value is still below low at the upper transmission limit, the upper limit is
+    used as the optimised value.
+
+    Raises:
+        AttenuationOptimisationFailedException:
+        This error is thrown if the transmission goes below the lower limit or the
+        maximum cycles are reached
+
+    Returns:
+        optimised_transmission: (float)
+        The final transmission value which produces a value within the limits
+    """
+    search = LogTransmissionSearch(
+        low, high, aim, upper_transmission_limit, lower_transmission_limit
+    )
+    for cycle in range(0, max_cycles):
+        LOGGER.info(
+            f"Setting transmission to {transmission} for attenuation optimisation cycle {cycle}"
+        )
+        yield from do_device_optimise_iteration(composite, transmission)
+        value = yield from read()
+
+        if low <= value <= high:
+            LOGGER.info(
+                f"Optimised transmission {transmission} found after {cycle + 1} cycles: {low} <= {value} <= {high}"
+            )
+            return transmission
+        if value < low and transmission == upper_transmission_limit:
+            LOGGER.warning(
+                f"{value} is still below {low} at maximum transmission {upper_transmission_limit}. Using maximum transmission as optimised value."
+            )
+            return transmission
+        transmission = search.next_transmission(transmission, value)
+
+    raise AttenuationOptimisationFailedException(
+        f"Unable to optimise attenuation after maximum cycles. Value did not get within limits: {low} to {high} in maximum cycles {max_cycles}"
+    )
+
+
 def deadtime_optimisation(
     composite: OptimizeAttenuationComposite,
     transmission: float,
@@ -184,6 +357,7 @@ def deadtime_optimisation(
     max_cycles: int,
     upper_transmission_limit: float,
     lower_transmission_limit: float,
+    search: TransmissionSearch = TransmissionSearch.STEP,
 ):
     """Optimises the attenuation for the Xspress3Mini based on the detector deadtime
 
@@ -221,6 +395,11 @@ def deadtime_optimisation(
         lower_transmission_limit (float):
         Minimum expected transmission. Raise an error if transmission goes lower.
 
+        search (TransmissionSearch):
+        With TransmissionSearch.MODEL, model_search_optimisation is used to find a
+        transmission giving a deadtime below the threshold but above the threshold /
+        increment, so that it is as close to the threshold as stepping would get.
+
     Raises:
         AttenuationOptimisationFailedException:
         This error is thrown if the transmission goes below the expected value or the maximum cycles are reached
@@ -230,28 +409,28 @@ def deadtime_optimisation(
         The final transmission value which produces an acceptable deadtime
     """
 
-    direction = Direction.POSITIVE
     LOGGER.info(f"Target deadtime is {deadtime_threshold}")
+    if search == TransmissionSearch.MODEL:
+        return (
+            yield from model_search_optimisation(
+                composite,
+                transmission,
+                lambda: read_deadtime(composite),
+                deadtime_threshold / increment,
+                deadtime_threshold,
+                deadtime_threshold / math.sqrt(increment),
+                max_cycles,
+                upper_transmission_limit,
+                lower_transmission_limit,
+            )
+        )
+
+    direction = Direction.POSITIVE
     optimised_transmission: float = 0
     for cycle in range(0, max_cycles):
         yield from do_device_optimise_iteration(composite, transmission)
 
-        total_time = yield from bps.rd(composite.xspress3mini.channels[1].total_time)
-        reset_ticks = yield from bps.rd(composite.xspress3mini.channels[1].reset_ticks)
-
-        LOGGER.info(f"Current total time = {total_time}")
-        LOGGER.info(f"Current reset ticks = {reset_ticks}")
-        deadtime = 0
-
-        """
-            The reset ticks PV stops ticking while the detector is unable to process events, so the absolute difference between the total time and the
-            reset ticks time gives the deadtime in unit time. Divide by total time to get it as a percentage.
-        """
-
-        if total_time != reset_ticks:
-            deadtime = 1 - abs(total_time - reset_ticks) / (total_time)
-
-        LOGGER.info(f"Deadtime is now at {deadtime}")
+        deadtime = yield from read_deadtime(composite)
 
         # Check if new deadtime is OK
 
@@ -295,6 +474,7 @@ def total_counts_optimisation(
     max_cycles: int,
     upper_transmission_limit: float,
     lower_transmission_limit: float,
+    search: TransmissionSearch = TransmissionSearch.STEP,
 ):
     """Optimises the attenuation for the Xspress3Mini based on the total counts
 
@@ -335,12 +515,31 @@ def total_counts_optimisation(
         lower_transmission_limit: (float)
         The minimum allowed value for the transmission
 
+        search: (TransmissionSearch)
+        With TransmissionSearch.MODEL, model_search_optimisation is used rather than
+        scaling the transmission by target_count / total_count each cycle
+
     Returns:
         optimised_transmission: (float)
         The final transmission value which produces an acceptable total_count value
     """
 
     LOGGER.info("Using total count optimisation")
+    if search == TransmissionSearch.MODEL:
+        return (
+            yield from model_search_optimisation(
+                composite,
+                transmission,
+                lambda: read_total_count(composite, low_roi, high_roi),
+                lower_count_limit,
+                upper_count_limit,
+                target_count,
+                max_cycles,
+                upper_transmission_limit,
+                lower_transmission_limit,
+            )
+        )
+
     optimised_transmission: float = 0
     for cycle in range(0, max_cycles):
         LOGGER.info(
@@ -349,11 +548,7 @@ def total_counts_optimisation(
 
         yield from do_device_optimise_iteration(composite, transmission)
 
-        data = np.array(
-            (yield from bps.rd(composite.xspress3mini.dt_corrected_latest_mca[1]))
-        )
-        total_count = sum(data[int(low_roi) : int(high_roi)])
-        LOGGER.info(f"Total count is {total_count}")
+        total_count = yield from read_total_count(composite, low_roi, high_roi)
 
         if is_counts_within_target(total_count, lower_count_limit, upper_count_limit):
             optimised_transmission = transmission
@@ -404,6 +599,7 @@ def optimise_attenuation_plan(
     max_cycles=10,
     increment=2,
     deadtime_threshold=0.002,
+    search=TransmissionSearch.STEP,
 ):
     check_parameters(
         target_count,
@@ -437,6 +633,7 @@ def optimise_attenuation_plan(
             max_cycles,
             upper_transmission_limit,
             lower_transmission_limit,
+            TransmissionSearch(search),
         )
 
     elif optimisation_type == "deadtime":
@@ -446,11 +643,12 @@ def optimise_attenuation_plan(
         optimised_transmission = yield from deadtime_optimisation(
             composite,
             initial_transmission,
-            upper_transmission_limit,
-            lower_transmission_limit,
             increment,
             deadtime_threshold,
             max_cycles,
+            upper_transmission_limit,
+            lower_transmission_limit,
+            TransmissionSearch(search),
         )
 
     yield from bps.abs_set(
@@ -31,6 +31,7 @@ from mx_bluesky.hyperion.parameters.gridscan import (
     PinTipCentreThenXrayCentre,
 )
 from mx_bluesky.hyperion.utils.context import device_composite_from_context
+from mx_bluesky.hyperion.utils.phase_timing import sample_timing_wrapper, timed_phase
 
 
 def create_devices(context: BlueskyContext) -> GridDetectThenXRayCentreComposite:
@@ -80,11 +81,12 @@ def pin_centre_then_xray_centre_plan(
             group=CONST.WAIT.READY_FOR_OAV,
         )
 
-        yield from pin_tip_centre_plan(
-            pin_tip_centring_composite,
-            parameters.tip_offset_um,
-            oav_config_file,
-        )
+        with timed_phase(CONST.PHASE.PIN_TIP_CENTRING):
+            yield from pin_tip_centre_plan(
+                pin_tip_centring_composite,
+                parameters.tip_offset_um,
+                oav_config_file,
+            )
 
         grid_detect_params = create_parameters_for_grid_detection(parameters)
 
@@ -110,10 +112,14 @@ def pin_tip_centre_then_xray_centre(
 
     eiger.set_detector_parameters(parameters.detector_params)
 
-    return start_preparing_data_collection_then_do_plan(
-        eiger,
-        composite.detector_motion,
-        parameters.detector_params.detector_distance,
-        pin_centre_then_xray_centre_plan(composite, parameters, oav_config_file),
-        group=CONST.WAIT.GRID_READY_FOR_DC,
+    return sample_timing_wrapper(
+        start_preparing_data_collection_then_do_plan(
+            eiger,
+            composite.detector_motion,
+            parameters.detector_params.detector_distance,
+            pin_centre_then_xray_centre_plan(composite, parameters, oav_config_file),
+            group=CONST.WAIT.GRID_READY_FOR_DC,
+        ),
+        "pin_tip_centre_then_xray_centre",
+        parameters.sample_id,
     )
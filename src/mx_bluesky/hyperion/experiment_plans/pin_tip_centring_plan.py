@@ -15,13 +15,15 @@ from dodal.devices.oav.utils import (
 )
 from dodal.devices.smargon import Smargon
 
-from mx_bluesky.hyperion.device_setup_plans.setup_oav import pre_centring_setup_oav
+from mx_bluesky.hyperion.device_setup_plans.setup_oav import (
+    pre_centring_setup_oav,
+    wait_for_new_oav_frames,
+)
 from mx_bluesky.hyperion.device_setup_plans.smargon import (
     move_smargon_warn_on_out_of_range,
 )
 from mx_bluesky.hyperion.exceptions import WarningException
 from mx_bluesky.hyperion.log import LOGGER
-from mx_bluesky.hyperion.parameters.constants import CONST
 from mx_bluesky.hyperion.utils.context import device_composite_from_context
 
 DEFAULT_STEP_SIZE = 0.5
@@ -53,6 +55,7 @@ def trigger_and_return_pin_tip(
 def move_pin_into_view(
     pin_tip_device: PinTipDetection,
     smargon: Smargon,
+    oav: OAV,
     step_size_mm: float = DEFAULT_STEP_SIZE,
     max_steps: int = 2,
 ) -> Generator[Msg, None, Pixel]:
@@ -63,6 +66,8 @@ def move_pin_into_view(
     Args:
         pin_tip_device (PinTipDetection): The device being used to detect the pin
         smargon (Smargon): The gonio to move the tip
+        oav (OAV): The camera the pin tip is detected in, which must have taken new
+                   frames after each move before the tip is looked for again
         step_size (float, optional): Distance to move the gonio (in mm) for each
                                     step of the search. Defaults to 0.5.
         max_steps (int, optional): The number of steps to search with. Defaults to 2.
@@ -99,8 +104,7 @@ def move_pin_into_view(
             )
         yield from bps.mv(smargon.x, move_within_limits)  # type: ignore # See: https://github.com/bluesky/bluesky/issues/1809
 
-        # Some time for the view to settle after the move
-        yield from bps.sleep(CONST.HARDWARE.OAV_REFRESH_DELAY)
+        yield from wait_for_new_oav_frames(oav, "pin search x move")
 
     tip_x_px, tip_y_px = yield from trigger_and_return_pin_tip(pin_tip_device)
 
@@ -145,20 +149,16 @@ def pin_tip_centre_plan(
 
     LOGGER.info(f"Tip offset in pixels: {tip_offset_px}")
 
-    # need to wait for the OAV image to update
-    # See #673 for improvements
-    yield from bps.sleep(0.3)
+    yield from wait_for_new_oav_frames(oav, "start of pin tip centring")
 
     yield from pre_centring_setup_oav(oav, oav_params, pin_tip_setup)
 
-    tip = yield from move_pin_into_view(pin_tip_detect, smargon)
+    tip = yield from move_pin_into_view(pin_tip_detect, smargon, oav)
     yield from offset_and_move(tip)
 
     yield from bps.mvr(smargon.omega, 90)  # type: ignore # See: https://github.com/bluesky/bluesky/issues/1809
 
-    # need to wait for the OAV image to update
-    # See #673 for improvements
-    yield from bps.sleep(0.3)
+    yield from wait_for_new_oav_frames(oav, "pin tip centring omega move")
 
     tip = yield from wait_for_tip_to_be_found(pin_tip_detect)
     yield from offset_and_move(tip)
@@ -24,6 +24,7 @@ from dodal.devices.webcam import Webcam
 from dodal.devices.xbpm_feedback import XBPMFeedback
 from dodal.plans.motor_util_plans import MoveTooLarge, home_and_reset_wrapper
 
+from mx_bluesky.hyperion.device_setup_plans.utils import wait_for_signals
 from mx_bluesky.hyperion.experiment_plans.set_energy_plan import (
     SetEnergyComposite,
     set_energy_plan,
@@ -31,6 +32,7 @@ from mx_bluesky.hyperion.experiment_plans.set_energy_plan import (
 from mx_bluesky.hyperion.log import LOGGER
 from mx_bluesky.hyperion.parameters.constants import CONST
 from mx_bluesky.hyperion.parameters.robot_load import RobotLoadAndEnergyChange
+from mx_bluesky.hyperion.utils.phase_timing import timed_phase
 
 
 @dataclasses.dataclass
@@ -65,17 +67,15 @@ def wait_for_smargon_not_disabled(smargon: Smargon, timeout=60):
     connection between the robot and the smargon.
     """
     LOGGER.info("Waiting for smargon enabled")
-    SLEEP_PER_CHECK = 0.1
-    times_to_check = int(timeout / SLEEP_PER_CHECK)
-    for _ in range(times_to_check):
-        smargon_disabled = yield from bps.rd(smargon.disabled)
-        if not smargon_disabled:
-            LOGGER.info("Smargon now enabled")
-            return
-        yield from bps.sleep(SLEEP_PER_CHECK)
-    raise TimeoutError(
-        "Timed out waiting for smargon to become enabled after robot load"
-    )
+    try:
+        yield from wait_for_signals(
+            lambda disabled: not disabled, smargon.disabled, timeout=timeout
+        )
+    except TimeoutError as e:
+        raise TimeoutError(
+            "Timed out waiting for smargon to become enabled after robot load"
+        ) from e
+    LOGGER.info("Smargon now enabled")
 
 
 def take_robot_snapshots(oav: OAV, webcam: Webcam, directory: Path):
@@ -215,27 +215,28 @@ def robot_load_and_change_energy_plan(
 
     sample_location = SampleLocation(params.sample_puck, params.sample_pin)
 
-    yield from prepare_for_robot_load(
-        composite.aperture_scatterguard, composite.smargon
-    )
-    yield from bpp.run_wrapper(
-        robot_load_and_snapshots(
-            composite,
-            sample_location,
-            params.snapshot_directory,
-            params.thawing_time,
-            params.demand_energy_ev,
-        ),
-        md={
-            "subplan_name": CONST.PLAN.ROBOT_LOAD,
-            "metadata": {
-                "visit": params.visit,
-                "sample_id": params.sample_id,
-                "sample_puck": sample_location.puck,
-                "sample_pin": sample_location.pin,
+    with timed_phase(CONST.PHASE.ROBOT_LOAD):
+        yield from prepare_for_robot_load(
+            composite.aperture_scatterguard, composite.smargon
+        )
+        yield from bpp.run_wrapper(
+            robot_load_and_snapshots(
+                composite,
+                sample_location,
+                params.snapshot_directory,
+                params.thawing_time,
+                params.demand_energy_ev,
+            ),
+            md={
+                "subplan_name": CONST.PLAN.ROBOT_LOAD,
+                "metadata": {
+                    "visit": params.visit,
+                    "sample_id": params.sample_id,
+                    "sample_puck": sample_location.puck,
+                    "sample_pin": sample_location.pin,
+                },
+                "activate_callbacks": [
+                    "RobotLoadISPyBCallback",
+                ],
             },
-            "activate_callbacks": [
-                "RobotLoadISPyBCallback",
-            ],
-        },
-    )
+        )
@@ -48,6 +48,7 @@ from mx_bluesky.hyperion.experiment_plans.robot_load_and_change_energy import (
 )
 from mx_bluesky.hyperion.parameters.constants import CONST
 from mx_bluesky.hyperion.parameters.gridscan import RobotLoadThenCentre
+from mx_bluesky.hyperion.utils.phase_timing import sample_timing_wrapper
 
 
 @dataclasses.dataclass
@@ -119,6 +120,17 @@ def robot_load_then_centre_plan(
 def robot_load_then_centre(
     composite: RobotLoadThenCentreComposite,
     parameters: RobotLoadThenCentre,
+) -> MsgGenerator:
+    yield from sample_timing_wrapper(
+        _robot_load_then_centre(composite, parameters),
+        "robot_load_then_centre",
+        parameters.sample_id,
+    )
+
+
+def _robot_load_then_centre(
+    composite: RobotLoadThenCentreComposite,
+    parameters: RobotLoadThenCentre,
 ) -> MsgGenerator:
     eiger: EigerDetector = composite.eiger
 
@@ -58,6 +58,8 @@ from mx_bluesky.hyperion.parameters.rotation import (
     RotationScan,
 )
 from mx_bluesky.hyperion.utils.context import device_composite_from_context
+from mx_bluesky.hyperion.utils.phase_timing import sample_timing_wrapper, timed_phase
+from mx_bluesky.hyperion.utils.utils import compact_scan_points
 
 
 @dataclasses.dataclass
@@ -202,7 +204,11 @@ def rotation_scan_plan(
     @bpp.run_decorator(
         md={
             "subplan_name": CONST.PLAN.ROTATION_MAIN,
-            "scan_points": [params.scan_points],
+            "scan_points": [
+                compact_scan_points(params.scan_spec)
+                if params.features.compact_scan_points_in_documents
+                else params.scan_points
+            ],
         }
     )
     def _rotation_scan_plan(
@@ -241,9 +247,11 @@ def rotation_scan_plan(
         )
 
         LOGGER.info("Wait for any previous moves...")
-        # wait for all the setup tasks at once
-        yield from bps.wait(CONST.WAIT.ROTATION_READY_FOR_DC)
-        yield from bps.wait(CONST.WAIT.MOVE_GONIO_TO_START)
+        # wait for all the setup tasks at once, of which arming takes longest
+        with timed_phase(CONST.PHASE.EIGER_ARMING):
+            yield from bps.wait(CONST.WAIT.ROTATION_READY_FOR_DC)
+        with timed_phase(CONST.PHASE.MOVE_GONIO_TO_START):
+            yield from bps.wait(CONST.WAIT.MOVE_GONIO_TO_START)
 
         # get some information for the ispyb deposition and trigger the callback
         yield from read_hardware_for_zocalo(composite.eiger)
@@ -265,14 +273,16 @@ def rotation_scan_plan(
         yield from arm_zebra(composite.zebra)
 
         # Check topup gate
-        yield from check_topup_and_wait_if_necessary(
-            composite.synchrotron,
-            motion_values.total_exposure_s,
-            ops_time=10.0,  # Additional time to account for rotation, is s
-        )  # See #https://github.com/DiamondLightSource/hyperion/issues/932
+        with timed_phase(CONST.PHASE.TOPUP_WAIT):
+            yield from check_topup_and_wait_if_necessary(
+                composite.synchrotron,
+                motion_values.total_exposure_s,
+                ops_time=10.0,  # Additional time to account for rotation, is s
+            )  # See #https://github.com/DiamondLightSource/hyperion/issues/932
 
         LOGGER.info("Executing rotation scan")
-        yield from bps.rel_set(axis, motion_values.distance_to_move_deg, wait=True)
+        with timed_phase(CONST.PHASE.ROTATION):
+            yield from bps.rel_set(axis, motion_values.distance_to_move_deg, wait=True)
 
         yield from read_hardware_during_collection(
             composite.aperture_scatterguard,
@@ -287,13 +297,18 @@ def rotation_scan_plan(
 
 def _cleanup_plan(composite: RotationScanComposite, **kwargs):
     LOGGER.info("Cleaning up after rotation scan")
-    max_vel = yield from bps.rd(composite.smargon.omega.max_velocity)
-    yield from cleanup_sample_environment(composite.detector_motion, group="cleanup")
-    yield from bps.abs_set(composite.smargon.omega.velocity, max_vel, group="cleanup")
-    yield from tidy_up_zebra_after_rotation_scan(
-        composite.zebra, composite.sample_shutter, group="cleanup", wait=False
-    )
-    yield from bps.wait("cleanup")
+    with timed_phase(CONST.PHASE.CLEANUP):
+        max_vel = yield from bps.rd(composite.smargon.omega.max_velocity)
+        yield from cleanup_sample_environment(
+            composite.detector_motion, group="cleanup"
+        )
+        yield from bps.abs_set(
+            composite.smargon.omega.velocity, max_vel, group="cleanup"
+        )
+        yield from tidy_up_zebra_after_rotation_scan(
+            composite.zebra, composite.sample_shutter, group="cleanup", wait=False
+        )
+        yield from bps.wait("cleanup")
 
 
 def _move_and_rotation(
@@ -381,7 +396,11 @@ def rotation_scan(
         )
         yield from bps.unstage(eiger)  # type: ignore # See: https://github.com/bluesky/bluesky/issues/1809
 
-    yield from rotation_scan_plan_with_stage_and_cleanup(parameters)
+    yield from sample_timing_wrapper(
+        rotation_scan_plan_with_stage_and_cleanup(parameters),
+        "rotation_scan",
+        parameters.sample_id,
+    )
 
 
 def multi_rotation_scan(
@@ -427,10 +446,14 @@ def multi_rotation_scan(
             yield from rotation_scan_core(single_scan)
 
     LOGGER.info("setting up and staging eiger...")
-    yield from start_preparing_data_collection_then_do_plan(
-        eiger,
-        composite.detector_motion,
-        parameters.detector_distance_mm,
-        _multi_rotation_scan(),
-        group=CONST.WAIT.ROTATION_READY_FOR_DC,
+    yield from sample_timing_wrapper(
+        start_preparing_data_collection_then_do_plan(
+            eiger,
+            composite.detector_motion,
+            parameters.detector_distance_mm,
+            _multi_rotation_scan(),
+            group=CONST.WAIT.ROTATION_READY_FOR_DC,
+        ),
+        "multi_rotation_scan",
+        parameters.sample_id,
     )
@@ -3,10 +3,14 @@ from collections.abc import Callable, Sequence
 from threading import Thread
 from time import sleep
 
+from bluesky.callbacks import CallbackBase
 from bluesky.callbacks.zmq import Proxy, RemoteDispatcher
 from dodal.log import LOGGER as dodal_logger
 from dodal.log import set_up_all_logging_handlers
 
+from mx_bluesky.hyperion.external_interaction.callbacks.callback_worker import (
+    CallbackWorker,
+)
 from mx_bluesky.hyperion.external_interaction.callbacks.log_uid_tag_callback import (
     LogUidTaggingCallback,
 )
@@ -28,6 +32,17 @@ from mx_bluesky.hyperion.external_interaction.callbacks.xray_centre.nexus_callba
 from mx_bluesky.hyperion.external_interaction.callbacks.zocalo_callback import (
     ZocaloCallback,
 )
+from mx_bluesky.hyperion.external_interaction.ispyb.connection_pool import (
+    close_connection_pools,
+    enable_connection_pooling,
+)
+from mx_bluesky.hyperion.external_interaction.ispyb.deposition_queue import (
+    enable_deposition_queue,
+    shutdown_deposition_queue,
+)
+from mx_bluesky.hyperion.external_interaction.ispyb.ispyb_utils import (
+    get_ispyb_connection_pool_size,
+)
 from mx_bluesky.hyperion.log import (
     ISPYB_LOGGER,
     NEXUS_LOGGER,
@@ -39,17 +54,39 @@ from mx_bluesky.hyperion.parameters.constants import CONST
 
 LIVENESS_POLL_SECONDS = 1
 ERROR_LOG_BUFFER_LINES = 5000
+CALLBACK_WORKER_SHUTDOWN_TIMEOUT_S = 60
+# The families whose callbacks add to the documents they receive, e.g. the ISPyB
+# callbacks tagging them with data collection IDs for Zocalo
+DOCUMENT_CHANGING_FAMILIES = {"ispyb_zocalo"}
 
 
-def setup_callbacks():
+def setup_callback_families() -> dict[str, list[CallbackBase]]:
+    """Callbacks grouped by which can be run independently of each other. The Zocalo
+    callback is emitted to by the ISPyB callbacks so must be in the same family."""
     zocalo = ZocaloCallback()
+    return {
+        "nexus": [GridscanNexusFileCallback(), RotationNexusFileCallback()],
+        "ispyb_zocalo": [
+            GridscanISPyBCallback(emit=zocalo),
+            RotationISPyBCallback(emit=zocalo),
+        ],
+        "robot_load": [RobotLoadISPyBCallback()],
+        "log_tagging": [LogUidTaggingCallback()],
+    }
+
+
+def setup_callbacks() -> list[CallbackBase]:
+    return [cb for family in setup_callback_families().values() for cb in family]
+
+
+def setup_callback_workers(
+    families: dict[str, list[CallbackBase]],
+) -> list[CallbackWorker]:
     return [
-        GridscanNexusFileCallback(),
-        GridscanISPyBCallback(emit=zocalo),
-        RotationNexusFileCallback(),
-        RotationISPyBCallback(emit=zocalo),
-        LogUidTaggingCallback(),
-        RobotLoadISPyBCallback(),
+        CallbackWorker(
+            name, callbacks, copy_documents=name in DOCUMENT_CHANGING_FAMILIES
+        )
+        for name, callbacks in families.items()
     ]
 
 
@@ -110,31 +147,67 @@ def wait_for_threads_forever(threads: Sequence[Thread]):
     except KeyboardInterrupt:
         log_info("Main thread received interrupt - exiting.")
     else:
-        log_info("Proxy or dispatcher thread ended - exiting.")
+        log_info("Proxy, dispatcher or callback worker thread ended - exiting.")
 
 
 class HyperionCallbackRunner:
-    """Runs Nexus, ISPyB and Zocalo callbacks in their own process."""
+    """Runs Nexus, ISPyB and Zocalo callbacks in their own process.
+
+    With sharded_dispatch each family of callbacks is given its own worker thread,
+    otherwise all callbacks are run in turn on the dispatcher thread."""
 
-    def __init__(self, dev_mode) -> None:
+    def __init__(self, dev_mode, sharded_dispatch: bool = True) -> None:
         setup_logging(dev_mode)
         log_info("Hyperion callback process started.")
 
-        self.callbacks = setup_callbacks()
+        # The ISPyB callbacks are recreated for every run, pool connections so that
+        # they are shared between runs rather than reopened for each deposition
+        enable_connection_pooling(get_ispyb_connection_pool_size())
+        # Write ISPyB depositions behind the dispatcher so a slow database doesn't
+        # hold up NeXus writing and Zocalo triggering
+        enable_deposition_queue(
+            CONST.ISPYB_DEPOSITION_WORKERS, CONST.ISPYB_DEPOSITION_MAX_PENDING
+        )
+        self.workers: list[CallbackWorker] = []
+        if sharded_dispatch:
+            families = setup_callback_families()
+            self.callbacks = [cb for family in families.values() for cb in family]
+            self.workers = setup_callback_workers(families)
+            dispatched: list[Callable] = [worker.put for worker in self.workers]
+        else:
+            self.callbacks = setup_callbacks()
+            dispatched = list(self.callbacks)
         self.proxy, self.dispatcher, start_proxy, start_dispatcher = setup_threads()
         log_info("Created 0MQ proxy and local RemoteDispatcher.")
 
         self.proxy_thread = Thread(target=start_proxy, daemon=True)
         self.dispatcher_thread = Thread(
-            target=start_dispatcher, args=[self.callbacks], daemon=True
+            target=start_dispatcher, args=[dispatched], daemon=True
         )
 
     def start(self):
         log_info(f"Launching threads, with callbacks: {self.callbacks}")
+        for worker in self.workers:
+            worker.start()
         self.proxy_thread.start()
         self.dispatcher_thread.start()
-        log_info("Proxy and dispatcher thread launched.")
-        wait_for_threads_forever([self.proxy_thread, self.dispatcher_thread])
+        log_info(
+            f"Proxy and dispatcher thread launched, with {len(self.workers)} callback "
+            "workers."
+        )
+        wait_for_threads_forever(
+            [
+                self.proxy_thread,
+                self.dispatcher_thread,
+                *(worker.thread for worker in self.workers),
+            ]
+        )
+        log_info("Waiting for callback workers to process outstanding documents.")
+        for worker in self.workers:
+            worker.stop(CALLBACK_WORKER_SHUTDOWN_TIMEOUT_S)
+        log_info("Waiting for outstanding ISPyB depositions to complete.")
+        shutdown_deposition_queue()
+        close_connection_pools()
 
 
 def main(dev_mode=False) -> None:
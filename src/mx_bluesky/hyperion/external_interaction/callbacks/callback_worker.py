@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Sequence
+from copy import deepcopy
+from queue import Queue
+from threading import Thread
+from typing import Any
+
+from mx_bluesky.hyperion.log import ISPYB_LOGGER, NEXUS_LOGGER
+from mx_bluesky.hyperion.tracing import METER
+
+QUEUE_DEPTH = METER.create_up_down_counter(
+    "hyperion.callbacks.queue_depth",
+    description="Documents waiting to be processed by each callback worker",
+)
+PROCESSING_TIME = METER.create_histogram(
+    "hyperion.callbacks.processing_time",
+    unit="s",
+    description="Time taken by each callback to process a document",
+)
+LAG = METER.create_histogram(
+    "hyperion.callbacks.lag",
+    unit="s",
+    description="Time between the RunEngine creating a document and a callback worker "
+    "starting to process it",
+)
+
+
+class CallbackWorker:
+    """Passes documents to a family of callbacks on a dedicated thread, so that a slow
+    family (e.g. NeXus writing) doesn't hold up the others.
+
+    Documents are queued by put() and given to each callback in the order they were
+    put, so the ordering of documents within a run is preserved for the callbacks of a
+    worker. There is no ordering between workers.
+
+    Workers share the documents they are given, so callbacks must not change them
+    unless their worker has copy_documents set, in which case it deep copies each
+    document on its own thread before passing it on.
+
+    As with a bluesky dispatcher, an exception from a callback is logged and stops the
+    worker."""
+
+    def __init__(
+        self,
+        name: str,
+        callbacks: Sequence[Callable[[str, Any], Any]],
+        copy_documents: bool = False,
+    ):
+        self.name = name
+        self.callbacks = list(callbacks)
+        self.copy_documents = copy_documents
+        self._attributes = {"worker": name}
+        self._queue: Queue[tuple[str, dict] | None] = Queue()
+        self._thread = Thread(target=self._run, name=f"{name}_callbacks", daemon=True)
+
+    @property
+    def thread(self) -> Thread:
+        return self._thread
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def put(self, name: str, doc: dict) -> None:
+        self._queue.put((name, doc))
+        QUEUE_DEPTH.add(1, self._attributes)
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Process all documents already queued and then stop the worker thread."""
+        self._queue.put(None)
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while (item := self._queue.get()) is not None:
+            QUEUE_DEPTH.add(-1, self._attributes)
+            name, doc = item
+            if self.copy_documents:
+                doc = deepcopy(doc)
+            if (created := doc.get("time")) is not None:
+                LAG.record(time.time() - created, self._attributes)
+            for callback in self.callbacks:
+                start = time.perf_counter()
+                try:
+                    callback(name, doc)
+                except Exception as e:
+                    for logger in (ISPYB_LOGGER, NEXUS_LOGGER):
+                        logger.exception(
+                            f"{callback} failed on {name} document, stopping "
+                            f"{self.name} callback worker: {e}"
+                        )
+                    raise
+                finally:
+                    PROCESSING_TIME.record(
+                        time.perf_counter() - start,
+                        self._attributes | {"callback": type(callback).__name__},
+                    )
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from abc import abstractmethod
 from collections.abc import Callable, Sequence
+from concurrent.futures import Future
 from typing import TYPE_CHECKING, Any, TypeVar, cast
 
 from dodal.beamline_specific_utils.i03 import beam_size_from_aperture
@@ -16,6 +17,9 @@ from mx_bluesky.hyperion.external_interaction.ispyb.data_model import (
     DataCollectionPositionInfo,
     ScanDataInfo,
 )
+from mx_bluesky.hyperion.external_interaction.ispyb.deposition_queue import (
+    get_deposition_queue,
+)
 from mx_bluesky.hyperion.external_interaction.ispyb.ispyb_store import (
     IspybIds,
     StoreInIspyb,
@@ -41,7 +45,11 @@ class BaseISPyBCallback(PlanReactiveCallback):
     ) -> None:
         """Subclasses should run super().__init__() with parameters, then set
         self.ispyb to the type of ispyb relevant to the experiment and define the type
-        for self.ispyb_ids."""
+        for self.ispyb_ids.
+
+        Anything which talks to ISPyB, or reads or writes self.params, self.ispyb or
+        self.ispyb_ids, should be wrapped in a step passed to self._deposit() so that
+        it is run in order behind the callback's earlier depositions."""
         ISPYB_LOGGER.debug("Initialising ISPyB callback")
         super().__init__(log=ISPYB_LOGGER, emit=emit)
         self._oav_snapshot_event_idx: int = 0
@@ -60,11 +68,26 @@ class BaseISPyBCallback(PlanReactiveCallback):
             )
         self.uid_to_finalize_on: str | None = None
         self.ispyb_ids: IspybIds = IspybIds()
+        # A copy of ispyb_ids as of the last completed step, for tagging documents
+        self._deposited_ids: IspybIds = IspybIds()
         self.log = ISPYB_LOGGER
+        self._zocalo_triggering_plan: str | None = None
+        self._last_deposition: Future | None = None
 
     def activity_gated_start(self, doc: RunStart):
-        self._oav_snapshot_event_idx = 0
-        return self._tag_doc(doc)
+        def reset_snapshot_index():
+            self._oav_snapshot_event_idx = 0
+
+        self._deposit(reset_snapshot_index)
+        if triggering_plan := doc.get(CONST.TRIGGER.ZOCALO):
+            self._zocalo_triggering_plan = triggering_plan
+        # The Zocalo callback needs the data collection IDs in this document, so it's
+        # the one place we have to wait for the deposition to catch up
+        return self._tag_doc(
+            doc,
+            wait_for_ids=self._zocalo_triggering_plan is not None
+            and doc.get("subplan_name") == self._zocalo_triggering_plan,
+        )
 
     def activity_gated_descriptor(self, doc: EventDescriptor):
         self.descriptors[doc["uid"]] = doc
@@ -74,8 +97,6 @@ class BaseISPyBCallback(PlanReactiveCallback):
         """Subclasses should extend this to add a call to set_dcig_tag from
         hyperion.log"""
         ISPYB_LOGGER.debug("ISPyB handler received event document.")
-        assert self.ispyb is not None, "ISPyB deposition wasn't initialised!"
-        assert self.params is not None, "ISPyB handler didn't receive parameters!"
 
         event_descriptor = self.descriptors.get(doc["descriptor"])
         if event_descriptor is None:
@@ -86,13 +107,25 @@ class BaseISPyBCallback(PlanReactiveCallback):
             return doc
         match event_descriptor.get("name"):
             case CONST.DESCRIPTORS.HARDWARE_READ_PRE:
-                scan_data_infos = self._handle_ispyb_hardware_read(doc)
+                handler = self._handle_ispyb_hardware_read
             case CONST.DESCRIPTORS.HARDWARE_READ_DURING:
-                scan_data_infos = self._handle_ispyb_transmission_flux_read(doc)
+                handler = self._handle_ispyb_transmission_flux_read
             case _:
                 return self._tag_doc(doc)
-        self.ispyb_ids = self.ispyb.update_deposition(self.ispyb_ids, scan_data_infos)
-        ISPYB_LOGGER.info(f"Received ISPYB IDs: {self.ispyb_ids}")
+
+        def update_deposition():
+            assert self.ispyb is not None, "ISPyB deposition wasn't initialised!"
+            assert self.params is not None, "ISPyB handler didn't receive parameters!"
+            # The flux read handler also appends to the comment, so write both as one
+            # transaction
+            with self.ispyb.batch():
+                scan_data_infos = handler(doc)
+                self.ispyb_ids = self.ispyb.update_deposition(
+                    self.ispyb_ids, scan_data_infos
+                )
+            ISPYB_LOGGER.info(f"Received ISPYB IDs: {self.ispyb_ids}")
+
+        self._deposit(update_deposition)
         return self._tag_doc(doc)
 
     def _handle_ispyb_hardware_read(self, doc) -> Sequence[ScanDataInfo]:
@@ -166,21 +199,27 @@ class BaseISPyBCallback(PlanReactiveCallback):
     def activity_gated_stop(self, doc: RunStop) -> RunStop:
         """Subclasses must check that they are recieving a stop document for the correct
         uid to use this method!"""
-        assert (
-            self.ispyb is not None
-        ), "ISPyB handler received stop document, but deposition object doesn't exist!"
         ISPYB_LOGGER.debug("ISPyB handler received stop document.")
         exit_status = (
             doc.get("exit_status") or "Exit status not available in stop document!"
         )
         reason = doc.get("reason") or ""
-        set_dcgid_tag(None)
-        try:
-            self.ispyb.end_deposition(self.ispyb_ids, exit_status, reason)
-        except Exception as e:
-            ISPYB_LOGGER.warning(
-                f"Failed to finalise ISPyB deposition on stop document: {format_doc_for_log(doc)} with exception: {e}"
-            )
+
+        def end_deposition():
+            assert (
+                self.ispyb is not None
+            ), "ISPyB handler received stop document, but deposition object doesn't exist!"
+            set_dcgid_tag(None)
+            try:
+                self.ispyb.end_deposition(self.ispyb_ids, exit_status, reason)
+            except Exception as e:
+                ISPYB_LOGGER.warning(
+                    f"Failed to finalise ISPyB deposition on stop document: {format_doc_for_log(doc)} with exception: {e}"
+                )
+
+        self._deposit(end_deposition)
+        # Raise any failure from this run's depositions, as we would without the queue
+        self._wait_for_depositions()
         return self._tag_doc(doc)
 
     def _append_to_comment(self, id: int, comment: str) -> None:
@@ -196,8 +235,32 @@ class BaseISPyBCallback(PlanReactiveCallback):
         for id in self.ispyb_ids.data_collection_ids:
             self._append_to_comment(id, comment)
 
-    def _tag_doc(self, doc: D) -> D:
+    def _deposit(self, step: Callable[[], None], new_deposition: bool = False) -> None:
+        """Run step after all the steps previously deposited by this callback. Depending
+        on how the deposition queue is configured this may happen immediately or on a
+        worker thread. If an earlier step failed, step is skipped unless it begins a new
+        deposition."""
+
+        def step_then_copy_ids():
+            step()
+            self._deposited_ids = self.ispyb_ids.model_copy()
+
+        self._last_deposition = get_deposition_queue().submit(
+            self, step_then_copy_ids, new_deposition
+        )
+
+    def _wait_for_depositions(self) -> None:
+        """Block until every step deposited by this callback so far has completed."""
+        if self._last_deposition is not None:
+            self._last_deposition.result()
+
+    def _tag_doc(self, doc: D, wait_for_ids: bool = False) -> D:
+        """Tag doc with the data collection IDs as of the last completed deposition
+        step. Unless wait_for_ids is set these may be stale, from before the steps still
+        queued for earlier documents."""
         assert isinstance(doc, dict)
-        if self.ispyb_ids:
-            doc["ispyb_dcids"] = self.ispyb_ids.data_collection_ids
+        if wait_for_ids:
+            self._wait_for_depositions()
+        if ids := self._deposited_ids:
+            doc["ispyb_dcids"] = ids.data_collection_ids
         return cast(D, doc)
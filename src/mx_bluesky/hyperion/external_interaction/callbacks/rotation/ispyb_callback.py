@@ -60,48 +60,48 @@ class RotationISPyBCallback(BaseISPyBCallback):
             ISPYB_LOGGER.info(
                 "ISPyB callback received start document with experiment parameters."
             )
-            self.params = RotationScan.from_json(doc.get("hyperion_parameters"))
-            dcgid = (
-                self.ispyb_ids.data_collection_group_id
-                if (self.params.sample_id == self.last_sample_id)
-                else None
-            )
-            if (
-                self.params.ispyb_experiment_type
-                == IspybExperimentType.CHARACTERIZATION
-            ):
-                ISPYB_LOGGER.info("Screening collection - using new DCG")
-                dcgid = None
-                self.last_sample_id = None
-            else:
-                ISPYB_LOGGER.info(
-                    f"Collection is {self.params.ispyb_experiment_type} - storing sampleID to bundle images"
-                )
-                self.last_sample_id = self.params.sample_id
-            self.ispyb = StoreInIspyb(self.ispyb_config)
-            ISPYB_LOGGER.info("Beginning ispyb deposition")
-            data_collection_group_info = populate_data_collection_group(self.params)
-            data_collection_info = populate_data_collection_info_for_rotation(
-                cast(RotationScan, self.params)
-            )
-            data_collection_info = populate_remaining_data_collection_info(
-                self.params.comment,
-                dcgid,
-                data_collection_info,
-                self.params,
-            )
-            data_collection_info.parent_id = dcgid
-            scan_data_info = ScanDataInfo(
-                data_collection_info=data_collection_info,
-            )
-            self.ispyb_ids = self.ispyb.begin_deposition(
-                data_collection_group_info, [scan_data_info]
-            )
+            self._deposit(lambda: self._begin_deposition(doc), new_deposition=True)
         ISPYB_LOGGER.info("ISPYB handler received start document.")
         if doc.get("subplan_name") == CONST.PLAN.ROTATION_MAIN:
             self.uid_to_finalize_on = doc.get("uid")
         return super().activity_gated_start(doc)
 
+    def _begin_deposition(self, doc: RunStart):
+        self.params = RotationScan.from_json(doc.get("hyperion_parameters"))
+        dcgid = (
+            self.ispyb_ids.data_collection_group_id
+            if (self.params.sample_id == self.last_sample_id)
+            else None
+        )
+        if self.params.ispyb_experiment_type == IspybExperimentType.CHARACTERIZATION:
+            ISPYB_LOGGER.info("Screening collection - using new DCG")
+            dcgid = None
+            self.last_sample_id = None
+        else:
+            ISPYB_LOGGER.info(
+                f"Collection is {self.params.ispyb_experiment_type} - storing sampleID to bundle images"
+            )
+            self.last_sample_id = self.params.sample_id
+        self.ispyb = StoreInIspyb(self.ispyb_config)
+        ISPYB_LOGGER.info("Beginning ispyb deposition")
+        data_collection_group_info = populate_data_collection_group(self.params)
+        data_collection_info = populate_data_collection_info_for_rotation(
+            cast(RotationScan, self.params)
+        )
+        data_collection_info = populate_remaining_data_collection_info(
+            self.params.comment,
+            dcgid,
+            data_collection_info,
+            self.params,
+        )
+        data_collection_info.parent_id = dcgid
+        scan_data_info = ScanDataInfo(
+            data_collection_info=data_collection_info,
+        )
+        self.ispyb_ids = self.ispyb.begin_deposition(
+            data_collection_group_info, [scan_data_info]
+        )
+
     def populate_info_for_update(
         self,
         event_sourced_data_collection_info: DataCollectionInfo,
@@ -138,14 +138,18 @@ class RotationISPyBCallback(BaseISPyBCallback):
 
     def activity_gated_event(self, doc: Event):
         doc = super().activity_gated_event(doc)
-        set_dcgid_tag(self.ispyb_ids.data_collection_group_id)
+        self._deposit(lambda: set_dcgid_tag(self.ispyb_ids.data_collection_group_id))
 
         descriptor_name = self.descriptors[doc["descriptor"]].get("name")
         if descriptor_name == CONST.DESCRIPTORS.OAV_ROTATION_SNAPSHOT_TRIGGERED:
-            scan_data_infos = self._handle_oav_rotation_snapshot_triggered(doc)
-            self.ispyb_ids = self.ispyb.update_deposition(
-                self.ispyb_ids, scan_data_infos
-            )
+
+            def update_deposition():
+                scan_data_infos = self._handle_oav_rotation_snapshot_triggered(doc)
+                self.ispyb_ids = self.ispyb.update_deposition(
+                    self.ispyb_ids, scan_data_infos
+                )
+
+            self._deposit(update_deposition)
 
         return doc
 
@@ -93,48 +93,55 @@ class GridscanISPyBCallback(BaseISPyBCallback):
                 "ISPyB callback received start document with experiment parameters and "
                 f"uid: {self.uid_to_finalize_on}"
             )
-            self.params = GridCommon.from_json(doc.get("hyperion_parameters"))
-            self.ispyb = StoreInIspyb(self.ispyb_config)
-            data_collection_group_info = populate_data_collection_group(self.params)
+            self._deposit(lambda: self._begin_deposition(doc), new_deposition=True)
+        return super().activity_gated_start(doc)
+
+    def _begin_deposition(self, doc: RunStart):
+        self.params = GridCommon.from_json(doc.get("hyperion_parameters"))
+        self.ispyb = StoreInIspyb(self.ispyb_config)
+        data_collection_group_info = populate_data_collection_group(self.params)
 
-            scan_data_infos = [
-                ScanDataInfo(
-                    data_collection_info=populate_remaining_data_collection_info(
-                        None,
-                        None,
-                        populate_xy_data_collection_info(
-                            self.params.detector_params,
-                        ),
-                        self.params,
+        scan_data_infos = [
+            ScanDataInfo(
+                data_collection_info=populate_remaining_data_collection_info(
+                    None,
+                    None,
+                    populate_xy_data_collection_info(
+                        self.params.detector_params,
                     ),
+                    self.params,
                 ),
-                ScanDataInfo(
-                    data_collection_info=populate_remaining_data_collection_info(
-                        None,
-                        None,
-                        populate_xz_data_collection_info(self.params.detector_params),
-                        self.params,
-                    )
-                ),
-            ]
+            ),
+            ScanDataInfo(
+                data_collection_info=populate_remaining_data_collection_info(
+                    None,
+                    None,
+                    populate_xz_data_collection_info(self.params.detector_params),
+                    self.params,
+                )
+            ),
+        ]
 
-            self.ispyb_ids = self.ispyb.begin_deposition(
-                data_collection_group_info, scan_data_infos
-            )
-            set_dcgid_tag(self.ispyb_ids.data_collection_group_id)
-        return super().activity_gated_start(doc)
+        self.ispyb_ids = self.ispyb.begin_deposition(
+            data_collection_group_info, scan_data_infos
+        )
+        set_dcgid_tag(self.ispyb_ids.data_collection_group_id)
 
     def activity_gated_event(self, doc: Event):
         doc = super().activity_gated_event(doc)
 
         descriptor_name = self.descriptors[doc["descriptor"]].get("name")
         if descriptor_name == ZOCALO_READING_PLAN_NAME:
-            self._handle_zocalo_read_event(doc)
+            self._deposit(lambda: self._handle_zocalo_read_event(doc))
         elif descriptor_name == CONST.DESCRIPTORS.OAV_GRID_SNAPSHOT_TRIGGERED:
-            scan_data_infos = self._handle_oav_grid_snapshot_triggered(doc)
-            self.ispyb_ids = self.ispyb.update_deposition(
-                self.ispyb_ids, scan_data_infos
-            )
+
+            def update_deposition():
+                scan_data_infos = self._handle_oav_grid_snapshot_triggered(doc)
+                self.ispyb_ids = self.ispyb.update_deposition(
+                    self.ispyb_ids, scan_data_infos
+                )
+
+            self._deposit(update_deposition)
 
         return doc
 
@@ -263,7 +270,13 @@ class GridscanISPyBCallback(BaseISPyBCallback):
                 "ISPyB callback received stop document corresponding to start document "
                 f"with uid: {self.uid_to_finalize_on}."
             )
-            if self.ispyb_ids == IspybIds():
-                raise ISPyBDepositionNotMade("ispyb was not initialised at run start")
+
+            def check_deposition_made():
+                if self.ispyb_ids == IspybIds():
+                    raise ISPyBDepositionNotMade(
+                        "ispyb was not initialised at run start"
+                    )
+
+            self._deposit(check_deposition_made)
             return super().activity_gated_stop(doc)
         return self._tag_doc(doc)
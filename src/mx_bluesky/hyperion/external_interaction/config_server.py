@@ -20,6 +20,10 @@ class FeatureFlags(BaseModel):
     use_panda_for_gridscan: bool = False
     use_gpu_for_gridscan: bool = False
     set_stub_offsets: bool = False
+    # Only the Zocalo callback reads the scan points in the do_fgs and rotation start
+    # documents, and it only needs the number of frames from them
+    compact_scan_points_in_documents: bool = False
+    early_zocalo_run_end: bool = False
 
     @classmethod
     def _get_flags(cls):
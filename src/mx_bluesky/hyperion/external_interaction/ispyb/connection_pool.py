@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+
+import ispyb
+from ispyb.connector.mysqlsp.main import ISPyBMySQLSPConnector as Connector
+from mysql.connector.errors import InterfaceError, OperationalError
+
+from mx_bluesky.hyperion.log import ISPYB_LOGGER
+
+# Errors after which a connection can no longer be trusted and should not be returned
+# to the pool. Anything else (e.g. a ReadWriteError from a bad stored procedure call)
+# leaves the connection itself in a usable state.
+CONNECTION_ERRORS = (ispyb.ConnectionError, InterfaceError, OperationalError)
+
+
+@dataclass
+class _PooledConnection:
+    conn: Connector
+    closer: ExitStack
+
+
+@dataclass
+class ConnectionPoolStats:
+    opened: int = 0
+    reused: int = 0
+    discarded: int = 0
+
+
+class ISPyBConnectionPool:
+    """A bounded pool of open ISPyB connections for a single credentials file.
+
+    Connections are opened lazily, handed out one caller at a time and returned to the
+    pool afterwards so that subsequent depositions don't pay the connect and
+    authentication cost again. Idle connections are health checked before being reused
+    and replaced with a fresh connection if the server has dropped them. At most
+    max_size connections are ever open at once, further callers block until one is
+    returned."""
+
+    def __init__(self, config_path: str, max_size: int) -> None:
+        assert max_size > 0, "ISPyB connection pool must allow at least one connection"
+        self.config_path = config_path
+        self.max_size = max_size
+        self.stats = ConnectionPoolStats()
+        self._idle: deque[_PooledConnection] = deque()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._closed = False
+
+    @contextmanager
+    def connection(self) -> Iterator[Connector]:
+        with self._slots:
+            pooled = self._acquire()
+            try:
+                yield pooled.conn
+            except CONNECTION_ERRORS:
+                self._discard(pooled)
+                raise
+            except BaseException:
+                self._release(pooled)
+                raise
+            else:
+                self._release(pooled)
+
+    def close(self) -> None:
+        """Close all idle connections. Connections currently in use are closed when
+        they are returned."""
+        with self._lock:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+        for pooled in idle:
+            pooled.closer.close()
+
+    def _acquire(self) -> _PooledConnection:
+        while True:
+            with self._lock:
+                pooled = self._idle.popleft() if self._idle else None
+            if pooled is None:
+                return self._open()
+            if self._is_healthy(pooled.conn):
+                with self._lock:
+                    self.stats.reused += 1
+                return pooled
+            ISPYB_LOGGER.info(
+                "Pooled ISPyB connection is no longer alive, replacing it"
+            )
+            self._discard(pooled)
+
+    def _open(self) -> _PooledConnection:
+        closer = ExitStack()
+        conn = closer.enter_context(ispyb.open(self.config_path))
+        with self._lock:
+            self.stats.opened += 1
+            opened = self.stats.opened
+        ISPYB_LOGGER.debug(
+            f"Opened ISPyB connection {opened} for pool {self.config_path}"
+        )
+        return _PooledConnection(conn, closer)
+
+    def _release(self, pooled: _PooledConnection) -> None:
+        with self._lock:
+            if not self._closed:
+                self._idle.append(pooled)
+                return
+        pooled.closer.close()
+
+    def _discard(self, pooled: _PooledConnection) -> None:
+        with self._lock:
+            self.stats.discarded += 1
+        try:
+            pooled.closer.close()
+        except Exception as e:
+            ISPYB_LOGGER.debug(f"Error closing discarded ISPyB connection: {e}")
+
+    @staticmethod
+    def _is_healthy(conn: Connector) -> bool:
+        mysql_conn = getattr(conn, "conn", None)
+        if mysql_conn is None:
+            return False
+        try:
+            return bool(mysql_conn.is_connected())
+        except Exception:
+            return False
+
+
+_pools: dict[str, ISPyBConnectionPool] = {}
+_pools_lock = threading.Lock()
+_pool_size: int = 0
+
+
+def enable_connection_pooling(max_size: int) -> None:
+    """Make all subsequent ISPyB connections in this process come from a pool of up to
+    max_size connections per credentials file. A size of 0 disables pooling."""
+    global _pool_size
+    close_connection_pools()
+    _pool_size = max_size
+    ISPYB_LOGGER.info(f"ISPyB connection pool size set to {max_size}")
+
+
+def close_connection_pools() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        ISPYB_LOGGER.info(f"Closing ISPyB connection pool with stats {pool.stats}")
+        pool.close()
+
+
+def get_connection_pool(config_path: str) -> ISPyBConnectionPool | None:
+    if _pool_size <= 0:
+        return None
+    with _pools_lock:
+        if config_path not in _pools:
+            _pools[config_path] = ISPyBConnectionPool(config_path, _pool_size)
+        return _pools[config_path]
+
+
+@contextmanager
+def ispyb_connection(config_path: str) -> Iterator[Connector]:
+    """Yields an ISPyB connection, taken from the pool for config_path if pooling is
+    enabled, otherwise a new connection that is closed on exit."""
+    pool = get_connection_pool(config_path)
+    if pool is None:
+        with ispyb.open(config_path) as conn:
+            yield conn
+    else:
+        with pool.connection() as conn:
+            yield conn
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from mx_bluesky.hyperion.external_interaction.exceptions import ISPyBDepositionNotMade
+from mx_bluesky.hyperion.log import ISPYB_LOGGER
+
+T = TypeVar("T")
+
+
+class DepositionQueue:
+    """Runs ISPyB deposition steps behind the callback that submitted them, so that slow
+    database writes don't hold up the document dispatcher.
+
+    Steps submitted with the same key are run strictly in submission order, one at a
+    time, steps for different keys may run concurrently on up to max_workers threads.
+    Each step's result is available from the returned future, so anything that needs
+    an ID created by an earlier step can block on just that step.
+
+    Once a step fails, the steps after it with the same key are skipped, with an error
+    logged and ISPyBDepositionNotMade set on their futures, as they would otherwise
+    write to a deposition that was never made or is only half made. A step submitted
+    with new_deposition=True starts afresh, running along with the steps after it.
+
+    Submitting blocks once max_pending steps are outstanding, to bound how far the
+    database can fall behind the RunEngine. With max_workers=0 steps are run
+    immediately in the submitting thread and any exception is raised to the caller, as
+    if there were no queue at all."""
+
+    def __init__(self, max_workers: int = 0, max_pending: int = 0) -> None:
+        self.max_workers = max_workers
+        self._executor = (
+            ThreadPoolExecutor(max_workers, thread_name_prefix="ispyb_deposition")
+            if max_workers > 0
+            else None
+        )
+        self._slots = (
+            threading.BoundedSemaphore(max_pending) if max_pending > 0 else None
+        )
+        self._lock = threading.Lock()
+        self._all_done = threading.Condition(self._lock)
+        self._steps: dict[Hashable, deque[tuple[Callable[[], Any], Future, bool]]] = {}
+        self._failures: dict[Hashable, BaseException] = {}
+        self._pending = 0
+        self._shutdown = False
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return self._pending
+
+    def submit(
+        self, key: Hashable, step: Callable[[], T], new_deposition: bool = False
+    ) -> Future[T]:
+        future: Future[T] = Future()
+        if self._executor is None:
+            future.set_running_or_notify_cancel()
+            future.set_result(step())
+            return future
+
+        if self._slots:
+            self._slots.acquire()
+        with self._lock:
+            if self._shutdown:
+                if self._slots:
+                    self._slots.release()
+                raise RuntimeError("Cannot queue ISPyB deposition after shutdown")
+            self._pending += 1
+            steps = self._steps.setdefault(key, deque())
+            steps.append((step, future, new_deposition))
+            start_worker = len(steps) == 1
+        if start_worker:
+            self._executor.submit(self._run_steps_for, key)
+        return future
+
+    def drain(self, timeout: float | None = None) -> bool:
+        """Wait for every step submitted so far to finish. Returns False on timeout."""
+        with self._all_done:
+            return self._all_done.wait_for(lambda: self._pending == 0, timeout)
+
+    def shutdown(self, timeout: float | None = None) -> None:
+        """Stop accepting new steps and wait for all outstanding ones to complete."""
+        with self._lock:
+            self._shutdown = True
+        if not self.drain(timeout):
+            ISPYB_LOGGER.error(
+                f"Shut down ISPyB deposition queue with {self.pending} steps outstanding"
+            )
+        if self._executor:
+            self._executor.shutdown(wait=False)
+
+    def _run_steps_for(self, key: Hashable) -> None:
+        while True:
+            with self._lock:
+                step, future, new_deposition = self._steps[key][0]
+                if new_deposition:
+                    self._failures.pop(key, None)
+                earlier_failure = self._failures.get(key)
+            if future.set_running_or_notify_cancel():
+                if earlier_failure is not None:
+                    ISPYB_LOGGER.error(
+                        "Skipping queued ISPyB deposition as an earlier one failed: "
+                        f"{earlier_failure}"
+                    )
+                    skipped = ISPyBDepositionNotMade(
+                        f"Skipped as an earlier deposition failed: {earlier_failure}"
+                    )
+                    skipped.__cause__ = earlier_failure
+                    future.set_exception(skipped)
+                else:
+                    try:
+                        future.set_result(step())
+                    except BaseException as e:
+                        ISPYB_LOGGER.exception(f"Queued ISPyB deposition failed: {e}")
+                        with self._lock:
+                            self._failures[key] = e
+                        future.set_exception(e)
+            with self._lock:
+                steps = self._steps[key]
+                steps.popleft()
+                self._pending -= 1
+                if self._slots:
+                    self._slots.release()
+                if self._pending == 0:
+                    self._all_done.notify_all()
+                if not steps:
+                    del self._steps[key]
+                    return
+
+
+_queue = DepositionQueue()
+
+
+def get_deposition_queue() -> DepositionQueue:
+    return _queue
+
+
+def enable_deposition_queue(max_workers: int, max_pending: int) -> None:
+    """Run all subsequently queued ISPyB depositions in this process on a pool of
+    max_workers threads. A max_workers of 0 runs them synchronously."""
+    global _queue
+    shutdown_deposition_queue()
+    _queue = DepositionQueue(max_workers, max_pending)
+    ISPYB_LOGGER.info(
+        f"ISPyB deposition queue using {max_workers} workers and at most "
+        f"{max_pending} pending depositions"
+    )
+
+
+def shutdown_deposition_queue(timeout: float | None = None) -> None:
+    global _queue
+    queue, _queue = _queue, DepositionQueue()
+    queue.shutdown(timeout)
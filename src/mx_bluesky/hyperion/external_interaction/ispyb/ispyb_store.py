@@ -1,16 +1,20 @@
 from __future__ import annotations
 
-from collections.abc import Sequence
+import threading
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
 from dataclasses import asdict
 from typing import TYPE_CHECKING
 
 import ispyb
-import ispyb.sqlalchemy
 from ispyb.connector.mysqlsp.main import ISPyBMySQLSPConnector as Connector
 from ispyb.sp.mxacquisition import MXAcquisition
 from ispyb.strictordereddict import StrictOrderedDict
 from pydantic import BaseModel
 
+from mx_bluesky.hyperion.external_interaction.ispyb.connection_pool import (
+    ispyb_connection,
+)
 from mx_bluesky.hyperion.external_interaction.ispyb.data_model import (
     DataCollectionGridInfo,
     DataCollectionGroupInfo,
@@ -37,10 +41,68 @@ class IspybIds(BaseModel):
     grid_ids: tuple[int, ...] = ()
 
 
+@contextmanager
+def _transaction(conn: Connector) -> Iterator[None]:
+    """Make all writes on conn inside the block a single transaction. The connector
+    otherwise autocommits every stored procedure call individually.
+
+    The connector also silently reconnects, in autocommit mode, before any call that
+    finds the connection dropped, which would commit the rest of the block write by
+    write. That is turned off for the block, and if the connection has changed anyway
+    by the end an ispyb.ConnectionError is raised rather than committing, so that the
+    connection is discarded and the whole block can be run again."""
+    mysql_conn = getattr(conn, "conn", None)
+    if mysql_conn is None:
+        yield
+        return
+    connection_id = mysql_conn.connection_id
+    reconnect_attempts = conn.reconn_attempts
+    # With no attempts the connector's ping doesn't reconnect, and the next write
+    # fails on the dropped connection
+    conn.reconn_attempts = 0
+    mysql_conn.start_transaction()
+    try:
+        yield
+        if mysql_conn.connection_id != connection_id:
+            raise ispyb.ConnectionError(
+                "ISPyB connection was lost part way through a transaction"
+            )
+    except BaseException:
+        try:
+            mysql_conn.rollback()
+        except Exception as e:
+            ISPYB_LOGGER.warning(f"Failed to roll back ISPyB transaction: {e}")
+        raise
+    else:
+        mysql_conn.commit()
+    finally:
+        conn.reconn_attempts = reconnect_attempts
+
+
 class StoreInIspyb:
     def __init__(self, ispyb_config: str) -> None:
         self.ISPYB_CONFIG_PATH: str = ispyb_config
         self._data_collection_group_id: int | None
+        # The connection of the batch open on each thread, if there is one
+        self._batch = threading.local()
+
+    @contextmanager
+    def batch(self) -> Iterator[Connector]:
+        """Groups every ISPyB write made through this store inside the block onto one
+        connection and one transaction, which is committed when the block exits and
+        rolled back if it raises. Batches may be nested, inner batches join the
+        outermost one on the same thread."""
+        if (batch_conn := getattr(self._batch, "conn", None)) is not None:
+            yield batch_conn
+            return
+        with ispyb_connection(self.ISPYB_CONFIG_PATH) as conn:
+            assert conn is not None, "Failed to connect to ISPyB"
+            self._batch.conn = conn
+            try:
+                with _transaction(conn):
+                    yield conn
+            finally:
+                self._batch.conn = None
 
     def begin_deposition(
         self,
@@ -76,8 +138,7 @@ class StoreInIspyb:
         data_collection_group_info: DataCollectionGroupInfo | None,
         scan_data_infos,
     ) -> IspybIds:
-        with ispyb.open(self.ISPYB_CONFIG_PATH) as conn:
-            assert conn is not None, "Failed to connect to ISPyB"
+        with self.batch() as conn:
             if data_collection_group_info:
                 ispyb_ids.data_collection_group_id = (
                     self._store_data_collection_group_table(
@@ -123,28 +184,28 @@ class StoreInIspyb:
             ispyb_ids.data_collection_group_id is not None
         ), "Cannot end ISPyB deposition without data collection group ID"
 
-        for id_ in ispyb_ids.data_collection_ids:
-            ISPYB_LOGGER.info(
-                f"End ispyb deposition with status '{success}' and reason '{reason}'."
-            )
-            if success == "fail" or success == "abort":
-                run_status = "DataCollection Unsuccessful"
-            else:
-                run_status = "DataCollection Successful"
-            current_time = get_current_time_string()
-            self._update_scan_with_end_time_and_status(
-                current_time,
-                run_status,
-                reason,
-                id_,
-                ispyb_ids.data_collection_group_id,
-            )
+        with self.batch():
+            for id_ in ispyb_ids.data_collection_ids:
+                ISPYB_LOGGER.info(
+                    f"End ispyb deposition with status '{success}' and reason '{reason}'."
+                )
+                if success == "fail" or success == "abort":
+                    run_status = "DataCollection Unsuccessful"
+                else:
+                    run_status = "DataCollection Successful"
+                current_time = get_current_time_string()
+                self._update_scan_with_end_time_and_status(
+                    current_time,
+                    run_status,
+                    reason,
+                    id_,
+                    ispyb_ids.data_collection_group_id,
+                )
 
     def append_to_comment(
         self, data_collection_id: int, comment: str, delimiter: str = " "
     ) -> None:
-        with ispyb.open(self.ISPYB_CONFIG_PATH) as conn:
-            assert conn is not None, "Failed to connect to ISPyB!"
+        with self.batch() as conn:
             mx_acquisition: MXAcquisition = conn.mx_acquisition
             mx_acquisition.update_data_collection_append_comments(
                 data_collection_id, comment, delimiter
@@ -161,9 +222,7 @@ class StoreInIspyb:
         if reason is not None and reason != "":
             self.append_to_comment(data_collection_id, f"{run_status} reason: {reason}")
 
-        with ispyb.open(self.ISPYB_CONFIG_PATH) as conn:
-            assert conn is not None, "Failed to connect to ISPyB!"
-
+        with self.batch() as conn:
             mx_acquisition: MXAcquisition = conn.mx_acquisition
 
             params = mx_acquisition.get_data_collection_params()
@@ -2,22 +2,98 @@ from __future__ import annotations
 
 import datetime
 import os
+import threading
+import time
+from collections import OrderedDict
 
 from ispyb import NoResult
 from ispyb.connector.mysqlsp.main import ISPyBMySQLSPConnector as Connector
 from ispyb.sp.core import Core
 
+from mx_bluesky.hyperion.log import ISPYB_LOGGER
 from mx_bluesky.hyperion.parameters.constants import CONST
+from mx_bluesky.hyperion.tracing import METER
 
 
 def get_ispyb_config():
     return os.environ.get("ISPYB_CONFIG_PATH", CONST.SIM.ISPYB_CONFIG)
 
 
+def get_ispyb_connection_pool_size() -> int:
+    return int(
+        os.environ.get("ISPYB_CONNECTION_POOL_SIZE", CONST.ISPYB_CONNECTION_POOL_SIZE)
+    )
+
+
+class SessionIdCache:
+    """A thread safe LRU cache of visit string to ISPyB session ID, where each entry
+    expires ttl_s after it was looked up. A visit's session ID doesn't change during a
+    shift so this saves a database round trip on most depositions.
+
+    Failed lookups are never cached, and a NoResult evicts any entry for that visit so
+    that a visit removed from the database isn't kept alive by the cache."""
+
+    def __init__(self, ttl_s: float, max_size: int) -> None:
+        self.ttl_s = ttl_s
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[int, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = METER.create_counter(
+            "ispyb.session_id_cache.hits",
+            description="Visit to session ID lookups answered from the cache",
+        )
+        self._misses = METER.create_counter(
+            "ispyb.session_id_cache.misses",
+            description="Visit to session ID lookups that went to ISPyB",
+        )
+
+    def get(self, conn: Connector, visit: str) -> int:
+        if (session_id := self._cached(visit)) is not None:
+            self._hits.add(1)
+            return session_id
+        self._misses.add(1)
+        try:
+            core: Core = conn.core
+            session_id = core.retrieve_visit_id(visit)
+        except NoResult:
+            self.invalidate(visit)
+            raise
+        with self._lock:
+            self._entries[visit] = (session_id, time.monotonic() + self.ttl_s)
+            self._entries.move_to_end(visit)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return session_id
+
+    def invalidate(self, visit: str | None = None) -> None:
+        """Forget the session ID for visit, or for every visit if visit is None."""
+        with self._lock:
+            if visit is None:
+                self._entries.clear()
+            elif self._entries.pop(visit, None) is not None:
+                ISPYB_LOGGER.info(f"Invalidated cached session ID for visit {visit}")
+
+    def _cached(self, visit: str) -> int | None:
+        with self._lock:
+            entry = self._entries.get(visit)
+            if entry is None:
+                return None
+            session_id, expiry = entry
+            if time.monotonic() >= expiry:
+                del self._entries[visit]
+                return None
+            self._entries.move_to_end(visit)
+            return session_id
+
+
+SESSION_ID_CACHE = SessionIdCache(
+    CONST.ISPYB_SESSION_ID_CACHE_TTL_S, CONST.ISPYB_SESSION_ID_CACHE_SIZE
+)
+
+
 def get_session_id_from_visit(conn: Connector, visit: str):
     try:
-        core: Core = conn.core
-        return core.retrieve_visit_id(visit)
+        return SESSION_ID_CACHE.get(conn, visit)
     except NoResult as e:
         raise NoResult(f"No session ID found in ispyb for visit {visit}") from e
 
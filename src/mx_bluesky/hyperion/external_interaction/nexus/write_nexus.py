@@ -6,6 +6,7 @@ gridscan.
 from __future__ import annotations
 
 import math
+import shutil
 from pathlib import Path
 
 from dodal.devices.zebra import RotationDirection
@@ -86,24 +87,30 @@ class NexusWriter:
 
         vds_shape = self.data_shape
 
-        for filename in [self.nexus_file, self.master_file]:
-            NXmx_Writer = NXmxFileWriter(
-                filename,
-                self.goniometer,
-                self.detector,
-                self.source,
-                self.beam,
-                self.attenuator,
-                self.full_num_of_images,
-            )
-            NXmx_Writer.write(
-                image_filename=f"{self.data_filename}",
-                start_time=start_time,
-                est_end_time=est_end_time,
-            )
-            NXmx_Writer.write_vds(
-                vds_offset=self.start_index, vds_shape=vds_shape, vds_dtype=bit_depth
+        # The .nxs and _master.h5 files have identical contents, and nothing in them
+        # depends on their own filename, so write one with nexgen and copy it
+        NXmx_Writer = NXmxFileWriter(
+            self.nexus_file,
+            self.goniometer,
+            self.detector,
+            self.source,
+            self.beam,
+            self.attenuator,
+            self.full_num_of_images,
+        )
+        NXmx_Writer.write(
+            image_filename=f"{self.data_filename}",
+            start_time=start_time,
+            est_end_time=est_end_time,
+        )
+        NXmx_Writer.write_vds(
+            vds_offset=self.start_index, vds_shape=vds_shape, vds_dtype=bit_depth
+        )
+        if self.master_file.exists():
+            raise FileExistsError(
+                f"NeXus master file {self.master_file} already exists"
             )
+        shutil.copyfile(self.nexus_file, self.master_file)
 
     def get_image_datafiles(self, max_images_per_file=1000):
         return [
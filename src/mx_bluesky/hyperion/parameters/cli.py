@@ -11,6 +11,7 @@ class HyperionArgs:
     use_external_callbacks: bool = False
     verbose_event_logging: bool = False
     skip_startup_connection: bool = False
+    background_device_connection: bool = False
 
 
 def _add_callback_relevant_args(parser: argparse.ArgumentParser) -> None:
@@ -35,6 +36,7 @@ def parse_cli_args() -> HyperionArgs:
     the fields: (verbose_event_logging: bool,
                  dev_mode: bool,
                  skip_startup_connection: bool,
+                 background_device_connection: bool,
                  external_callbacks: bool)"""
     parser = argparse.ArgumentParser()
     _add_callback_relevant_args(parser)
@@ -48,6 +50,12 @@ def parse_cli_args() -> HyperionArgs:
         action="store_true",
         help="Skip connecting to EPICS PVs on startup",
     )
+    parser.add_argument(
+        "--background-device-connection",
+        action="store_true",
+        help="Connect to devices in the background after startup, each plan waits for "
+        "only the devices it uses",
+    )
     parser.add_argument(
         "--external-callbacks",
         action="store_true",
@@ -64,5 +72,6 @@ def parse_cli_args() -> HyperionArgs:
         verbose_event_logging=args.verbose_event_logging or False,
         dev_mode=args.dev or False,
         skip_startup_connection=args.skip_startup_connection or False,
+        background_device_connection=args.background_device_connection or False,
         use_external_callbacks=args.external_callbacks or False,
     )
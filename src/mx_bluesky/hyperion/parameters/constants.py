@@ -43,6 +43,24 @@ class PlanGroupCheckpointConstants:
     ROTATION_READY_FOR_DC = "rotation_ready_for_data_collection"
     MOVE_GONIO_TO_START = "move_gonio_to_start"
     READY_FOR_OAV = "ready_for_oav"
+    GRID_DETECTION_OMEGA = "grid_detection_omega"
+    GRID_SNAPSHOT = "grid_snapshot"
+
+
+@dataclass(frozen=True)
+class SamplePhaseConstants:
+    # Phases of handling a sample that are timed for the per-sample timing summary
+    ROBOT_LOAD = "robot_load"
+    PIN_TIP_CENTRING = "pin_tip_centring"
+    GRID_DETECTION = "oav_grid_detection"
+    EIGER_ARMING = "eiger_arming"
+    MOVE_GONIO_TO_START = "move_gonio_to_start"
+    TOPUP_WAIT = "topup_wait"
+    FGS = "fgs"
+    ZOCALO_WAIT = "zocalo_wait"
+    APERTURE_CHANGE = "aperture_change"
+    ROTATION = "rotation"
+    CLEANUP = "cleanup"
 
 
 @dataclass(frozen=True)
@@ -59,7 +77,15 @@ class DocDescriptorNames:
 
 @dataclass(frozen=True)
 class HardwareConstants:
-    OAV_REFRESH_DELAY = 0.3
+    # New OAV frames to wait for after a move before using the image, the first may
+    # have been exposed while still moving
+    OAV_REFRESH_FRAMES = 2
+    OAV_REFRESH_TIMEOUT = 1.0
+    # Time for an OAV snapshot to grab and save its unmodified image
+    OAV_SNAPSHOT_IMAGE_TIMEOUT = 30.0
+    # Time for the Eiger filewriters to close their files once the gridscan completes,
+    # the same as the Eiger waits for them when unstaging
+    EIGER_FILES_CLOSED_TIMEOUT = 30.0
     PANDA_FGS_RUN_UP_DEFAULT = 0.17
     CRYOJET_MARGIN_MM = 0.2
 
@@ -75,6 +101,7 @@ class GridscanParamConstants:
     EXPOSURE_TIME_S = 0.004
     USE_ROI = True
     BOX_WIDTH_UM = 20.0
+    EDGE_OUTLIER_PERCENTILE = 0.0
     OMEGA_1 = 0.0
     OMEGA_2 = 90.0
 
@@ -124,6 +151,7 @@ class HyperionConstants:
     I03 = I03Constants()
     PARAM = ExperimentParamConstants()
     PLAN = PlanNameConstants()
+    PHASE = SamplePhaseConstants()
     WAIT = PlanGroupCheckpointConstants()
     SIM = SimConstants()
     TRIGGER = TriggerConstants()
@@ -135,6 +163,13 @@ class HyperionConstants:
         else "https://daq-config.diamond.ac.uk/api"
     )
     GRAYLOG_PORT = 12232
+    ISPYB_CONNECTION_POOL_SIZE = 2
+    ISPYB_DEPOSITION_WORKERS = 2
+    ISPYB_DEPOSITION_MAX_PENDING = 200
+    ISPYB_SESSION_ID_CACHE_TTL_S = 3600
+    ISPYB_SESSION_ID_CACHE_SIZE = 32
+    SAMPLE_TIMING_HISTORY = 1000
+    EXPERIMENT_QUEUE_SIZE = 20
     PARAMETER_SCHEMA_DIRECTORY = "src/hyperion/parameters/schemas/"
     ZOCALO_ENV = "dev_artemis" if TEST_MODE else "artemis"
 
@@ -144,6 +179,7 @@ CONST = HyperionConstants()
 
 class Actions(Enum):
     START = "start"
+    ENQUEUE = "enqueue"
     STOP = "stop"
     SHUTDOWN = "shutdown"
     STATUS = "status"
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 
+import numpy as np
 from dodal.devices.aperturescatterguard import ApertureValue
 from dodal.devices.detector import (
     DetectorParams,
@@ -11,7 +12,7 @@ from dodal.devices.fast_grid_scan import (
     ZebraGridScanParams,
 )
 from pydantic import Field, PrivateAttr
-from scanspec.core import Path as ScanPath
+from scanspec.core import AxesPoints
 from scanspec.specs import Line, Static
 
 from mx_bluesky.hyperion.parameters.components import (
@@ -32,6 +33,9 @@ class GridCommon(
     DiffractionExperimentWithSample, OptionalGonioAngleStarts, WithOavCentring
 ):
     grid_width_um: float = Field(default=CONST.PARAM.GRIDSCAN.WIDTH_UM)
+    edge_outlier_percentile: float = Field(
+        default=CONST.PARAM.GRIDSCAN.EDGE_OUTLIER_PERCENTILE, ge=0, lt=50
+    )
     exposure_time_s: float = Field(default=CONST.PARAM.GRIDSCAN.EXPOSURE_TIME_S)
     use_roi_mode: bool = Field(default=CONST.PARAM.GRIDSCAN.USE_ROI)
     panda_runup_distance_mm: float = Field(
@@ -120,6 +124,9 @@ class ThreeDGridScan(SpecifiedGridScan, SplitScan, WithOptionalEnergyChange):
     y_steps: int = Field(gt=0)
     z_steps: int = Field(gt=0)
     _set_stub_offsets: bool = PrivateAttr(default_factory=lambda: False)
+    _grid_points_cache: tuple[tuple, tuple[AxesPoints, AxesPoints]] | None = (
+        PrivateAttr(default=None)
+    )
 
     @property
     def FGS_params(self) -> ZebraGridScanParams:
@@ -187,10 +194,7 @@ class ThreeDGridScan(SpecifiedGridScan, SplitScan, WithOptionalEnergyChange):
     @property
     def scan_indices(self):
         """The first index of each gridscan, useful for writing nexus files/VDS"""
-        return [
-            0,
-            len(ScanPath(self.grid_1_spec.calculate()).consume().midpoints["sam_x"]),
-        ]
+        return [0, self.x_steps * self.y_steps]
 
     @property
     def scan_spec(self):
@@ -201,21 +205,76 @@ class ThreeDGridScan(SpecifiedGridScan, SplitScan, WithOptionalEnergyChange):
     @property
     def scan_points(self):
         """A list of all the points in the scan_spec."""
-        return ScanPath(self.scan_spec.calculate()).consume().midpoints
+        first_grid, second_grid = self._grid_points()
+        return {
+            axis: np.concatenate([points, second_grid[axis]])
+            for axis, points in first_grid.items()
+        }
 
     @property
     def scan_points_first_grid(self):
         """A list of all the points in the first grid scan."""
-        return ScanPath(self.grid_1_spec.calculate()).consume().midpoints
+        return self._grid_points()[0]
 
     @property
     def scan_points_second_grid(self):
         """A list of all the points in the second grid scan."""
-        return ScanPath(self.grid_2_spec.calculate()).consume().midpoints
+        return self._grid_points()[1]
 
     @property
     def num_images(self) -> int:
-        return len(self.scan_points["sam_x"])
+        return self.x_steps * (self.y_steps + self.z_steps)
+
+    def _grid_points(self) -> tuple[AxesPoints, AxesPoints]:
+        """The midpoints of grid_1_spec and grid_2_spec, calculated directly rather than
+        through scanspec and cached until one of the grid's parameters changes. The
+        returned arrays are read only as they are shared between callers."""
+        key = (
+            self.x_start_um,
+            self.x_step_size_um,
+            self.x_steps,
+            self.y_start_um,
+            self.y_step_size_um,
+            self.y_steps,
+            self.z_start_um,
+            self.y2_start_um,
+            self.z2_start_um,
+            self.z_step_size_um,
+            self.z_steps,
+        )
+        if self._grid_points_cache is None or self._grid_points_cache[0] != key:
+            x = _line_midpoints(self.x_start_um, self.x_step_size_um, self.x_steps)
+            y = _line_midpoints(self.y_start_um, self.y_step_size_um, self.y_steps)
+            z = _line_midpoints(self.z2_start_um, self.z_step_size_um, self.z_steps)
+            first_grid = {
+                "sam_y": np.repeat(y, self.x_steps),
+                "sam_z": np.full(self.x_steps * self.y_steps, self.z_start_um),
+                "sam_x": _snaked(x, self.y_steps),
+            }
+            second_grid = {
+                "sam_z": np.repeat(z, self.x_steps),
+                "sam_y": np.full(self.x_steps * self.z_steps, self.y2_start_um),
+                "sam_x": _snaked(x, self.z_steps),
+            }
+            for points in (*first_grid.values(), *second_grid.values()):
+                points.flags.writeable = False
+            self._grid_points_cache = (key, (first_grid, second_grid))
+        return self._grid_points_cache[1]
+
+
+def _line_midpoints(start: float, step_size: float, num: int) -> np.ndarray:
+    """The midpoints of a scanspec Line of num points from start in steps of step_size,
+    using the same arithmetic as scanspec so the values are identical."""
+    stop = start + step_size * (num - 1)
+    step = stop - start if num == 1 else (stop - start) / (num - 1)
+    return np.linspace(0.5, num - 0.5, num) * step + (start - step / 2)
+
+
+def _snaked(row: np.ndarray, num_rows: int) -> np.ndarray:
+    """row repeated num_rows times, with every other repeat reversed."""
+    rows = np.tile(row, (num_rows, 1))
+    rows[1::2] = rows[1::2, ::-1]
+    return rows.ravel()
 
 
 class OddYStepsException(Exception): ...
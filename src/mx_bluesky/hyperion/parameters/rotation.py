@@ -92,8 +92,8 @@ class RotationScan(WithScan, RotationScanPerSweep, RotationExperiment):
         return self._detector_params(self.omega_start_deg)
 
     @property
-    def scan_points(self) -> AxesPoints:
-        scan_spec = Line(
+    def scan_spec(self) -> Line:
+        return Line(
             axis="omega",
             start=self.omega_start_deg,
             stop=(
@@ -102,7 +102,10 @@ class RotationScan(WithScan, RotationScanPerSweep, RotationExperiment):
             ),
             num=self.num_images,
         )
-        scan_path = ScanPath(scan_spec.calculate())
+
+    @property
+    def scan_points(self) -> AxesPoints:
+        scan_path = ScanPath(self.scan_spec.calculate())
         return scan_path.consume().midpoints
 
     @property
@@ -26,3 +26,4 @@ def setup_tracing():
 
 
 TRACER = trace.get_tracer(__name__)
+METER = metrics.get_meter(__name__)
@@ -1,4 +1,5 @@
 import dataclasses
+from functools import cache
 from typing import Any, ClassVar, Protocol, TypeVar, get_type_hints
 
 from blueapi.core import BlueskyContext
@@ -19,6 +20,10 @@ class _IsDataclass(Protocol):
 
 DT = TypeVar("DT", bound=_IsDataclass)
 
+# The last composite made of each type, reused while the context still holds the same
+# devices so that they aren't looked up and checked again for every plan started
+_composites: dict[type, Any] = {}
+
 
 def find_device_in_context(
     context: BlueskyContext,
@@ -44,30 +49,47 @@ def find_device_in_context(
     return device
 
 
+@cache
+def _composite_fields(dc: type[_IsDataclass]) -> tuple[tuple[str, type], ...]:
+    """The names and expected device types of the fields of a composite dataclass"""
+    dc_type_hints: dict[str, Any] = get_type_hints(dc)
+    return tuple(
+        (field.name, dc_type_hints.get(field.name, Device))
+        for field in dataclasses.fields(dc)
+    )
+
+
 def device_composite_from_context(context: BlueskyContext, dc: type[DT]) -> DT:
     """
     Initializes all of the devices referenced in a given dataclass from a provided
     context, checking that the types of devices returned by the context are compatible
     with the type annotations of the dataclass.
 
+    The composite is reused for as long as the context gives the same devices for all
+    of its fields, so a new one is made if the devices are recreated on reconnection.
+
     Note that if the context was not created with `wait_for_connection=True` devices may
     still be unconnected.
     """
+    fields = _composite_fields(dc)
+    cached = _composites.get(dc)
+    if cached is not None and all(
+        context.find_device(name) is getattr(cached, name) for name, _ in fields
+    ):
+        return cached
+
     LOGGER.debug(
         f"Attempting to initialize devices referenced in dataclass {dc} from blueapi context"
     )
 
-    devices: dict[str, Any] = {}
-    dc_type_hints: dict[str, Any] = get_type_hints(dc)
-
-    for field in dataclasses.fields(dc):
-        device = find_device_in_context(
-            context, field.name, expected_type=dc_type_hints.get(field.name, Device)
-        )
-
-        devices[field.name] = device
+    devices: dict[str, Any] = {
+        name: find_device_in_context(context, name, expected_type=expected_type)
+        for name, expected_type in fields
+    }
 
-    return dc(**devices)
+    composite = dc(**devices)
+    _composites[dc] = composite
+    return composite
 
 
 def setup_context(wait_for_connection: bool = True) -> BlueskyContext:
@@ -0,0 +1,174 @@
+import dataclasses
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from enum import Enum
+from typing import Any
+
+from dodal.common.beamlines.beamline_utils import (
+    DEFAULT_CONNECTION_TIMEOUT,
+    wait_for_connection,
+)
+from dodal.utils import AnyDevice
+
+from mx_bluesky.hyperion.log import LOGGER
+
+
+class ConnectionState(Enum):
+    CONNECTING = "Connecting"
+    CONNECTED = "Connected"
+    FAILED = "Failed"
+
+
+@dataclasses.dataclass
+class DeviceConnection:
+    state: ConnectionState = ConnectionState.CONNECTING
+    time_s: float | None = None
+    error: Exception | None = None
+
+
+class DeviceConnector:
+    """Connects devices in the background, all at the same time, so that Hyperion can
+    take requests without waiting for every device to connect first. A plan then only
+    waits for the devices it uses, see wait_for_composite.
+
+    A device that fails to connect is tried again when a plan next needs it, so an IOC
+    that was down when Hyperion started only stops the plans that need it.
+    """
+
+    def __init__(
+        self,
+        devices: dict[str, AnyDevice],
+        timeout: float = DEFAULT_CONNECTION_TIMEOUT,
+    ) -> None:
+        self._devices = dict(devices)
+        self._timeout = timeout
+        self._connections = {name: DeviceConnection() for name in self._devices}
+        self._futures: dict[str, Future[DeviceConnection]] = {}
+        self._tried_again: set[str] = set()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(len(self._devices), 1),
+            thread_name_prefix="device_connection",
+        )
+        self._lock = threading.Lock()
+        self._start_time = 0.0
+        self._startup_time_s: float | None = None
+        self._left_to_connect_on_startup = len(self._devices)
+
+    def start(self):
+        LOGGER.info(f"Connecting to {len(self._devices)} devices in the background")
+        self._start_time = time.perf_counter()
+        if not self._devices:
+            self._startup_time_s = 0
+        with self._lock:
+            self._futures = {
+                name: self._executor.submit(self._connect, name, startup=True)
+                for name in self._devices
+            }
+
+    def progress(self) -> dict[str, Any]:
+        """Counts of the devices in each connection state, the state of each device and
+        the time taken to connect on startup so far, or in total once every device has
+        finished connecting or failed"""
+        with self._lock:
+            states = {
+                name: connection.state.value
+                for name, connection in self._connections.items()
+            }
+            startup_time_s = self._startup_time_s
+        if startup_time_s is None:
+            startup_time_s = time.perf_counter() - self._start_time
+        return {
+            **{
+                state.value: list(states.values()).count(state.value)
+                for state in ConnectionState
+            },
+            "startup_time_s": startup_time_s,
+            "devices": states,
+        }
+
+    def wait_for(self, names: Iterable[str]):
+        """Waits for the named devices to finish connecting, trying any that failed
+        again. A device is only tried again once however many plans are waiting for it,
+        and not straight after another plan's attempt that was already under way.
+        Raises a ConnectionError if any of them still can't be connected."""
+        failed: dict[str, Exception | None] = {}
+        for name in names:
+            with self._lock:
+                future = self._futures.get(name)
+                if future is None:
+                    continue
+                may_try_again = future.done() or name not in self._tried_again
+            connection = future.result()
+            if connection.state == ConnectionState.FAILED and may_try_again:
+                with self._lock:
+                    # Another plan may have tried again already, or still be trying
+                    future = self._futures[name]
+                    if (
+                        future.done()
+                        and future.result().state == ConnectionState.FAILED
+                    ):
+                        LOGGER.info(f"Trying to connect to {name} again")
+                        self._connections[name] = DeviceConnection()
+                        future = self._executor.submit(self._connect, name)
+                        self._futures[name] = future
+                        self._tried_again.add(name)
+                connection = future.result()
+            if connection.error is not None:
+                failed[name] = connection.error
+        if failed:
+            raise ConnectionError(f"Failed to connect to devices: {failed}")
+
+    def wait_for_composite(self, composite: Any):
+        """Waits for the devices in a device composite dataclass, whose fields are named
+        after the devices, to finish connecting"""
+        if dataclasses.is_dataclass(composite):
+            self.wait_for(field.name for field in dataclasses.fields(composite))
+
+    def _connect(self, name: str, startup: bool = False) -> DeviceConnection:
+        start = time.perf_counter()
+        try:
+            wait_for_connection(self._devices[name], timeout=self._timeout)
+            connection = DeviceConnection(
+                ConnectionState.CONNECTED, time.perf_counter() - start
+            )
+        except Exception as e:
+            LOGGER.warning(f"Failed to connect to {name}: {e!r}")
+            connection = DeviceConnection(
+                ConnectionState.FAILED, time.perf_counter() - start, e
+            )
+        with self._lock:
+            self._connections[name] = connection
+            if startup:
+                self._left_to_connect_on_startup -= 1
+                if self._left_to_connect_on_startup == 0:
+                    self._startup_time_s = time.perf_counter() - self._start_time
+                    self._log_startup_report()
+        return connection
+
+    def _log_startup_report(self):
+        """Must be called holding the lock"""
+        by_time = sorted(
+            self._connections.items(),
+            key=lambda item: item[1].time_s or 0,
+            reverse=True,
+        )
+        connected = [
+            name
+            for name, connection in by_time
+            if connection.state == ConnectionState.CONNECTED
+        ]
+        failed = [
+            name
+            for name, connection in by_time
+            if connection.state == ConnectionState.FAILED
+        ]
+        slowest = ", ".join(
+            f"{name} {connection.time_s or 0:.2f}s" for name, connection in by_time[:5]
+        )
+        LOGGER.info(
+            f"Connected to {len(connected)} of {len(self._connections)} devices in "
+            f"{self._startup_time_s:.2f}s, slowest: {slowest}"
+            + (f", failed to connect to {failed}" if failed else "")
+        )
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import dataclasses
+import time
+from collections import defaultdict, deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+
+import numpy as np
+from blueapi.core import MsgGenerator
+from bluesky.utils import RequestAbort
+from ophyd.status import StatusBase
+
+from mx_bluesky.hyperion.log import LOGGER
+from mx_bluesky.hyperion.parameters.constants import CONST
+from mx_bluesky.hyperion.tracing import METER
+
+PHASE_DURATION = METER.create_histogram(
+    "hyperion.sample.phase_duration",
+    unit="s",
+    description="Wall-clock time spent in each phase of handling a sample",
+)
+SAMPLE_DURATION = METER.create_histogram(
+    "hyperion.sample.duration",
+    unit="s",
+    description="Wall-clock time taken to handle a sample, from start to finish",
+)
+BACKGROUND_DURATION = METER.create_histogram(
+    "hyperion.sample.background_duration",
+    unit="s",
+    description="Wall-clock time taken by work started in the background while "
+    "handling a sample",
+)
+
+
+@dataclasses.dataclass
+class SampleTiming:
+    """Wall-clock time spent in each phase of handling one sample, as kept by
+    SampleTimer.
+
+    background holds the time taken by work left to finish while other phases ran,
+    such as arming the Eiger during the robot load. The time it saved is its background
+    time less any time spent waiting for it in the phase of the same name."""
+
+    plan_name: str
+    sample_id: int | None
+    start_time: float
+    total_s: float = 0
+    succeeded: bool = False
+    phases: dict[str, float] = dataclasses.field(
+        default_factory=lambda: defaultdict(float)
+    )
+    background: dict[str, float] = dataclasses.field(
+        default_factory=lambda: defaultdict(float)
+    )
+
+
+TOTAL = "total"
+DEFAULT_PERCENTILES = (50, 90, 99)
+
+# The SampleTimer timing the plans run in the current context, see SampleTimer.active
+_active_timer: ContextVar[SampleTimer | None] = ContextVar(
+    "active_sample_timer", default=None
+)
+
+
+class SampleTimer:
+    """Times the samples handled by the plans run while it is active, and keeps the
+    summaries of the most recent so that they can be queried over the REST API, e.g. to
+    look at percentiles over a shift. Only one sample is handled at a time, which is
+    current while it is being timed."""
+
+    def __init__(self, max_samples: int = CONST.SAMPLE_TIMING_HISTORY) -> None:
+        self.current: SampleTiming | None = None
+        self._samples: deque[dict] = deque(maxlen=max_samples)
+        self._lock = Lock()
+
+    @contextmanager
+    def active(self) -> Iterator[None]:
+        """Times the samples of the plans run by the RunEngine in the body"""
+        token = _active_timer.set(self)
+        try:
+            yield
+        finally:
+            _active_timer.reset(token)
+
+    def close(self, timing: SampleTiming):
+        """Stops timing, and so adding background time to, the current sample"""
+        with self._lock:
+            self.current = None
+            timing.phases = dict(timing.phases)
+            timing.background = dict(timing.background)
+
+    def add_background(self, sample: SampleTiming, phase: str, duration: float) -> bool:
+        """Adds duration to the background time of phase for sample, unless it has
+        already been closed. Returns whether it was added. Safe to call from any
+        thread, such as that of a status callback."""
+        with self._lock:
+            if sample is not self.current:
+                return False
+            sample.background[phase] += duration
+            return True
+
+    def add(self, timing: SampleTiming):
+        with self._lock:
+            self._samples.append(dataclasses.asdict(timing))
+
+    def samples(self, since: float | None = None) -> list[dict]:
+        """The timing summaries of samples started at or after the since timestamp,
+        oldest first."""
+        with self._lock:
+            samples = list(self._samples)
+        if since is None:
+            return samples
+        return [sample for sample in samples if sample["start_time"] >= since]
+
+    def percentiles(
+        self,
+        since: float | None = None,
+        percentiles: tuple[float, ...] = DEFAULT_PERCENTILES,
+    ) -> dict[str, dict[str, float]]:
+        """Percentiles of the time spent in each phase, and in total, over the samples
+        started at or after since that succeeded. A sample that never reached a phase
+        isn't counted for that phase."""
+        durations: dict[str, list[float]] = {TOTAL: []}
+        for sample in self.samples(since):
+            if not sample["succeeded"]:
+                continue
+            durations[TOTAL].append(sample["total_s"])
+            for phase, duration in sample["phases"].items():
+                durations.setdefault(phase, []).append(duration)
+        return {
+            phase: {
+                f"p{p:g}": float(value)
+                for p, value in zip(
+                    percentiles, np.percentile(values, percentiles), strict=True
+                )
+            }
+            for phase, values in durations.items()
+            if values
+        }
+
+
+def _current_sample() -> SampleTiming | None:
+    timer = _active_timer.get()
+    return timer.current if timer is not None else None
+
+
+@contextmanager
+def timed_phase(phase: str) -> Iterator[None]:
+    """Records the wall-clock time spent in the body against phase for the sample
+    currently being timed. Use around the yield from of the plan making up the phase.
+    Time spent in the same phase more than once for a sample is added together."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        LOGGER.info(f"{phase} took {duration:.2f}s")
+        PHASE_DURATION.record(duration, {"phase": phase})
+        if (sample := _current_sample()) is not None:
+            sample.phases[phase] += duration
+
+
+def time_in_background(status: StatusBase | None, phase: str):
+    """Records the wall-clock time from now until status finishes against phase in the
+    background timings for the sample currently being timed. Use on the status of work
+    which is started and then left to run alongside other phases.
+
+    If the work fails this is logged straight away, rather than only once the plan
+    waits for it. If it finishes after the sample has, this is logged instead of
+    being recorded."""
+    if status is None:
+        return
+    timer = _active_timer.get()
+    sample = timer.current if timer is not None else None
+    start = time.perf_counter()
+
+    def record(_):
+        duration = time.perf_counter() - start
+        if not status.success:
+            LOGGER.error(
+                f"{phase} failed in the background after {duration:.2f}s: "
+                f"{status.exception()}"
+            )
+            return
+        LOGGER.info(f"{phase} finished in the background after {duration:.2f}s")
+        BACKGROUND_DURATION.record(duration, {"phase": phase})
+        if (
+            timer is not None
+            and sample is not None
+            and not timer.add_background(sample, phase, duration)
+        ):
+            LOGGER.warning(
+                f"{phase} finished in the background after its sample, so isn't "
+                "included in the sample's timing"
+            )
+
+    status.add_callback(record)
+
+
+def sample_timing_wrapper(
+    plan: MsgGenerator, plan_name: str, sample_id: int | None
+) -> MsgGenerator:
+    """Times the phases of handling a sample in plan and, once it has finished, adds a
+    SampleTiming summary to the active SampleTimer and records its total time in the
+    metrics. The summary of a failed sample is added with succeeded False, that of an
+    aborted one is only logged as it was stopped at an arbitrary point. Nothing is
+    timed if no SampleTimer is active.
+
+    If plan is run inside another plan which is already timing the sample its phases
+    are timed as part of that sample instead."""
+    timer = _active_timer.get()
+    if timer is None or timer.current is not None:
+        return (yield from plan)
+
+    timing = SampleTiming(plan_name, sample_id, time.time())
+    start = time.perf_counter()
+    timer.current = timing
+    aborted = False
+    try:
+        result = yield from plan
+        timing.succeeded = True
+        return result
+    except RequestAbort:
+        aborted = True
+        raise
+    finally:
+        timer.close(timing)
+        timing.total_s = time.perf_counter() - start
+        LOGGER.info(f"Sample timing{' (aborted)' if aborted else ''}: {timing}")
+        if not aborted:
+            SAMPLE_DURATION.record(
+                timing.total_s, {"plan": plan_name, "succeeded": timing.succeeded}
+            )
+            timer.add(timing)
@@ -1,4 +1,10 @@
+import math
+from functools import cache
+from typing import Any
+
+from pydantic import TypeAdapter
 from scanspec.core import AxesPoints, Axis
+from scanspec.specs import Spec
 from scipy.constants import physical_constants
 
 hc_in_eV_and_Angstrom: float = (
@@ -20,6 +26,31 @@ def convert_angstrom_to_eV(wavelength: float) -> float:
     return interconvert_eV_Angstrom(wavelength)
 
 
-def number_of_frames_from_scan_spec(scan_points: AxesPoints[Axis]):
+# Key of the compact representation of a scan's points in a start document
+SCAN_SPEC_KEY = "scan_spec"
+
+
+@cache
+def _spec_adapter() -> TypeAdapter[Spec]:
+    # Spec.serialize and Spec.deserialize build one of these on every call, which takes
+    # far longer than the (de)serialisation itself
+    return TypeAdapter(Spec)
+
+
+def compact_scan_points(spec: Spec[Axis]) -> dict[str, Any]:
+    """A representation of the points of spec to put in a document in place of the
+    points themselves, which is a few hundred bytes however large the scan is. Only
+    number_of_frames_from_scan_spec reads it, so it is only for documents whose
+    consumers just need the number of frames."""
+    return {SCAN_SPEC_KEY: _spec_adapter().dump_python(spec)}
+
+
+def number_of_frames_from_scan_spec(
+    scan_points: AxesPoints[Axis] | dict[str, Any],
+):
+    if SCAN_SPEC_KEY in scan_points:
+        return math.prod(
+            _spec_adapter().validate_python(scan_points[SCAN_SPEC_KEY]).shape()
+        )
     ax = list(scan_points.keys())[0]
     return len(scan_points[ax])
@@ -0,0 +1,49 @@
+"""Helpers shared by the benchmarks. Each benchmark reports its results through the
+benchmark_report fixture, and they are shown together in a benchmark results section
+at the end of the pytest summary, so they can be seen without ``-s``."""
+
+import time
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+
+REPEATS = 5
+
+_REPORTS = pytest.StashKey[dict[str, list[str]]]()
+
+
+def best_time(
+    func: Callable[[], Any],
+    repeats: int = REPEATS,
+    setup: Callable[[], Any] | None = None,
+) -> float:
+    """The shortest wall-clock time func took over repeats calls, each made after
+    calling setup, if given, which isn't timed"""
+    times = []
+    for _ in range(repeats):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+@pytest.fixture
+def benchmark_report(request: pytest.FixtureRequest) -> Callable[[str], None]:
+    """Adds a line to the results reported for the benchmark"""
+    lines = request.config.stash.setdefault(_REPORTS, {}).setdefault(
+        request.node.nodeid, []
+    )
+    return lines.append
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config: pytest.Config):
+    if not (reports := config.stash.get(_REPORTS, {})):
+        return
+    terminalreporter.section("benchmark results")
+    for nodeid, lines in reports.items():
+        terminalreporter.write_line(nodeid)
+        for line in lines:
+            terminalreporter.write_line(f"    {line}")
@@ -0,0 +1,103 @@
+"""Number of Xspress3Mini exposures, and the dose to the sample as the sum of the
+transmissions they were taken at, needed by the attenuation optimisation with
+TransmissionSearch.MODEL compared with TransmissionSearch.STEP, the fixed increment for
+deadtime and target / counts scaling for total counts. The detector is simulated, with
+a paralysable deadtime and counts that saturate as the deadtime goes up, starting from a
+range of transmissions."""
+
+from __future__ import annotations
+
+import math
+from unittest.mock import patch
+
+import bluesky.plan_stubs as bps
+import numpy as np
+from bluesky.run_engine import RunEngine
+from dodal.beamlines import i03
+from ophyd_async.core import set_mock_value
+
+from mx_bluesky.hyperion.experiment_plans.optimise_attenuation_plan import (
+    OptimizeAttenuationComposite,
+    TransmissionSearch,
+    deadtime_optimisation,
+    total_counts_optimisation,
+)
+
+INITIAL_TRANSMISSIONS = (1e-5, 1e-4, 1e-3, 1e-2)
+# Deadtime fraction 1 - exp(-transmission / DEADTIME_SCALE) is 0.002 at ~4e-3
+DEADTIME_SCALE = 2
+# Counts in the ROI at full transmission without deadtime
+FULL_FLUX_COUNTS = 5e7
+TOTAL_TIME = 1e7
+
+
+class SimulatedXspress3Mini:
+    """Stands in for an exposure, putting the deadtime and counts that the simulated
+    detector gives at the transmission on the Xspress3Mini signals"""
+
+    def __init__(self, composite: OptimizeAttenuationComposite):
+        self.composite = composite
+        self.transmissions: list[float] = []
+
+    def __call__(self, composite: OptimizeAttenuationComposite, transmission: float):
+        self.transmissions.append(transmission)
+        deadtime = 1 - math.exp(-transmission / DEADTIME_SCALE)
+        channel = composite.xspress3mini.channels[1]
+        set_mock_value(channel.total_time, TOTAL_TIME)
+        set_mock_value(channel.reset_ticks, TOTAL_TIME * deadtime)
+        counts = FULL_FLUX_COUNTS * transmission * (1 - deadtime) ** 20
+        set_mock_value(
+            composite.xspress3mini.dt_corrected_latest_mca[1],
+            np.full(10, counts / 10),
+        )
+        yield from bps.null()
+
+
+def _exposures_and_dose(RE: RunEngine, composite, plan) -> tuple[int, float]:
+    detector = SimulatedXspress3Mini(composite)
+    with patch(
+        "mx_bluesky.hyperion.experiment_plans.optimise_attenuation_plan.do_device_optimise_iteration",
+        new=detector,
+    ):
+        RE(plan)
+    return len(detector.transmissions), sum(detector.transmissions)
+
+
+def test_attenuation_optimisation_exposures(RE: RunEngine, benchmark_report):
+    composite = OptimizeAttenuationComposite(
+        attenuator=i03.attenuator(fake_with_ophyd_sim=True, wait_for_connection=True),
+        sample_shutter=i03.sample_shutter(
+            fake_with_ophyd_sim=True, wait_for_connection=True
+        ),
+        xspress3mini=i03.xspress3mini(
+            fake_with_ophyd_sim=True, wait_for_connection=True
+        ),
+    )
+
+    def deadtime(transmission: float, search: TransmissionSearch):
+        return deadtime_optimisation(
+            composite, transmission, 2, 0.002, 20, 0.1, 1e-6, search
+        )
+
+    def total_counts(transmission: float, search: TransmissionSearch):
+        return total_counts_optimisation(
+            composite, transmission, 0, 10, 20000, 50000, 20000, 20, 0.1, 1e-6, search
+        )
+
+    for name, optimisation in (("deadtime", deadtime), ("total counts", total_counts)):
+        results = {
+            search: [
+                _exposures_and_dose(RE, composite, optimisation(transmission, search))
+                for transmission in INITIAL_TRANSMISSIONS
+            ]
+            for search in TransmissionSearch
+        }
+        step = results[TransmissionSearch.STEP]
+        model = results[TransmissionSearch.MODEL]
+        benchmark_report(
+            f"{name.capitalize()} optimisation from transmissions "
+            f"{INITIAL_TRANSMISSIONS}: step exposures {[n for n, _ in step]}, dose "
+            f"{sum(d for _, d in step):.3g}; model exposures {[n for n, _ in model]}, "
+            f"dose {sum(d for _, d in model):.3g}"
+        )
+        assert sum(n for n, _ in model) < sum(n for n, _ in step)
@@ -0,0 +1,148 @@
+"""Time taken by grid_detection_plan, which moves to the next angle as soon as the
+snapshot image has been taken and waits for new OAV frames after moving, compared with
+doing each angle in turn with a fixed sleep after moving as it did before. Omega moves,
+pin tip detection and saving snapshot images are simulated with fixed delays and the
+OAV takes frames at 25 Hz."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import bluesky.plan_stubs as bps
+import bluesky.preprocessors as bpp
+import numpy as np
+from bluesky.run_engine import RunEngine
+from dodal.beamlines import i03
+from dodal.devices.backlight import Backlight
+from dodal.devices.oav.oav_detector import OAVConfigParams
+from dodal.devices.oav.oav_parameters import OAVParameters
+from dodal.devices.oav.pin_image_recognition.utils import SampleLocation
+from dodal.devices.oav.utils import wait_for_tip_to_be_found
+from dodal.devices.smargon import Smargon
+from ophyd_async.core import AsyncStatus
+
+from mx_bluesky.hyperion.device_setup_plans.setup_oav import pre_centring_setup_oav
+from mx_bluesky.hyperion.experiment_plans.oav_grid_detection_plan import (
+    OavGridDetectionComposite,
+    grid_detection_plan,
+)
+from mx_bluesky.hyperion.parameters.constants import CONST
+from tests.conftest import oav_producing_frames
+
+OMEGA_MOVE_TIME_S = 0.2
+TIP_DETECTION_TIME_S = 0.05
+IMAGE_SAVE_TIME_S = 0.05
+FRAME_PERIOD_S = 0.04
+OLD_OAV_REFRESH_DELAY_S = 0.3
+
+
+def _sequential_grid_detection(
+    composite: OavGridDetectionComposite, parameters: OAVParameters
+):
+    """grid_detection_plan as it was, drawing the same grid at both angles rather than
+    calculating it"""
+    oav = composite.oav
+    yield from pre_centring_setup_oav(oav, parameters, composite.pin_tip_detection)
+    for angle in [0, -90]:
+        yield from bps.mv(composite.smargon.omega, angle)  # type: ignore
+        yield from bps.sleep(OLD_OAV_REFRESH_DELAY_S)
+        yield from wait_for_tip_to_be_found(composite.pin_tip_detection)
+        yield from bps.rd(composite.pin_tip_detection.triggered_top_edge)
+        yield from bps.rd(composite.pin_tip_detection.triggered_bottom_edge)
+        for signal, value in (
+            (oav.grid_snapshot.top_left_x, 8),
+            (oav.grid_snapshot.top_left_y, 0),
+            (oav.grid_snapshot.box_width, 12),
+            (oav.grid_snapshot.num_boxes_x, 9),
+            (oav.grid_snapshot.num_boxes_y, 2),
+            (oav.grid_snapshot.filename, f"test_{abs(angle)}"),
+        ):
+            yield from bps.abs_set(signal, value)  # type: ignore
+        yield from bps.abs_set(oav.grid_snapshot.directory, "tmp")  # type: ignore
+        yield from bps.trigger(oav.grid_snapshot, wait=True)  # type: ignore
+        yield from bps.create(CONST.DESCRIPTORS.OAV_GRID_SNAPSHOT_TRIGGERED)
+        yield from bps.read(oav.grid_snapshot)  # type: ignore
+        yield from bps.read(composite.smargon)
+        yield from bps.save()
+
+
+def test_grid_detection_time(
+    RE: RunEngine,
+    smargon: Smargon,
+    backlight: Backlight,
+    test_config_files: dict[str, str],
+    benchmark_report,
+):
+    oav = i03.oav(
+        wait_for_connection=False,
+        fake_with_ophyd_sim=True,
+        params=OAVConfigParams(
+            test_config_files["zoom_params_file"], test_config_files["display_config"]
+        ),
+    )
+    oav.parameters.update_on_zoom = MagicMock()
+    oav.parameters.load_microns_per_pixel = MagicMock()
+    oav.parameters.micronsPerXPixel = 1.58
+    oav.parameters.micronsPerYPixel = 1.58
+    oav.wait_for_connection()
+    oav.zoom_controller.thst.set("5.0x")
+
+    pin_tip_detection = i03.pin_tip_detection(fake_with_ophyd_sim=True)
+
+    async def detect_tip(_):
+        await asyncio.sleep(TIP_DETECTION_TIME_S)
+        return SampleLocation(8, 5, np.array([0] * 8 + [5] * 12), np.array([10] * 20))
+
+    pin_tip_detection._get_tip_and_edge_data = AsyncMock(side_effect=detect_tip)
+
+    move_omega = smargon.omega.set
+
+    @AsyncStatus.wrap
+    async def slow_omega_move(value, *args, **kwargs):
+        await asyncio.sleep(OMEGA_MOVE_TIME_S)
+        await move_omega(value)
+
+    smargon.omega.set = slow_omega_move  # type: ignore
+
+    composite = OavGridDetectionComposite(
+        backlight=backlight,
+        oav=oav,
+        smargon=smargon,
+        pin_tip_detection=pin_tip_detection,
+    )
+    parameters = OAVParameters("loopCentring", test_config_files["oav_config_json"])
+
+    with (
+        patch("dodal.devices.areadetector.plugins.MJPG.requests") as mock_requests,
+        patch("dodal.devices.areadetector.plugins.MJPG.Image") as mock_image_class,
+        oav_producing_frames(oav, FRAME_PERIOD_S),
+    ):
+        mock_requests.get.return_value.content = b""
+        mock_image = mock_image_class.open.return_value.__enter__.return_value
+        mock_image.save = MagicMock(side_effect=lambda _: time.sleep(IMAGE_SAVE_TIME_S))
+
+        start = time.perf_counter()
+        RE(bpp.run_wrapper(_sequential_grid_detection(composite, parameters)))
+        sequential = time.perf_counter() - start
+
+        start = time.perf_counter()
+        RE(
+            bpp.run_wrapper(
+                grid_detection_plan(
+                    composite,
+                    parameters=parameters,
+                    snapshot_dir="tmp",
+                    snapshot_template="test_{angle}",
+                    grid_width_microns=161.2,
+                )
+            )
+        )
+        pipelined = time.perf_counter() - start
+
+    benchmark_report(
+        f"Grid detection: one angle at a time with a fixed sleep {sequential:.2f}s, "
+        f"moving while saving snapshots and waiting for frames {pipelined:.2f}s"
+    )
+    assert pipelined < sequential
@@ -0,0 +1,45 @@
+"""Time taken to get the scan points of a large 3D grid scan, compared with generating
+them through scanspec."""
+
+from __future__ import annotations
+
+import pytest
+from scanspec.core import Path as ScanPath
+
+from mx_bluesky.hyperion.parameters.gridscan import ThreeDGridScan
+from tests.benchmarks.conftest import best_time
+
+
+@pytest.mark.parametrize("x_steps, y_steps, z_steps", [(40, 20, 20), (200, 100, 100)])
+def test_scan_points_for_large_grid(
+    test_fgs_params: ThreeDGridScan, benchmark_report, x_steps, y_steps, z_steps
+):
+    test_fgs_params.x_steps = x_steps
+    test_fgs_params.y_steps = y_steps
+    test_fgs_params.z_steps = z_steps
+
+    def uncached():
+        # Changing a grid parameter invalidates the cache
+        test_fgs_params.x_start_um += 1
+        return test_fgs_params.scan_points
+
+    def cached():
+        return (
+            test_fgs_params.scan_points_first_grid,
+            test_fgs_params.scan_points_second_grid,
+            test_fgs_params.num_images,
+            test_fgs_params.scan_indices,
+        )
+
+    scanspec = best_time(
+        lambda: ScanPath(test_fgs_params.scan_spec.calculate()).consume().midpoints
+    )
+    first_call = best_time(uncached)
+    repeat_calls = best_time(cached)
+    benchmark_report(
+        f"{x_steps}x{y_steps}x{z_steps} grid: scanspec {scanspec * 1000:.2f} ms, "
+        f"scan_points {first_call * 1000:.2f} ms, cached grids, num_images and "
+        f"scan_indices {repeat_calls * 1000:.3f} ms"
+    )
+    assert first_call < scanspec
+    assert repeat_calls < first_call
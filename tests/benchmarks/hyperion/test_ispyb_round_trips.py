@@ -0,0 +1,199 @@
+"""Round trip counts and simulated latency for ISPyB depositions.
+
+These stand in a fake connector for the database which sleeps for a fixed latency on
+every server round trip, modelled on the ISPyB MySQL stored procedure connector:
+connecting, each stored procedure call (which pings the server before calling) and
+each transaction statement."""
+
+from __future__ import annotations
+
+import time
+from itertools import count
+from unittest.mock import patch
+
+import pytest
+from ispyb.sp.core import Core
+from ispyb.sp.mxacquisition import MXAcquisition
+
+from mx_bluesky.hyperion.external_interaction.ispyb.data_model import (
+    DataCollectionGridInfo,
+    DataCollectionGroupInfo,
+    DataCollectionInfo,
+    DataCollectionPositionInfo,
+    Orientation,
+    ScanDataInfo,
+)
+from mx_bluesky.hyperion.external_interaction.ispyb.ispyb_store import (
+    IspybIds,
+    StoreInIspyb,
+)
+from mx_bluesky.hyperion.parameters.constants import CONST
+
+LATENCY_S = 0.002
+CONNECT_ROUND_TRIPS = 3
+CALL_ROUND_TRIPS = 2
+
+
+class FakeServer:
+    def __init__(self):
+        self.round_trips = 0
+        self.connections = 0
+        self.ids = count(1)
+
+    def round_trip(self, n: int = 1):
+        self.round_trips += n
+        time.sleep(LATENCY_S * n)
+
+    def open(self, _config_path):
+        self.connections += 1
+        self.round_trip(CONNECT_ROUND_TRIPS)
+        return FakeConnector(self)
+
+
+class FakeMySQLConnection:
+    def __init__(self, server: FakeServer):
+        self._server = server
+        self.connection_id = server.connections
+
+    def is_connected(self):
+        return True
+
+    def start_transaction(self):
+        self._server.round_trip()
+
+    def commit(self):
+        self._server.round_trip()
+
+    def rollback(self):
+        self._server.round_trip()
+
+
+class FakeStoredProcedures:
+    def __init__(self, server: FakeServer, template):
+        self._server = server
+        self._template = template
+
+    def __getattr__(self, name):
+        if name.startswith("get_") and name.endswith("_params"):
+            return getattr(self._template, name)
+
+        def call(*_):
+            self._server.round_trip(CALL_ROUND_TRIPS)
+            return next(self._server.ids)
+
+        return call
+
+
+class FakeConnector:
+    def __init__(self, server: FakeServer):
+        self.conn = FakeMySQLConnection(server)
+        self.reconn_attempts = 6
+        self.mx_acquisition = FakeStoredProcedures(server, MXAcquisition)
+        self.core = FakeStoredProcedures(server, Core)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = FakeServer()
+    with patch("ispyb.open", side_effect=server.open):
+        yield server
+
+
+def _report(report, name: str, server: FakeServer, elapsed: float):
+    report(
+        f"{name}: {server.connections} connections, {server.round_trips} round "
+        f"trips, {elapsed * 1000:.1f} ms at {LATENCY_S * 1000:.0f} ms latency"
+    )
+
+
+def _grid_scan_data_info(dcid: int | None, grid_number: int) -> ScanDataInfo:
+    return ScanDataInfo(
+        data_collection_info=DataCollectionInfo(
+            comments=f"Grid {grid_number}", parent_id=1, visit_string="cm31105-4"
+        ),
+        data_collection_grid_info=DataCollectionGridInfo(
+            dx_in_mm=0.1,
+            dy_in_mm=0.1,
+            steps_x=40,
+            steps_y=20,
+            microns_per_pixel_x=1.25,
+            microns_per_pixel_y=1.25,
+            snapshot_offset_x_pixel=50,
+            snapshot_offset_y_pixel=100,
+            orientation=Orientation.HORIZONTAL,
+            snaked=True,
+        ),
+        data_collection_position_info=DataCollectionPositionInfo(0, 0, 0),
+        data_collection_id=dcid,
+    )
+
+
+@pytest.mark.parametrize("n_rotations", [1, 10, 50])
+def test_end_deposition_for_multi_rotation(
+    server: FakeServer, benchmark_report, n_rotations: int
+):
+    store = StoreInIspyb(CONST.SIM.ISPYB_CONFIG)
+    ids = IspybIds(
+        data_collection_ids=tuple(range(n_rotations)), data_collection_group_id=1
+    )
+
+    start = time.perf_counter()
+    for dcid in ids.data_collection_ids:
+        store._update_scan_with_end_time_and_status(
+            "2024-02-08 14:04:01", "DataCollection Successful", "reason", dcid, 1
+        )
+    _report(
+        benchmark_report,
+        f"{n_rotations} rotations ended one at a time",
+        server,
+        time.perf_counter() - start,
+    )
+    unbatched_round_trips = server.round_trips
+
+    server.round_trips = server.connections = 0
+    start = time.perf_counter()
+    store.end_deposition(ids, "success", "reason")
+    _report(
+        benchmark_report,
+        f"{n_rotations} rotations ended in one batch",
+        server,
+        time.perf_counter() - start,
+    )
+
+    assert server.connections == 1
+    assert server.round_trips == (
+        CONNECT_ROUND_TRIPS + 2 + 2 * n_rotations * CALL_ROUND_TRIPS
+    )
+    assert server.round_trips < unbatched_round_trips
+
+
+def test_two_grid_3d_scan_deposition(server: FakeServer, benchmark_report):
+    store = StoreInIspyb(CONST.SIM.ISPYB_CONFIG)
+
+    start = time.perf_counter()
+    ids = store.begin_deposition(
+        DataCollectionGroupInfo("cm31105-4", "Mesh3D", None),
+        [
+            ScanDataInfo(
+                data_collection_info=DataCollectionInfo(visit_string="cm31105-4")
+            )
+        ],
+    )
+    ids = store.update_deposition(
+        ids,
+        [
+            _grid_scan_data_info(ids.data_collection_ids[0], 1),
+            _grid_scan_data_info(None, 2),
+        ],
+    )
+    store.end_deposition(ids, "success", "")
+    _report(benchmark_report, "Two grid 3D scan", server, time.perf_counter() - start)
+
+    # One connection and transaction for each of the three documents
+    assert server.connections == 3
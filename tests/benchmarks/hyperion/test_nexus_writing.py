@@ -0,0 +1,148 @@
+"""Time taken to write the NeXus files for a typical rotation and grid scan, compared
+with running the full nexgen write for each of the .nxs and _master.h5 files."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from nexgen.nxs_write.nxmx_writer import NXmxFileWriter
+
+from mx_bluesky.hyperion.external_interaction.nexus.nexus_utils import (
+    create_beam_and_attenuator_parameters,
+    get_start_and_predicted_end_time,
+)
+from mx_bluesky.hyperion.external_interaction.nexus.write_nexus import NexusWriter
+from mx_bluesky.hyperion.parameters.gridscan import ThreeDGridScan
+from mx_bluesky.hyperion.parameters.rotation import RotationScan
+from tests.benchmarks.conftest import best_time
+
+REPEATS = 3
+
+
+def _write_each_file_with_nexgen(writer: NexusWriter, bit_depth):
+    start_time, est_end_time = get_start_and_predicted_end_time(
+        writer.detector.exp_time * writer.full_num_of_images
+    )
+    for filename in [writer.nexus_file, writer.master_file]:
+        nxmx_writer = NXmxFileWriter(
+            filename,
+            writer.goniometer,
+            writer.detector,
+            writer.source,
+            writer.beam,
+            writer.attenuator,
+            writer.full_num_of_images,
+        )
+        nxmx_writer.write(
+            image_filename=writer.data_filename,
+            start_time=start_time,
+            est_end_time=est_end_time,
+        )
+        nxmx_writer.write_vds(
+            vds_offset=writer.start_index,
+            vds_shape=writer.data_shape,
+            vds_dtype=bit_depth,
+        )
+
+
+def _time_writes(writers: list[NexusWriter], write) -> float:
+    def remove_files():
+        for writer in writers:
+            writer.nexus_file.unlink(missing_ok=True)
+            writer.master_file.unlink(missing_ok=True)
+
+    def write_files():
+        for writer in writers:
+            write(writer)
+
+    return best_time(write_files, REPEATS, setup=remove_files)
+
+
+def _compare(report, name: str, writers: list[NexusWriter]):
+    nexgen_twice = _time_writes(
+        writers, lambda w: _write_each_file_with_nexgen(w, np.uint16)
+    )
+    create_nexus_file = _time_writes(writers, lambda w: w.create_nexus_file(np.uint16))
+    report(
+        f"{name}: create_nexus_file {create_nexus_file * 1000:.1f} ms, "
+        f"writing each file with nexgen {nexgen_twice * 1000:.1f} ms"
+    )
+    for writer in writers:
+        assert writer.master_file.read_bytes() == writer.nexus_file.read_bytes()
+    return create_nexus_file, nexgen_twice
+
+
+def _with_beam(writer: NexusWriter) -> NexusWriter:
+    writer.beam, writer.attenuator = create_beam_and_attenuator_parameters(
+        20, 1e10, 0.5
+    )
+    return writer
+
+
+def test_3600_image_rotation(
+    tmp_path, test_rotation_params: RotationScan, benchmark_report
+):
+    test_rotation_params.storage_directory = str(tmp_path)
+    test_rotation_params.scan_width_deg = 360
+    test_rotation_params.rotation_increment_deg = 0.1
+    assert test_rotation_params.num_images == 3600
+    d_size = (
+        test_rotation_params.detector_params.detector_size_constants.det_size_pixels
+    )
+    writer = _with_beam(
+        NexusWriter(
+            test_rotation_params,
+            (test_rotation_params.num_images, d_size.width, d_size.height),
+            test_rotation_params.scan_points,
+            omega_start_deg=test_rotation_params.omega_start_deg,
+        )
+    )
+
+    create_nexus_file, nexgen_twice = _compare(
+        benchmark_report, "3600 image rotation", [writer]
+    )
+    assert create_nexus_file < nexgen_twice
+
+
+@pytest.mark.parametrize("x_steps, y_steps, z_steps", [(40, 20, 20)])
+def test_two_grid_gridscan(
+    tmp_path,
+    test_fgs_params: ThreeDGridScan,
+    benchmark_report,
+    x_steps,
+    y_steps,
+    z_steps,
+):
+    test_fgs_params.storage_directory = str(tmp_path)
+    test_fgs_params.x_steps = x_steps
+    test_fgs_params.y_steps = y_steps
+    test_fgs_params.z_steps = z_steps
+    d_size = test_fgs_params.detector_params.detector_size_constants.det_size_pixels
+    first_grid_images = test_fgs_params.scan_indices[1]
+    second_grid_images = test_fgs_params.num_images - first_grid_images
+    writers = [
+        _with_beam(
+            NexusWriter(
+                test_fgs_params,
+                (first_grid_images, d_size.width, d_size.height),
+                test_fgs_params.scan_points_first_grid,
+            )
+        ),
+        _with_beam(
+            NexusWriter(
+                test_fgs_params,
+                (second_grid_images, d_size.width, d_size.height),
+                test_fgs_params.scan_points_second_grid,
+                run_number=test_fgs_params.detector_params.run_number + 1,
+                vds_start_index=first_grid_images,
+                omega_start_deg=90,
+            )
+        ),
+    ]
+
+    create_nexus_file, nexgen_twice = _compare(
+        benchmark_report,
+        f"{x_steps}x{y_steps}x{z_steps} two grid gridscan",
+        writers,
+    )
+    assert create_nexus_file < nexgen_twice
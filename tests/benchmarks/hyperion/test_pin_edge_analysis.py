@@ -0,0 +1,80 @@
+"""Time taken to work out the grid from 1024 wide pin edge arrays, with the vectorised
+get_grid_extent and the edges logged lazily at debug compared with builtin min/max
+over the arrays and the edges logged as lists at info as it was before, and with
+percentile clipping of outliers."""
+
+from __future__ import annotations
+
+import logging
+import math
+
+import numpy as np
+from dodal.devices.oav.pin_image_recognition.utils import NONE_VALUE
+
+from mx_bluesky.hyperion.experiment_plans.oav_grid_detection_plan import (
+    _LazyArrayStr,
+    get_grid_extent,
+)
+from tests.benchmarks.conftest import best_time
+
+WIDTH_PX = 1024
+HEIGHT_PX = 768
+BOX_SIZE_PX = 12.3
+REPEATS = 200
+
+logger = logging.getLogger("pin_edge_analysis_benchmark")
+logger.setLevel(logging.INFO)
+
+
+def _edges() -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(0)
+    top = rng.integers(300, 350, WIDTH_PX)
+    bottom = rng.integers(400, 450, WIDTH_PX)
+    top[rng.choice(WIDTH_PX, 100, replace=False)] = NONE_VALUE
+    bottom[rng.choice(WIDTH_PX, 100, replace=False)] = NONE_VALUE
+    return top, bottom
+
+
+def _old_grid(top: np.ndarray, bottom: np.ndarray):
+    """The grid calculation in grid_detection_plan as it was"""
+    logger.info(f"OAV Edge detection top: {list(top)}")
+    logger.info(f"OAV Edge detection bottom: {list(bottom)}")
+    filtered_top = top[np.where((top != 0) & (top != NONE_VALUE))]
+    min_y = min(filtered_top) if len(filtered_top) else 0
+    filtered_bottom = bottom[np.where((bottom != HEIGHT_PX) & (bottom != NONE_VALUE))]
+    max_y = max(filtered_bottom) if len(filtered_bottom) else HEIGHT_PX
+    y_steps = math.ceil((float(max_y) - float(min_y)) / BOX_SIZE_PX)
+    return (0, float(min_y)), math.ceil(WIDTH_PX / BOX_SIZE_PX), y_steps
+
+
+def _new_grid(top: np.ndarray, bottom: np.ndarray, outlier_percentile: float = 0):
+    logger.debug("OAV Edge detection top: %s", _LazyArrayStr(top))
+    logger.debug("OAV Edge detection bottom: %s", _LazyArrayStr(bottom))
+    grid = get_grid_extent(
+        top,
+        bottom,
+        0,
+        HEIGHT_PX,
+        WIDTH_PX,
+        BOX_SIZE_PX,
+        BOX_SIZE_PX,
+        outlier_percentile=outlier_percentile,
+    )
+    return grid.upper_left, grid.x_steps, grid.y_steps
+
+
+def test_pin_edge_analysis_time(benchmark_report):
+    top, bottom = _edges()
+    assert _old_grid(top, bottom) == _new_grid(top, bottom)
+
+    old = best_time(lambda: _old_grid(top, bottom), REPEATS)
+    new = best_time(lambda: _new_grid(top, bottom), REPEATS)
+    clipped = best_time(lambda: _new_grid(top, bottom, 1), REPEATS)
+
+    benchmark_report(
+        f"Grid from {WIDTH_PX} wide pin edges: builtin min/max and edges logged as "
+        f"lists {old * 1e6:.0f}us, vectorised with lazy debug logging "
+        f"{new * 1e6:.0f}us, with 1st/99th percentile clipping {clipped * 1e6:.0f}us"
+    )
+    assert new < old
+    assert clipped < old
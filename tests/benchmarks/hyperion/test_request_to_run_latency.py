@@ -0,0 +1,97 @@
+"""Time from a robot_load_then_centre start request reaching the REST API to the
+RunEngine being called, with the device composite reused from the previous request
+compared with it being made from the context every time as it was before. The context
+holds mock devices, so this doesn't include any time spent connecting devices."""
+
+from __future__ import annotations
+
+import statistics
+import threading
+import time
+from typing import Any, get_type_hints
+from unittest.mock import MagicMock, patch
+
+from blueapi.core import BlueskyContext
+
+import mx_bluesky.hyperion.experiment_plans as hyperion_plans
+from mx_bluesky.hyperion.__main__ import create_app
+from mx_bluesky.hyperion.experiment_plans.robot_load_then_centre_plan import (
+    RobotLoadThenCentreComposite,
+)
+from mx_bluesky.hyperion.utils import context as context_utils
+
+REPEATS = 50
+PARAMS_FILE = (
+    "tests/test_data/parameter_json_files/good_test_robot_load_and_centre_params.json"
+)
+
+
+class FakeRunEngine:
+    def __init__(self):
+        self.called = threading.Event()
+        self.called_at = 0.0
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        self.called_at = time.perf_counter()
+        self.called.set()
+
+    def subscribe(self, *args):
+        pass
+
+    def unsubscribe(self, *args):
+        pass
+
+    def abort(self):
+        pass
+
+
+def _context_with_mock_devices() -> BlueskyContext:
+    context = BlueskyContext()
+    context.with_plan_module(hyperion_plans)
+    for name, device_type in get_type_hints(RobotLoadThenCentreComposite).items():
+        context.devices[name] = MagicMock(spec=device_type)
+    return context
+
+
+def _latencies(reuse_composite: bool) -> list[float]:
+    RE = FakeRunEngine()
+    with patch(
+        "mx_bluesky.hyperion.__main__.setup_context",
+        return_value=_context_with_mock_devices(),
+    ):
+        app, runner = create_app({"TESTING": True}, RE, True)  # type: ignore
+    runner_thread = threading.Thread(target=runner.wait_on_queue)
+    runner_thread.start()
+    with open(PARAMS_FILE) as f:
+        params = f.read()
+
+    latencies = []
+    try:
+        with app.test_client() as client:
+            for _ in range(REPEATS):
+                if not reuse_composite:
+                    context_utils._composites.clear()
+                    context_utils._composite_fields.cache_clear()
+                RE.called.clear()
+                start = time.perf_counter()
+                response = client.put("/robot_load_then_centre/start", data=params)
+                assert response.json["status"] == "Success", response.json
+                assert RE.called.wait(5)
+                latencies.append(RE.called_at - start)
+                while runner.current_status.status == "Busy":
+                    time.sleep(0.001)
+    finally:
+        runner.shutdown()
+        runner_thread.join()
+    return latencies
+
+
+def test_start_request_to_run_engine_latency(benchmark_report):
+    rebuilt = _latencies(reuse_composite=False)
+    reused = _latencies(reuse_composite=True)
+    benchmark_report(
+        f"Start request to RunEngine called: composite made every time mean "
+        f"{statistics.mean(rebuilt) * 1000:.2f} ms, reused mean "
+        f"{statistics.mean(reused) * 1000:.2f} ms"
+    )
+    assert statistics.median(reused) < statistics.median(rebuilt)
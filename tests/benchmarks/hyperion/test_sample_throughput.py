@@ -0,0 +1,201 @@
+"""Estimated time per sample, per phase and in total, and samples per hour for
+load_centre_collect_full_plan, grid_detect_then_xray_centre and multi_rotation_scan,
+run against simulated devices with realistic latencies by ThroughputSimulator. This
+runs on a virtual clock, so takes a few seconds whatever the latencies are, and can be
+used to see the effect of changing the order of or overlapping steps in the plans.
+
+Each test fails if a phase, or the total, takes longer than its threshold in
+throughput_thresholds.json, which should be lowered when a plan is made faster."""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from bluesky.protocols import Location
+from dodal.devices.oav.oav_parameters import OAVParameters
+from dodal.devices.synchrotron import SynchrotronMode
+from ophyd.sim import NullStatus
+from ophyd_async.core import set_mock_value
+
+from mx_bluesky.hyperion.experiment_plans.grid_detect_then_xray_centre_plan import (
+    grid_detect_then_xray_centre,
+)
+from mx_bluesky.hyperion.experiment_plans.load_centre_collect_full_plan import (
+    LoadCentreCollectComposite,
+    load_centre_collect_full_plan,
+)
+from mx_bluesky.hyperion.experiment_plans.rotation_scan_plan import (
+    multi_rotation_scan,
+)
+from mx_bluesky.hyperion.parameters.gridscan import GridScanWithEdgeDetect
+from mx_bluesky.hyperion.parameters.load_centre_collect import LoadCentreCollect
+from mx_bluesky.hyperion.parameters.rotation import MultiRotationScan
+from tests.conftest import pin_tip_edge_data, raw_params_from_file
+
+from .throughput_simulator import ThroughputSimulator
+
+THRESHOLDS = json.loads(
+    (Path(__file__).parent / "throughput_thresholds.json").read_text()
+)
+# Fixtures for the composite fields that aren't named after the device
+FIXTURE_FOR_FIELD = {
+    "zebra_fast_grid_scan": "fast_grid_scan",
+    "pin_tip_detection": "ophyd_pin_tip_detection",
+}
+GRID_PARAMETERS = {
+    "transmission_frac": 1.0,
+    "exposure_time_s": 0,
+    "x_start_um": 0,
+    "y_start_um": 0,
+    "y2_start_um": 0,
+    "z_start_um": 0,
+    "z2_start_um": 0,
+    "x_steps": 20,
+    "y_steps": 10,
+    "z_steps": 10,
+    "x_step_size_um": 0.02,
+    "y_step_size_um": 0.02,
+    "z_step_size_um": 0.02,
+}
+
+
+@pytest.fixture
+def composite(request: pytest.FixtureRequest) -> LoadCentreCollectComposite:
+    composite = LoadCentreCollectComposite(
+        **{
+            field.name: request.getfixturevalue(
+                FIXTURE_FOR_FIELD.get(field.name, field.name)
+            )
+            for field in dataclasses.fields(LoadCentreCollectComposite)
+        }
+    )
+    composite.oav.parameters.update_on_zoom(7.5, 1024, 768)
+    composite.oav.zoom_controller.frst.set("7.5x")
+    composite.smargon.stub_offsets.set = MagicMock(return_value=NullStatus())
+    composite.aperture_scatterguard.set = MagicMock(return_value=NullStatus())
+    set_mock_value(composite.dcm.energy_in_kev.user_readback, 11.105)
+    return composite
+
+
+@pytest.fixture
+def sim(composite: LoadCentreCollectComposite) -> ThroughputSimulator:
+    sim = ThroughputSimulator()
+    for axis in ("x", "y", "z"):
+        sim.add_handler(
+            "locate",
+            lambda _: Location(setpoint=-2, readback=-2),
+            f"smargon-{axis}-low_limit_travel",
+        )
+        sim.add_handler(
+            "locate",
+            lambda _: Location(setpoint=2, readback=2),
+            f"smargon-{axis}-high_limit_travel",
+        )
+    sim.add_read_handler_for(
+        composite.synchrotron.synchrotron_mode, SynchrotronMode.USER
+    )
+    sim.add_read_handler_for(composite.synchrotron.top_up_start_countdown, -1)
+    # Within both the test pitch and roll lookup tables
+    sim.add_read_handler_for(composite.dcm.bragg_in_degrees.user_readback, 5.0)
+    tip_x_px, tip_y_px, top_edge, bottom_edge = pin_tip_edge_data()
+    sim.add_read_handler_for(
+        composite.pin_tip_detection.triggered_tip, (tip_x_px, tip_y_px)
+    )
+    sim.add_read_handler_for(composite.pin_tip_detection.triggered_top_edge, top_edge)
+    sim.add_read_handler_for(
+        composite.pin_tip_detection.triggered_bottom_edge, bottom_edge
+    )
+    sim.add_read_handler_for(composite.zocalo.centres_of_mass, [[10, 5, 5]])
+    sim.add_read_handler_for(composite.zocalo.bbox_sizes, [[2, 2, 2]])
+    return sim
+
+
+@pytest.fixture
+def detected_grid():
+    """Grid detection is done by a callback, which isn't run by the simulator"""
+    with patch(
+        "mx_bluesky.hyperion.experiment_plans.grid_detect_then_xray_centre_plan.GridDetectionCallback",
+        autospec=True,
+    ) as callback:
+        callback.return_value.get_grid_parameters.return_value = GRID_PARAMETERS
+        yield callback
+
+
+def _report_and_check(sim: ThroughputSimulator, report, plan_name: str):
+    [timing] = sim.sample_timings
+    thresholds = THRESHOLDS[plan_name]
+    phases = dict(sorted(timing["phases"].items(), key=lambda item: -item[1]))
+    report(
+        f"{plan_name}: {timing['total_s']:.1f}s per sample, "
+        f"{3600 / timing['total_s']:.1f} samples/hour"
+    )
+    for phase, duration in phases.items():
+        report(f"    {phase}: {duration:.1f}s (threshold {thresholds.get(phase, 0)}s)")
+    report(f"    other: {timing['total_s'] - sum(phases.values()):.1f}s")
+
+    regressed = {
+        phase: duration
+        for phase, duration in {**phases, "total": timing["total_s"]}.items()
+        if duration > thresholds.get(phase, 0)
+    }
+    assert not regressed, f"Phases slower than their thresholds: {regressed}"
+
+
+def test_load_centre_collect_throughput(
+    composite: LoadCentreCollectComposite,
+    sim: ThroughputSimulator,
+    detected_grid,
+    oav_parameters_for_rotation: OAVParameters,
+    benchmark_report,
+):
+    params = LoadCentreCollect(
+        **raw_params_from_file(
+            "tests/test_data/parameter_json_files/good_test_load_centre_collect_params.json"
+        )
+    )
+    with sim.virtual_clock():
+        sim.simulate_plan(
+            load_centre_collect_full_plan(
+                composite, params, oav_parameters_for_rotation
+            )
+        )
+    _report_and_check(sim, benchmark_report, "load_centre_collect_full_plan")
+
+
+def test_grid_detect_then_xray_centre_throughput(
+    composite: LoadCentreCollectComposite,
+    sim: ThroughputSimulator,
+    detected_grid,
+    test_full_grid_scan_params: GridScanWithEdgeDetect,
+    test_config_files: dict[str, str],
+    benchmark_report,
+):
+    with sim.virtual_clock():
+        sim.simulate_plan(
+            grid_detect_then_xray_centre(
+                composite,  # type: ignore
+                test_full_grid_scan_params,
+                test_config_files["oav_config_json"],
+            )
+        )
+    _report_and_check(sim, benchmark_report, "grid_detect_then_xray_centre")
+
+
+def test_multi_rotation_scan_throughput(
+    composite: LoadCentreCollectComposite,
+    sim: ThroughputSimulator,
+    test_multi_rotation_params: MultiRotationScan,
+    oav_parameters_for_rotation: OAVParameters,
+    benchmark_report,
+):
+    with sim.virtual_clock():
+        sim.simulate_plan(
+            multi_rotation_scan(
+                composite, test_multi_rotation_params, oav_parameters_for_rotation
+            )
+        )
+    _report_and_check(sim, benchmark_report, "multi_rotation_scan")
@@ -0,0 +1,66 @@
+"""Time from the smargon becoming enabled to a plan waiting for it continuing, waiting
+with wait_for_smargon_not_disabled compared with polling the signal every 0.1 s as it
+did before. The smargon is enabled at a random time after the wait starts, from the
+RunEngine event loop as a monitor update would be."""
+
+from __future__ import annotations
+
+import random
+import statistics
+import time
+
+import bluesky.plan_stubs as bps
+from bluesky.run_engine import RunEngine
+from dodal.devices.smargon import Smargon
+from ophyd_async.core import set_mock_value
+
+from mx_bluesky.hyperion.experiment_plans.robot_load_and_change_energy import (
+    wait_for_smargon_not_disabled,
+)
+
+REPEATS = 20
+
+
+def _poll_for_smargon_not_disabled(smargon: Smargon, timeout=60):
+    SLEEP_PER_CHECK = 0.1
+    for _ in range(int(timeout / SLEEP_PER_CHECK)):
+        smargon_disabled = yield from bps.rd(smargon.disabled)
+        if not smargon_disabled:
+            return
+        yield from bps.sleep(SLEEP_PER_CHECK)
+    raise TimeoutError()
+
+
+def _latencies(RE: RunEngine, smargon: Smargon, wait) -> list[float]:
+    latencies = []
+    for _ in range(REPEATS):
+        enabled_at = None
+
+        def enable():
+            nonlocal enabled_at
+            enabled_at = time.perf_counter()
+            set_mock_value(smargon.disabled, 0)
+
+        def plan():
+            set_mock_value(smargon.disabled, 1)
+            RE.loop.call_later(random.uniform(0.01, 0.2), enable)
+            yield from wait(smargon)
+            assert enabled_at is not None
+            latencies.append(time.perf_counter() - enabled_at)
+
+        RE(plan())
+    return latencies
+
+
+def test_smargon_enabled_to_plan_continuing(
+    smargon: Smargon, RE: RunEngine, benchmark_report
+):
+    polled = _latencies(RE, smargon, _poll_for_smargon_not_disabled)
+    monitored = _latencies(RE, smargon, wait_for_smargon_not_disabled)
+    benchmark_report(
+        f"Smargon enabled to plan continuing: polling mean "
+        f"{statistics.mean(polled) * 1000:.1f} ms, max {max(polled) * 1000:.1f} ms; "
+        f"monitoring mean {statistics.mean(monitored) * 1000:.2f} ms, max "
+        f"{max(monitored) * 1000:.2f} ms"
+    )
+    assert statistics.mean(monitored) < statistics.mean(polled)
@@ -0,0 +1,79 @@
+"""Size of the scan points put in start documents, and the time taken to send them to
+the external callbacks, with and without compact_scan_points_in_documents. The 0MQ
+Publisher and RemoteDispatcher pickle every document, so the time here is that taken to
+pickle the scan points and unpickle them again in the callback process, plus the time
+the ZocaloCallback then takes to count the frames. This doesn't include the time to
+send the pickled documents between processes, which is where most of the cost of the
+full scan points is."""
+
+from __future__ import annotations
+
+import pickle
+
+import pytest
+
+from mx_bluesky.hyperion.parameters.gridscan import ThreeDGridScan
+from mx_bluesky.hyperion.parameters.rotation import RotationScan
+from mx_bluesky.hyperion.utils.utils import (
+    compact_scan_points,
+    number_of_frames_from_scan_spec,
+)
+from tests.benchmarks.conftest import best_time
+
+
+def _send_and_count_frames(scan_points: list) -> tuple[int, float]:
+    def send_and_count():
+        received = pickle.loads(pickle.dumps(scan_points))
+        for points in received:
+            number_of_frames_from_scan_spec(points)
+
+    return len(pickle.dumps(scan_points)), best_time(send_and_count)
+
+
+def _compare(report, name: str, full: list, compact: list):
+    full_size, full_time = _send_and_count_frames(full)
+    compact_size, compact_time = _send_and_count_frames(compact)
+    report(
+        f"{name}: full scan points {full_size / 1e6:.2f} MB in "
+        f"{full_time * 1000:.2f} ms, compact {compact_size} bytes in "
+        f"{compact_time * 1000:.3f} ms"
+    )
+    assert [number_of_frames_from_scan_spec(p) for p in compact] == [
+        number_of_frames_from_scan_spec(p) for p in full
+    ]
+    assert compact_size < full_size
+
+
+@pytest.mark.parametrize("x_steps, y_steps, z_steps", [(40, 20, 20), (200, 100, 100)])
+def test_grid_scan_scan_points(
+    test_fgs_params: ThreeDGridScan, benchmark_report, x_steps, y_steps, z_steps
+):
+    test_fgs_params.x_steps = x_steps
+    test_fgs_params.y_steps = y_steps
+    test_fgs_params.z_steps = z_steps
+    _compare(
+        benchmark_report,
+        f"{x_steps}x{y_steps}x{z_steps} grid",
+        [
+            test_fgs_params.scan_points_first_grid,
+            test_fgs_params.scan_points_second_grid,
+        ],
+        [
+            compact_scan_points(test_fgs_params.grid_1_spec),
+            compact_scan_points(test_fgs_params.grid_2_spec),
+        ],
+    )
+
+
+def test_3600_image_rotation_scan_points(
+    test_rotation_params: RotationScan, benchmark_report
+):
+    test_rotation_params.scan_width_deg = 360
+    test_rotation_params.rotation_increment_deg = 0.1
+    assert test_rotation_params.num_images == 3600
+    _compare(
+        benchmark_report,
+        "3600 image rotation",
+        [test_rotation_params.scan_points],
+        [compact_scan_points(test_rotation_params.scan_spec)],
+    )
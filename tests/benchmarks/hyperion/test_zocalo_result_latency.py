@@ -0,0 +1,137 @@
+"""Time from the start of the gridscan to the Zocalo results being received, with Zocalo
+told the gridscan has ended before the Eiger is unstaged (early_zocalo_run_end)
+compared with after it as it was before. Zocalo is simulated by SimulatedZocalo, which
+releases results a configurable time after it is sent run_end for every grid. The
+filewriters close the files as soon as the gridscan completes, and the Eiger then takes
+a configurable time to unstage."""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import bluesky.plan_stubs as bps
+from bluesky.run_engine import RunEngine
+from bluesky.utils import Msg
+from dodal.devices.zocalo import ZocaloResults, ZocaloStartInfo
+from ophyd.sim import NullStatus
+
+from mx_bluesky.hyperion.experiment_plans.flyscan_xray_centre_plan import (
+    FlyScanXRayCentreComposite,
+    kickoff_and_complete_gridscan,
+)
+from mx_bluesky.hyperion.external_interaction.callbacks.common.callback_util import (
+    create_gridscan_callbacks,
+)
+from mx_bluesky.hyperion.parameters.constants import CONST
+from tests.conftest import create_dummy_scan_spec
+
+EIGER_UNSTAGE_TIME_S = 0.5
+ZOCALO_PROCESSING_TIME_S = 0.5
+DCIDS = (100, 200)
+RESULT = {
+    "centre_of_mass": [6, 6, 6],
+    "max_voxel": [5, 5, 5],
+    "max_count": 123456,
+    "n_voxels": 321,
+    "total_count": 999999,
+    "bounding_box": [[3, 3, 3], [9, 9, 9]],
+}
+
+
+class SimulatedZocalo:
+    """Stands in for ZocaloTrigger, putting RESULT on the results device's queue
+    processing_time_s after run_end has been sent for every data collection"""
+
+    def __init__(self, results_device: ZocaloResults, processing_time_s: float):
+        self.results_device = results_device
+        self.processing_time_s = processing_time_s
+        self._running: set[int] = set()
+
+    def __call__(self, environment: str) -> "SimulatedZocalo":
+        return self
+
+    def run_start(self, start_info: ZocaloStartInfo):
+        self._running.add(start_info.ispyb_dcid)
+
+    def run_end(self, dcid: int):
+        self._running.discard(dcid)
+        if not self._running:
+            threading.Timer(self.processing_time_s, self._put_results).start()
+
+    def _put_results(self):
+        self.results_device._raw_results_received.put(
+            {"results": [RESULT], "recipe_parameters": {"dcid": 0, "dcgid": 0}}
+        )
+
+
+def _time_to_results(
+    RE: RunEngine, composite: FlyScanXRayCentreComposite, early_zocalo_run_end: bool
+) -> float:
+    _, ispyb_cb = create_gridscan_callbacks()
+    ispyb_cb.active = True
+    ispyb_cb.ispyb = MagicMock()
+    ispyb_cb.params = MagicMock()
+    ispyb_cb.ispyb_ids.data_collection_ids = DCIDS
+    ispyb_cb.emit_cb.start(
+        {CONST.TRIGGER.ZOCALO: CONST.PLAN.DO_FGS, "zocalo_environment": "dev_env"}  # type: ignore
+    )
+    subscription = RE.subscribe(ispyb_cb)
+
+    def gridscan_then_results():
+        yield from kickoff_and_complete_gridscan(
+            composite.zebra_fast_grid_scan,
+            composite.eiger,
+            composite.synchrotron,
+            scan_points=create_dummy_scan_spec(10, 20, 30),
+            scan_start_indices=[0, 200],
+            end_run_before_eiger_unstage=early_zocalo_run_end,
+        )
+        yield from bps.trigger(composite.zocalo, wait=True)
+
+    start = time.perf_counter()
+    RE(gridscan_then_results())
+    RE.unsubscribe(subscription)
+    return time.perf_counter() - start
+
+
+@patch(
+    "mx_bluesky.hyperion.experiment_plans.flyscan_xray_centre_plan.check_topup_and_wait_if_necessary",
+    new=MagicMock(side_effect=lambda *_, **__: iter([Msg("null")])),
+)
+def test_time_from_gridscan_to_zocalo_results(
+    RE: RunEngine,
+    fake_fgs_composite: FlyScanXRayCentreComposite,
+    benchmark_report,
+):
+    zocalo = fake_fgs_composite.zocalo
+    del zocalo.trigger  # use the real trigger, which waits on the results queue
+    zocalo.transport = MagicMock()
+    fake_fgs_composite.zebra_fast_grid_scan.kickoff = MagicMock(
+        return_value=NullStatus()
+    )
+    fake_fgs_composite.zebra_fast_grid_scan.complete = MagicMock(
+        return_value=NullStatus()
+    )
+    fake_fgs_composite.eiger.unstage = MagicMock(
+        side_effect=lambda: time.sleep(EIGER_UNSTAGE_TIME_S)
+    )
+    fake_fgs_composite.eiger.odin.create_finished_status = MagicMock(
+        return_value=NullStatus()
+    )
+    fake_fgs_composite.eiger.odin.file_writer.id.sim_put("test/filename")  # type: ignore
+
+    simulated_zocalo = SimulatedZocalo(zocalo, ZOCALO_PROCESSING_TIME_S)
+    with patch(
+        "mx_bluesky.hyperion.external_interaction.callbacks.zocalo_callback.ZocaloTrigger",
+        new=simulated_zocalo,
+    ):
+        after_unstage = _time_to_results(RE, fake_fgs_composite, False)
+        before_unstage = _time_to_results(RE, fake_fgs_composite, True)
+
+    benchmark_report(
+        f"Gridscan start to Zocalo results, with an Eiger unstage of "
+        f"{EIGER_UNSTAGE_TIME_S}s and Zocalo processing of {ZOCALO_PROCESSING_TIME_S}s:"
+        f" run_end after unstage {after_unstage:.2f}s, before unstage "
+        f"{before_unstage:.2f}s"
+    )
+    assert before_unstage < after_unstage - EIGER_UNSTAGE_TIME_S / 2
@@ -0,0 +1,205 @@
+"""A RunEngineSimulator that keeps a virtual clock, so that how long a plan would take
+on the beamline can be estimated offline from how long each device takes to move or
+respond. See test_sample_throughput.py for its use.
+
+Each set, trigger, kickoff, complete, stage and unstage takes the time given by
+DeviceLatencies for its device. Sets, triggers, kickoffs and completes finish in the
+background, in their group, and a wait on the group moves the clock on to when the last
+of them finishes. Sleeps move the clock on by the time slept. Only the plan is modelled:
+callbacks, such as those writing to ISPyB, run outside the RunEngine and take no time.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import time
+from collections import defaultdict
+from collections.abc import Generator, Mapping
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import patch
+
+from bluesky.simulators import RunEngineSimulator
+from bluesky.utils import Msg
+
+from mx_bluesky.hyperion.utils.phase_timing import SampleTimer
+
+
+@dataclasses.dataclass
+class MotorLatency:
+    """A motor that moves at velocity, in its units per second, after accelerating for
+    acceleration_time_s, and takes the same time again to settle"""
+
+    velocity: float
+    acceleration_time_s: float = 0.1
+
+    def move_time_s(self, distance: float, velocity: float | None = None) -> float:
+        return 2 * self.acceleration_time_s + abs(distance) / (
+            velocity or self.velocity
+        )
+
+
+@dataclasses.dataclass
+class DeviceLatencies:
+    """How long each device takes to respond, by the start of the device's name.
+    The longest matching name is used, so e.g. "smargon-omega" overrides "smargon"."""
+
+    motors: Mapping[str, MotorLatency] = dataclasses.field(
+        default_factory=lambda: {
+            "smargon-x": MotorLatency(velocity=2),
+            "smargon-y": MotorLatency(velocity=2),
+            "smargon-z": MotorLatency(velocity=2),
+            "smargon-omega": MotorLatency(velocity=90, acceleration_time_s=0.2),
+            "smargon-phi": MotorLatency(velocity=90, acceleration_time_s=0.2),
+            "smargon-chi": MotorLatency(velocity=5, acceleration_time_s=0.2),
+            "detector_motion-z": MotorLatency(velocity=20, acceleration_time_s=0.5),
+        }
+    )
+    # Sets to anything that isn't a motor
+    sets_s: Mapping[str, float] = dataclasses.field(
+        default_factory=lambda: {
+            "robot": 40.0,
+            "aperture_scatterguard": 2.5,
+            "attenuator": 0.5,
+            "backlight": 1.0,
+            "dcm": 5.0,
+            "undulator": 3.0,
+            "detector_motion-shutter": 1.0,
+            "sample_shutter": 0.1,
+            "eiger-do_arm": 1.5,
+            "oav-zoom_controller": 1.0,
+            "thawer": 0.1,
+            "xbpm_feedback": 0.5,
+        }
+    )
+    triggers_s: Mapping[str, float] = dataclasses.field(
+        default_factory=lambda: {
+            "pin_tip_detection": 0.1,
+            "oav-grid_snapshot": 0.2,
+            "oav-snapshot": 0.2,
+            "zocalo": 3.0,
+            "xbpm_feedback": 0.5,
+            "flux": 0.1,
+        }
+    )
+    stages_s: Mapping[str, float] = dataclasses.field(
+        default_factory=lambda: {"eiger": 1.5, "zocalo": 0.1}
+    )
+    unstages_s: Mapping[str, float] = dataclasses.field(
+        default_factory=lambda: {"eiger": 0.5, "zocalo": 0.1}
+    )
+    kickoffs_s: Mapping[str, float] = dataclasses.field(
+        default_factory=lambda: {"zebra_fast_grid_scan": 0.2}
+    )
+    completes_s: Mapping[str, float] = dataclasses.field(
+        # The gridscan itself, for both grids
+        default_factory=lambda: {"zebra_fast_grid_scan": 8.0}
+    )
+    # Everything waited for with bps.wait_for, such as new OAV frames
+    wait_for_s: float = 0.1
+    # Any other set, trigger, stage etc., a PV put with callback
+    default_s: float = 0.01
+
+
+def _for_device(latencies: Mapping[str, Any], name: str, default: Any = None):
+    matches = [prefix for prefix in latencies if name.startswith(prefix)]
+    return latencies[max(matches, key=len)] if matches else default
+
+
+class ThroughputSimulator(RunEngineSimulator):
+    """A RunEngineSimulator that keeps a virtual clock, see the module docstring.
+
+    Read handlers for the values the plan needs should be added as for any other
+    RunEngineSimulator. The samples timed by sample_timing_wrapper while in
+    virtual_clock are timed by the virtual clock and kept in sample_timings.
+    """
+
+    def __init__(self, latencies: DeviceLatencies | None = None):
+        super().__init__()
+        self.latencies = latencies or DeviceLatencies()
+        self.now = 0.0
+        self.positions: dict[str, float] = defaultdict(float)
+        self.velocities: dict[str, float] = {}
+        self.sample_timer = SampleTimer()
+        self._group_done_at: dict[Any, float] = {}
+
+        self.add_handler("set", self._set)
+        for command, table in (
+            ("trigger", lambda: self.latencies.triggers_s),
+            ("kickoff", lambda: self.latencies.kickoffs_s),
+            ("complete", lambda: self.latencies.completes_s),
+        ):
+            self.add_handler(command, self._in_background(table))
+        self.add_handler("stage", self._blocking(lambda: self.latencies.stages_s))
+        self.add_handler("unstage", self._blocking(lambda: self.latencies.unstages_s))
+        self.add_handler("wait", self._wait)
+        self.add_handler("sleep", self._sleep)
+        self.add_handler("wait_for", self._wait_for)
+
+    def _finish_in_background(self, msg: Msg, duration_s: float):
+        group = msg.kwargs.get("group")
+        self._group_done_at[group] = max(
+            self._group_done_at.get(group, self.now), self.now + duration_s
+        )
+
+    def _set(self, msg: Msg):
+        name = msg.obj.name
+        value = msg.args[0] if msg.args else None
+        if name.endswith("-velocity") and isinstance(value, int | float):
+            self.velocities[name.removesuffix("-velocity")] = value
+            duration_s = self.latencies.default_s
+        elif (motor := _for_device(self.latencies.motors, name)) is not None:
+            duration_s = self.latencies.default_s
+            if isinstance(value, int | float):
+                duration_s = motor.move_time_s(
+                    value - self.positions[name], self.velocities.get(name)
+                )
+                self.positions[name] = value
+        else:
+            duration_s = _for_device(
+                self.latencies.sets_s, name, self.latencies.default_s
+            )
+        self._finish_in_background(msg, duration_s)
+
+    def _in_background(self, table):
+        def handler(msg: Msg):
+            self._finish_in_background(
+                msg, _for_device(table(), msg.obj.name, self.latencies.default_s)
+            )
+
+        return handler
+
+    def _blocking(self, table):
+        def handler(msg: Msg):
+            if msg.kwargs.get("group") is not None:
+                self._in_background(table)(msg)
+            else:
+                self.now += _for_device(table(), msg.obj.name, self.latencies.default_s)
+
+        return handler
+
+    def _wait(self, msg: Msg):
+        self.now = max(self.now, self._group_done_at.pop(msg.kwargs.get("group"), 0))
+
+    def _sleep(self, msg: Msg):
+        self.now += msg.args[0]
+
+    def _wait_for(self, msg: Msg):
+        self.now += self.latencies.wait_for_s
+
+    @property
+    def sample_timings(self) -> list[dict[str, Any]]:
+        return self.sample_timer.samples()
+
+    @contextmanager
+    def virtual_clock(self) -> Generator[None, None, None]:
+        """Times the phases of a sample with the virtual clock rather than the real one"""
+        with (
+            patch(
+                "mx_bluesky.hyperion.utils.phase_timing.time",
+                new=SimpleNamespace(perf_counter=lambda: self.now, time=time.time),
+            ),
+            self.sample_timer.active(),
+        ):
+            yield
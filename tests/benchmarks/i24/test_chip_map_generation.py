@@ -0,0 +1,105 @@
+"""Time taken to write the shot ordered address file for an Oxford chip's full map,
+25,600 wells, and read it back into a presence map, using the cached chip address table
+compared with building the address lists from strings and working out the coordinates
+of each well from its address as it was before."""
+
+from __future__ import annotations
+
+import string
+from pathlib import Path
+from unittest.mock import patch
+
+from mx_bluesky.beamlines.i24.serial.fixed_target import (
+    i24ssx_Chip_Mapping_py3v1 as mapping,
+)
+from mx_bluesky.beamlines.i24.serial.fixed_target import (
+    i24ssx_Chip_StartUp_py3v1 as startup,
+)
+from mx_bluesky.beamlines.i24.serial.fixed_target.ft_utils import ChipType
+from mx_bluesky.beamlines.i24.serial.parameters import (
+    FixedTargetParameters,
+    get_chip_format,
+)
+from tests.benchmarks.conftest import best_time
+
+PARAMS = FixedTargetParameters(
+    visit="foo",
+    directory="bar",
+    filename="chip",
+    exposure_time_s=0.01,
+    detector_distance_mm=100,
+    detector_name="eiger",
+    num_exposures=1,
+    chip=get_chip_format(ChipType.Oxford).model_dump(),
+    map_type=1,
+    pump_repeat=0,
+    checker_pattern=False,
+)
+
+
+def _old_shot_order(chip_type: ChipType) -> list[str]:
+    """How get_shot_order built the addresses, windows_up was the same as windows_dn"""
+    chip_format = get_chip_format(chip_type)
+    blk_num = chip_format.x_blocks
+    letters = list(string.ascii_lowercase + string.ascii_uppercase + "0")
+    letters = letters[: chip_format.x_num_steps]
+    block_list = startup.zippum(
+        [list(string.ascii_uppercase)[:blk_num], "snake", 0],
+        [[str(x) for x in range(1, blk_num + 1)], "expand", 0],
+    )
+    window_list = startup.zippum([letters, "expand", 0], [letters, "snake", 0])
+    return [f"{block}_{window}" for block in block_list for window in window_list]
+
+
+def _old_write_file(params: FixedTargetParameters, chip_file_path: Path):
+    with open(chip_file_path, "a") as g:
+        for addr in _old_shot_order(params.chip.chip_type):
+            xtal_name = "_".join([params.filename, addr])
+            (x, y) = startup.get_xy(xtal_name, params.chip.chip_type)
+            line = "\t".join([xtal_name, str(x), str(y), "0.0", "-1"]) + "\n"
+            g.write(line)
+
+
+def _old_read_file_make_dict(fid: Path, chip_type: ChipType):
+    a_dict = {}
+    with open(fid) as f:
+        for line in f.readlines():
+            entry = line.rstrip().split()
+            a_dict[startup.get_xy(entry[0][-5:], chip_type)] = entry[4]
+    return a_dict
+
+
+def test_oxford_full_map_generation_time(tmp_path: Path, benchmark_report):
+    params = PARAMS
+    (tmp_path / "chips/bar").mkdir(parents=True)
+    old_file = tmp_path / "old.spec"
+    new_file = tmp_path / "chips/bar/chip.spec"
+
+    with patch.object(startup, "read_parameter_file", return_value=params):
+        old_write_s = best_time(
+            lambda: _old_write_file(params, old_file),
+            setup=lambda: old_file.unlink(missing_ok=True),
+        )
+        new_write_s = best_time(
+            lambda: startup.write_file(
+                suffix=".spec", order="shot", save_path=tmp_path
+            ),
+            setup=lambda: new_file.unlink(missing_ok=True),
+        )
+    assert old_file.read_text() == new_file.read_text()
+
+    chip_type = params.chip.chip_type
+    old_read_s = best_time(lambda: _old_read_file_make_dict(old_file, chip_type))
+    new_read_s = best_time(lambda: mapping.read_file_make_dict(new_file, chip_type))
+    assert _old_read_file_make_dict(old_file, chip_type) == mapping.read_file_make_dict(
+        new_file, chip_type
+    )
+
+    benchmark_report(
+        f"Oxford full map, {len(new_file.read_text().splitlines())} wells: "
+        f"write {old_write_s * 1000:.0f}ms before, {new_write_s * 1000:.0f}ms with "
+        f"the address table; read {old_read_s * 1000:.0f}ms before, "
+        f"{new_read_s * 1000:.0f}ms with the address table"
+    )
+    assert new_write_s < old_write_s
+    assert new_read_s < old_read_s
@@ -0,0 +1,71 @@
+"""Time taken to convert an Oxford chip's full map, 25,600 wells, into the 1,280
+P-variable lines uploaded to the PMAC, packing each row of windows into bits with NumPy
+compared with reordering a dict and joining strings of 0s and 1s one row at a time as it
+was before."""
+
+from __future__ import annotations
+
+import logging
+
+import numpy as np
+
+from mx_bluesky.beamlines.i24.serial.fixed_target.ft_utils import ChipType
+from mx_bluesky.beamlines.i24.serial.fixed_target.i24ssx_Chip_Mapping_py3v1 import (
+    presence_to_pvar_lines,
+)
+from mx_bluesky.beamlines.i24.serial.fixed_target.i24ssx_Chip_StartUp_py3v1 import (
+    chip_address_table,
+    get_shot_order,
+)
+from tests.benchmarks.conftest import best_time
+
+logger = logging.getLogger("I24ssx.chip_mapping")
+
+
+def _old_convert(chip_dict: dict[str, str], chip_type: ChipType) -> list[str]:
+    """How convert_chip_to_hex built the lines, with the hex width as an int"""
+    shot_order_list = get_shot_order(chip_type)
+    for i, k in enumerate(shot_order_list):
+        if i % 20 == 0:
+            logger.info("\n")
+        else:
+            logger.info(f"{k}")
+    sorted_pres_list = [chip_dict[addr] for addr in shot_order_list]
+    windows_per_block = 20
+    hex_length = windows_per_block // 4
+    lines = []
+    for i in range(len(sorted_pres_list) // windows_per_block):
+        sublist = sorted_pres_list[
+            i * windows_per_block : (i * windows_per_block) + windows_per_block
+        ]
+        right_list = sublist if i % 2 == 0 else sublist[::-1]
+        hex_string = (f"{{0:0>{hex_length}X}}").format(
+            int("".join(str(x) for x in right_list), 2)
+        )
+        line = f"P{5001 + i}=${hex_string + (7 - hex_length) * '0'}"
+        lines.append(line)
+        logger.info(f"hex string: {hex_string}")
+        logger.info(f"line number= {i}")
+        logger.info("right_list: \n{}\n".format("".join(str(x) for x in right_list)))
+        logger.info(f"PVAR: {line}")
+    return lines
+
+
+def test_oxford_full_map_conversion_time(benchmark_report):
+    table = chip_address_table(ChipType.Oxford)
+    presence = np.random.default_rng(0).integers(0, 2, len(table))
+    chip_dict = dict(
+        zip(table["address"].tolist(), presence.astype(str).tolist(), strict=True)
+    )
+
+    old_s = best_time(lambda: _old_convert(chip_dict, ChipType.Oxford))
+    new_s = best_time(lambda: presence_to_pvar_lines(presence, ChipType.Oxford))
+    assert _old_convert(chip_dict, ChipType.Oxford) == presence_to_pvar_lines(
+        presence, ChipType.Oxford
+    )
+
+    benchmark_report(
+        f"Oxford full map, {len(table)} wells: {old_s * 1000:.1f}ms one row at a "
+        f"time, {new_s * 1000:.1f}ms packed with NumPy"
+    )
+    assert new_s < old_s
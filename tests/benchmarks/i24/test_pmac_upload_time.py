@@ -0,0 +1,96 @@
+"""Time taken to upload an Oxford chip's lite map, motion program parameters and one
+block of its full map to the PMAC, with the P-variable assignments packed into as few
+PMAC_STRING puts as fit compared with one or two per put followed by fixed sleeps as it
+was before. The PMAC is stood in for by a mock PMAC_STRING which takes PUT_TIME_S to
+complete each put."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import bluesky.plan_stubs as bps
+from bluesky.run_engine import RunEngine
+from dodal.beamlines import i24
+from dodal.devices.i24.pmac import PMAC
+from ophyd_async.core import AsyncStatus, get_mock_put
+
+from mx_bluesky.beamlines.i24.serial.fixed_target.pmac_upload import (
+    upload_pmac_commands,
+)
+
+# A Channel Access put callback and the PMAC taking the line
+PUT_TIME_S = 0.005
+LITE_MAP = [f"P3{block:02d}1={block % 2}" for block in range(1, 65)]
+MOTION_PROGRAM = [
+    f"P12{pvar:02d}={value}"
+    for pvar, value in [
+        (11, 20),
+        (12, 20),
+        (13, 0.125),
+        (14, 0.125),
+        (15, 0.01),
+        (16, 0),
+        (17, 0),
+        (18, 0),
+        (20, 8),
+        (21, 8),
+        (24, 3.175),
+        (25, 3.175),
+        (26, 41),
+        (30, 1),
+        (32, 0),
+        (33, 0),
+    ]
+]
+FULL_MAP_BLOCK = [f"P{5001 + line}=$FFFFF00" for line in range(20)]
+
+
+def _old_upload(pmac: PMAC, commands: list[str], per_put: int, end_sleep_s: float):
+    """How load_motion_program_data, upload_parameters and upload_full sent commands"""
+    for i in range(0, len(commands), per_put):
+        line = " ".join(commands[i : i + per_put])
+        yield from bps.abs_set(pmac.pmac_string, line, wait=True)
+        yield from bps.sleep(0.02)
+    yield from bps.sleep(end_sleep_s)
+
+
+def _pmac_stand_in() -> PMAC:
+    pmac = i24.pmac(fake_with_ophyd_sim=True)
+    put = pmac.pmac_string.set
+
+    @AsyncStatus.wrap
+    async def slow_put(value, *args, **kwargs):
+        await asyncio.sleep(PUT_TIME_S)
+        await put(value, *args, **kwargs)
+
+    pmac.pmac_string.set = slow_put  # type: ignore
+    return pmac
+
+
+def _time_and_puts(RE: RunEngine, pmac: PMAC, plan) -> tuple[float, int]:
+    mock_put = get_mock_put(pmac.pmac_string)
+    mock_put.reset_mock()
+    start = time.perf_counter()
+    RE(plan)
+    return time.perf_counter() - start, mock_put.call_count
+
+
+def test_pmac_upload_time(RE: RunEngine, benchmark_report):
+    pmac = _pmac_stand_in()
+
+    for name, commands, per_put, end_sleep_s in (
+        ("Lite map", LITE_MAP, 1, 0),
+        ("Motion program", MOTION_PROGRAM, 1, 0.2),
+        ("Full map block", FULL_MAP_BLOCK, 2, 0),
+    ):
+        old, old_puts = _time_and_puts(
+            RE, pmac, _old_upload(pmac, commands, per_put, end_sleep_s)
+        )
+        new, new_puts = _time_and_puts(RE, pmac, upload_pmac_commands(pmac, commands))
+        benchmark_report(
+            f"{name}, {len(commands)} P-variables: {old_puts} puts and sleeps "
+            f"{old:.2f}s, {new_puts} packed puts {new:.2f}s"
+        )
+        assert new_puts <= old_puts
+        assert new < old
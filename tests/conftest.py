@@ -5,7 +5,7 @@ import logging
 import sys
 import threading
 from collections.abc import Callable, Generator, Sequence
-from contextlib import ExitStack
+from contextlib import ExitStack, contextmanager
 from functools import partial
 from typing import Any
 from unittest.mock import MagicMock, patch
@@ -75,6 +75,9 @@ from mx_bluesky.hyperion.external_interaction.callbacks.logging_callback import
     VerbosePlanExecutionLoggingCallback,
 )
 from mx_bluesky.hyperion.external_interaction.config_server import FeatureFlags
+from mx_bluesky.hyperion.external_interaction.ispyb.ispyb_utils import (
+    SESSION_ID_CACHE,
+)
 from mx_bluesky.hyperion.log import (
     ALL_LOGGERS,
     ISPYB_LOGGER,
@@ -162,6 +165,7 @@ def pytest_runtest_setup(item):
 def pytest_runtest_teardown(item):
     if "dodal.common.beamlines.beamline_utils" in sys.modules:
         sys.modules["dodal.common.beamlines.beamline_utils"].clear_devices()
+    SESSION_ID_CACHE.invalidate()
     markers = [m.name for m in item.own_markers]
     if "skip_log_setup" in markers:
         _reset_loggers([*ALL_LOGGERS, dodal_logger])
@@ -347,6 +351,26 @@ def synchrotron(RE):
     return synchrotron
 
 
+@contextmanager
+def oav_producing_frames(oav: OAV, frame_period_s: float = 0.005):
+    """Makes a fake OAV count up its array counter in the background, as the real one
+    does for each frame it takes"""
+    stop = threading.Event()
+
+    def produce_frames():
+        while not stop.wait(frame_period_s):
+            oav.cam.array_counter.sim_put(oav.cam.array_counter.get() + 1)  # type: ignore
+
+    oav.cam.array_counter.sim_put(0)  # type: ignore
+    frames = threading.Thread(target=produce_frames, daemon=True)
+    frames.start()
+    try:
+        yield oav
+    finally:
+        stop.set()
+        frames.join()
+
+
 @pytest.fixture
 def oav(test_config_files):
     parameters = OAVConfigParams(
@@ -365,7 +389,8 @@ def oav(test_config_files):
     oav.proc.port_name.sim_put("proc")  # type: ignore
     oav.cam.port_name.sim_put("CAM")  # type: ignore
     oav.grid_snapshot.trigger = MagicMock(return_value=NullStatus())
-    return oav
+    with oav_producing_frames(oav):
+        yield oav
 
 
 @pytest.fixture
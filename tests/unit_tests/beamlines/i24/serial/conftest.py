@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from unittest.mock import AsyncMock
+from collections import defaultdict
+from typing import Any
+from unittest.mock import AsyncMock, patch
 
 import pytest
 from dodal.beamlines import i24
@@ -16,6 +18,7 @@ from dodal.devices.i24.dcm import DCM
 from dodal.devices.i24.dual_backlight import DualBacklight
 from dodal.devices.i24.pmac import PMAC
 from dodal.devices.zebra import Zebra
+from epics import dbr
 from ophyd_async.core import callback_on_mock_put, set_mock_value
 from ophyd_async.epics.motor import Motor
 
@@ -32,6 +35,46 @@ def patch_motor(motor: Motor, initial_position: float = 0):
     )
 
 
+class FakeChannel:
+    """Stands in for the pyepics channel to a PV used by setup_beamline.ca, holding
+    its value in memory. Gets return None, as pyepics does when a get times out, while
+    get_timeouts is more than 0."""
+
+    def __init__(self, value: Any = 0, ftype: int = dbr.DOUBLE, connected=True):
+        self.value = value
+        self.ftype = ftype
+        self.connected = connected
+        self.get_timeouts = 0
+        self.gets = 0
+        self.puts: list[Any] = []
+
+    def wait_for_connection(self, timeout=None) -> bool:
+        return self.connected
+
+    def get(self, as_string=False, timeout=None):
+        self.gets += 1
+        if self.get_timeouts > 0:
+            self.get_timeouts -= 1
+            return None
+        return str(self.value) if as_string else self.value
+
+    def put(self, value, wait=False):
+        self.value = value
+        self.puts.append(value)
+
+
+@pytest.fixture
+def fake_channels():
+    """The channels used by setup_beamline.ca, by PV name. Any PV not already in it is
+    added, connected with value 0, when first used."""
+    channels: defaultdict[str, FakeChannel] = defaultdict(FakeChannel)
+    with patch(
+        "mx_bluesky.beamlines.i24.serial.setup_beamline.ca._channel",
+        side_effect=lambda pv: channels[pv],
+    ):
+        yield channels
+
+
 @pytest.fixture
 def zebra(RE) -> Zebra:
     zebra = i24.zebra(fake_with_ophyd_sim=True)
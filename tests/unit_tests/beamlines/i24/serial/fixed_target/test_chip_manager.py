@@ -14,13 +14,17 @@ from mx_bluesky.beamlines.i24.serial.fixed_target.i24ssx_Chip_Manager_py3v1 impo
     cs_reset,
     initialise_stages,
     laser_control,
+    load_stock_map,
     moveto,
     moveto_preset,
     pumpprobe_calc,
+    save_screen_map,
     scrape_mtr_directions,
     scrape_mtr_fiducials,
     set_pmac_strings_for_cs,
+    upload_full,
 )
+from mx_bluesky.beamlines.i24.serial.setup_beamline.ca import caput_many
 
 mtr_dir_str = """#Some words
 mtr1_dir=1
@@ -43,7 +47,11 @@ cs_json = '{"scalex":1, "scaley":2, "scalez":3, "skew":-0.5, "Sx_dir":1, "Sy_dir
     "mx_bluesky.beamlines.i24.serial.fixed_target.i24ssx_Chip_Manager_py3v1.get_detector_type"
 )
 @patch("mx_bluesky.beamlines.i24.serial.fixed_target.i24ssx_Chip_Manager_py3v1.caput")
+@patch(
+    "mx_bluesky.beamlines.i24.serial.fixed_target.i24ssx_Chip_Manager_py3v1.set_register_bank"
+)
 async def test_initialise(
+    fake_set_register_bank: MagicMock,
     fake_caput: MagicMock,
     fake_det: MagicMock,
     fake_sys: MagicMock,
@@ -67,6 +75,98 @@ async def test_initialise(
             call("m808=100 m809=150", wait=True, timeout=10.0),
         ]
     )
+    fake_set_register_bank.assert_called_once_with(
+        {register: 0 for register in range(4, 120)}
+    )
+
+
+@patch(
+    "mx_bluesky.beamlines.i24.serial.fixed_target.i24ssx_Chip_Manager_py3v1.setup_logging"
+)
+def test_load_stock_map_clears_blocks_and_sets_map_in_one_go(
+    fake_log: MagicMock, fake_channels, RE
+):
+    fake_channels["ME14E-MO-IOC-01:GP20"].value = 1
+
+    with patch(
+        "mx_bluesky.beamlines.i24.serial.setup_beamline.register_bank.caput_many",
+        wraps=caput_many,
+    ) as fake_caput_many:
+        RE(load_stock_map("x33"))
+
+    fake_caput_many.assert_called_once()
+    set_blocks = {
+        int(pv_name.removeprefix("ME14E-MO-IOC-01:GP")) - 10
+        for pv_name, channel in fake_channels.items()
+        if channel.value == 1
+    }
+    assert set_blocks == {31, 32, 33, 40, 51, 50, 49, 42, 41}
+    assert len(fake_channels) == 64
+
+
+@patch(
+    "mx_bluesky.beamlines.i24.serial.fixed_target.i24ssx_Chip_Manager_py3v1.setup_logging"
+)
+@patch(
+    "mx_bluesky.beamlines.i24.serial.fixed_target.i24ssx_Chip_Manager_py3v1.LITEMAP_PATH"
+)
+def test_save_screen_map_writes_all_blocks(
+    fake_litemap_path: MagicMock, fake_log: MagicMock, fake_channels, RE
+):
+    fake_channels["ME14E-MO-IOC-01:GP12"].value = 1
+    fake_litemap_path.__truediv__.return_value = "currentchip.map"
+
+    with patch(
+        "mx_bluesky.beamlines.i24.serial.fixed_target.i24ssx_Chip_Manager_py3v1.open",
+        mock_open(),
+    ) as fake_file:
+        RE(save_screen_map())
+
+    lines = [c.args[0] for c in fake_file().write.call_args_list]
+    assert len(lines) == 81
+    assert lines[0] == "01status    P3011 \t0\n"
+    assert lines[1] == "02status    P3021 \t1\n"
+    assert len(fake_channels) == 81
+
+
+@patch(
+    "mx_bluesky.beamlines.i24.serial.fixed_target.i24ssx_Chip_Manager_py3v1.setup_logging"
+)
+@patch(
+    "mx_bluesky.beamlines.i24.serial.fixed_target.i24ssx_Chip_Manager_py3v1.FULLMAP_PATH"
+)
+def test_upload_full_from_file(
+    fake_fullmap_path: MagicMock, fake_log: MagicMock, pmac: PMAC, RE, tmp_path
+):
+    (tmp_path / "currentchip.full").write_text(
+        "P5001=$FFFFF00\nP5002=$0000000\nP5003=$8000000\n"
+    )
+    fake_fullmap_path.__truediv__.return_value = tmp_path / "currentchip.full"
+
+    RE(upload_full(pmac))
+
+    assert get_mock_put(pmac.pmac_string).call_args_list == [
+        call("P5001=$FFFFF00 P5002=$0000000", wait=True, timeout=10.0),
+        call("P5003=$8000000", wait=True, timeout=10.0),
+    ]
+
+
+@patch(
+    "mx_bluesky.beamlines.i24.serial.fixed_target.i24ssx_Chip_Manager_py3v1.setup_logging"
+)
+@patch(
+    "mx_bluesky.beamlines.i24.serial.fixed_target.i24ssx_Chip_Manager_py3v1.FULLMAP_PATH"
+)
+def test_upload_full_from_lines_does_not_read_file(
+    fake_fullmap_path: MagicMock, fake_log: MagicMock, pmac: PMAC, RE
+):
+    RE(upload_full(pmac, ["P5001=$FFFFF00", "P5002=$0000000", "P5003=$8000000"]))
+
+    fake_fullmap_path.__truediv__.assert_not_called()
+    assert get_mock_put(pmac.pmac_string).call_args_list == [
+        call("P5001=$FFFFF00 P5002=$0000000", wait=True, timeout=10.0),
+        call("P5003=$8000000", wait=True, timeout=10.0),
+    ]
 
 
 @patch(
@@ -0,0 +1,124 @@
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from mx_bluesky.beamlines.i24.serial.fixed_target.ft_utils import ChipType
+from mx_bluesky.beamlines.i24.serial.fixed_target.i24ssx_Chip_Mapping_py3v1 import (
+    convert_chip_to_hex,
+    presence_to_pvar_lines,
+    read_presence,
+)
+from mx_bluesky.beamlines.i24.serial.fixed_target.i24ssx_Chip_StartUp_py3v1 import (
+    chip_address_table,
+    get_shot_order,
+)
+
+
+def _write_chip_map(path, chip_type, presence):
+    table = chip_address_table(chip_type)
+    lines = [
+        f"chip_{addr}\t{x}\t{y}\t0.0\t{pres}\n"
+        for addr, x, y, pres in zip(
+            table["address"], table["x"], table["y"], presence, strict=True
+        )
+    ]
+    path.write_text("#XtalAddr XCoord YCoord ZCoord Present\n" + "".join(lines))
+
+
+def _hex_lines_one_row_at_a_time(presence, chip_type):
+    """How convert_chip_to_hex built the lines, with the hex width as an int"""
+    table = chip_address_table(chip_type)
+    chip_dict = dict(zip(table["address"].tolist(), presence.tolist(), strict=True))
+    sorted_pres_list = [chip_dict[addr] for addr in get_shot_order(chip_type)]
+    windows_per_block = int(table["window_col"].max()) + 1
+    hex_length = windows_per_block // 4
+    lines = []
+    for i in range(len(sorted_pres_list) // windows_per_block):
+        sublist = sorted_pres_list[
+            i * windows_per_block : (i * windows_per_block) + windows_per_block
+        ]
+        right_list = sublist if i % 2 == 0 else sublist[::-1]
+        hex_string = (f"{{0:0>{hex_length}X}}").format(
+            int("".join(str(x) for x in right_list), 2)
+        )
+        lines.append(f"P{5001 + i}=${hex_string + (7 - hex_length) * '0'}")
+    return lines
+
+
+def test_presence_to_pvar_lines_matches_one_row_at_a_time():
+    presence = np.random.default_rng(0).integers(0, 2, 25600)
+
+    lines = presence_to_pvar_lines(presence, ChipType.Oxford)
+
+    assert len(lines) == 1280
+    assert lines == _hex_lines_one_row_at_a_time(presence, ChipType.Oxford)
+
+
+@pytest.mark.parametrize(
+    "chip_type, expected_lines, expected_line",
+    [
+        (ChipType.Oxford, 1280, "P5001=$FFFFF00"),
+        (ChipType.OxfordInner, 25, "P5001=$FFFFFF8"),
+    ],
+)
+def test_presence_to_pvar_lines_for_full_chip(chip_type, expected_lines, expected_line):
+    presence = np.ones(len(chip_address_table(chip_type)), dtype=np.int8)
+
+    lines = presence_to_pvar_lines(presence, chip_type)
+
+    assert len(lines) == expected_lines
+    assert lines[0] == expected_line
+    assert lines[-1] == f"P{5000 + expected_lines}={expected_line[6:]}"
+
+
+def test_presence_to_pvar_lines_reverses_every_other_row():
+    table = chip_address_table(ChipType.Oxford)
+    presence = np.isin(table["address"], ["A1_aa", "A1_ba"]).astype(np.int8)
+
+    lines = presence_to_pvar_lines(presence, ChipType.Oxford)
+
+    assert lines[:3] == ["P5001=$8000000", "P5002=$8000000", "P5003=$0000000"]
+
+
+def test_presence_to_pvar_lines_raises_for_unknown_presence():
+    presence = np.ones(25600, dtype=np.int8)
+    presence[7] = -1
+    with pytest.raises(ValueError):
+        presence_to_pvar_lines(presence, ChipType.Oxford)
+
+
+def test_read_presence_gives_missing_wells_minus_one(tmp_path):
+    map_file = tmp_path / "chip.spec"
+    map_file.write_text("#comment\nchip_A1_ab\t0.125\t0.0\t0.0\t1\n")
+
+    presence = read_presence(map_file, ChipType.Oxford)
+
+    assert presence[1] == 1
+    assert (np.delete(presence, 1) == -1).all()
+
+
+@patch(
+    "mx_bluesky.beamlines.i24.serial.fixed_target.i24ssx_Chip_Mapping_py3v1.check_files"
+)
+def test_convert_chip_to_hex_writes_full_file(fake_check: MagicMock, tmp_path):
+    presence = np.random.default_rng(1).integers(0, 2, 25600)
+    _write_chip_map(tmp_path / "chip.spec", ChipType.Oxford, presence)
+
+    lines = convert_chip_to_hex(tmp_path / "chip.spec", ChipType.Oxford)
+
+    assert lines == presence_to_pvar_lines(presence, ChipType.Oxford)
+    assert (tmp_path / "chip.full").read_text().splitlines() == lines
+
+
+@patch(
+    "mx_bluesky.beamlines.i24.serial.fixed_target.i24ssx_Chip_Mapping_py3v1.check_files"
+)
+def test_convert_chip_to_hex_without_saving_file(fake_check: MagicMock, tmp_path):
+    _write_chip_map(tmp_path / "chip.spec", ChipType.OxfordInner, [0] * 625)
+
+    lines = convert_chip_to_hex(tmp_path / "chip.spec", ChipType.OxfordInner, False)
+
+    assert lines[0] == "P5001=$0000000"
+    assert not (tmp_path / "chip.full").exists()
+    fake_check.assert_not_called()
@@ -2,10 +2,17 @@ from unittest.mock import patch
 
 import pytest
 
+from mx_bluesky.beamlines.i24.serial.fixed_target.ft_utils import ChipType
 from mx_bluesky.beamlines.i24.serial.fixed_target.i24ssx_Chip_StartUp_py3v1 import (
     check_files,
+    chip_address_table,
     fiducials,
+    get_alphanumeric,
+    get_shot_order,
+    get_xy,
     pathli,
+    write_file,
+    zippum,
 )
 
 
@@ -40,3 +47,90 @@ def test_check_files(fake_read_params, mock_os, dummy_params_without_pp):
 )
 def test_pathli(list_in, way, reverse, expected_res):
     assert pathli(list_in, way, reverse) == expected_res
+
+
+@pytest.mark.parametrize(
+    "chip_type, expected_wells",
+    [
+        (ChipType.Oxford, 25600),
+        (ChipType.OxfordInner, 625),
+        (ChipType.Minichip, 400),
+    ],
+)
+def test_chip_address_table_coordinates_match_get_xy(chip_type, expected_wells):
+    table = chip_address_table(chip_type)
+    assert len(table) == expected_wells
+    for well in table[:: len(table) // 97]:
+        assert (well["x"], well["y"]) == get_xy(f"chip_{well['address']}", chip_type)
+
+
+def test_chip_address_table_is_built_once_and_read_only():
+    table = chip_address_table(ChipType.Oxford)
+    assert chip_address_table(ChipType.Oxford) is table
+    with pytest.raises(ValueError):
+        table["x"][0] = 1
+
+
+def test_get_alphanumeric():
+    addresses = get_alphanumeric(ChipType.Oxford)
+    assert addresses[:3] == ["A1_aa", "A1_ab", "A1_ac"]
+    assert addresses[399:401] == ["A1_tt", "A2_aa"]
+    assert addresses[-1] == "H8_tt"
+
+
+@pytest.mark.parametrize("chip_type", [ChipType.Oxford, ChipType.OxfordInner])
+def test_get_shot_order(chip_type):
+    table = chip_address_table(chip_type)
+    blocks = sorted({address[:2] for address in table["address"]})
+    rows = list(dict.fromkeys(address[:1] for address in blocks))
+    columns = list(dict.fromkeys(address[1:] for address in blocks))
+    windows = list(dict.fromkeys(address[-1] for address in table["address"]))
+    expected_blocks = zippum([rows, "snake", False], [columns, "expand", False])
+    expected_windows = zippum([windows, "expand", False], [windows, "snake", False])
+
+    assert get_shot_order(chip_type) == [
+        f"{block}_{window}" for block in expected_blocks for window in expected_windows
+    ]
+
+
+@patch(
+    "mx_bluesky.beamlines.i24.serial.fixed_target.i24ssx_Chip_StartUp_py3v1.read_parameter_file"
+)
+def test_write_file_in_shot_order(fake_read_params, dummy_params_without_pp, tmp_path):
+    fake_read_params.return_value = dummy_params_without_pp
+    (tmp_path / "chips/bar").mkdir(parents=True)
+
+    write_file(suffix=".spec", order="shot", save_path=tmp_path)
+
+    lines = (tmp_path / "chips/bar/chip.spec").read_text().splitlines()
+    assert len(lines) == 25600
+    assert lines[0] == "chip_A1_aa\t0.0\t0.0\t0.0\t-1"
+    assert lines[20] == "chip_A1_bt\t2.375\t0.125\t0.0\t-1"
+    assert lines[400] == "chip_B1_aa\t0.0\t3.175\t0.0\t-1"
+    assert lines[3200] == "chip_H2_aa\t3.175\t22.225\t0.0\t-1"
+
+
+@patch(
+    "mx_bluesky.beamlines.i24.serial.fixed_target.i24ssx_Chip_StartUp_py3v1.read_parameter_file"
+)
+def test_write_file_with_random_presence(
+    fake_read_params, dummy_params_without_pp, tmp_path
+):
+    fake_read_params.return_value = dummy_params_without_pp
+    (tmp_path / "chips/bar").mkdir(parents=True)
+
+    write_file(suffix="rando.spec", save_path=tmp_path)
+
+    lines = (tmp_path / "chips/bar/chiprando.spec").read_text().splitlines()
+    assert {line.split("\t")[-1] for line in lines} == {"0", "1"}
+
+
+def test_write_file_with_unknown_order_raises(dummy_params_without_pp, tmp_path):
+    with (
+        patch(
+            "mx_bluesky.beamlines.i24.serial.fixed_target.i24ssx_Chip_StartUp_py3v1.read_parameter_file",
+            return_value=dummy_params_without_pp,
+        ),
+        pytest.raises(ValueError),
+    ):
+        write_file(order="diagonal", save_path=tmp_path)
@@ -92,27 +92,23 @@ def test_get_prog_number_raises_error_for_disabled_map_setting():
             1,
             2,
             False,
-            ["P1439=0", "P1441=0", "P1400=1"],
+            ["P1439=0 P1441=0 P1400=1"],
         ),  # Map irrelevant, pp to Repeat1, no checker
         (
             0,
             3,
             True,
-            ["P1439=0", "P1439=1", "P1441=0", "P1400=1"],
+            ["P1439=1 P1441=0 P1400=1"],
         ),  # Map irrelevant, pp to Repeat2, checker enabled
         (
             1,
             8,
             False,
-            ["P1439=0", "P1441=50", "P1400=1"],
+            ["P1439=0 P1441=50 P1400=1"],
         ),  # Map irrelevant, pp to Medium1, checker disabled
     ],
 )
-@patch(
-    "mx_bluesky.beamlines.i24.serial.fixed_target.i24ssx_Chip_Collect_py3v1.bps.sleep"
-)
 def test_load_motion_program_data(
-    mock_sleep,
     map_type: int,
     pump_repeat: int,
     checker: bool,
@@ -126,7 +122,7 @@ def test_load_motion_program_data(
     for i in expected_calls:
         call_list.append(call(i, wait=True, timeout=10.0))
     mock_pmac_str = get_mock_put(pmac.pmac_string)
-    mock_pmac_str.assert_has_calls(call_list)
+    assert mock_pmac_str.call_args_list == call_list
 
 
 @patch("mx_bluesky.beamlines.i24.serial.fixed_target.i24ssx_Chip_Collect_py3v1.DCID")
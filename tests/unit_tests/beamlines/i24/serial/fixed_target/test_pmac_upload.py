@@ -0,0 +1,66 @@
+from unittest.mock import call, patch
+
+import bluesky.plan_stubs as bps
+import pytest
+from dodal.devices.i24.pmac import PMAC
+from ophyd_async.core import get_mock_put
+
+from mx_bluesky.beamlines.i24.serial.fixed_target.pmac_upload import (
+    MAX_PMAC_STRING_LENGTH,
+    PMACUploadError,
+    pack_pmac_commands,
+    upload_pmac_commands,
+)
+
+
+def test_pack_pmac_commands_fills_lines_in_order():
+    commands = [f"P30{i:02d}1=1" for i in range(1, 12)]
+
+    lines = pack_pmac_commands(commands)
+
+    assert lines == [
+        "P30011=1 P30021=1 P30031=1 P30041=1",
+        "P30051=1 P30061=1 P30071=1 P30081=1",
+        "P30091=1 P30101=1 P30111=1",
+    ]
+    assert " ".join(lines).split() == commands
+
+
+def test_pack_pmac_commands_uses_whole_string_length():
+    commands = ["P5001=$0000000", "P5002=$0000000", "P1=1", "P22=1234567890"]
+
+    lines = pack_pmac_commands(commands)
+
+    assert lines == ["P5001=$0000000 P5002=$0000000 P1=1", "P22=1234567890"]
+    assert all(len(line) <= MAX_PMAC_STRING_LENGTH for line in lines)
+
+
+def test_pack_pmac_commands_with_no_commands():
+    assert pack_pmac_commands([]) == []
+
+
+def test_pack_pmac_commands_raises_for_command_too_long():
+    with pytest.raises(ValueError):
+        pack_pmac_commands(["P1=" + "1" * MAX_PMAC_STRING_LENGTH])
+
+
+def test_upload_pmac_commands_puts_each_line_once(pmac: PMAC, RE):
+    RE(upload_pmac_commands(pmac, [f"P{i}=1" for i in range(1, 11)]))
+
+    assert get_mock_put(pmac.pmac_string).call_args_list == [
+        call("P1=1 P2=1 P3=1 P4=1 P5=1 P6=1 P7=1 P8=1", wait=True, timeout=10.0),
+        call("P9=1 P10=1", wait=True, timeout=10.0),
+    ]
+
+
+def test_upload_pmac_commands_raises_if_last_line_not_read_back(pmac: PMAC, RE):
+    def read_back_other_string(_):
+        yield from bps.null()
+        return "P2=2"
+
+    with patch(
+        "mx_bluesky.beamlines.i24.serial.fixed_target.pmac_upload.bps.rd",
+        read_back_other_string,
+    ):
+        with pytest.raises(PMACUploadError, match="read back as P2=2, expected P1=1"):
+            RE(upload_pmac_commands(pmac, ["P1=1"]))
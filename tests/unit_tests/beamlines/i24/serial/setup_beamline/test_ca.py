@@ -0,0 +1,120 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from epics import dbr
+
+from mx_bluesky.beamlines.i24.serial.setup_beamline import ca
+from mx_bluesky.beamlines.i24.serial.setup_beamline.ca import (
+    GET_ATTEMPTS,
+    caget,
+    caget_many,
+    cagetstring,
+    caput,
+    caput_many,
+)
+
+from ..conftest import FakeChannel
+
+
+@patch("mx_bluesky.beamlines.i24.serial.setup_beamline.ca.epics")
+def test_channels_are_created_once_per_pv(fake_epics: MagicMock):
+    fake_epics.PV.side_effect = lambda *args, **kwargs: MagicMock()
+    ca._channel.cache_clear()
+    try:
+        assert ca._channel("BL24I-TEST-01") is ca._channel("BL24I-TEST-01")
+        assert ca._channel("BL24I-TEST-02") is not ca._channel("BL24I-TEST-01")
+        assert fake_epics.PV.call_count == 2
+    finally:
+        ca._channel.cache_clear()
+
+
+@pytest.mark.parametrize(
+    "value, ftype, expected_value",
+    [
+        (1.5, dbr.DOUBLE, "1.5"),
+        (2.0, dbr.DOUBLE, "2"),
+        (0.123456789, dbr.TIME_DOUBLE, "0.123457"),
+        (0.10000000149011612, dbr.FLOAT, "0.1"),
+        (1234567.0, dbr.DOUBLE, "1.23457e+06"),
+        (3, dbr.LONG, "3"),
+        ("Out", dbr.ENUM, "Out"),
+        ("chip_01", dbr.CHAR, "chip_01"),
+    ],
+)
+def test_caget_returns_value_as_caget_prints_it(
+    fake_channels: dict[str, FakeChannel], value, ftype, expected_value
+):
+    fake_channels["BL24I-TEST-01"] = FakeChannel(value, ftype)
+
+    assert caget("BL24I-TEST-01") == expected_value
+    assert cagetstring("BL24I-TEST-01") == expected_value
+
+
+def test_caget_many_returns_values_in_order(fake_channels: dict[str, FakeChannel]):
+    for i in range(5):
+        fake_channels[f"BL24I-TEST-{i:02d}"] = FakeChannel(i, dbr.LONG)
+
+    assert caget_many([f"BL24I-TEST-{i:02d}" for i in (3, 1, 4)]) == ["3", "1", "4"]
+
+
+def test_caget_retries_timed_out_gets(fake_channels: dict[str, FakeChannel]):
+    fake_channels["BL24I-TEST-01"].get_timeouts = GET_ATTEMPTS - 1
+
+    assert caget("BL24I-TEST-01") == "0"
+    assert fake_channels["BL24I-TEST-01"].gets == GET_ATTEMPTS
+
+
+def test_caget_many_only_retries_the_pvs_which_timed_out(
+    fake_channels: dict[str, FakeChannel],
+):
+    fake_channels["BL24I-TEST-02"].get_timeouts = 1
+
+    assert caget_many(["BL24I-TEST-01", "BL24I-TEST-02"]) == ["0", "0"]
+    assert fake_channels["BL24I-TEST-01"].gets == 1
+    assert fake_channels["BL24I-TEST-02"].gets == 2
+
+
+def test_caget_gives_up_after_bounded_attempts(fake_channels: dict[str, FakeChannel]):
+    fake_channels["BL24I-TEST-02"].get_timeouts = GET_ATTEMPTS
+    fake_channels["BL24I-TEST-03"].connected = False
+
+    with pytest.raises(TimeoutError, match="BL24I-TEST-02, BL24I-TEST-03"):
+        caget_many(["BL24I-TEST-01", "BL24I-TEST-02", "BL24I-TEST-03"])
+    assert fake_channels["BL24I-TEST-02"].gets == GET_ATTEMPTS
+
+
+@pytest.mark.parametrize(
+    "ftype, value, expected_value",
+    [
+        (dbr.DOUBLE, "1.5", 1.5),
+        (dbr.LONG, "3", 3),
+        (dbr.DOUBLE, 2, 2),
+        (dbr.CHAR, "chip_01", "chip_01"),
+        (dbr.STRING, "10", "10"),
+        (dbr.ENUM, "Out", "Out"),
+        (dbr.TIME_ENUM, "Out", "Out"),
+    ],
+)
+def test_caput_parses_strings_written_to_numeric_pvs(
+    fake_channels: dict[str, FakeChannel], ftype, value, expected_value
+):
+    fake_channels["BL24I-TEST-01"] = FakeChannel(ftype=ftype)
+
+    caput("BL24I-TEST-01", value)
+
+    assert fake_channels["BL24I-TEST-01"].puts == [expected_value]
+
+
+def test_caput_many_writes_nothing_if_a_pv_cannot_be_connected_to(
+    fake_channels: dict[str, FakeChannel],
+):
+    fake_channels["BL24I-TEST-02"].connected = False
+
+    with pytest.raises(TimeoutError, match="BL24I-TEST-02"):
+        caput_many(["BL24I-TEST-01", "BL24I-TEST-02"], [1, 2])
+    assert fake_channels["BL24I-TEST-01"].puts == []
+
+
+def test_caput_many_needs_a_value_for_each_pv(fake_channels: dict[str, FakeChannel]):
+    with pytest.raises(ValueError):
+        caput_many(["BL24I-TEST-01", "BL24I-TEST-02"], [1])
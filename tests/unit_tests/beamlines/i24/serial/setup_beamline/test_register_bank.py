@@ -0,0 +1,43 @@
+from unittest.mock import MagicMock, patch
+
+from mx_bluesky.beamlines.i24.serial.setup_beamline.register_bank import (
+    gp_pv,
+    read_register_bank,
+    set_register_bank,
+)
+
+from ..conftest import FakeChannel
+
+
+def test_set_register_bank_writes_each_register(
+    fake_channels: dict[str, FakeChannel],
+):
+    set_register_bank({11: 0, 12: 1, 100: "2.5"})
+
+    assert {pv_name: c.puts for pv_name, c in fake_channels.items()} == {
+        "ME14E-MO-IOC-01:GP11": [0],
+        "ME14E-MO-IOC-01:GP12": [1],
+        "ME14E-MO-IOC-01:GP100": [2.5],
+    }
+
+
+def test_read_register_bank_returns_values_by_register(
+    fake_channels: dict[str, FakeChannel],
+):
+    fake_channels[gp_pv(12)].value = 1
+
+    assert read_register_bank(range(11, 14)) == {11: "0", 12: "1", 13: "0"}
+
+
+@patch("mx_bluesky.beamlines.i24.serial.setup_beamline.register_bank.caget_many")
+@patch("mx_bluesky.beamlines.i24.serial.setup_beamline.register_bank.caput_many")
+def test_register_banks_are_read_and_written_in_one_go(
+    fake_caput_many: MagicMock, fake_caget_many: MagicMock
+):
+    fake_caget_many.return_value = ["0"] * 81
+
+    set_register_bank({register: 0 for register in range(4, 120)})
+    read_register_bank(range(11, 92))
+
+    fake_caput_many.assert_called_once()
+    fake_caget_many.assert_called_once_with([gp_pv(r) for r in range(11, 92)])
@@ -1,9 +1,11 @@
-from unittest.mock import MagicMock
+import time
+from unittest.mock import MagicMock, patch
 
 import pytest
 from bluesky import plan_stubs as bps
 from bluesky.run_engine import RunEngine
-from dodal.devices.oav.oav_detector import OAV
+from dodal.beamlines import i03
+from dodal.devices.oav.oav_detector import OAV, OAVConfigParams
 from dodal.devices.oav.oav_parameters import OAVParameters
 from dodal.devices.oav.pin_image_recognition import PinTipDetection
 from ophyd.signal import Signal
@@ -11,6 +13,7 @@ from ophyd.status import Status
 
 from mx_bluesky.hyperion.device_setup_plans.setup_oav import (
     pre_centring_setup_oav,
+    wait_for_new_oav_frames,
 )
 
 OAV_CENTRING_JSON = "tests/test_data/test_OAVCentring.json"
@@ -35,3 +38,59 @@ def test_when_set_up_oav_then_only_waits_on_oav_to_finish(
 
     RE = RunEngine()
     RE(my_plan())
+
+
+def test_wait_for_new_oav_frames_waits_for_the_counter_to_go_up(oav: OAV):
+    def plan():
+        start_count = yield from bps.rd(oav.cam.array_counter)  # type: ignore
+        yield from wait_for_new_oav_frames(oav, frames=3, timeout=1)
+        count = yield from bps.rd(oav.cam.array_counter)  # type: ignore
+        assert count >= start_count + 3
+
+    RunEngine()(plan())
+
+
+@patch("mx_bluesky.hyperion.device_setup_plans.setup_oav.OAV_REFRESH_WAIT")
+def test_wait_for_new_oav_frames_records_time_waited(
+    mock_refresh_wait: MagicMock, oav: OAV
+):
+    start = time.perf_counter()
+    RunEngine()(wait_for_new_oav_frames(oav, "omega move"))
+    elapsed = time.perf_counter() - start
+
+    mock_refresh_wait.record.assert_called_once()
+    waited, attributes = mock_refresh_wait.record.call_args.args
+    assert 0 < waited <= elapsed
+    assert attributes == {"after": "omega move", "timed_out": False}
+
+
+@patch("mx_bluesky.hyperion.device_setup_plans.setup_oav.OAV_REFRESH_WAIT")
+@patch("mx_bluesky.hyperion.device_setup_plans.setup_oav.LOGGER")
+def test_wait_for_new_oav_frames_carries_on_with_warning_if_no_frames(
+    mock_logger: MagicMock, mock_refresh_wait: MagicMock, test_config_files
+):
+    RE = RunEngine()
+    oav = i03.oav(
+        fake_with_ophyd_sim=True,
+        params=OAVConfigParams(
+            test_config_files["zoom_params_file"], test_config_files["display_config"]
+        ),
+    )
+    oav.cam.array_counter.sim_put(5)  # type: ignore
+
+    start = time.perf_counter()
+    RE(wait_for_new_oav_frames(oav, timeout=0.1))
+
+    assert time.perf_counter() - start < 1
+    mock_logger.warning.assert_called_once()
+    assert mock_refresh_wait.record.call_args.args[1]["timed_out"]
+
+
+@patch("mx_bluesky.hyperion.device_setup_plans.setup_oav.SubscriptionStatus")
+def test_wait_for_new_oav_frames_raises_errors_other_than_timeout(
+    mock_status: MagicMock, oav: OAV
+):
+    mock_status.return_value.wait.side_effect = RuntimeError("Disconnected")
+
+    with pytest.raises(RuntimeError, match="Disconnected"):
+        RunEngine()(wait_for_new_oav_frames(oav))
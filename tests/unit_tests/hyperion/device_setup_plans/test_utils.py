@@ -1,13 +1,16 @@
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 from bluesky import plan_stubs as bps
 from bluesky.utils import FailedStatus
 from dodal.beamlines import i03
 from ophyd.status import Status
+from ophyd_async.core import set_mock_value, soft_signal_rw
 
 from mx_bluesky.hyperion.device_setup_plans.utils import (
     start_preparing_data_collection_then_do_plan,
+    wait_for_signals,
+    wait_for_status,
 )
 
 
@@ -92,3 +95,89 @@ def test_given_detector_move_fails_then_eiger_disarmed_and_correct_exception_ret
     mock_eiger.async_stage.assert_called_once()
     detector_motion.z.set.assert_called_once()
     mock_eiger.disarm_detector.assert_called_once()
+
+
+@patch("mx_bluesky.hyperion.device_setup_plans.utils.time_in_background")
+def test_eiger_arming_is_timed_in_the_background(
+    mock_time_in_background: MagicMock, mock_eiger, RE
+):
+    arm_status = Status()
+    mock_eiger.do_arm.set = MagicMock(return_value=arm_status)
+    arm_status.set_finished()
+
+    RE(
+        start_preparing_data_collection_then_do_plan(
+            mock_eiger, MagicMock(), 100, bps.null()
+        )
+    )
+
+    mock_time_in_background.assert_called_once_with(arm_status, "eiger_arming")
+
+
+@pytest.fixture
+def signals(RE):
+    first = soft_signal_rw(int, 0, name="first")
+    second = soft_signal_rw(int, 0, name="second")
+    RE(
+        bps.wait_for(
+            [lambda: first.connect(mock=True), lambda: second.connect(mock=True)]
+        )
+    )
+    return first, second
+
+
+def test_given_condition_already_met_then_wait_for_signals_returns(signals, RE):
+    RE(wait_for_signals(lambda a, b: a == b, *signals, timeout=0.1))
+
+
+def test_given_signals_change_during_wait_then_wait_for_signals_returns_once_condition_met(
+    signals, RE
+):
+    first, second = signals
+    set_mock_value(second, 1)
+    RE.loop.call_soon_threadsafe(
+        RE.loop.call_later, 0.05, lambda: set_mock_value(first, 1)
+    )
+    RE(wait_for_signals(lambda a, b: a == b == 1, *signals, timeout=1))
+
+
+def test_given_condition_not_met_then_wait_for_signals_raises_with_last_values(
+    signals, RE
+):
+    first, second = signals
+    set_mock_value(second, 3)
+    with pytest.raises(TimeoutError, match="first, second, last values .*'second': 3"):
+        RE(wait_for_signals(lambda a, b: a == b, *signals, timeout=0.05))
+
+
+def test_wait_for_signals_unsubscribes_when_done(signals, RE):
+    first, _ = signals
+    predicate = MagicMock(return_value=False)
+    with pytest.raises(TimeoutError):
+        RE(wait_for_signals(predicate, first, timeout=0.05))
+    predicate.reset_mock()
+    set_mock_value(first, 5)
+    predicate.assert_not_called()
+
+
+def test_given_status_finishes_then_wait_for_status_returns(RE):
+    status = Status()
+    RE.loop.call_soon_threadsafe(RE.loop.call_later, 0.05, status.set_finished)
+    RE(wait_for_status(lambda: status, "the status", timeout=1))
+    assert status.success
+
+
+def test_given_status_fails_then_wait_for_status_raises_its_error(RE):
+    status = Status()
+    status.set_exception(MyTestException("failed"))
+    with pytest.raises(MyTestException, match="failed"):
+        RE(wait_for_status(lambda: status, "the status", timeout=1))
+
+
+def test_given_status_not_finished_then_wait_for_status_raises_and_stops_the_status(
+    RE,
+):
+    status = Status()
+    with pytest.raises(TimeoutError, match="0.05s waiting for the status"):
+        RE(wait_for_status(lambda: status, "the status", timeout=0.05))
+    assert status.done and not status.success
@@ -65,6 +65,7 @@ from mx_bluesky.hyperion.external_interaction.ispyb.ispyb_store import (
 from mx_bluesky.hyperion.log import ISPYB_LOGGER
 from mx_bluesky.hyperion.parameters.constants import CONST
 from mx_bluesky.hyperion.parameters.gridscan import ThreeDGridScan
+from mx_bluesky.hyperion.utils.utils import compact_scan_points
 from tests.conftest import (
     RunEngineSimulator,
     create_dummy_scan_spec,
@@ -803,22 +804,29 @@ class TestFlyscanXrayCentrePlan:
 
         patch_sleep.assert_not_called()
 
-    @patch(
-        "mx_bluesky.hyperion.experiment_plans.flyscan_xray_centre_plan.bps.sleep",
-        autospec=True,
-    )
-    def test_GIVEN_scan_not_valid_THEN_wait_for_GRIDSCAN_raises_and_sleeps_called(
-        self, patch_sleep: MagicMock, RE: RunEngine
-    ):
+    def test_GIVEN_scan_not_valid_THEN_wait_for_GRIDSCAN_raises(self, RE: RunEngine):
         test_fgs: ZebraFastGridScan = i03.zebra_fast_grid_scan(fake_with_ophyd_sim=True)
 
         set_mock_value(test_fgs.scan_invalid, True)
         set_mock_value(test_fgs.position_counter, 0)
 
         with pytest.raises(WarningException):
-            RE(wait_for_gridscan_valid(test_fgs))
+            RE(wait_for_gridscan_valid(test_fgs, timeout=0.05))
 
-        patch_sleep.assert_called()
+    def test_GIVEN_scan_becomes_valid_THEN_wait_for_GRIDSCAN_returns(
+        self, RE: RunEngine
+    ):
+        test_fgs: ZebraFastGridScan = i03.zebra_fast_grid_scan(fake_with_ophyd_sim=True)
+
+        set_mock_value(test_fgs.scan_invalid, True)
+        set_mock_value(test_fgs.position_counter, 5)
+
+        def make_valid():
+            set_mock_value(test_fgs.scan_invalid, False)
+            set_mock_value(test_fgs.position_counter, 0)
+
+        RE.loop.call_soon_threadsafe(RE.loop.call_later, 0.05, make_valid)
+        RE(wait_for_gridscan_valid(test_fgs))
 
     @patch(
         "mx_bluesky.hyperion.experiment_plans.flyscan_xray_centre_plan.bps.abs_set",
@@ -996,6 +1004,52 @@ class TestFlyscanXrayCentrePlan:
         fake_fgs_composite.eiger.stage.assert_called_once()  # type: ignore
         fake_fgs_composite.eiger.unstage.assert_called_once()
 
+    @pytest.mark.parametrize("compact", [True, False])
+    @patch(
+        "mx_bluesky.hyperion.experiment_plans.flyscan_xray_centre_plan.kickoff_and_complete_gridscan",
+        autospec=True,
+    )
+    @patch(
+        "mx_bluesky.hyperion.experiment_plans.flyscan_xray_centre_plan.bps.wait",
+        autospec=True,
+    )
+    def test_run_gridscan_passes_compact_scan_points_if_feature_enabled(
+        self,
+        mock_wait,
+        mock_kickoff_and_complete,
+        fake_fgs_composite: FlyScanXRayCentreComposite,
+        test_fgs_params_panda_zebra: ThreeDGridScan,
+        RE: RunEngine,
+        done_status: Status,
+        compact: bool,
+    ):
+        mock_kickoff_and_complete.return_value = iter([])
+        test_fgs_params_panda_zebra.features.compact_scan_points_in_documents = compact
+        feature_controlled = _get_feature_controlled(
+            fake_fgs_composite, test_fgs_params_panda_zebra
+        )
+        fake_fgs_composite.eiger.unstage = MagicMock(return_value=done_status)
+        RE(
+            run_gridscan(
+                fake_fgs_composite, test_fgs_params_panda_zebra, feature_controlled
+            )
+        )
+        scan_points = mock_kickoff_and_complete.call_args.args[3]
+        if compact:
+            assert scan_points == [
+                compact_scan_points(test_fgs_params_panda_zebra.grid_1_spec),
+                compact_scan_points(test_fgs_params_panda_zebra.grid_2_spec),
+            ]
+        else:
+            expected_points = [
+                test_fgs_params_panda_zebra.scan_points_first_grid,
+                test_fgs_params_panda_zebra.scan_points_second_grid,
+            ]
+            for points, expected in zip(scan_points, expected_points, strict=True):
+                assert points.keys() == expected.keys()
+                for axis in expected:
+                    np.testing.assert_array_equal(points[axis], expected[axis])
+
     @patch(
         "mx_bluesky.hyperion.experiment_plans.flyscan_xray_centre_plan.bps.kickoff",
         autospec=True,
@@ -1174,6 +1228,100 @@ class TestFlyscanXrayCentrePlan:
             msgs, lambda msg: msg.command == "save"
         )
 
+    @pytest.mark.parametrize(
+        "early_zocalo_run_end, first_after_complete, second_after_complete",
+        [(False, "unstage", "close_run"), (True, "close_run", "unstage")],
+    )
+    @patch(
+        "mx_bluesky.hyperion.experiment_plans.flyscan_xray_centre_plan.check_topup_and_wait_if_necessary",
+        new=MagicMock(side_effect=lambda *_, **__: iter([Msg("check_topup")])),
+    )
+    def test_do_fgs_run_ends_before_eiger_unstage_if_early_zocalo_run_end(
+        self,
+        fake_fgs_composite: FlyScanXRayCentreComposite,
+        test_fgs_params_panda_zebra: ThreeDGridScan,
+        sim_run_engine: RunEngineSimulator,
+        early_zocalo_run_end: bool,
+        first_after_complete: str,
+        second_after_complete: str,
+    ):
+        test_fgs_params_panda_zebra.features.early_zocalo_run_end = early_zocalo_run_end
+        feature_controlled = _get_feature_controlled(
+            fake_fgs_composite, test_fgs_params_panda_zebra
+        )
+        sim_run_engine.add_handler(
+            "read",
+            lambda msg: {"values": {"value": SynchrotronMode.USER}},
+            "synchrotron-synchrotron_mode",
+        )
+        msgs = sim_run_engine.simulate_plan(
+            run_gridscan(
+                fake_fgs_composite, test_fgs_params_panda_zebra, feature_controlled
+            )
+        )
+        msgs = assert_message_and_return_remaining(
+            msgs,
+            lambda msg: msg.command == "open_run"
+            and msg.kwargs["subplan_name"] == CONST.PLAN.DO_FGS,
+        )
+        msgs = assert_message_and_return_remaining(
+            msgs,
+            lambda msg: msg.command == "complete"
+            and msg.obj == feature_controlled.fgs_motors,
+        )
+        msgs = assert_message_and_return_remaining(
+            msgs,
+            lambda msg: msg.command in ("unstage", "close_run")
+            and msg.obj in (None, fake_fgs_composite.eiger),
+        )
+        assert msgs[0].command == first_after_complete
+        assert_message_and_return_remaining(
+            msgs[1:], lambda msg: msg.command == second_after_complete
+        )
+
+    @patch(
+        "mx_bluesky.hyperion.experiment_plans.flyscan_xray_centre_plan.check_topup_and_wait_if_necessary",
+        new=MagicMock(side_effect=lambda *_, **__: iter([Msg("check_topup")])),
+    )
+    @patch(
+        "mx_bluesky.hyperion.experiment_plans.flyscan_xray_centre_plan.wait_for_status",
+    )
+    def test_early_zocalo_run_end_waits_for_files_to_be_closed_before_ending_do_fgs(
+        self,
+        mock_wait_for_status: MagicMock,
+        fake_fgs_composite: FlyScanXRayCentreComposite,
+        test_fgs_params_panda_zebra: ThreeDGridScan,
+        sim_run_engine: RunEngineSimulator,
+    ):
+        mock_wait_for_status.side_effect = lambda *_: iter([Msg("files_closed")])
+        test_fgs_params_panda_zebra.features.early_zocalo_run_end = True
+        feature_controlled = _get_feature_controlled(
+            fake_fgs_composite, test_fgs_params_panda_zebra
+        )
+        sim_run_engine.add_handler(
+            "read",
+            lambda msg: {"values": {"value": SynchrotronMode.USER}},
+            "synchrotron-synchrotron_mode",
+        )
+        msgs = sim_run_engine.simulate_plan(
+            run_gridscan(
+                fake_fgs_composite, test_fgs_params_panda_zebra, feature_controlled
+            )
+        )
+        msgs = assert_message_and_return_remaining(
+            msgs,
+            lambda msg: msg.command == "complete"
+            and msg.obj == feature_controlled.fgs_motors,
+        )
+        assert msgs[1].command == "wait"
+        assert msgs[2].command == "files_closed"
+        assert msgs[3].command == "close_run"
+        mock_wait_for_status.assert_called_once_with(
+            fake_fgs_composite.eiger.odin.create_finished_status,
+            "the Eiger filewriters to close the files",
+            CONST.HARDWARE.EIGER_FILES_CLOSED_TIMEOUT,
+        )
+
     @patch(
         "mx_bluesky.hyperion.experiment_plans.flyscan_xray_centre_plan.kickoff_and_complete_gridscan",
     )
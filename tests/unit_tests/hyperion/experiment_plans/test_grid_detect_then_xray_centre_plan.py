@@ -40,6 +40,7 @@ def _fake_grid_detection(
     snapshot_dir: str,
     grid_width_microns: float = 0,
     box_size_um: float = 0.0,
+    edge_outlier_percentile: float = 0,
 ):
     oav = i03.oav(fake_with_ophyd_sim=True)
     oav.grid_snapshot.box_width.put(635.00986)
@@ -1,12 +1,13 @@
+import threading
 from typing import Any, Literal
-from unittest.mock import DEFAULT, AsyncMock, MagicMock, patch
+from unittest.mock import DEFAULT, AsyncMock, MagicMock, call, patch
 
 import bluesky.preprocessors as bpp
 import numpy as np
 import pytest
 from bluesky.run_engine import RunEngine
 from bluesky.simulators import RunEngineSimulator
-from bluesky.utils import Msg
+from bluesky.utils import FailedStatus, Msg
 from dodal.beamlines import i03
 from dodal.devices.backlight import Backlight
 from dodal.devices.oav.oav_detector import OAVConfigParams
@@ -15,11 +16,15 @@ from dodal.devices.oav.pin_image_recognition import PinTipDetection
 from dodal.devices.oav.pin_image_recognition.utils import NONE_VALUE, SampleLocation
 from dodal.devices.smargon import Smargon
 from numpy._typing._array_like import NDArray
+from ophyd.status import Status
 from ophyd_async.core import set_mock_value
 
 from mx_bluesky.hyperion.exceptions import WarningException
 from mx_bluesky.hyperion.experiment_plans.oav_grid_detection_plan import (
     OavGridDetectionComposite,
+    _LazyArrayStr,
+    _wait_for_snapshot_image,
+    get_grid_extent,
     get_min_and_max_y_of_pin,
     grid_detection_plan,
 )
@@ -32,6 +37,7 @@ from mx_bluesky.hyperion.external_interaction.callbacks.xray_centre.ispyb_callba
 )
 from mx_bluesky.hyperion.parameters.gridscan import ThreeDGridScan
 
+from ....conftest import oav_producing_frames
 from .conftest import assert_event
 
 
@@ -75,6 +81,7 @@ def fake_devices(
     with (
         patch("dodal.devices.areadetector.plugins.MJPG.requests") as patch_requests,
         patch("dodal.devices.areadetector.plugins.MJPG.Image") as mock_image_class,
+        oav_producing_frames(oav),
     ):
         patch_requests.get.return_value.content = b""
         mock_image = MagicMock()
@@ -413,17 +420,180 @@ def test_when_detected_grid_has_odd_y_steps_then_add_a_y_step_and_shift_grid(
     expected_min_y = initial_min_y - box_size_y_pixels / 2 if odd else initial_min_y
     expected_y_steps = 2
 
-    if odd:
-        fake_logger.debug.assert_called_once_with(
-            f"Forcing number of rows in first grid to be even: Adding an extra row onto bottom of first grid and shifting grid upwards by {box_size_y_pixels/2}"
-        )
-    else:
-        fake_logger.debug.assert_not_called()
+    forcing_even_rows = call(
+        f"Forcing number of rows in first grid to be even: Adding an extra row onto bottom of first grid and shifting grid upwards by {box_size_y_pixels/2}"
+    )
+    assert (forcing_even_rows in fake_logger.debug.call_args_list) == odd
 
     assert abs_sets["grid_snapshot.top_left_y"][0] == expected_min_y
     assert abs_sets["grid_snapshot.num_boxes_y"][0] == expected_y_steps
 
 
+@patch(
+    "dodal.common.beamlines.beamline_utils.active_device_is_same_type",
+    lambda a, b: True,
+)
+def test_grid_detection_moves_to_next_angle_while_saving_snapshot(
+    fake_devices: tuple[OavGridDetectionComposite, MagicMock],
+    sim_run_engine: RunEngineSimulator,
+    test_config_files: dict[str, str],
+):
+    composite, _ = fake_devices
+    params = OAVParameters("loopCentring", test_config_files["oav_config_json"])
+    sim_run_engine.add_read_handler_for(
+        composite.pin_tip_detection.triggered_tip, (8, 5)
+    )
+    for edge in (
+        composite.pin_tip_detection.triggered_top_edge,
+        composite.pin_tip_detection.triggered_bottom_edge,
+    ):
+        sim_run_engine.add_read_handler_for(edge, np.array([10] * 20))
+
+    msgs = sim_run_engine.simulate_plan(
+        grid_detection_plan(
+            composite,
+            parameters=params,
+            snapshot_dir="tmp",
+            snapshot_template="test_{angle}",
+            grid_width_microns=161.2,
+        )
+    )
+
+    omega = composite.smargon.omega
+    snapshot = composite.oav.grid_snapshot
+    steps = [
+        (msg.command, msg.obj)
+        for msg in msgs
+        if msg.command in ("create", "save")
+        or (msg.command == "set" and msg.obj is omega)
+        or (msg.command == "trigger" and msg.obj is snapshot)
+    ]
+    assert steps == [
+        ("set", omega),
+        ("trigger", snapshot),
+        ("create", None),
+        ("set", omega),
+        ("save", None),
+        ("trigger", snapshot),
+        ("create", None),
+        ("save", None),
+    ]
+
+
+def _fail_second_snapshot_after_image_saved(composite: OavGridDetectionComposite):
+    snapshot = composite.oav.grid_snapshot
+    statuses = []
+
+    def trigger():
+        snapshot.last_saved_path.put("image.png")
+        status = Status()
+        if statuses:
+            threading.Timer(
+                0.1, status.set_exception, [RuntimeError("Snapshot failed")]
+            ).start()
+        else:
+            status.set_finished()
+        statuses.append(status)
+        return status
+
+    snapshot.trigger = trigger
+
+
+@patch(
+    "dodal.common.beamlines.beamline_utils.active_device_is_same_type",
+    lambda a, b: True,
+)
+def test_when_snapshot_fails_then_its_event_is_dropped_and_error_raised(
+    RE: RunEngine,
+    test_config_files: dict[str, str],
+    fake_devices: tuple[OavGridDetectionComposite, MagicMock],
+):
+    params = OAVParameters("loopCentring", test_config_files["oav_config_json"])
+    composite, _ = fake_devices
+    _fail_second_snapshot_after_image_saved(composite)
+    events = []
+    RE.subscribe(lambda name, doc: events.append(doc), "event")
+
+    @bpp.run_decorator()
+    def decorated():
+        yield from grid_detection_plan(
+            composite,
+            parameters=params,
+            snapshot_dir="tmp",
+            snapshot_template="test_{angle}",
+            grid_width_microns=161.2,
+        )
+
+    with pytest.raises(FailedStatus) as e:
+        RE(decorated())
+
+    assert str(e.value.__cause__) == "Snapshot failed"
+    assert len(events) == 1
+
+
+@patch(
+    "dodal.common.beamlines.beamline_utils.active_device_is_same_type",
+    lambda a, b: True,
+)
+def test_when_plan_closed_with_snapshot_event_open_then_nothing_more_is_yielded(
+    fake_devices: tuple[OavGridDetectionComposite, MagicMock],
+    sim_run_engine: RunEngineSimulator,
+    test_config_files: dict[str, str],
+):
+    composite, _ = fake_devices
+    params = OAVParameters("loopCentring", test_config_files["oav_config_json"])
+    sim_run_engine.add_read_handler_for(
+        composite.pin_tip_detection.triggered_tip, (8, 5)
+    )
+    for edge in (
+        composite.pin_tip_detection.triggered_top_edge,
+        composite.pin_tip_detection.triggered_bottom_edge,
+    ):
+        sim_run_engine.add_read_handler_for(edge, np.array([10] * 20))
+    plan = grid_detection_plan(
+        composite,
+        parameters=params,
+        snapshot_dir="tmp",
+        snapshot_template="test_{angle}",
+        grid_width_microns=161.2,
+    )
+
+    response = None
+    while (msg := plan.send(response)).command != "create":
+        handler = next(
+            (h for h in sim_run_engine.message_handlers if h.predicate(msg)), None
+        )
+        response = handler.runnable(msg) if handler else None
+
+    plan.close()
+
+
+def test_wait_for_snapshot_image_returns_once_image_saved_without_waiting_for_grid(
+    RE: RunEngine, fake_devices: tuple[OavGridDetectionComposite, MagicMock]
+):
+    snapshot = fake_devices[0].oav.grid_snapshot
+    snapshot.last_saved_path.put("")
+    snapshot_taken = Status()
+    threading.Timer(0.05, snapshot.last_saved_path.put, ["image.png"]).start()
+
+    RE(_wait_for_snapshot_image(snapshot, snapshot_taken))
+
+    assert not snapshot_taken.done
+    snapshot_taken.set_finished()
+
+
+def test_wait_for_snapshot_image_raises_if_snapshot_fails_before_image_saved(
+    RE: RunEngine, fake_devices: tuple[OavGridDetectionComposite, MagicMock]
+):
+    snapshot = fake_devices[0].oav.grid_snapshot
+    snapshot.last_saved_path.put("")
+    snapshot_taken = Status()
+    snapshot_taken.set_exception(RuntimeError("Snapshot failed"))
+
+    with pytest.raises(RuntimeError, match="Snapshot failed"):
+        RE(_wait_for_snapshot_image(snapshot, snapshot_taken))
+
+
 @pytest.mark.parametrize(
     "top, bottom, expected_min, expected_max",
     [
@@ -479,3 +649,50 @@ def test_given_array_with_all_invalid_top_and_bottom_sections_then_min_and_max_i
     min_y, max_y = get_min_and_max_y_of_pin(top, bottom, 100)
     assert min_y == expected_min
     assert max_y == expected_max
+
+
+@pytest.mark.parametrize(
+    "outlier_percentile, expected_min, expected_max",
+    [(0, 1, 90), (5, 10, 30)],
+)
+def test_given_edge_outliers_then_percentile_clipping_ignores_them(
+    outlier_percentile: float, expected_min: int, expected_max: int
+):
+    top = np.array([1] + [10] * 98 + [NONE_VALUE])
+    bottom = np.array([90] + [30] * 98 + [NONE_VALUE])
+    min_y, max_y = get_min_and_max_y_of_pin(top, bottom, 100, outlier_percentile)
+    assert min_y == expected_min
+    assert max_y == expected_max
+
+
+@pytest.mark.parametrize(
+    "even_rows, expected_upper_left, expected_y_steps",
+    [(False, (50, 10), 3), (True, (50, 5), 4)],
+)
+def test_get_grid_extent_covers_the_pin(
+    even_rows: bool, expected_upper_left: tuple[int, float], expected_y_steps: int
+):
+    grid = get_grid_extent(
+        np.array([10, 12, 11]),
+        np.array([38, 40, 39]),
+        tip_x_px=50,
+        full_image_height_px=100,
+        grid_width_pixels=25,
+        box_size_x_pixels=10,
+        box_size_y_pixels=10,
+        even_rows=even_rows,
+    )
+    assert grid.upper_left == expected_upper_left
+    assert grid.x_steps == 3
+    assert grid.y_steps == expected_y_steps
+    assert grid.height_px == expected_y_steps * 10
+
+
+def test_lazy_array_str_only_formats_the_whole_array_when_logged():
+    with patch.object(np, "array2string", wraps=np.array2string) as array2string:
+        lazy_edges = _LazyArrayStr(np.arange(1024))
+        array2string.assert_not_called()
+        formatted = str(lazy_edges)
+    array2string.assert_called_once()
+    assert "..." not in formatted
+    assert len(formatted.strip("[]").split()) == 1024
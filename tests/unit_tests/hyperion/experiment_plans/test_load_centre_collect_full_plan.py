@@ -26,6 +26,7 @@ from mx_bluesky.hyperion.experiment_plans.rotation_scan_plan import (
 from mx_bluesky.hyperion.parameters.load_centre_collect import LoadCentreCollect
 from mx_bluesky.hyperion.parameters.robot_load import RobotLoadAndEnergyChange
 from mx_bluesky.hyperion.parameters.rotation import MultiRotationScan
+from mx_bluesky.hyperion.utils.phase_timing import SampleTimer
 
 from ....conftest import pin_tip_edge_data, raw_params_from_file
 
@@ -150,12 +151,16 @@ def test_load_centre_collect_full_plan_happy_path_invokes_all_steps(
     oav_parameters_for_rotation: OAVParameters,
     sim_run_engine,
 ):
-    sim_run_engine.simulate_plan(
-        load_centre_collect_full_plan(
-            composite, load_centre_collect_params, oav_parameters_for_rotation
+    sample_timer = SampleTimer()
+    with sample_timer.active():
+        sim_run_engine.simulate_plan(
+            load_centre_collect_full_plan(
+                composite, load_centre_collect_params, oav_parameters_for_rotation
+            )
         )
-    )
 
+    [timing] = sample_timer.samples()
+    assert timing["plan_name"] == "load_centre_collect_full_plan"
     mock_full_robot_load_plan.assert_called_once()
     robot_load_energy_change_composite = mock_full_robot_load_plan.mock_calls[0].args[0]
     robot_load_energy_change_params = mock_full_robot_load_plan.mock_calls[0].args[1]
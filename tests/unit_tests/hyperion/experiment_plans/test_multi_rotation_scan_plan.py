@@ -407,10 +407,13 @@ def test_full_multi_rotation_plan_ispyb_called_correctly(
         oav_parameters_for_rotation,
     )
     ispyb_calls = mock_ispyb_store.call_args_list
+    deposition_calls = [
+        c for c in mock_ispyb_store.return_value.method_calls if c[0] != "batch"
+    ]
     for instantiation_call, ispyb_store_calls, _ in zip(
         ispyb_calls,
         [  # there should be 4 calls to the IspybStore per run
-            mock_ispyb_store.return_value.method_calls[i * 4 : (i + 1) * 4]
+            deposition_calls[i * 4 : (i + 1) * 4]
             for i in range(len(test_multi_rotation_params.rotation_scans))
         ],
         test_multi_rotation_params.single_rotation_scans,
@@ -13,7 +13,9 @@ from mx_bluesky.hyperion.experiment_plans import optimise_attenuation_plan
 from mx_bluesky.hyperion.experiment_plans.optimise_attenuation_plan import (
     AttenuationOptimisationFailedException,
     Direction,
+    LogTransmissionSearch,
     OptimizeAttenuationComposite,
+    TransmissionSearch,
     calculate_new_direction,
     check_parameters,
     deadtime_calc_new_transmission,
@@ -383,3 +385,112 @@ def test_optimisation_attenuation_plan_runs_correct_functions(
     fake_composite.attenuator.set.assert_called_once()
     mock_check_parameters.assert_called_once()
     fake_composite.xspress3mini.acquire_time.set.assert_called_once()
+    optimisation = (
+        mock_total_counts_optimisation
+        if optimisation_type == "total_counts"
+        else mock_deadtime_optimisation
+    )
+    assert optimisation.call_args.args[-1] == TransmissionSearch.STEP
+
+
+def test_log_transmission_search_goes_straight_to_aim_for_a_linear_reading():
+    search = LogTransmissionSearch(100, 200, 150, 1, 1e-6)
+    assert search.next_transmission(1e-3, 10) == pytest.approx(1.5e-2)
+
+
+def test_log_transmission_search_fits_power_of_transmission():
+    # reading = 1e6 * transmission ** 2
+    search = LogTransmissionSearch(90, 110, 100, 1, 1e-6)
+    transmission = search.next_transmission(1e-3, 1)
+    assert transmission == pytest.approx(0.1)
+    transmission = search.next_transmission(transmission, 1e6 * transmission**2)
+    assert transmission == pytest.approx(1e-2)
+
+
+def test_log_transmission_search_bisects_when_model_leaves_bracket():
+    search = LogTransmissionSearch(100, 200, 150, 1, 1e-6)
+    search.next_transmission(1e-3, 10)
+    # Reading far above, so the next transmission would be below the one read below
+    assert search.next_transmission(4e-3, 1e5) == pytest.approx(2e-3)
+
+
+def test_log_transmission_search_steps_up_on_zero_reading_and_keeps_to_upper_limit():
+    search = LogTransmissionSearch(100, 200, 150, 0.1, 1e-6)
+    assert search.next_transmission(1e-3, 0) == pytest.approx(1e-2)
+    assert search.next_transmission(1e-2, 0) == 0.1
+
+
+def test_log_transmission_search_raises_below_lower_limit():
+    search = LogTransmissionSearch(100, 200, 150, 1, 1e-3)
+    with pytest.raises(AttenuationOptimisationFailedException):
+        search.next_transmission(1e-3, 1e4)
+
+
+@pytest.mark.parametrize("search", list(TransmissionSearch))
+def test_deadtime_optimisation_gets_below_threshold(
+    search: TransmissionSearch,
+    RE: RunEngine,
+    fake_composite_mocked_sets: OptimizeAttenuationComposite,
+):
+    channel = fake_composite_mocked_sets.xspress3mini.channels[1]
+    set_mock_value(channel.total_time, 1e7)
+    transmissions = []
+
+    def set_deadtime(transmission):
+        # Deadtime is proportional to transmission, 0.002 at 1e-3
+        transmissions.append(transmission)
+        set_mock_value(channel.reset_ticks, 1e7 * 2 * transmission)
+        return AsyncStatus(asyncio.sleep(0))
+
+    fake_composite_mocked_sets.attenuator.set = set_deadtime
+
+    optimised = RE(
+        deadtime_optimisation(
+            fake_composite_mocked_sets,
+            transmission=1e-5,
+            increment=2,
+            deadtime_threshold=0.002,
+            max_cycles=20,
+            upper_transmission_limit=0.1,
+            lower_transmission_limit=1e-6,
+            search=search,
+        )
+    ).plan_result  # type: ignore
+
+    assert 5e-4 < optimised <= 1e-3
+    if search == TransmissionSearch.MODEL:
+        assert len(transmissions) == 2
+
+
+def test_model_total_counts_optimisation_uses_max_transmission_if_counts_too_low(
+    RE: RunEngine, fake_composite_mocked_sets: OptimizeAttenuationComposite
+):
+    set_mock_value(
+        fake_composite_mocked_sets.xspress3mini.dt_corrected_latest_mca[1],
+        np.array([1, 1, 1, 1, 1, 1]),
+    )
+    fake_composite_mocked_sets.attenuator.set = MagicMock(
+        return_value=get_good_status()
+    )
+
+    optimised = RE(
+        total_counts_optimisation(
+            fake_composite_mocked_sets,
+            transmission=0.01,
+            low_roi=0,
+            high_roi=4,
+            lower_count_limit=1000,
+            upper_count_limit=2000,
+            target_count=1500,
+            max_cycles=10,
+            upper_transmission_limit=0.1,
+            lower_transmission_limit=1e-6,
+            search=TransmissionSearch.MODEL,
+        )
+    ).plan_result  # type: ignore
+
+    assert optimised == 0.1
+    assert [
+        call.args[0]
+        for call in fake_composite_mocked_sets.attenuator.set.call_args_list
+    ] == [0.01, 0.1]
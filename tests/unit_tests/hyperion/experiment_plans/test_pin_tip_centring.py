@@ -39,10 +39,6 @@ def mock_pin_tip(pin_tip: PinTipDetection):
     return pin_tip
 
 
-@patch(
-    "mx_bluesky.hyperion.experiment_plans.pin_tip_centring_plan.bps.sleep",
-    new=MagicMock(),
-)
 async def test_given_the_pin_tip_is_already_in_view_when_get_tip_into_view_then_tip_returned_and_smargon_not_moved(
     smargon: Smargon, oav: OAV, RE: RunEngine, mock_pin_tip: PinTipDetection
 ):
@@ -51,7 +47,7 @@ async def test_given_the_pin_tip_is_already_in_view_when_get_tip_into_view_then_
 
     mock_pin_tip.trigger = MagicMock(return_value=NullStatus())
 
-    result = RE(move_pin_into_view(mock_pin_tip, smargon))
+    result = RE(move_pin_into_view(mock_pin_tip, smargon, oav))
 
     mock_pin_tip.trigger.assert_called_once()
     assert await smargon.x.user_readback.get_value() == 0
@@ -59,10 +55,6 @@ async def test_given_the_pin_tip_is_already_in_view_when_get_tip_into_view_then_
     assert result.plan_result == (100, 200)
 
 
-@patch(
-    "mx_bluesky.hyperion.experiment_plans.pin_tip_centring_plan.bps.sleep",
-    new=MagicMock(),
-)
 async def test_given_no_tip_found_but_will_be_found_when_get_tip_into_view_then_smargon_moved_positive_and_tip_returned(
     smargon: Smargon, oav: OAV, RE: RunEngine, mock_pin_tip: PinTipDetection
 ):
@@ -80,17 +72,13 @@ async def test_given_no_tip_found_but_will_be_found_when_get_tip_into_view_then_
         set_pin_tip_when_x_moved, x_user_setpoint.side_effect
     )
 
-    result = RE(move_pin_into_view(mock_pin_tip, smargon))
+    result = RE(move_pin_into_view(mock_pin_tip, smargon, oav))
 
     assert await smargon.x.user_readback.get_value() == DEFAULT_STEP_SIZE
     assert isinstance(result, RunEngineResult)
     assert result.plan_result == (100, 200)
 
 
-@patch(
-    "mx_bluesky.hyperion.experiment_plans.pin_tip_centring_plan.bps.sleep",
-    new=MagicMock(),
-)
 async def test_given_tip_at_zero_but_will_be_found_when_get_tip_into_view_then_smargon_moved_negative_and_tip_returned(
     smargon: Smargon, oav: OAV, RE: RunEngine, mock_pin_tip: PinTipDetection
 ):
@@ -112,7 +100,7 @@ async def test_given_tip_at_zero_but_will_be_found_when_get_tip_into_view_then_s
         set_pin_tip_when_x_moved, x_user_setpoint.side_effect
     )
 
-    result = RE(move_pin_into_view(mock_pin_tip, smargon))
+    result = RE(move_pin_into_view(mock_pin_tip, smargon, oav))
 
     assert await smargon.x.user_readback.get_value() == -DEFAULT_STEP_SIZE
     assert result.plan_result == (100, 200)  # type: ignore
@@ -143,10 +131,6 @@ def test_trigger_and_return_pin_tip_works_for_ophyd_pin_tip_detection(
 @patch(
     "mx_bluesky.hyperion.experiment_plans.pin_tip_centring_plan.trigger_and_return_pin_tip"
 )
-@patch(
-    "mx_bluesky.hyperion.experiment_plans.pin_tip_centring_plan.bps.sleep",
-    new=MagicMock(),
-)
 async def test_pin_tip_starting_near_negative_edge_doesnt_exceed_limit(
     mock_trigger_and_return_tip: MagicMock,
     smargon: Smargon,
@@ -163,7 +147,7 @@ async def test_pin_tip_starting_near_negative_edge_doesnt_exceed_limit(
     set_mock_value(smargon.x.user_readback, -1.8)
 
     with pytest.raises(WarningException):
-        RE(move_pin_into_view(pin_tip, smargon, max_steps=1))
+        RE(move_pin_into_view(pin_tip, smargon, oav, max_steps=1))
 
     assert await smargon.x.user_readback.get_value() == -2
 
@@ -171,10 +155,6 @@ async def test_pin_tip_starting_near_negative_edge_doesnt_exceed_limit(
 @patch(
     "mx_bluesky.hyperion.experiment_plans.pin_tip_centring_plan.trigger_and_return_pin_tip"
 )
-@patch(
-    "mx_bluesky.hyperion.experiment_plans.pin_tip_centring_plan.bps.sleep",
-    new=MagicMock(),
-)
 async def test_pin_tip_starting_near_positive_edge_doesnt_exceed_limit(
     mock_trigger_and_return_pin_tip: MagicMock,
     smargon: Smargon,
@@ -190,15 +170,11 @@ async def test_pin_tip_starting_near_positive_edge_doesnt_exceed_limit(
     set_mock_value(smargon.x.user_readback, 1.8)
 
     with pytest.raises(WarningException):
-        RE(move_pin_into_view(pin_tip, smargon, max_steps=1))
+        RE(move_pin_into_view(pin_tip, smargon, oav, max_steps=1))
 
     assert await smargon.x.user_readback.get_value() == 2
 
 
-@patch(
-    "mx_bluesky.hyperion.experiment_plans.pin_tip_centring_plan.bps.sleep",
-    new=MagicMock(),
-)
 async def test_given_no_tip_found_ever_when_get_tip_into_view_then_smargon_moved_positive_and_exception_thrown(
     smargon: Smargon, oav: OAV, RE: RunEngine, pin_tip: PinTipDetection
 ):
@@ -208,7 +184,7 @@ async def test_given_no_tip_found_ever_when_get_tip_into_view_then_smargon_moved
     set_mock_value(smargon.x.user_readback, 0)
 
     with pytest.raises(WarningException):
-        RE(move_pin_into_view(pin_tip, smargon))
+        RE(move_pin_into_view(pin_tip, smargon, oav))
 
     assert await smargon.x.user_readback.get_value() == 1
 
@@ -244,7 +220,7 @@ def return_pixel(pixel, *args):
     autospec=True,
 )
 @patch(
-    "mx_bluesky.hyperion.experiment_plans.pin_tip_centring_plan.bps.sleep",
+    "mx_bluesky.hyperion.experiment_plans.pin_tip_centring_plan.wait_for_new_oav_frames",
     autospec=True,
 )
 @patch(
@@ -253,7 +229,7 @@ def return_pixel(pixel, *args):
 )
 async def test_when_pin_tip_centre_plan_called_then_expected_plans_called(
     move_smargon,
-    mock_sleep,
+    mock_wait_for_frames: MagicMock,
     mock_setup_oav,
     get_move: MagicMock,
     smargon: Smargon,
@@ -276,6 +252,7 @@ async def test_when_pin_tip_centre_plan_called_then_expected_plans_called(
     RE(pin_tip_centre_plan(composite, 50, test_config_files["oav_config_json"]))
 
     assert mock_setup_oav.call_count == 1
+    assert mock_wait_for_frames.call_count == 2
 
     assert len(get_move.call_args_list) == 2
 
@@ -304,7 +281,7 @@ async def test_when_pin_tip_centre_plan_called_then_expected_plans_called(
     autospec=True,
 )
 @patch(
-    "mx_bluesky.hyperion.experiment_plans.pin_tip_centring_plan.bps.sleep",
+    "mx_bluesky.hyperion.experiment_plans.pin_tip_centring_plan.wait_for_new_oav_frames",
     autospec=True,
 )
 @patch(
@@ -313,7 +290,7 @@ async def test_when_pin_tip_centre_plan_called_then_expected_plans_called(
 )
 def test_given_pin_tip_detect_using_ophyd_when_pin_tip_centre_plan_called_then_expected_plans_called(
     move_smargon,
-    mock_sleep,
+    mock_wait_for_frames: MagicMock,
     mock_setup_oav,
     mock_move_into_view,
     get_move: MagicMock,
@@ -333,6 +310,8 @@ def test_given_pin_tip_detect_using_ophyd_when_pin_tip_centre_plan_called_then_e
     mock_move_into_view.side_effect = partial(return_pixel, (100, 100))
     RE(pin_tip_centre_plan(composite, 50, test_config_files["oav_config_json"]))
 
-    mock_move_into_view.assert_called_once_with(mock_ophyd_pin_tip_detection, smargon)
+    mock_move_into_view.assert_called_once_with(
+        mock_ophyd_pin_tip_detection, smargon, oav
+    )
 
     assert mock_setup_oav.call_count == 1
@@ -1,3 +1,4 @@
+from concurrent.futures import Future
 from functools import partial
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -18,6 +19,7 @@ from mx_bluesky.hyperion.experiment_plans.robot_load_and_change_energy import (
     prepare_for_robot_load,
     robot_load_and_change_energy_plan,
     take_robot_snapshots,
+    wait_for_smargon_not_disabled,
 )
 from mx_bluesky.hyperion.external_interaction.callbacks.robot_load.ispyb_callback import (
     RobotLoadISPyBCallback,
@@ -92,78 +94,48 @@ def test_robot_load_and_energy_change_doesnt_set_energy_if_not_specified(
     assert not any(msg for msg in messages if msg.command == "set_energy_plan")
 
 
-def run_simulating_smargon_wait(
-    robot_load_then_centre_params,
-    robot_load_composite,
-    total_disabled_reads,
-    sim_run_engine: RunEngineSimulator,
+async def test_given_smargon_disabled_when_wait_for_smargon_not_disabled_then_waits_until_enabled(
+    smargon: Smargon, RE: RunEngine
 ):
-    num_of_reads = 0
-
-    def return_not_disabled_after_reads(_):
-        nonlocal num_of_reads
-        num_of_reads += 1
-        return {"values": {"value": int(num_of_reads < total_disabled_reads)}}
-
-    sim_run_engine.add_handler(
-        "locate",
-        lambda msg: {"readback": 11.105},
-        "dcm-energy_in_kev",
-    )
-    sim_run_engine.add_handler(
-        "read", return_not_disabled_after_reads, "smargon-disabled"
-    )
-
-    return sim_run_engine.simulate_plan(
-        robot_load_and_change_energy_plan(
-            robot_load_composite, robot_load_then_centre_params
-        )
+    set_mock_value(smargon.disabled, 1)
+    RE.loop.call_soon_threadsafe(
+        RE.loop.call_later, 0.05, lambda: set_mock_value(smargon.disabled, 0)
     )
+    RE(wait_for_smargon_not_disabled(smargon))
+    assert await smargon.disabled.get_value() == 0
 
 
-@pytest.mark.parametrize("total_disabled_reads", [5, 3, 14])
-@patch(
-    "mx_bluesky.hyperion.experiment_plans.robot_load_and_change_energy.set_energy_plan",
-    MagicMock(return_value=iter([])),
-)
-def test_given_smargon_disabled_when_plan_run_then_waits_on_smargon(
-    robot_load_and_energy_change_composite: RobotLoadAndEnergyChangeComposite,
-    robot_load_and_energy_change_params: RobotLoadAndEnergyChange,
-    total_disabled_reads: int,
-    sim_run_engine,
+def test_given_smargon_disabled_for_longer_than_timeout_when_wait_for_smargon_not_disabled_then_throws_exception(
+    smargon: Smargon, RE: RunEngine
 ):
-    messages = run_simulating_smargon_wait(
-        robot_load_and_energy_change_params,
-        robot_load_and_energy_change_composite,
-        total_disabled_reads,
-        sim_run_engine,
-    )
-
-    sleep_messages = filter(lambda msg: msg.command == "sleep", messages)
-    read_disabled_messages = filter(
-        lambda msg: msg.command == "read" and msg.obj.name == "smargon-disabled",
-        messages,
-    )
-
-    assert len(list(sleep_messages)) == total_disabled_reads - 1
-    assert len(list(read_disabled_messages)) == total_disabled_reads
+    set_mock_value(smargon.disabled, 1)
+    with pytest.raises(TimeoutError, match="smargon to become enabled"):
+        RE(wait_for_smargon_not_disabled(smargon, timeout=0.05))
 
 
 @patch(
     "mx_bluesky.hyperion.experiment_plans.robot_load_and_change_energy.set_energy_plan",
     MagicMock(return_value=iter([])),
 )
-def test_given_smargon_disabled_for_longer_than_timeout_when_plan_run_then_throws_exception(
+def test_given_smargon_wait_fails_when_plan_run_then_throws_exception(
     robot_load_and_energy_change_composite: RobotLoadAndEnergyChangeComposite,
     robot_load_and_energy_change_params: RobotLoadAndEnergyChange,
-    sim_run_engine,
+    sim_run_engine: RunEngineSimulator,
 ):
-    with pytest.raises(TimeoutError):
-        run_simulating_smargon_wait(
-            robot_load_and_energy_change_params,
-            robot_load_and_energy_change_composite,
-            1000,
-            sim_run_engine,
+    timed_out = Future()
+    timed_out.set_exception(TimeoutError())
+    sim_run_engine.add_handler(
+        "locate",
+        lambda msg: {"readback": 11.105},
+        "dcm-energy_in_kev",
+    )
+    sim_run_engine.add_handler("wait_for", lambda msg: [timed_out])
+    with pytest.raises(TimeoutError, match="smargon to become enabled"):
+        sim_run_engine.simulate_plan(
+            robot_load_and_change_energy_plan(
+                robot_load_and_energy_change_composite,
+                robot_load_and_energy_change_params,
+            )
         )
 
 
@@ -338,9 +310,8 @@ def test_when_plan_run_then_lower_gonio_moved_before_robot_loads_and_back_after_
             and msg.args == (0,),
         )
 
-    assert_message_and_return_remaining(
-        messages,
-        lambda msg: msg.command == "read" and msg.obj.name == "smargon-disabled",
+    messages = assert_message_and_return_remaining(
+        messages, lambda msg: msg.command == "wait_for"
     )
 
     for axis, initial in initial_values.items():
@@ -4,6 +4,7 @@ from itertools import takewhile
 from typing import Any
 from unittest.mock import MagicMock, call, patch
 
+import numpy as np
 import pytest
 from bluesky.run_engine import RunEngine
 from bluesky.simulators import RunEngineSimulator, assert_message_and_return_remaining
@@ -37,6 +38,12 @@ from mx_bluesky.hyperion.external_interaction.callbacks.zocalo_callback import (
 from mx_bluesky.hyperion.external_interaction.ispyb.ispyb_store import IspybIds
 from mx_bluesky.hyperion.parameters.constants import CONST, DocDescriptorNames
 from mx_bluesky.hyperion.parameters.rotation import RotationScan
+from mx_bluesky.hyperion.utils.phase_timing import SampleTimer
+from mx_bluesky.hyperion.utils.utils import (
+    SCAN_SPEC_KEY,
+    compact_scan_points,
+    number_of_frames_from_scan_spec,
+)
 
 from .conftest import fake_read
 
@@ -701,3 +708,65 @@ def test_rotation_scan_correctly_triggers_zocalo_callback(
             ),
         )
     mock_zocalo_interactor.return_value.run_start.assert_called_once()
+
+
+@pytest.mark.parametrize("compact", [True, False])
+def test_rotation_scan_start_document_scan_points_are_compact_if_feature_enabled(
+    fake_create_rotation_devices: RotationScanComposite,
+    sim_run_engine: RunEngineSimulator,
+    test_rotation_params: RotationScan,
+    motion_values: RotationMotionProfile,
+    compact: bool,
+):
+    _add_sim_handlers_for_normal_operation(fake_create_rotation_devices, sim_run_engine)
+    test_rotation_params.features.compact_scan_points_in_documents = compact
+
+    msgs = sim_run_engine.simulate_plan(
+        rotation_scan_plan(
+            fake_create_rotation_devices, test_rotation_params, motion_values
+        )
+    )
+    msgs = assert_message_and_return_remaining(
+        msgs,
+        lambda msg: msg.command == "open_run"
+        and msg.kwargs["subplan_name"] == CONST.PLAN.ROTATION_MAIN,
+    )
+    [scan_points] = msgs[0].kwargs["scan_points"]
+    assert (SCAN_SPEC_KEY in scan_points) == compact
+    assert number_of_frames_from_scan_spec(scan_points) == (
+        test_rotation_params.num_images
+    )
+    if compact:
+        assert scan_points == compact_scan_points(test_rotation_params.scan_spec)
+    else:
+        np.testing.assert_array_equal(
+            scan_points["omega"], test_rotation_params.scan_points["omega"]
+        )
+
+
+def test_rotation_scan_times_sample_with_rotation_phases(
+    sim_run_engine: RunEngineSimulator,
+    fake_create_rotation_devices: RotationScanComposite,
+    test_rotation_params: RotationScan,
+    oav_parameters_for_rotation: OAVParameters,
+):
+    _add_sim_handlers_for_normal_operation(fake_create_rotation_devices, sim_run_engine)
+    sample_timer = SampleTimer()
+    with sample_timer.active():
+        sim_run_engine.simulate_plan(
+            rotation_scan(
+                fake_create_rotation_devices,
+                test_rotation_params,
+                oav_parameters_for_rotation,
+            )
+        )
+    [timing] = sample_timer.samples()
+    assert timing["plan_name"] == "rotation_scan"
+    assert timing["succeeded"]
+    assert timing["phases"].keys() == {
+        CONST.PHASE.EIGER_ARMING,
+        CONST.PHASE.MOVE_GONIO_TO_START,
+        CONST.PHASE.TOPUP_WAIT,
+        CONST.PHASE.ROTATION,
+        CONST.PHASE.CLEANUP,
+    }
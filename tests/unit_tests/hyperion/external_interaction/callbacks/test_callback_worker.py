@@ -0,0 +1,91 @@
+from threading import Event
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from mx_bluesky.hyperion.external_interaction.callbacks.callback_worker import (
+    CallbackWorker,
+)
+
+
+def test_worker_passes_documents_to_each_callback_in_order():
+    first, second = MagicMock(), MagicMock()
+    worker = CallbackWorker("test", [first, second])
+    worker.start()
+    docs = [("start", {"uid": "a"}), ("event", {"seq_num": 1}), ("stop", {})]
+    for name, doc in docs:
+        worker.put(name, doc)
+    worker.stop(1)
+
+    for callback in (first, second):
+        assert [c.args for c in callback.call_args_list] == docs
+    assert not worker.thread.is_alive()
+
+
+def test_only_workers_that_copy_documents_get_their_own_copy():
+    def add_ids(name, doc):
+        doc["ispyb_dcids"] = (1,)
+
+    other = MagicMock()
+    workers = [
+        CallbackWorker("ispyb", [add_ids], copy_documents=True),
+        CallbackWorker("nexus", [other]),
+    ]
+    doc = {"uid": "a"}
+    for worker in workers:
+        worker.put("start", doc)
+        worker.start()
+        worker.stop(1)
+
+    assert doc == {"uid": "a"}
+    assert other.call_args.args[1] is doc
+
+
+def test_slow_worker_does_not_block_another_worker():
+    release = Event()
+    fast_done = Event()
+    slow = CallbackWorker("slow", [lambda *_: release.wait(1)])
+    fast = CallbackWorker("fast", [lambda *_: fast_done.set()])
+    for worker in (slow, fast):
+        worker.start()
+        worker.put("start", {})
+
+    assert fast_done.wait(1)
+    assert slow.depth == 0 and slow.thread.is_alive()
+    release.set()
+    slow.stop(1)
+    fast.stop(1)
+
+
+def test_worker_stops_on_callback_exception():
+    after = MagicMock()
+    worker = CallbackWorker("test", [MagicMock(side_effect=ValueError), after])
+    worker.put("start", {})
+    with pytest.raises(ValueError):
+        worker._run()
+    after.assert_not_called()
+
+
+@patch("mx_bluesky.hyperion.external_interaction.callbacks.callback_worker.LAG")
+@patch(
+    "mx_bluesky.hyperion.external_interaction.callbacks.callback_worker.PROCESSING_TIME"
+)
+@patch("mx_bluesky.hyperion.external_interaction.callbacks.callback_worker.QUEUE_DEPTH")
+def test_worker_records_queue_depth_processing_time_and_lag(
+    queue_depth: MagicMock, processing_time: MagicMock, lag: MagicMock
+):
+    callback = MagicMock()
+    worker = CallbackWorker("test", [callback])
+    worker.put("start", {"time": 0})
+    worker.put("descriptor", {})
+    worker.start()
+    worker.stop(1)
+
+    assert [c.args[0] for c in queue_depth.add.call_args_list] == [1, 1, -1, -1]
+    assert processing_time.record.call_count == 2
+    assert processing_time.record.call_args.args[1] == {
+        "worker": "test",
+        "callback": "MagicMock",
+    }
+    lag.record.assert_called_once()
+    assert lag.record.call_args.args[0] > 0
@@ -8,25 +8,39 @@ from bluesky.callbacks.zmq import Proxy, RemoteDispatcher
 from dodal.log import LOGGER as DODAL_LOGGER
 
 from mx_bluesky.hyperion.external_interaction.callbacks.__main__ import (
+    HyperionCallbackRunner,
     main,
+    setup_callback_families,
+    setup_callback_workers,
     setup_callbacks,
     setup_logging,
     setup_threads,
 )
 from mx_bluesky.hyperion.log import ISPYB_LOGGER, NEXUS_LOGGER
+from mx_bluesky.hyperion.parameters.constants import CONST
 
 
 @patch(
     "mx_bluesky.hyperion.external_interaction.callbacks.__main__.parse_callback_dev_mode_arg",
     return_value=("DEBUG", True),
 )
-@patch("mx_bluesky.hyperion.external_interaction.callbacks.__main__.setup_callbacks")
+@patch(
+    "mx_bluesky.hyperion.external_interaction.callbacks.__main__.setup_callback_families"
+)
 @patch("mx_bluesky.hyperion.external_interaction.callbacks.__main__.setup_logging")
 @patch("mx_bluesky.hyperion.external_interaction.callbacks.__main__.setup_threads")
+@patch(
+    "mx_bluesky.hyperion.external_interaction.callbacks.__main__.enable_connection_pooling"
+)
+@patch(
+    "mx_bluesky.hyperion.external_interaction.callbacks.__main__.enable_deposition_queue"
+)
 def test_main_function(
+    enable_deposition_queue: MagicMock,
+    enable_connection_pooling: MagicMock,
     setup_threads: MagicMock,
     setup_logging: MagicMock,
-    setup_callbacks: MagicMock,
+    setup_callback_families: MagicMock,
     parse_callback_dev_mode_arg: MagicMock,
 ):
     setup_threads.return_value = (MagicMock(), MagicMock(), MagicMock(), MagicMock())
@@ -34,7 +48,8 @@ def test_main_function(
     main()
     setup_threads.assert_called()
     setup_logging.assert_called()
-    setup_callbacks.assert_called()
+    setup_callback_families.assert_called()
+    enable_connection_pooling.assert_called_once_with(CONST.ISPYB_CONNECTION_POOL_SIZE)
 
 
 def test_setup_callbacks():
@@ -44,6 +59,52 @@ def test_setup_callbacks():
     assert len(set(cbs)) == current_number_of_callbacks
 
 
+def test_setup_callback_families_puts_zocalo_with_the_ispyb_callbacks_it_follows():
+    families = setup_callback_families()
+    assert list(families.keys()) == [
+        "nexus",
+        "ispyb_zocalo",
+        "robot_load",
+        "log_tagging",
+    ]
+    assert sum(len(cbs) for cbs in families.values()) == 6
+    gridscan_ispyb, rotation_ispyb = families["ispyb_zocalo"]
+    assert gridscan_ispyb.emit_cb is rotation_ispyb.emit_cb
+
+
+def test_only_the_ispyb_zocalo_worker_copies_documents():
+    workers = setup_callback_workers(setup_callback_families())
+    assert [worker.name for worker in workers if worker.copy_documents] == [
+        "ispyb_zocalo"
+    ]
+
+
+@patch(
+    "mx_bluesky.hyperion.external_interaction.callbacks.__main__.enable_connection_pooling",
+    MagicMock(),
+)
+@patch(
+    "mx_bluesky.hyperion.external_interaction.callbacks.__main__.enable_deposition_queue",
+    MagicMock(),
+)
+@patch("mx_bluesky.hyperion.external_interaction.callbacks.__main__.setup_logging")
+@patch("mx_bluesky.hyperion.external_interaction.callbacks.__main__.setup_threads")
+@pytest.mark.parametrize(
+    "sharded_dispatch, expected_subscriptions", [(True, 4), (False, 6)]
+)
+def test_runner_subscribes_a_worker_per_family_when_sharded(
+    setup_threads: MagicMock,
+    setup_logging: MagicMock,
+    sharded_dispatch: bool,
+    expected_subscriptions: int,
+):
+    setup_threads.return_value = (MagicMock(), MagicMock(), MagicMock(), MagicMock())
+    runner = HyperionCallbackRunner(False, sharded_dispatch)
+    assert len(runner.callbacks) == 6
+    assert len(runner.workers) == (4 if sharded_dispatch else 0)
+    assert len(runner.dispatcher_thread._args[0]) == expected_subscriptions
+
+
 @pytest.mark.skip_log_setup
 @patch(
     "mx_bluesky.hyperion.external_interaction.callbacks.__main__.parse_callback_dev_mode_arg",
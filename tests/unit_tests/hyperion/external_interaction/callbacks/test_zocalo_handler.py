@@ -1,7 +1,9 @@
+from threading import Event
 from unittest.mock import MagicMock, call, patch
 
 import pytest
 from dodal.devices.zocalo import ZocaloStartInfo
+from scanspec.specs import Line
 
 from mx_bluesky.hyperion.external_interaction.callbacks.common.callback_util import (
     create_gridscan_callbacks,
@@ -10,11 +12,16 @@ from mx_bluesky.hyperion.external_interaction.callbacks.zocalo_callback import (
     ZocaloCallback,
 )
 from mx_bluesky.hyperion.external_interaction.exceptions import ISPyBDepositionNotMade
+from mx_bluesky.hyperion.external_interaction.ispyb.deposition_queue import (
+    enable_deposition_queue,
+    shutdown_deposition_queue,
+)
 from mx_bluesky.hyperion.external_interaction.ispyb.ispyb_store import (
     IspybIds,
     StoreInIspyb,
 )
 from mx_bluesky.hyperion.parameters.constants import CONST
+from mx_bluesky.hyperion.utils.utils import compact_scan_points
 
 from .conftest import TestData
 
@@ -81,6 +88,30 @@ class TestZocaloHandler:
         )
         assert zocalo_handler.zocalo_interactor is not None
 
+    @patch(
+        "mx_bluesky.hyperion.external_interaction.callbacks.zocalo_callback.ZocaloTrigger",
+        autospec=True,
+    )
+    def test_handler_gets_number_of_frames_from_compact_scan_points(
+        self, zocalo_trigger
+    ):
+        zocalo_handler = self._setup_handler()
+        zocalo_handler.start(
+            {
+                "subplan_name": "test_plan_name",
+                "zocalo_environment": "test_env",
+                "ispyb_dcids": (135, 139),
+                "scan_points": [
+                    compact_scan_points(Line("y", 0, 1, 20) * ~Line("x", 0, 1, 10)),
+                    compact_scan_points(Line("z", 0, 1, 30) * ~Line("x", 0, 1, 10)),
+                ],
+            }  # type: ignore
+        )
+        assert zocalo_handler.zocalo_info == [
+            ZocaloStartInfo(135, None, 0, 200, 0),
+            ZocaloStartInfo(139, None, 200, 300, 1),
+        ]
+
     @patch(
         "mx_bluesky.hyperion.external_interaction.callbacks.zocalo_callback.ZocaloTrigger",
         autospec=True,
@@ -140,3 +171,70 @@ class TestZocaloHandler:
         assert zocalo_handler.zocalo_interactor.run_end.call_count == len(dc_ids)  # type: ignore
 
         zocalo_handler._reset_state.assert_called()
+
+    @patch(
+        "mx_bluesky.hyperion.external_interaction.callbacks.zocalo_callback.ZocaloTrigger",
+        autospec=True,
+    )
+    @patch(
+        "mx_bluesky.hyperion.external_interaction.callbacks.xray_centre.ispyb_callback.StoreInIspyb",
+    )
+    def test_zocalo_gets_ids_from_slow_queued_deposition(
+        self, ispyb_store: MagicMock, zocalo_trigger
+    ):
+        dc_ids = (1, 2)
+        mock_ids = IspybIds(data_collection_ids=dc_ids, data_collection_group_id=4)
+        release_deposition = Event()
+
+        def slow_begin_deposition(*_):
+            release_deposition.wait(1)
+            return mock_ids
+
+        ispyb_store.return_value.begin_deposition.side_effect = slow_begin_deposition
+        ispyb_store.return_value.update_deposition.return_value = mock_ids
+
+        enable_deposition_queue(2, 10)
+        try:
+            _, ispyb_cb = create_gridscan_callbacks()
+            ispyb_cb.active = True
+            assert isinstance(zocalo_handler := ispyb_cb.emit_cb, ZocaloCallback)
+
+            ispyb_cb.start(td.test_gridscan3d_start_document)  # type: ignore
+            ispyb_cb.start(td.test_gridscan_outer_start_document)  # type: ignore
+            assert ispyb_cb.ispyb_ids == IspybIds()
+            release_deposition.set()
+            ispyb_cb.start(td.test_do_fgs_start_document)  # type: ignore
+
+            assert [info.ispyb_dcid for info in zocalo_handler.zocalo_info] == list(
+                dc_ids
+            )
+        finally:
+            shutdown_deposition_queue()
+
+    @patch(
+        "mx_bluesky.hyperion.external_interaction.callbacks.zocalo_callback.ZocaloTrigger",
+        autospec=True,
+    )
+    @patch(
+        "mx_bluesky.hyperion.external_interaction.callbacks.xray_centre.ispyb_callback.StoreInIspyb",
+    )
+    def test_failed_queued_deposition_skips_later_steps_and_raises_at_stop(
+        self, ispyb_store: MagicMock, zocalo_trigger
+    ):
+        ispyb_store.return_value.begin_deposition.side_effect = RuntimeError("no db")
+
+        enable_deposition_queue(2, 10)
+        try:
+            _, ispyb_cb = create_gridscan_callbacks()
+            ispyb_cb.active = True
+
+            ispyb_cb.start(td.test_gridscan3d_start_document)  # type: ignore
+            ispyb_cb.descriptor(td.test_descriptor_document_pre_data_collection)  # type: ignore
+            ispyb_cb.event(td.test_event_document_pre_data_collection)
+            with pytest.raises(ISPyBDepositionNotMade):
+                ispyb_cb.stop(td.test_stop_document)
+
+            ispyb_store.return_value.update_deposition.assert_not_called()
+            ispyb_store.return_value.end_deposition.assert_not_called()
+        finally:
+            shutdown_deposition_queue()
@@ -195,6 +195,7 @@ def base_ispyb_conn():
 
         mock_core.retrieve_visit_id.side_effect = mock_retrieve_visit
         ispyb_connection.return_value.core = mock_core
+        ispyb_connection.return_value.reconn_attempts = 6
         yield ispyb_connection
 
 
@@ -0,0 +1,180 @@
+from threading import Event, Thread
+from unittest.mock import MagicMock, patch
+
+import pytest
+from ispyb import ConnectionError, ReadWriteError
+
+from mx_bluesky.hyperion.external_interaction.ispyb.connection_pool import (
+    ISPyBConnectionPool,
+    enable_connection_pooling,
+    get_connection_pool,
+)
+from mx_bluesky.hyperion.external_interaction.ispyb.ispyb_store import (
+    IspybIds,
+    StoreInIspyb,
+)
+from mx_bluesky.hyperion.parameters.constants import CONST
+
+from ..conftest import TEST_DATA_COLLECTION_GROUP_ID, TEST_DATA_COLLECTION_IDS
+
+
+@pytest.fixture
+def mock_open():
+    with patch("ispyb.open") as mock_open:
+        mock_open.side_effect = lambda _: MagicMock()
+        yield mock_open
+
+
+@pytest.fixture
+def pooling_enabled():
+    enable_connection_pooling(2)
+    yield
+    enable_connection_pooling(0)
+
+
+def test_connection_is_reused_between_calls(mock_open):
+    pool = ISPyBConnectionPool(CONST.SIM.ISPYB_CONFIG, 2)
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+
+    mock_open.assert_called_once_with(CONST.SIM.ISPYB_CONFIG)
+    assert first is second
+    assert pool.stats.opened == 1
+    assert pool.stats.reused == 1
+
+
+def test_dead_connection_is_replaced(mock_open):
+    pool = ISPyBConnectionPool(CONST.SIM.ISPYB_CONFIG, 2)
+    with pool.connection() as first:
+        first.conn.is_connected.return_value = False
+    with pool.connection() as second:
+        pass
+
+    assert first is not second
+    assert pool.stats.opened == 2
+    assert pool.stats.reused == 0
+    assert pool.stats.discarded == 1
+
+
+def test_connection_discarded_after_connection_error(mock_open):
+    pool = ISPyBConnectionPool(CONST.SIM.ISPYB_CONFIG, 2)
+    with pytest.raises(ConnectionError):
+        with pool.connection():
+            raise ConnectionError()
+    with pool.connection():
+        pass
+
+    assert pool.stats.opened == 2
+    assert pool.stats.discarded == 1
+
+
+def test_connection_kept_after_other_errors(mock_open):
+    pool = ISPyBConnectionPool(CONST.SIM.ISPYB_CONFIG, 2)
+    with pytest.raises(ReadWriteError):
+        with pool.connection():
+            raise ReadWriteError()
+    with pool.connection():
+        pass
+
+    assert pool.stats.opened == 1
+    assert pool.stats.reused == 1
+
+
+def test_pool_never_opens_more_than_max_size_connections(mock_open):
+    pool = ISPyBConnectionPool(CONST.SIM.ISPYB_CONFIG, 1)
+    first_acquired = Event()
+    release_first = Event()
+
+    def hold_connection():
+        with pool.connection():
+            first_acquired.set()
+            release_first.wait(1)
+
+    thread = Thread(target=hold_connection)
+    thread.start()
+    first_acquired.wait(1)
+    release_first.set()
+    with pool.connection():
+        pass
+    thread.join()
+
+    assert pool.stats.opened == 1
+    assert pool.stats.reused == 1
+
+
+def test_close_closes_idle_connections(mock_open):
+    pool = ISPyBConnectionPool(CONST.SIM.ISPYB_CONFIG, 2)
+    connector = MagicMock()
+    mock_open.side_effect = None
+    mock_open.return_value = connector
+    with pool.connection():
+        pass
+    connector.__exit__.assert_not_called()
+
+    pool.close()
+    connector.__exit__.assert_called_once()
+
+
+def test_connection_in_use_when_pool_closed_is_closed_when_returned(mock_open):
+    pool = ISPyBConnectionPool(CONST.SIM.ISPYB_CONFIG, 2)
+    connector = MagicMock()
+    mock_open.side_effect = None
+    mock_open.return_value = connector
+    with pool.connection():
+        pool.close()
+        connector.__exit__.assert_not_called()
+
+    connector.__exit__.assert_called_once()
+    assert not pool._idle
+
+
+def test_no_pool_when_pooling_disabled():
+    assert get_connection_pool(CONST.SIM.ISPYB_CONFIG) is None
+
+
+def test_pool_shared_between_stores(pooling_enabled):
+    assert get_connection_pool(CONST.SIM.ISPYB_CONFIG) is get_connection_pool(
+        CONST.SIM.ISPYB_CONFIG
+    )
+
+
+@patch(
+    "mx_bluesky.hyperion.external_interaction.ispyb.ispyb_store.get_current_time_string",
+    new=MagicMock(return_value="2024-02-08 14:04:01"),
+)
+def test_end_deposition_opens_one_connection_without_pooling(
+    mock_ispyb_conn,
+):
+    ids = IspybIds(
+        data_collection_ids=TEST_DATA_COLLECTION_IDS,
+        data_collection_group_id=TEST_DATA_COLLECTION_GROUP_ID,
+    )
+    StoreInIspyb(CONST.SIM.ISPYB_CONFIG).end_deposition(ids, "fail", "reason")
+
+    assert mock_ispyb_conn.call_count == 1
+
+
+@patch(
+    "mx_bluesky.hyperion.external_interaction.ispyb.ispyb_store.get_current_time_string",
+    new=MagicMock(return_value="2024-02-08 14:04:01"),
+)
+def test_end_deposition_reuses_connection_across_stores_with_pooling(
+    mock_ispyb_conn, pooling_enabled
+):
+    mock_ispyb_conn.return_value.conn = MagicMock()
+    ids = IspybIds(
+        data_collection_ids=TEST_DATA_COLLECTION_IDS,
+        data_collection_group_id=TEST_DATA_COLLECTION_GROUP_ID,
+    )
+    StoreInIspyb(CONST.SIM.ISPYB_CONFIG).end_deposition(ids, "fail", "reason")
+    StoreInIspyb(CONST.SIM.ISPYB_CONFIG).end_deposition(ids, "success", "")
+
+    assert mock_ispyb_conn.call_count == 1
+    pool = get_connection_pool(CONST.SIM.ISPYB_CONFIG)
+    assert pool
+    assert pool.stats.opened == 1
+    assert pool.stats.reused == 1
+    mx_acquisition = mock_ispyb_conn.return_value.__enter__.return_value.mx_acquisition
+    assert mx_acquisition.upsert_data_collection.call_count == 4
@@ -0,0 +1,124 @@
+from threading import Event, Lock, Thread
+from time import sleep
+
+import pytest
+
+from mx_bluesky.hyperion.external_interaction.exceptions import ISPyBDepositionNotMade
+from mx_bluesky.hyperion.external_interaction.ispyb.deposition_queue import (
+    DepositionQueue,
+    enable_deposition_queue,
+    get_deposition_queue,
+    shutdown_deposition_queue,
+)
+
+
+def test_synchronous_queue_runs_step_immediately_and_raises():
+    queue = DepositionQueue()
+    assert queue.submit("key", lambda: 5).result() == 5
+    with pytest.raises(ZeroDivisionError):
+        queue.submit("key", lambda: 1 / 0)
+
+
+def test_steps_with_same_key_run_in_order():
+    queue = DepositionQueue(max_workers=4)
+    results = []
+
+    def step(i):
+        sleep(0.001 * (5 - i))
+        results.append(i)
+        return i
+
+    futures = [queue.submit("dcg", lambda i=i: step(i)) for i in range(5)]
+    assert [f.result(timeout=1) for f in futures] == list(range(5))
+    assert results == list(range(5))
+    queue.shutdown()
+
+
+def test_steps_with_different_keys_run_concurrently():
+    queue = DepositionQueue(max_workers=2)
+    first_running = Event()
+    release_first = Event()
+
+    def blocking_step():
+        first_running.set()
+        release_first.wait(1)
+        return "first"
+
+    first = queue.submit("dcg_1", blocking_step)
+    first_running.wait(1)
+    assert queue.submit("dcg_2", lambda: "second").result(timeout=1) == "second"
+    assert not first.done()
+    release_first.set()
+    assert first.result(timeout=1) == "first"
+    queue.shutdown()
+
+
+def test_failed_step_is_reported_through_future_and_later_steps_are_skipped():
+    queue = DepositionQueue(max_workers=1)
+    ran = []
+    failed = queue.submit("dcg", lambda: 1 / 0)
+    after = queue.submit("dcg", lambda: ran.append("after"))
+    other_key = queue.submit("other_dcg", lambda: "ran")
+    with pytest.raises(ZeroDivisionError):
+        failed.result(timeout=1)
+    with pytest.raises(ISPyBDepositionNotMade):
+        after.result(timeout=1)
+    assert other_key.result(timeout=1) == "ran"
+    assert ran == []
+    queue.shutdown()
+
+
+def test_new_deposition_runs_after_a_failed_step():
+    queue = DepositionQueue(max_workers=1)
+    queue.submit("dcg", lambda: 1 / 0)
+    new = queue.submit("dcg", lambda: "new", new_deposition=True)
+    after = queue.submit("dcg", lambda: "after")
+    assert new.result(timeout=1) == "new"
+    assert after.result(timeout=1) == "after"
+    queue.shutdown()
+
+
+def test_submit_blocks_when_max_pending_reached():
+    queue = DepositionQueue(max_workers=1, max_pending=1)
+    release_first = Event()
+    submitted_second = Event()
+    queue.submit("dcg", lambda: release_first.wait(1))
+
+    def submit_second():
+        queue.submit("dcg", lambda: None)
+        submitted_second.set()
+
+    thread = Thread(target=submit_second)
+    thread.start()
+    assert not submitted_second.wait(0.05)
+    release_first.set()
+    assert submitted_second.wait(1)
+    thread.join()
+    queue.shutdown()
+
+
+def test_shutdown_drains_outstanding_steps_and_rejects_new_ones():
+    queue = DepositionQueue(max_workers=2)
+    completed = []
+    lock = Lock()
+
+    def step(i):
+        sleep(0.01)
+        with lock:
+            completed.append(i)
+
+    for i in range(6):
+        queue.submit(f"dcg_{i % 3}", lambda i=i: step(i))
+    queue.shutdown()
+
+    assert sorted(completed) == list(range(6))
+    assert queue.pending == 0
+    with pytest.raises(RuntimeError):
+        queue.submit("dcg", lambda: None)
+
+
+def test_enable_and_shutdown_swap_the_process_queue():
+    enable_deposition_queue(2, 10)
+    assert get_deposition_queue().max_workers == 2
+    shutdown_deposition_queue()
+    assert get_deposition_queue().max_workers == 0
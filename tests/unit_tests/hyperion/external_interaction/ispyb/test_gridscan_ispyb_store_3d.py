@@ -1,6 +1,8 @@
+from threading import Thread
 from unittest.mock import MagicMock, patch
 
 import pytest
+from ispyb import ConnectionError, ReadWriteError
 from ispyb.sp.mxacquisition import MXAcquisition
 
 from mx_bluesky.hyperion.external_interaction.ispyb.data_model import (
@@ -764,3 +766,109 @@ def test_no_exception_during_run_results_in_good_run_status(
     upserted_param_value_list = end_deposition_upsert_args[0]
     assert "DataCollection Unsuccessful" not in upserted_param_value_list
     assert "DataCollection Successful" in upserted_param_value_list
+
+
+def test_update_deposition_for_both_grids_uses_one_connection_and_transaction(
+    mock_ispyb_conn: MagicMock,
+    dummy_3d_gridscan_ispyb: StoreInIspyb,
+    dummy_collection_group_info,
+    scan_data_info_for_begin,
+    scan_data_infos_for_update,
+):
+    mysql_conn = mock_ispyb_conn.return_value.conn = MagicMock()
+    ispyb_ids = dummy_3d_gridscan_ispyb.begin_deposition(
+        dummy_collection_group_info, [scan_data_info_for_begin]
+    )
+    mock_ispyb_conn.reset_mock()
+    mysql_conn.reset_mock()
+
+    dummy_3d_gridscan_ispyb.update_deposition(ispyb_ids, scan_data_infos_for_update)
+
+    mock_ispyb_conn.assert_called_once()
+    mysql_conn.start_transaction.assert_called_once()
+    mysql_conn.commit.assert_called_once()
+    mysql_conn.rollback.assert_not_called()
+
+
+def test_nested_batches_share_outermost_connection_and_transaction(
+    mock_ispyb_conn: MagicMock,
+    dummy_3d_gridscan_ispyb: StoreInIspyb,
+    dummy_collection_group_info,
+    scan_data_info_for_begin,
+    scan_data_infos_for_update,
+):
+    mysql_conn = mock_ispyb_conn.return_value.conn = MagicMock()
+    with dummy_3d_gridscan_ispyb.batch():
+        ispyb_ids = dummy_3d_gridscan_ispyb.begin_deposition(
+            dummy_collection_group_info, [scan_data_info_for_begin]
+        )
+        ispyb_ids = dummy_3d_gridscan_ispyb.update_deposition(
+            ispyb_ids, scan_data_infos_for_update
+        )
+        dummy_3d_gridscan_ispyb.end_deposition(ispyb_ids, "success", "reason")
+        mysql_conn.commit.assert_not_called()
+
+    mock_ispyb_conn.assert_called_once()
+    mysql_conn.start_transaction.assert_called_once()
+    mysql_conn.commit.assert_called_once()
+
+
+def test_batch_rolled_back_if_a_write_fails(
+    mock_ispyb_conn: MagicMock,
+    dummy_3d_gridscan_ispyb: StoreInIspyb,
+    dummy_collection_group_info,
+    scan_data_info_for_begin,
+    scan_data_infos_for_update,
+):
+    mysql_conn = mock_ispyb_conn.return_value.conn = MagicMock()
+    ispyb_ids = dummy_3d_gridscan_ispyb.begin_deposition(
+        dummy_collection_group_info, [scan_data_info_for_begin]
+    )
+    mx_acquisition_from_conn(mock_ispyb_conn).upsert_dc_grid.side_effect = [
+        TEST_GRID_INFO_IDS[0],
+        ReadWriteError(),
+    ]
+    mysql_conn.reset_mock()
+
+    with pytest.raises(ReadWriteError):
+        dummy_3d_gridscan_ispyb.update_deposition(ispyb_ids, scan_data_infos_for_update)
+
+    mysql_conn.rollback.assert_called_once()
+    mysql_conn.commit.assert_not_called()
+
+
+def test_batch_not_committed_if_connection_changed_part_way_through(
+    mock_ispyb_conn: MagicMock,
+    dummy_3d_gridscan_ispyb: StoreInIspyb,
+):
+    connector = mock_ispyb_conn.return_value
+    mysql_conn = connector.conn = MagicMock()
+    mysql_conn.connection_id = 1
+
+    with pytest.raises(ConnectionError):
+        with dummy_3d_gridscan_ispyb.batch():
+            assert connector.reconn_attempts == 0
+            mysql_conn.connection_id = 2
+
+    mysql_conn.rollback.assert_called_once()
+    mysql_conn.commit.assert_not_called()
+    assert connector.reconn_attempts == 6
+
+
+def test_batches_on_different_threads_use_their_own_connections(
+    mock_ispyb_conn: MagicMock,
+    dummy_3d_gridscan_ispyb: StoreInIspyb,
+):
+    other_thread_conns = []
+
+    def batch_on_other_thread():
+        with dummy_3d_gridscan_ispyb.batch() as conn:
+            other_thread_conns.append(conn)
+
+    with dummy_3d_gridscan_ispyb.batch():
+        thread = Thread(target=batch_on_other_thread)
+        thread.start()
+        thread.join()
+
+    assert mock_ispyb_conn.call_count == 2
+    assert len(other_thread_conns) == 1
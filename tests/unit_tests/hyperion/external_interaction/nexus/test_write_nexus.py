@@ -11,6 +11,7 @@ from dodal.devices.detector.det_dim_constants import (
     PIXELS_Y_EIGER2_X_4M,
 )
 from dodal.devices.fast_grid_scan import GridAxis, ZebraGridScanParams
+from nexgen.nxs_write.nxmx_writer import NXmxFileWriter
 
 from mx_bluesky.hyperion.external_interaction.nexus.nexus_utils import (
     create_beam_and_attenuator_parameters,
@@ -375,3 +376,91 @@ def test_given_data_files_not_yet_written_when_nexus_files_created_then_nexus_fi
             nexus_writer_1.master_file,
         ]:
             assert os.path.exists(filename)
+
+
+def _h5_contents(h5_object) -> dict:
+    contents = {"attrs": {k: np.array(v).tolist() for k, v in h5_object.attrs.items()}}
+    if isinstance(h5_object, h5py.Dataset) and h5_object.is_virtual:
+        # Don't read the virtual dataset, which would pull in all the image data
+        contents["shape"] = h5_object.shape
+        contents["sources"] = [
+            (s.file_name, s.dset_name, s.src_space.shape, s.vspace.get_select_bounds())
+            for s in h5_object.virtual_sources()
+        ]
+    elif isinstance(h5_object, h5py.Dataset):
+        contents["data"] = np.array(h5_object[()]).tolist()
+    else:
+        for name in h5_object:
+            link = h5_object.get(name, getlink=True)
+            if isinstance(link, h5py.ExternalLink):
+                contents[name] = (link.filename, link.path)
+            else:
+                contents[name] = _h5_contents(h5_object[name])
+    return contents
+
+
+@patch(
+    "mx_bluesky.hyperion.external_interaction.nexus.write_nexus.get_start_and_predicted_end_time",
+    return_value=("2024-02-08T14:03:59Z", "2024-02-08T14:04:01Z"),
+)
+def test_master_file_is_the_same_as_nexgen_would_write(_, tmp_path, single_dummy_file):
+    single_dummy_file.beam, single_dummy_file.attenuator = (
+        create_beam_and_attenuator_parameters(20, TEST_FLUX, 0.5)
+    )
+    single_dummy_file.create_nexus_file(np.uint16)
+
+    nexgen_master_file = tmp_path / single_dummy_file.master_file.name
+    nexgen_writer = NXmxFileWriter(
+        nexgen_master_file,
+        single_dummy_file.goniometer,
+        single_dummy_file.detector,
+        single_dummy_file.source,
+        single_dummy_file.beam,
+        single_dummy_file.attenuator,
+        single_dummy_file.full_num_of_images,
+    )
+    nexgen_writer.write(
+        image_filename=single_dummy_file.data_filename,
+        start_time="2024-02-08T14:03:59Z",
+        est_end_time="2024-02-08T14:04:01Z",
+    )
+    nexgen_writer.write_vds(
+        vds_offset=single_dummy_file.start_index,
+        vds_shape=single_dummy_file.data_shape,
+        vds_dtype=np.uint16,
+    )
+
+    with (
+        h5py.File(single_dummy_file.nexus_file) as nexus_file,
+        h5py.File(single_dummy_file.master_file) as master_file,
+        h5py.File(nexgen_master_file) as expected,
+    ):
+        assert _h5_contents(master_file) == _h5_contents(expected)
+        assert _h5_contents(nexus_file) == _h5_contents(expected)
+
+
+def test_nexus_file_only_written_once_by_nexgen(single_dummy_file: NexusWriter):
+    single_dummy_file.beam, single_dummy_file.attenuator = (
+        create_beam_and_attenuator_parameters(20, TEST_FLUX, 0.5)
+    )
+    with patch(
+        "mx_bluesky.hyperion.external_interaction.nexus.write_nexus.NXmxFileWriter",
+        wraps=NXmxFileWriter,
+    ) as writer:
+        single_dummy_file.create_nexus_file(np.uint16)
+
+    writer.assert_called_once()
+    assert (
+        single_dummy_file.master_file.read_bytes()
+        == single_dummy_file.nexus_file.read_bytes()
+    )
+
+
+def test_existing_master_file_is_not_overwritten(single_dummy_file: NexusWriter):
+    single_dummy_file.beam, single_dummy_file.attenuator = (
+        create_beam_and_attenuator_parameters(20, TEST_FLUX, 0.5)
+    )
+    single_dummy_file.master_file.write_bytes(b"existing")
+    with pytest.raises(FileExistsError):
+        single_dummy_file.create_nexus_file(np.uint16)
+    assert single_dummy_file.master_file.read_bytes() == b"existing"
@@ -1,12 +1,16 @@
 import re
+from unittest.mock import MagicMock, patch
 
 import pytest
+from ispyb import NoResult
 
 from mx_bluesky.hyperion.external_interaction.callbacks.common.ispyb_mapping import (
     get_proposal_and_session_from_visit_string,
 )
 from mx_bluesky.hyperion.external_interaction.ispyb.ispyb_utils import (
+    SessionIdCache,
     get_current_time_string,
+    get_session_id_from_visit,
 )
 
 TIME_FORMAT_REGEX = r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}"
@@ -48,3 +52,74 @@ def test_given_invalid_visit_string_get_proposal_and_session_throws(
 ):
     with pytest.raises(exception_type):
         get_proposal_and_session_from_visit_string(visit_string)
+
+
+@pytest.fixture
+def mock_conn():
+    conn = MagicMock()
+    conn.core.retrieve_visit_id.side_effect = lambda visit: {"cm1-1": 1, "cm2-1": 2}[
+        visit
+    ]
+    return conn
+
+
+def test_session_id_cached_between_lookups(mock_conn):
+    cache = SessionIdCache(60, 10)
+    assert cache.get(mock_conn, "cm1-1") == 1
+    assert cache.get(mock_conn, "cm1-1") == 1
+    mock_conn.core.retrieve_visit_id.assert_called_once_with("cm1-1")
+
+
+def test_get_session_id_from_visit_uses_process_wide_cache(mock_conn):
+    assert get_session_id_from_visit(mock_conn, "cm2-1") == 2
+    assert get_session_id_from_visit(mock_conn, "cm2-1") == 2
+    mock_conn.core.retrieve_visit_id.assert_called_once_with("cm2-1")
+
+
+@patch("mx_bluesky.hyperion.external_interaction.ispyb.ispyb_utils.time")
+def test_session_id_looked_up_again_after_ttl_expires(mock_time, mock_conn):
+    mock_time.monotonic.return_value = 100
+    cache = SessionIdCache(60, 10)
+    cache.get(mock_conn, "cm1-1")
+    mock_time.monotonic.return_value = 159
+    cache.get(mock_conn, "cm1-1")
+    assert mock_conn.core.retrieve_visit_id.call_count == 1
+    mock_time.monotonic.return_value = 160
+    cache.get(mock_conn, "cm1-1")
+    assert mock_conn.core.retrieve_visit_id.call_count == 2
+
+
+def test_least_recently_used_session_id_evicted_when_full(mock_conn):
+    cache = SessionIdCache(60, 1)
+    cache.get(mock_conn, "cm1-1")
+    cache.get(mock_conn, "cm2-1")
+    cache.get(mock_conn, "cm2-1")
+    cache.get(mock_conn, "cm1-1")
+    assert [c.args[0] for c in mock_conn.core.retrieve_visit_id.call_args_list] == [
+        "cm1-1",
+        "cm2-1",
+        "cm1-1",
+    ]
+
+
+def test_no_result_is_not_cached_and_invalidates_visit(mock_conn):
+    cache = SessionIdCache(60, 10)
+    cache.get(mock_conn, "cm1-1")
+    cache.invalidate("cm1-1")
+    mock_conn.core.retrieve_visit_id.side_effect = NoResult
+    with pytest.raises(NoResult):
+        cache.get(mock_conn, "cm1-1")
+    with pytest.raises(NoResult):
+        get_session_id_from_visit(mock_conn, "cm3-1")
+    assert mock_conn.core.retrieve_visit_id.call_count == 3
+
+
+def test_cache_hits_and_misses_are_counted(mock_conn):
+    cache = SessionIdCache(60, 10)
+    cache._hits = MagicMock()
+    cache._misses = MagicMock()
+    cache.get(mock_conn, "cm1-1")
+    cache.get(mock_conn, "cm1-1")
+    cache.get(mock_conn, "cm1-1")
+    assert cache._misses.add.call_count == 1
+    assert cache._hits.add.call_count == 2
@@ -343,9 +343,11 @@ def test_rotation_scan_nexus_output_compared_to_existing_file(
     "bit_depth,expected_type",
     [(8, np.uint8), (16, np.uint16), (32, np.uint32), (100, np.uint16)],
 )
+@patch("mx_bluesky.hyperion.external_interaction.nexus.write_nexus.shutil")
 @patch("mx_bluesky.hyperion.external_interaction.nexus.write_nexus.NXmxFileWriter")
 def test_given_detector_bit_depth_changes_then_vds_datatype_as_expected(
     mock_nexus_writer,
+    mock_shutil,
     test_params: RotationScan,
     fake_create_rotation_devices: RotationScanComposite,
     bit_depth,
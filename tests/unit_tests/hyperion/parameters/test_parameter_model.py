@@ -1,9 +1,11 @@
 import json
 from pathlib import Path
 
+import numpy as np
 import pytest
 from dodal.devices.aperturescatterguard import ApertureValue
 from pydantic import ValidationError
+from scanspec.core import Path as ScanPath
 
 from mx_bluesky.hyperion.parameters.constants import GridscanParamConstants
 from mx_bluesky.hyperion.parameters.gridscan import (
@@ -43,6 +45,43 @@ def test_minimal_3d_gridscan_params(minimal_3d_gridscan_params):
     assert test_params.exposure_time_s == GridscanParamConstants.EXPOSURE_TIME_S
 
 
+@pytest.mark.parametrize(
+    "x_steps, y_steps, z_steps", [(5, 7, 9), (1, 1, 1), (40, 20, 20), (3, 1, 4)]
+)
+def test_grid_scan_points_are_the_same_as_scanspec(
+    minimal_3d_gridscan_params, x_steps, y_steps, z_steps
+):
+    test_params = ThreeDGridScan(
+        **minimal_3d_gridscan_params
+        | {"x_steps": x_steps, "y_steps": y_steps, "z_steps": z_steps}
+    )
+    for spec, points in [
+        (test_params.grid_1_spec, test_params.scan_points_first_grid),
+        (test_params.grid_2_spec, test_params.scan_points_second_grid),
+        (test_params.scan_spec, test_params.scan_points),
+    ]:
+        expected = ScanPath(spec.calculate()).consume().midpoints
+        assert list(points.keys()) == list(expected.keys())
+        for axis, expected_points in expected.items():
+            np.testing.assert_array_equal(points[axis], expected_points)
+    assert test_params.scan_indices == [0, len(expected["sam_x"]) - z_steps * x_steps]
+    assert test_params.num_images == len(expected["sam_x"])
+
+
+def test_grid_scan_points_are_cached_until_grid_changes(minimal_3d_gridscan_params):
+    test_params = ThreeDGridScan(**minimal_3d_gridscan_params)
+    first_grid = test_params.scan_points_first_grid
+    assert test_params.scan_points_first_grid is first_grid
+    with pytest.raises(ValueError):
+        first_grid["sam_x"][0] = 100
+
+    test_params.x_steps = 6
+    assert test_params.scan_points_first_grid is not first_grid
+    assert len(test_params.scan_points_first_grid["sam_x"]) == 6 * 7
+    test_params.y2_start_um = 10
+    np.testing.assert_array_equal(test_params.scan_points_second_grid["sam_y"], 10)
+
+
 def test_cant_do_panda_fgs_with_odd_y_steps(minimal_3d_gridscan_params):
     test_params = ThreeDGridScan(**minimal_3d_gridscan_params)
     with pytest.raises(OddYStepsException):
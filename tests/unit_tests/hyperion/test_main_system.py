@@ -10,11 +10,13 @@ from queue import Queue
 from sys import argv
 from time import sleep
 from typing import Any
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
 
+import bluesky.plan_stubs as bps
 import flask
 import pytest
 from blueapi.core import BlueskyContext
+from bluesky.run_engine import RunEngine
 from dodal.devices.attenuator import Attenuator
 from dodal.devices.zebra import Zebra
 from flask.testing import FlaskClient
@@ -22,7 +24,11 @@ from flask.testing import FlaskClient
 from mx_bluesky.hyperion.__main__ import (
     Actions,
     BlueskyRunner,
+    Command,
+    QueuedExperiment,
     Status,
+    StatusAndMessage,
+    StopOrStatus,
     create_app,
     create_targets,
     setup_context,
@@ -31,8 +37,11 @@ from mx_bluesky.hyperion.exceptions import WarningException
 from mx_bluesky.hyperion.experiment_plans.experiment_registry import PLAN_REGISTRY
 from mx_bluesky.hyperion.log import LOGGER
 from mx_bluesky.hyperion.parameters.cli import parse_cli_args
+from mx_bluesky.hyperion.parameters.constants import CONST
 from mx_bluesky.hyperion.parameters.gridscan import ThreeDGridScan
 from mx_bluesky.hyperion.utils.context import device_composite_from_context
+from mx_bluesky.hyperion.utils.device_connection import DeviceConnector
+from mx_bluesky.hyperion.utils.phase_timing import SampleTimer, sample_timing_wrapper
 
 from ...conftest import raw_params_from_file
 
@@ -41,6 +50,9 @@ START_ENDPOINT = FGS_ENDPOINT + Actions.START.value
 STOP_ENDPOINT = Actions.STOP.value
 STATUS_ENDPOINT = Actions.STATUS.value
 SHUTDOWN_ENDPOINT = Actions.SHUTDOWN.value
+SAMPLE_TIMINGS_ENDPOINT = "/sample_timings"
+ENQUEUE_ENDPOINT = FGS_ENDPOINT + Actions.ENQUEUE.value
+QUEUE_ENDPOINT = "/queue"
 TEST_BAD_PARAM_ENDPOINT = "/fgs_real_params/" + Actions.START.value
 TEST_PARAMS = json.dumps(
     raw_params_from_file(
@@ -69,8 +81,10 @@ class MockRunEngine:
         self.aborting_takes_time = False
         self.error: Exception | None = None
         self.test_name = test_name
+        self.call_count = 0
 
     def __call__(self, *args: Any, **kwds: Any) -> Any:
+        self.call_count += 1
         time = 0.0
         while self.RE_takes_time:
             sleep(SECS_PER_RUNENGINE_LOOP)
@@ -215,6 +229,218 @@ def test_getting_status_after_start_sent_returns_busy(
     check_status_in_response(response, Status.BUSY)
 
 
+def test_sample_timings_gives_samples_and_percentiles(test_env: ClientAndRunEngine):
+    samples = [
+        {
+            "start_time": 0,
+            "total_s": 100,
+            "succeeded": True,
+            "phases": {"robot_load": 20},
+        },
+        {
+            "start_time": 0,
+            "total_s": 200,
+            "succeeded": True,
+            "phases": {"robot_load": 40},
+        },
+    ]
+    with patch.object(
+        SampleTimer, "samples", autospec=True, return_value=samples
+    ) as mock_samples:
+        response = test_env.client.get(SAMPLE_TIMINGS_ENDPOINT)
+        mock_samples.assert_called_with(ANY, None)
+    assert response.json["samples"] == samples
+    assert response.json["percentiles"]["total"]["p50"] == 150
+    assert response.json["percentiles"]["robot_load"]["p50"] == 30
+
+
+@patch("mx_bluesky.hyperion.__main__.time.time", MagicMock(return_value=36000))
+def test_sample_timings_over_last_hours(test_env: ClientAndRunEngine):
+    with patch.object(
+        SampleTimer, "samples", autospec=True, return_value=[]
+    ) as mock_samples:
+        response = test_env.client.get(SAMPLE_TIMINGS_ENDPOINT + "?hours=8")
+        mock_samples.assert_called_with(ANY, 36000 - 8 * 3600)
+    assert response.json == {"samples": [], "percentiles": {}}
+
+
+def _queued_ids(client: FlaskClient) -> list[str]:
+    return [
+        queued["experiment_id"] for queued in client.get(QUEUE_ENDPOINT).json["queue"]
+    ]
+
+
+def test_enqueue_when_idle_starts_straight_away(test_env: ClientAndRunEngine):
+    response = test_env.client.put(ENQUEUE_ENDPOINT, data=TEST_PARAMS)
+    check_status_in_response(response, Status.SUCCESS)
+    assert response.json["experiment_id"]
+    check_status_in_response(test_env.client.get(STATUS_ENDPOINT), Status.BUSY)
+    assert _queued_ids(test_env.client) == []
+
+
+def test_enqueue_when_busy_queues_experiment(test_env: ClientAndRunEngine):
+    test_env.client.put(START_ENDPOINT, data=TEST_PARAMS)
+    response = test_env.client.put(ENQUEUE_ENDPOINT, data=TEST_PARAMS)
+    check_status_in_response(response, Status.SUCCESS)
+    queue = test_env.client.get(QUEUE_ENDPOINT).json["queue"]
+    assert len(queue) == 1
+    assert queue[0]["experiment_id"] == response.json["experiment_id"]
+    assert queue[0]["plan_name"] == "flyscan_xray_centre"
+    assert queue[0]["sample_id"] == json.loads(TEST_PARAMS)["sample_id"]
+
+
+@patch("mx_bluesky.hyperion.__main__.QUEUE_LATENCY")
+def test_queued_experiments_run_back_to_back_and_record_latency(
+    mock_queue_latency: MagicMock, test_env: ClientAndRunEngine
+):
+    test_env.client.put(START_ENDPOINT, data=TEST_PARAMS)
+    test_env.client.put(ENQUEUE_ENDPOINT, data=TEST_PARAMS)
+    test_env.client.put(ENQUEUE_ENDPOINT, data=TEST_PARAMS)
+    test_env.mock_run_engine.RE_takes_time = False
+    wait_for_run_engine_status(
+        test_env.client,
+        lambda status: status == Status.IDLE.value
+        and test_env.mock_run_engine.call_count == 3,
+    )
+    assert _queued_ids(test_env.client) == []
+    assert mock_queue_latency.record.call_count == 2
+
+
+def test_enqueue_when_queue_full_fails(test_env: ClientAndRunEngine):
+    test_env.client.put(START_ENDPOINT, data=TEST_PARAMS)
+    for _ in range(CONST.EXPERIMENT_QUEUE_SIZE):
+        response = test_env.client.put(ENQUEUE_ENDPOINT, data=TEST_PARAMS)
+        check_status_in_response(response, Status.SUCCESS)
+    response = test_env.client.put(ENQUEUE_ENDPOINT, data=TEST_PARAMS)
+    check_status_in_response(response, Status.FAILED)
+    assert len(_queued_ids(test_env.client)) == CONST.EXPERIMENT_QUEUE_SIZE
+
+
+def test_enqueue_with_bad_params_fails_and_does_not_queue(
+    test_env: ClientAndRunEngine,
+):
+    test_env.client.put(START_ENDPOINT, data=TEST_PARAMS)
+    response = test_env.client.put(
+        "/fgs_real_params/" + Actions.ENQUEUE.value, data='{"bad":1}'
+    )
+    check_status_in_response(response, Status.FAILED)
+    assert _queued_ids(test_env.client) == []
+
+
+def test_cancel_queued_experiment(test_env: ClientAndRunEngine):
+    test_env.client.put(START_ENDPOINT, data=TEST_PARAMS)
+    first = test_env.client.put(ENQUEUE_ENDPOINT, data=TEST_PARAMS).json
+    second = test_env.client.put(ENQUEUE_ENDPOINT, data=TEST_PARAMS).json
+    response = test_env.client.delete(f"{QUEUE_ENDPOINT}/{first['experiment_id']}")
+    check_status_in_response(response, Status.SUCCESS)
+    assert _queued_ids(test_env.client) == [second["experiment_id"]]
+
+
+def test_cancel_experiment_not_in_queue_fails(test_env: ClientAndRunEngine):
+    response = test_env.client.delete(f"{QUEUE_ENDPOINT}/not_an_experiment")
+    check_status_in_response(response, Status.FAILED)
+    test_env.mock_run_engine.RE_takes_time = False
+
+
+def test_move_queued_experiment_to_front(test_env: ClientAndRunEngine):
+    test_env.client.put(START_ENDPOINT, data=TEST_PARAMS)
+    ids = [
+        test_env.client.put(ENQUEUE_ENDPOINT, data=TEST_PARAMS).json["experiment_id"]
+        for _ in range(3)
+    ]
+    response = test_env.client.put(
+        f"{QUEUE_ENDPOINT}/{ids[2]}", data=json.dumps({"position": 0})
+    )
+    check_status_in_response(response, Status.SUCCESS)
+    assert _queued_ids(test_env.client) == [ids[2], ids[0], ids[1]]
+
+
+@pytest.mark.parametrize("body", [{"position": 1}, {"position": -1}, {}])
+def test_move_queued_experiment_to_bad_position_fails(
+    test_env: ClientAndRunEngine, body: dict
+):
+    test_env.client.put(START_ENDPOINT, data=TEST_PARAMS)
+    experiment_id = test_env.client.put(ENQUEUE_ENDPOINT, data=TEST_PARAMS).json[
+        "experiment_id"
+    ]
+    response = test_env.client.put(
+        f"{QUEUE_ENDPOINT}/{experiment_id}", data=json.dumps(body)
+    )
+    check_status_in_response(response, Status.FAILED)
+    assert _queued_ids(test_env.client) == [experiment_id]
+
+
+def test_stop_clears_queue(test_env: ClientAndRunEngine):
+    test_env.client.put(START_ENDPOINT, data=TEST_PARAMS)
+    test_env.client.put(ENQUEUE_ENDPOINT, data=TEST_PARAMS)
+    test_env.client.put(STOP_ENDPOINT)
+    assert _queued_ids(test_env.client) == []
+    wait_for_run_engine_status(
+        test_env.client, lambda status: status == Status.IDLE.value
+    )
+    assert test_env.mock_run_engine.call_count == 1
+
+
+def test_failed_experiment_clears_queue(test_env: ClientAndRunEngine):
+    test_env.client.put(START_ENDPOINT, data=TEST_PARAMS)
+    test_env.client.put(ENQUEUE_ENDPOINT, data=TEST_PARAMS)
+    test_env.mock_run_engine.error = Exception("D'Oh")
+    wait_for_run_engine_status(
+        test_env.client,
+        lambda status: status == Status.FAILED.value
+        and not _queued_ids(test_env.client),
+    )
+    assert test_env.mock_run_engine.call_count == 1
+
+
+def test_warning_exception_carries_on_with_queue(test_env: ClientAndRunEngine):
+    test_env.client.put(START_ENDPOINT, data=TEST_PARAMS)
+    test_env.client.put(ENQUEUE_ENDPOINT, data=TEST_PARAMS)
+    test_env.mock_run_engine.error = WarningException("D'Oh")
+    response_json = wait_for_run_engine_status(
+        test_env.client,
+        lambda status: status == Status.FAILED.value
+        and test_env.mock_run_engine.call_count == 2,
+    )
+    assert response_json["exception_type"] == "WarningException"
+
+
+@patch.dict("mx_bluesky.hyperion.__main__.PLAN_REGISTRY", TEST_EXPTS)
+def test_start_while_finishing_experiment_with_more_queued_fails():
+    runner = BlueskyRunner(MagicMock(), MagicMock(), skip_startup_connection=True)
+    queued_command = Command(
+        action=Actions.START, devices=None, experiment=MagicMock(), parameters=None
+    )
+    runner.experiment_queue.append(
+        QueuedExperiment("queued", "test_experiment", 0, queued_command)
+    )
+    starts_while_finishing = []
+    # The per plan callbacks are unsubscribed after the experiment finishes but
+    # before the next one is picked from the queue
+    runner.RE.unsubscribe.side_effect = lambda _: starts_while_finishing.append(
+        runner.start(MagicMock(), MagicMock(), "test_experiment", None)
+    )
+    runner.current_status = StatusAndMessage(Status.BUSY)
+    runner.command_queue.put(
+        Command(
+            action=Actions.START,
+            devices=None,
+            experiment=MagicMock(),
+            parameters=None,
+            callbacks=lambda: [MagicMock()],
+        )
+    )
+    runner.command_queue.put(Command(action=Actions.SHUTDOWN))
+    runner.wait_on_queue()
+
+    assert starts_while_finishing == [
+        StatusAndMessage(Status.FAILED, "Bluesky already running")
+    ]
+    assert runner.current_status == StatusAndMessage(Status.BUSY)
+    assert runner.command_queue.get_nowait() is queued_command
+    assert runner.command_queue.empty()
+
+
 def test_putting_bad_plan_fails(test_env: ClientAndRunEngine):
     response = test_env.client.put("/bad_plan/start", data=TEST_PARAMS).json
     assert isinstance(response, dict)
@@ -576,3 +802,84 @@ def test_when_context_created_then_contains_expected_number_of_plans(
         assert "flyscan_xray_centre" in plan_names
         assert "pin_tip_centre_then_xray_centre" in plan_names
         assert "robot_load_then_centre" in plan_names
+
+
+def test_cli_args_parse_background_device_connection():
+    argv[1:] = ["--background-device-connection"]
+    assert parse_cli_args().background_device_connection
+    argv[1:] = []
+    assert not parse_cli_args().background_device_connection
+
+
+def test_status_includes_device_connection_progress_if_connecting_in_background():
+    mock_connector = MagicMock(spec=DeviceConnector)
+    mock_connector.progress.return_value = {
+        "Connected": 1,
+        "devices": {"a": "Connected"},
+    }
+    runner = BlueskyRunner(
+        MagicMock(),
+        MagicMock(),
+        skip_startup_connection=True,
+        device_connector=mock_connector,
+    )
+    status = StopOrStatus(runner).get(action=Actions.STATUS.value)
+    assert status["status"] == Status.IDLE.value
+    assert status["device_connection"] == mock_connector.progress.return_value
+
+
+def _run_command_with_device_connector(mock_connector: MagicMock) -> BlueskyRunner:
+    runner = BlueskyRunner(
+        MagicMock(),
+        MagicMock(),
+        skip_startup_connection=True,
+        device_connector=mock_connector,
+    )
+    runner.current_status = StatusAndMessage(Status.BUSY)
+    runner.command_queue.put(
+        Command(
+            action=Actions.START,
+            devices="composite",
+            experiment=MagicMock(),
+            parameters=None,
+        )
+    )
+    runner.command_queue.put(Command(action=Actions.SHUTDOWN))
+    runner.wait_on_queue()
+    return runner
+
+
+def test_runner_waits_for_plan_devices_to_connect_before_running():
+    mock_connector = MagicMock(spec=DeviceConnector)
+    runner = _run_command_with_device_connector(mock_connector)
+    runner.RE.assert_called_once()
+    mock_connector.wait_for_composite.assert_called_once_with("composite")
+
+
+def test_runner_fails_plan_if_its_devices_cannot_connect():
+    mock_connector = MagicMock(spec=DeviceConnector)
+    mock_connector.wait_for_composite.side_effect = ConnectionError("broken")
+    runner = _run_command_with_device_connector(mock_connector)
+    runner.RE.assert_not_called()
+    assert runner.current_status.status == Status.FAILED.value
+    assert runner.current_status.exception_type == "ConnectionError"  # type: ignore
+
+
+def test_runner_times_the_samples_of_the_plans_it_runs(RE: RunEngine):
+    runner = BlueskyRunner(RE, MagicMock(), skip_startup_connection=True)
+    runner.current_status = StatusAndMessage(Status.BUSY)
+    runner.command_queue.put(
+        Command(
+            action=Actions.START,
+            devices=None,
+            experiment=lambda devices, parameters: sample_timing_wrapper(
+                bps.null(), "test_plan", 5
+            ),
+            parameters=None,
+        )
+    )
+    runner.command_queue.put(Command(action=Actions.SHUTDOWN))
+    runner.wait_on_queue()
+    [timing] = runner.sample_timer.samples()
+    assert timing["plan_name"] == "test_plan"
+    assert timing["succeeded"]
@@ -1,8 +1,14 @@
+import numpy as np
 import pytest
+from scanspec.specs import Line, Spec
 
+from mx_bluesky.hyperion.parameters.gridscan import ThreeDGridScan
 from mx_bluesky.hyperion.utils.utils import (
+    SCAN_SPEC_KEY,
+    compact_scan_points,
     convert_angstrom_to_eV,
     convert_eV_to_angstrom,
+    number_of_frames_from_scan_spec,
 )
 
 test_wavelengths = [1.620709, 1.2398425, 0.9762539, 0.8265616, 0.68880138]
@@ -23,3 +29,37 @@ def test_ev_to_a_converter(test_wavelength, test_energy):
 )
 def test_a_to_ev_converter(test_wavelength, test_energy):
     assert convert_angstrom_to_eV(test_wavelength) == pytest.approx(test_energy)
+
+
+def test_compact_scan_points_round_trip_for_grid_scan(
+    test_fgs_params: ThreeDGridScan,
+):
+    for spec, points in [
+        (test_fgs_params.grid_1_spec, test_fgs_params.scan_points_first_grid),
+        (test_fgs_params.grid_2_spec, test_fgs_params.scan_points_second_grid),
+    ]:
+        compact = compact_scan_points(spec)
+        assert number_of_frames_from_scan_spec(compact) == (
+            number_of_frames_from_scan_spec(points)
+        )
+        assert Spec.deserialize(compact[SCAN_SPEC_KEY]) == spec
+
+
+def test_compact_scan_points_round_trip_for_rotation():
+    spec = Line("omega", 0, 359.9, 3600)
+    compact = compact_scan_points(spec)
+    assert number_of_frames_from_scan_spec(compact) == 3600
+    assert Spec.deserialize(compact[SCAN_SPEC_KEY]) == spec
+
+
+def test_compact_scan_points_are_small_for_large_scans():
+    compact = compact_scan_points(
+        Line("y", 0, 1, 100) * ~Line("x", 0, 1, 200) * Line("z", 0, 1, 100)
+    )
+    assert number_of_frames_from_scan_spec(compact) == 2000000
+    assert len(str(compact)) < 1000
+
+
+def test_number_of_frames_of_full_points():
+    points = {"omega": np.array([0.0, 0.1, 0.2])}
+    assert number_of_frames_from_scan_spec(points) == 3
@@ -1,5 +1,5 @@
 import dataclasses
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 from ophyd.device import Device
@@ -72,3 +72,64 @@ def test_device_composite_from_context():
 
     assert composite.device2 == device2_instance
     assert isinstance(composite.device2, _DeviceType2)
+
+
+@dataclasses.dataclass
+class _CachedComposite:
+    device1: _DeviceType1
+    device2: _DeviceType2
+
+
+def _context_finding(devices: dict) -> MagicMock:
+    context = MagicMock()
+    context.find_device = MagicMock(side_effect=devices.get)
+    return context
+
+
+@patch("mx_bluesky.hyperion.utils.context.find_device_in_context")
+def test_device_composite_from_context_reused_while_devices_unchanged(
+    mock_find_device_in_context: MagicMock,
+):
+    devices = {
+        "device1": MagicMock(spec=_DeviceType1),
+        "device2": MagicMock(spec=_DeviceType2),
+    }
+    mock_find_device_in_context.side_effect = lambda _, name, expected_type: devices[
+        name
+    ]
+    context = _context_finding(devices)
+
+    first = device_composite_from_context(context, _CachedComposite)
+    second = device_composite_from_context(context, _CachedComposite)
+
+    assert second is first
+    assert mock_find_device_in_context.call_count == 2
+
+
+def test_device_composite_from_context_remade_when_device_replaced():
+    devices = {
+        "device1": MagicMock(spec=_DeviceType1),
+        "device2": MagicMock(spec=_DeviceType2),
+    }
+    context = _context_finding(devices)
+    first = device_composite_from_context(context, _CachedComposite)
+
+    devices["device2"] = MagicMock(spec=_DeviceType2)
+    second = device_composite_from_context(context, _CachedComposite)
+
+    assert second is not first
+    assert second.device1 is devices["device1"]
+    assert second.device2 is devices["device2"]
+
+
+def test_device_composite_from_context_checks_devices_in_new_context():
+    device1 = MagicMock(spec=_DeviceType1)
+    device_composite_from_context(
+        _context_finding({"device1": device1, "device2": MagicMock(spec=_DeviceType2)}),
+        _CachedComposite,
+    )
+
+    with pytest.raises(ValueError):
+        device_composite_from_context(
+            _context_finding({"device1": device1}), _CachedComposite
+        )
@@ -0,0 +1,128 @@
+import asyncio
+import dataclasses
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+from bluesky.run_engine import RunEngine
+from ophyd_async.core import Device, NotConnected
+
+from mx_bluesky.hyperion.utils.device_connection import DeviceConnector
+
+
+class SlowDevice(Device):
+    """Takes delay seconds to connect, failing to if fail is set"""
+
+    def __init__(self, delay: float, fail: bool = False, name: str = "") -> None:
+        self.delay = delay
+        self.fail = fail
+        self.connect_count = 0
+        super().__init__(name)
+
+    async def connect(self, mock=False, timeout=10.0, force_reconnect=False):
+        self.connect_count += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise NotConnected(f"{self.name} IOC is down")
+
+
+@pytest.fixture
+def devices(RE: RunEngine) -> dict[str, SlowDevice]:
+    return {
+        "fast": SlowDevice(0.01, name="fast"),
+        "slow": SlowDevice(1, name="slow"),
+        "broken": SlowDevice(0.01, fail=True, name="broken"),
+    }
+
+
+def test_devices_connected_at_the_same_time(RE: RunEngine):
+    devices = {f"device_{i}": SlowDevice(0.2, name=f"device_{i}") for i in range(5)}
+    connector = DeviceConnector(devices)
+
+    start = time.perf_counter()
+    connector.start()
+    connector.wait_for(devices)
+
+    assert time.perf_counter() - start < 0.5
+    progress = connector.progress()
+    assert progress["Connected"] == 5
+    assert progress["startup_time_s"] < 0.5
+    assert all(state == "Connected" for state in progress["devices"].values())
+
+
+def test_wait_for_only_waits_for_the_given_devices(devices: dict[str, SlowDevice]):
+    connector = DeviceConnector(devices)
+    connector.start()
+
+    start = time.perf_counter()
+    connector.wait_for(["fast"])
+
+    assert time.perf_counter() - start < 0.5
+    progress = connector.progress()
+    assert progress["devices"]["fast"] == "Connected"
+    assert progress["devices"]["slow"] == "Connecting"
+
+
+def test_wait_for_composite_waits_for_its_devices(devices: dict[str, SlowDevice]):
+    @dataclasses.dataclass
+    class Composite:
+        fast: SlowDevice
+        slow: SlowDevice
+
+    connector = DeviceConnector(devices)
+    connector.start()
+    connector.wait_for_composite(Composite(devices["fast"], devices["slow"]))
+
+    assert connector.progress()["devices"]["slow"] == "Connected"
+
+
+def test_device_that_failed_is_tried_again_when_needed(
+    devices: dict[str, SlowDevice],
+):
+    connector = DeviceConnector(devices)
+    connector.start()
+
+    with pytest.raises(ConnectionError, match="broken"):
+        connector.wait_for(["fast", "broken"])
+    assert devices["broken"].connect_count == 2
+    assert connector.progress()["Failed"] == 1
+
+    devices["broken"].fail = False
+    connector.wait_for(["broken"])
+    assert devices["broken"].connect_count == 3
+    assert connector.progress()["devices"]["broken"] == "Connected"
+
+
+def test_failed_device_tried_again_once_for_plans_waiting_at_the_same_time(
+    devices: dict[str, SlowDevice],
+):
+    connector = DeviceConnector(devices)
+    connector.start()
+    connector.wait_for(["fast"])
+    while connector.progress()["Failed"] == 0:
+        time.sleep(0.01)
+    devices["broken"].delay = 0.2
+
+    def wait_for_broken():
+        with pytest.raises(ConnectionError, match="broken"):
+            connector.wait_for(["broken"])
+
+    with ThreadPoolExecutor(2) as executor:
+        for waiting in [executor.submit(wait_for_broken) for _ in range(2)]:
+            waiting.result()
+    assert devices["broken"].connect_count == 2
+
+
+@patch("mx_bluesky.hyperion.utils.device_connection.LOGGER")
+def test_startup_report_logged_once_all_devices_tried(
+    mock_logger: MagicMock, devices: dict[str, SlowDevice]
+):
+    connector = DeviceConnector(devices)
+    connector.start()
+    connector.wait_for(["slow"])
+
+    report = mock_logger.info.call_args_list[-1].args[0]
+    assert report.startswith("Connected to 2 of 3 devices in")
+    assert "slowest: slow 1.0" in report
+    assert "failed to connect to ['broken']" in report
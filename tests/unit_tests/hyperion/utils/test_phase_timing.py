@@ -0,0 +1,320 @@
+import dataclasses
+from unittest.mock import patch
+
+import bluesky.plan_stubs as bps
+import pytest
+from bluesky.run_engine import RunEngine
+from bluesky.utils import RequestAbort
+from ophyd.status import Status
+
+from mx_bluesky.hyperion.parameters.constants import CONST
+from mx_bluesky.hyperion.utils.phase_timing import (
+    SampleTimer,
+    SampleTiming,
+    sample_timing_wrapper,
+    time_in_background,
+    timed_phase,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds: float):
+        yield from bps.null()
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    clock = FakeClock()
+    with patch("mx_bluesky.hyperion.utils.phase_timing.time.perf_counter", clock):
+        yield clock
+
+
+@pytest.fixture
+def timer():
+    timer = SampleTimer()
+    with timer.active():
+        yield timer
+
+
+def test_phases_are_summed_and_summary_kept_at_end_of_sample(
+    RE: RunEngine, clock: FakeClock, timer: SampleTimer
+):
+    def plan():
+        with timed_phase("first"):
+            yield from clock.sleep(1)
+        with timed_phase("second"):
+            yield from clock.sleep(2)
+        with timed_phase("first"):
+            yield from clock.sleep(3)
+        yield from clock.sleep(4)
+        return "result"
+
+    result = RE(sample_timing_wrapper(plan(), "test_plan", 5))
+
+    assert result.plan_result == "result"  # type: ignore
+    [timing] = timer.samples()
+    assert timing["plan_name"] == "test_plan"
+    assert timing["sample_id"] == 5
+    assert timing["succeeded"]
+    assert timing["total_s"] == 10
+    assert timing["phases"] == {"first": 4, "second": 2}
+
+
+def test_sample_timing_does_not_add_to_the_documents_or_messages(
+    RE: RunEngine, timer: SampleTimer
+):
+    def plan():
+        with timed_phase("first"):
+            yield from bps.null()
+
+    documents = []
+    RE.subscribe(lambda name, doc: documents.append(name))
+    messages = []
+    RE.msg_hook = messages.append
+
+    RE(sample_timing_wrapper(plan(), "test_plan", 5))
+
+    assert documents == []
+    assert [msg.command for msg in messages] == ["null"]
+    assert len(timer.samples()) == 1
+
+
+def test_nested_samples_are_timed_as_the_outer_sample(
+    RE: RunEngine, clock: FakeClock, timer: SampleTimer
+):
+    def inner():
+        with timed_phase("inner"):
+            yield from clock.sleep(1)
+
+    def outer():
+        yield from sample_timing_wrapper(inner(), "inner_plan", 1)
+        with timed_phase("outer"):
+            yield from clock.sleep(2)
+
+    RE(sample_timing_wrapper(outer(), "outer_plan", 1))
+
+    [timing] = timer.samples()
+    assert timing["plan_name"] == "outer_plan"
+    assert timing["phases"] == {"inner": 1, "outer": 2}
+
+
+def test_summary_kept_for_failed_sample(
+    RE: RunEngine, clock: FakeClock, timer: SampleTimer
+):
+    def plan():
+        with timed_phase("failing"):
+            yield from clock.sleep(1)
+            raise ValueError()
+
+    with pytest.raises(ValueError):
+        RE(sample_timing_wrapper(plan(), "test_plan", 5))
+
+    [timing] = timer.samples()
+    assert not timing["succeeded"]
+    assert timing["phases"] == {"failing": 1}
+    assert timer.current is None
+
+
+def test_phases_outside_a_sample_are_not_recorded(
+    RE: RunEngine, clock: FakeClock, timer: SampleTimer
+):
+    def plan():
+        with timed_phase("unrecorded"):
+            yield from clock.sleep(1)
+
+    RE(plan())
+    RE(sample_timing_wrapper(bps.null(), "test_plan", 5))
+
+    [timing] = timer.samples()
+    assert timing["phases"] == {}
+
+
+def test_samples_not_timed_without_an_active_timer(RE: RunEngine, clock: FakeClock):
+    timer = SampleTimer()
+
+    def plan():
+        with timed_phase("untimed"):
+            yield from clock.sleep(1)
+
+    RE(sample_timing_wrapper(plan(), "test_plan", 5))
+
+    assert timer.samples() == []
+    assert timer.current is None
+
+
+def test_background_work_is_timed_until_its_status_finishes(
+    RE: RunEngine, clock: FakeClock, timer: SampleTimer
+):
+    def plan():
+        status = Status()
+        time_in_background(status, "arming")
+        with timed_phase("loading"):
+            yield from clock.sleep(5)
+        status.set_finished()
+        status.wait()
+        with timed_phase("arming"):
+            yield from bps.null()
+
+    RE(sample_timing_wrapper(plan(), "test_plan", 5))
+
+    [timing] = timer.samples()
+    assert timing["phases"] == {"loading": 5, "arming": 0}
+    assert timing["background"] == {"arming": 5}
+
+
+@patch("mx_bluesky.hyperion.utils.phase_timing.LOGGER")
+def test_failed_background_work_is_logged_and_not_timed(
+    mock_logger, RE: RunEngine, clock: FakeClock, timer: SampleTimer
+):
+    def plan():
+        status = Status()
+        time_in_background(status, "arming")
+        yield from clock.sleep(1)
+        status.set_exception(ValueError("Arming failed"))
+        with pytest.raises(ValueError):
+            status.wait()
+        time_in_background(None, "no_status")
+
+    RE(sample_timing_wrapper(plan(), "test_plan", 5))
+
+    [timing] = timer.samples()
+    assert timing["background"] == {}
+    mock_logger.error.assert_called_once_with(
+        "arming failed in the background after 1.00s: Arming failed"
+    )
+
+
+@patch("mx_bluesky.hyperion.utils.phase_timing.LOGGER")
+def test_background_work_finishing_after_its_sample_is_logged_and_not_timed(
+    mock_logger, RE: RunEngine, clock: FakeClock, timer: SampleTimer
+):
+    status = Status()
+
+    def plan():
+        time_in_background(status, "arming")
+        yield from clock.sleep(1)
+
+    RE(sample_timing_wrapper(plan(), "test_plan", 5))
+    clock.now += 1
+    status.set_finished()
+    status.wait()
+
+    [timing] = timer.samples()
+    assert timing["background"] == {}
+    mock_logger.warning.assert_called_once_with(
+        "arming finished in the background after its sample, so isn't included in "
+        "the sample's timing"
+    )
+
+
+def test_background_time_is_only_added_to_the_current_sample():
+    timer = SampleTimer()
+    sample = SampleTiming("test_plan", 5, 0)
+    timer.current = sample
+    assert timer.add_background(sample, "arming", 2)
+    timer.close(sample)
+    assert not timer.add_background(sample, "arming", 3)
+    assert sample.background == {"arming": 2}
+
+
+def test_summary_not_kept_for_aborted_sample(
+    RE: RunEngine, clock: FakeClock, timer: SampleTimer
+):
+    def plan():
+        with timed_phase("aborted"):
+            yield from clock.sleep(1)
+            raise RequestAbort()
+
+    # The RunEngine treats this as an abort rather than raising it
+    RE(sample_timing_wrapper(plan(), "test_plan", 5))
+
+    assert timer.samples() == []
+    assert timer.current is None
+
+
+def _timing(
+    start_time: float,
+    total_s: float,
+    phases: dict[str, float],
+    succeeded: bool = True,
+):
+    return SampleTiming(
+        "load_centre_collect_full_plan",
+        1,
+        start_time,
+        total_s=total_s,
+        succeeded=succeeded,
+        phases=phases,
+        background={},
+    )
+
+
+@pytest.fixture
+def timer_with_samples():
+    timer = SampleTimer()
+    for i in range(1, 101):
+        timer.add(
+            _timing(
+                start_time=i,
+                total_s=i * 10,
+                phases={CONST.PHASE.ROBOT_LOAD: i, CONST.PHASE.FGS: 2 * i}
+                if i % 2
+                else {CONST.PHASE.ROBOT_LOAD: i},
+            )
+        )
+    return timer
+
+
+def test_samples_are_kept_oldest_first(timer_with_samples: SampleTimer):
+    samples = timer_with_samples.samples()
+    assert len(samples) == 100
+    assert [sample["start_time"] for sample in samples] == list(range(1, 101))
+    assert samples[0] == dataclasses.asdict(
+        _timing(1, 10, {CONST.PHASE.ROBOT_LOAD: 1, CONST.PHASE.FGS: 2})
+    )
+
+
+def test_samples_filtered_by_start_time(timer_with_samples: SampleTimer):
+    assert [s["start_time"] for s in timer_with_samples.samples(since=98)] == [
+        98,
+        99,
+        100,
+    ]
+
+
+def test_percentiles_for_each_phase_and_total(timer_with_samples: SampleTimer):
+    percentiles = timer_with_samples.percentiles()
+    assert percentiles["total"]["p50"] == pytest.approx(505)
+    assert percentiles[CONST.PHASE.ROBOT_LOAD]["p50"] == pytest.approx(50.5)
+    assert percentiles[CONST.PHASE.ROBOT_LOAD]["p99"] == pytest.approx(99.01)
+    # Only odd samples had an FGS
+    assert percentiles[CONST.PHASE.FGS]["p50"] == pytest.approx(100)
+    assert percentiles[CONST.PHASE.FGS].keys() == {"p50", "p90", "p99"}
+
+
+def test_percentiles_leave_out_failed_samples(timer_with_samples: SampleTimer):
+    timer_with_samples.add(
+        _timing(101, 5000, {CONST.PHASE.ROBOT_LOAD: 5000}, succeeded=False)
+    )
+    assert len(timer_with_samples.samples()) == 101
+    percentiles = timer_with_samples.percentiles()
+    assert percentiles["total"]["p99"] == pytest.approx(990.1)
+    assert percentiles[CONST.PHASE.ROBOT_LOAD]["p99"] == pytest.approx(99.01)
+
+
+def test_percentiles_of_no_samples_are_empty():
+    assert SampleTimer().percentiles() == {}
+
+
+def test_oldest_samples_dropped_when_history_full():
+    timer = SampleTimer(max_samples=2)
+    for i in range(3):
+        timer.add(_timing(i, 1, {}))
+    assert [s["start_time"] for s in timer.samples()] == [1, 2]
@@ -2,11 +2,16 @@
 # Entry point for the production docker image that launches the external callbacks
 # as well as the main server
 
+BACKGROUND_DEVICE_CONNECTION=false
+
 for option in "$@"; do
     case $option in
         --skip-startup-connection)
             SKIP_STARTUP_CONNECTION=true
             ;;
+        --background-device-connection)
+            BACKGROUND_DEVICE_CONNECTION=true
+            ;;
         --dev)
             IN_DEV=true
             ;;
@@ -46,9 +51,11 @@ callback_start_log_path=$HYPERION_LOG_DIR/callback_start_log.log
 
 #Add future arguments here
 declare -A h_only_args=(        ["SKIP_STARTUP_CONNECTION"]="$SKIP_STARTUP_CONNECTION"
+                                ["BACKGROUND_DEVICE_CONNECTION"]="$BACKGROUND_DEVICE_CONNECTION"
                                 ["VERBOSE_EVENT_LOGGING"]="$VERBOSE_EVENT_LOGGING"
                                 ["EXTERNAL_CALLBACK_SERVICE"]="$EXTERNAL_CALLBACK_SERVICE" )
 declare -A h_only_arg_strings=( ["SKIP_STARTUP_CONNECTION"]="--skip-startup-connection"
+                                ["BACKGROUND_DEVICE_CONNECTION"]="--background-device-connection"
                                 ["VERBOSE_EVENT_LOGGING"]="--verbose-event-logging"
                                 ["EXTERNAL_CALLBACK_SERVICE"]="--external-callbacks")
 